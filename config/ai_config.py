@@ -15,7 +15,7 @@ from typing import Dict, Any
 # DeepSeek配置
 DEEPSEEK_CONFIG = {
     'api_key': os.getenv('DEEPSEEK_API_KEY', 'sk-d246fe03fd164cf3abf49f45d0220d21'),  # 从环境变量获取，默认使用提供的密钥
-    'base_url': 'https://api.deepseek.com',
+    'base_url': os.getenv('DEEPSEEK_BASE_URL', 'https://api.deepseek.com'),  # 可指向本地模拟服务（scripts/mock_llm_server.py）
     'model_name': 'deepseek-reasoner',  # 使用推理模型
     'chat_model': 'deepseek-chat',  # 聊天模型
     'max_tokens': 2000,
@@ -36,6 +36,71 @@ OPENAI_CONFIG = {
 # 中转服务配置示例（如果使用中转服务）
 # OPENAI_CONFIG['base_url'] = 'https://your-proxy-service.com'  # 替换为你的中转服务地址
 
+# AI响应缓存配置（按 规范化内容 + 提示词版本 + 模型 的哈希缓存，正文未变时跳过AI调用）
+AI_CACHE_CONFIG = {
+    'enabled': True,
+    'path': 'data/ai_cache.json',
+    'ttl_seconds': 7 * 24 * 3600,  # 缓存有效期
+    'max_entries': 500  # 超出时淘汰最久未使用的条目
+}
+
+# AI请求并发配置（时间提取与完整分析同时发出，共用 HTTP_CLIENT_CONFIG 的连接池）
+AI_CONCURRENCY_CONFIG = {
+    'concurrent_analysis': True,  # 完整分析在后台与时间提取并发进行
+    'analysis_workers': 2,  # 后台分析线程数
+    'analysis_wait_timeout_s': 120  # 结束前等待后台分析完成的最长时间
+}
+
+# 本地模拟LLM服务配置（scripts/mock_llm_server.py、scripts/benchmark_ai_pipeline.py 使用）
+# 比例按 断连 → HTTP错误 → 卡住 的顺序依次判定，随机种子固定，结果可复现
+MOCK_LLM_PROFILES = {
+    'fast': {
+        'latency_s': 0.05,
+        'token_interval_s': 0.002,
+        'description': '本机即时响应（基线）'
+    },
+    'typical': {
+        'latency_s': 0.8,
+        'token_interval_s': 0.02,
+        'jitter_s': 0.3,
+        'description': 'DeepSeek日常响应'
+    },
+    'slow': {
+        'latency_s': 3.0,
+        'token_interval_s': 0.05,
+        'jitter_s': 1.0,
+        'description': '高峰期排队'
+    },
+    'flaky': {
+        'latency_s': 0.5,
+        'token_interval_s': 0.02,
+        'failure_rate': 0.2,
+        'disconnect_rate': 0.2,
+        'description': '部分请求返回5xx或直接断开'
+    },
+    'slow_primary': {
+        'latency_s': 0.5,
+        'model_latency_s': {'deepseek-chat': 12.0},
+        'token_interval_s': 0.02,
+        'description': 'chat模型排队变慢，推理模型正常（验证竞速请求）'
+    },
+    'stalled': {
+        'latency_s': 0.3,
+        'token_interval_s': 0.02,
+        'stall_rate': 0.5,
+        'stall_s': 15,
+        'description': '一半请求只发keep-alive迟迟不出token'
+    },
+}
+
+# AI流水线基准测试配置
+AI_BENCHMARK_CONFIG = {
+    'profiles': ['fast', 'typical', 'flaky', 'slow_primary', 'stalled'],
+    'runs_per_profile': 3,  # 每个配置每篇公告的运行次数（第2次起可命中缓存）
+    'first_token_timeout_s': 2,  # 基准测试中放宽/收紧首token超时，避免卡住的请求拖太久
+    'analysis_wait_timeout_s': 60
+}
+
 # =============================================================================
 # 演唱会信息提取配置
 # =============================================================================
@@ -62,19 +127,58 @@ DEFAULT_SELECTORS = {
     }
 }
 
-# 时间格式配置
-TIME_PATTERNS = {
-    'korean_formats': [
-        r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*\(([^)]+)\)\s*(\d{1,2}):(\d{2})',  # 2024년 1월 15일 (월) 19:00
-        r'(\d{4})\.(\d{1,2})\.(\d{1,2})\s*\(([^)]+)\)\s*(\d{1,2}):(\d{2})',      # 2024.01.15 (월) 19:00
-        r'(\d{1,2})월\s*(\d{1,2})일\s*\(([^)]+)\)\s*(\d{1,2}):(\d{2})',         # 1월 15일 (월) 19:00
-        r'(\d{1,2})/(\d{1,2})\s*\(([^)]+)\)\s*(\d{1,2}):(\d{2})',             # 1/15 (월) 19:00
-    ],
-    'international_formats': [
-        r'(\d{4})-(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{2})',                   # 2024-01-15 19:00
-        r'(\d{1,2})/(\d{1,2})/(\d{4})\s+(\d{1,2}):(\d{2})',                   # 01/15/2024 19:00
-        r'(\d{4})\.(\d{1,2})\.(\d{1,2})\s+(\d{1,2}):(\d{2})',                 # 2024.01.15 19:00
-    ]
+# 规则时间解析配置（AI时间提取前的快速路径，置信度达到阈值时不调用AI）
+RULE_TIME_PARSER_CONFIG = {
+    'enabled': True,
+    'min_confidence': 0.75,  # 低于该置信度时再调用AI
+    # 时间点前面最近的关键词决定类别
+    'labels': {
+        'application': ['신청', '응모', '접수', '참여', '申请', '报名', 'apply', 'application'],
+        'activity': ['공연', '행사', '팬미팅', '콘서트', '녹화', '방송', '사인회', '活动', '演出', 'concert', 'event'],
+        'gathering': ['집합', '입장', '모임', '집결', '集合', '入场'],
+        'announcement': ['발표', '당첨', '公布', '公告'],
+    },
+    'end_markers': ['마감', '종료', '까지', '截止', '结束', 'deadline'],
+    'start_markers': ['시작', '오픈', '부터', '开始', 'open'],
+}
+
+# AI流式响应配置（时间提取以SSE流式接收，JSON对象完整即返回）
+AI_STREAMING_CONFIG = {
+    'enabled': True,
+    'connect_timeout_s': 5,  # 建立连接超时
+    'first_token_timeout_s': 10,  # 首个token（含推理内容）超时，也是两次收到数据的最长间隔
+    'total_timeout_s': 60  # 单次请求总时长上限（切换推理模型时按其超时放宽）
+}
+
+# 模型竞速配置（时间提取先请求主模型，超过其历史p90延迟仍未返回时并行请求备用模型，取先到的有效结果）
+AI_HEDGING_CONFIG = {
+    'enabled': True,
+    'primary_model': 'deepseek-chat',
+    'secondary_model': 'deepseek-reasoner',
+    'timeouts_s': {'deepseek-chat': 60, 'deepseek-reasoner': 120},  # 各模型单次请求总时长上限
+    'hedge_percentile': 90,  # 主模型历史延迟的该百分位作为竞速等待时间
+    'default_hedge_delay_s': 8.0,  # 样本不足时的等待时间
+    'min_hedge_delay_s': 1.0,
+    'max_hedge_delay_s': 30.0,
+    'min_samples': 5,  # 至少多少条成功记录才使用历史百分位
+    'history_size': 50,  # 每个模型保留最近多少条延迟
+    'history_path': 'data/ai_latency_history.json',
+    'max_rounds': 2  # 两个模型都失败时最多再来几轮
+}
+
+# 提示词相关窗口配置（AI时间提取只发送日期时间和申请关键词附近的句子）
+PROMPT_WINDOW_CONFIG = {
+    'enabled': True,
+    'min_chars': 400,  # 正文短于该长度时原样发送
+    'max_chars': 1500,  # 窗口长度上限，超出时按优先级保留
+    'head_sentences': 1,  # 始终保留开头的标题句
+    'window_before': 1,  # 锚点句前后保留的上下文句数
+    'window_after': 1,
+    'heading_max_chars': 30,  # 不超过该长度且无句末标点的关键词句视为小标题
+    'dedupe_languages': True,  # 其他语言重复的同一时间段只保留主要语言
+    'require_application_time': True,  # 规则解析没找到申请时间时不裁剪（时间写法可能是规则不认识的）
+    'keywords': ['신청', '응모', '마감', '참여', '접수', '기간', '일시', '발표', '입장', '집합',
+                 '申请', '报名', '截止', '时间', 'apply', 'application', 'registration', 'deadline', 'period'],
 }
 
 # =============================================================================
@@ -175,7 +279,7 @@ def get_config(config_type: str) -> Dict[str, Any]:
     获取指定类型的配置
     
     Args:
-        config_type: 配置类型 ('deepseek', 'openai', 'browser', 'display')
+        config_type: 配置类型 ('deepseek', 'openai', 'browser', 'display', 'cache', 'concurrency', 'streaming', 'hedging')
     
     Returns:
         配置字典
@@ -184,7 +288,11 @@ def get_config(config_type: str) -> Dict[str, Any]:
         'deepseek': DEEPSEEK_CONFIG,
         'openai': OPENAI_CONFIG,
         'browser': BROWSER_CONFIG,
-        'display': DISPLAY_CONFIG
+        'display': DISPLAY_CONFIG,
+        'cache': AI_CACHE_CONFIG,
+        'concurrency': AI_CONCURRENCY_CONFIG,
+        'streaming': AI_STREAMING_CONFIG,
+        'hedging': AI_HEDGING_CONFIG
     }
     
     return configs.get(config_type, {})
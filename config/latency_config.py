@@ -47,8 +47,12 @@ NETWORK_LATENCY_CONFIG = {
 
 # 监控配置
 MONITORING_CONFIG = {
-    # 监控间隔（毫秒）
-    'check_interval_ms': 500,  # 每0.5秒检查一次
+    # 事件循环：页面事件到达立即处理，无事件时按心跳读取网络日志
+    'event_loop': {
+        'max_wait_ms': 1000,  # 页面内单次等待上限（心跳），也是按回车后的最长响应时间
+        'coalesce_ms': 30,  # 同一波事件的合并窗口
+        'error_backoff_s': 0.5,  # 连续出错时的退避
+    },
     
     # 数据快照间隔（秒）
     'snapshot_interval_s': 10,  # 每10秒保存一次快照
@@ -57,9 +61,60 @@ MONITORING_CONFIG = {
     'detailed_request_logging': {
         'enabled': True,
         'methods': ['POST', 'PUT'],  # 详细记录的方法
-        'keywords': ['api', 'submit', 'form'],  # URL关键词
+        'keywords': ['api'],  # URL关键词（与原 'api' in url.lower() 判断一致；增加关键词会扩大详细记录和响应体抓取范围）
     },
-    
+
+    # 请求分类规则（编译一次，供 _analyze_requests 和监控循环复用）
+    'request_classification': {
+        'important_keywords': [
+            'apply', 'submit', 'join', 'register', 'signup',
+            '신청', '참여', '등록', '제출', '가입',
+            'api', 'ajax', 'json', 'form'
+        ],
+        'important_methods': ['POST', 'PUT', 'DELETE'],  # 这些方法一律视为关键请求
+        'api_keywords': ['api'],  # 非GET或URL含这些关键词 → API请求
+        'static_extensions': ['css', 'js', 'png', 'jpg', 'gif', 'ico', 'woff', 'woff2'],  # 按路径后缀匹配
+        'cache_size': 4096,  # 每个URL的分类结果缓存上限
+    },
+
+    # 选择性响应体抓取（只抓详细记录的请求，后台线程池执行）
+    'response_body_capture': {
+        'enabled': True,
+        'max_workers': 2,  # 抓取线程数
+        'byte_budget': 5 * 1024 * 1024,  # 整个会话的响应体字节预算
+        'max_body_bytes': 256 * 1024,  # 单个响应体上限（超出部分截断）
+        'drain_timeout_s': 2,  # 停止监控时等待未完成抓取的时间
+    },
+
+    # 点击后关键路径分析（点击申请 → 表单关键元素出现）
+    'critical_path_analysis': {
+        'enabled': False,  # 表单提交完成后分析，不影响抢票时序
+        'save_report': True,  # 保存JSON和文本瀑布图到data目录
+        'max_timeline_events': 20000,  # 监控期间保留的最近时间线事件条数
+    },
+
+    # 监控会话日志（只追加的JSON Lines，崩溃或中断后可恢复报告）
+    'session_journal': {
+        'enabled': True,
+        'dir': 'data/journal',
+        'buffer_records': 64,  # 缓冲条数达到上限立即写入
+        'flush_interval_s': 1,  # 缓冲最长停留时间
+        'fsync_interval_s': 5,  # 强制落盘间隔
+    },
+
+    # DOM变化追踪（页面内MutationObserver计数，每次只读一个整数）
+    'dom_change_tracking': {
+        'enabled': True,
+        'max_subtrees': 20,  # 页面内保留的最近变化子树摘要条数（0 表示不记录摘要）
+        'capture_page_source': False,  # 检测到变化时获取完整页面源码（增量记录器已覆盖，默认关闭）
+    },
+
+    # DOM增量记录：每个文档一份基线 + 变化记录，替代各阶段的完整页面源码
+    'dom_diff_recording': {
+        'enabled': True,
+        'max_pending_batches': 2000,  # 页面内未取走的变化批次上限，溢出后重新取基线
+    },
+
     # 用户操作追踪
     'user_action_tracking': {
         'enabled': True,
@@ -67,9 +122,153 @@ MONITORING_CONFIG = {
         'track_inputs': True,
         'track_form_submits': True,
         'track_checkbox_changes': True,
+        'ring_size': 500,  # 页面内保留的最近操作条数（超出丢弃最旧的）
+        'backup_flush_ms': 1000,  # sessionStorage备份的批量写入间隔
     }
 }
 
+# 网络条件模拟配置（本地基准测试用，通过CDP Network.emulateNetworkConditions 施加）
+# latency_ms 为每个请求附加的往返延迟，jitter_ms 为每轮随机抖动（均匀分布 ±jitter）
+NETWORK_EMULATION_PROFILES = {
+    'lan': {
+        'latency_ms': 0,
+        'download_kbps': 0,  # 0 表示不限速
+        'upload_kbps': 0,
+        'jitter_ms': 0,
+        'description': '本机回环，无额外延迟（基线）'
+    },
+    'korea_broadband': {
+        'latency_ms': 30,
+        'download_kbps': 100 * 1024,
+        'upload_kbps': 50 * 1024,
+        'jitter_ms': 10,
+        'description': '韩国本地宽带'
+    },
+    'shanghai_korea': {
+        'latency_ms': 120,
+        'download_kbps': 20 * 1024,
+        'upload_kbps': 10 * 1024,
+        'jitter_ms': 40,
+        'description': '上海到韩国跨境线路（日常）'
+    },
+    'shanghai_korea_congested': {
+        'latency_ms': 250,
+        'download_kbps': 5 * 1024,
+        'upload_kbps': 2 * 1024,
+        'jitter_ms': 120,
+        'description': '上海到韩国跨境线路（开票高峰拥塞）'
+    },
+    'mobile_4g': {
+        'latency_ms': 150,
+        'download_kbps': 9 * 1024,
+        'upload_kbps': 3 * 1024,
+        'jitter_ms': 60,
+        'description': '移动4G热点'
+    },
+}
+
+# 网络基准测试配置
+NETWORK_BENCHMARK_CONFIG = {
+    'runs_per_profile': 5,  # 每个配置重复次数
+    'profiles': ['lan', 'korea_broadband', 'shanghai_korea', 'shanghai_korea_congested'],
+    'bundle_kb': 300,  # 模拟表单页主脚本大小（受下载带宽影响）
+    'server_delay_ms': 20,  # 模拟服务端处理时间
+    'submit_timeout_s': 10,  # 等待提交回执的超时
+    'random_seed': 42,  # 固定种子，抖动可复现
+}
+
+# 非必要资源拦截配置（CDP Network.setBlockedURLs，* 为通配符）
+REQUEST_BLOCKING_CONFIG = {
+    'enabled': False,  # 启用前先用测量模式确认表单不受影响
+    'profile': 'weverse_form',
+    'profiles': {
+        # Weverse表单流程：只拦截与表单渲染和提交无关的资源
+        'weverse_form': {
+            'fonts': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*fonts.googleapis.com*', '*fonts.gstatic.com*'],
+            'analytics': [
+                '*google-analytics.com*', '*googletagmanager.com*', '*analytics.google.com*',
+                '*wcs.naver.net*', '*amplitude.com*', '*api.mixpanel.com*',
+            ],
+            'tracking': [
+                '*connect.facebook.net*', '*facebook.com/tr*', '*doubleclick.net*',
+                '*analytics.tiktok.com*', '*criteo.com*', '*appsflyer.com*', '*app.link*',
+            ],
+            'media': ['*.mp4', '*.webm', '*.m3u8', '*.mov', '*.mp3'],
+            'third_party_scripts': [
+                '*youtube.com/iframe_api*', '*ytimg.com*', '*player.vimeo.com*',
+                '*cdn.channel.io*', '*static.hotjar.com*', '*widget.intercom.io*',
+            ],
+        },
+    },
+    # 这些地址被拦截即视为破坏表单（测量模式中报警）
+    'essential_patterns': ['*weverse.io*', '*apis.naver.com*', '*recaptcha*', '*hcaptcha*'],
+    # 测量模式
+    'measurement': {
+        'runs': 3,  # 每种拦截组合重复次数（取中位数）
+        'timeout_s': 15,  # 等待表单关键元素出现的超时
+    },
+}
+
+# 热路径日志配置
+LOGGING_CONFIG = {
+    'level': 'INFO',  # 全局日志级别
+    # 按模块覆盖级别，键为 weverse. 之后的日志器名
+    'module_levels': {
+        'countdown': 'INFO',
+        'monitoring': 'INFO',
+        'lightning_form': 'INFO',
+    },
+    'queue_size': 10000,  # 日志队列容量，满了直接丢弃，不阻塞热路径
+    'format': '%(message)s',
+    'silent_critical_section': True,  # T-1秒到提交完成期间只输出错误
+    'silent_section_lead_s': 1.0,  # 静默关键区提前进入的秒数
+    'countdown_refresh_s': 0.1,  # 倒计时显示刷新间隔（不再每毫秒重写一行）
+}
+
+# 快照存储配置：HTML快照按内容哈希压缩存放，会话JSON只保留引用
+SNAPSHOT_STORE_CONFIG = {
+    'enabled': True,
+    'dir': 'data/snapshots',
+    'codec': 'auto',  # auto: 安装了zstandard用zstd，否则gzip
+    'level': 6,  # 压缩级别
+    'min_size': 1024,  # 小于该长度的字符串直接内联
+    'text_keys': ['html_content', 'page_source'],  # 外置为文本快照的字段
+    'json_keys': ['baseline'],  # 外置为JSON快照的字段（DOM增量记录基线）
+}
+
+# 离线表单分析配置（lxml解析保存的HTML快照，不启动浏览器）
+OFFLINE_ANALYSIS_CONFIG = {
+    'workers': None,  # 进程池大小，None 为CPU核数
+    'chunksize': 4,  # 每个进程一次领取的文件数
+    'patterns': ['*.json', '*.html'],  # 扫描的快照文件
+    'html_keys': ['html_content', 'page_source'],  # 会话JSON中保存HTML的字段
+}
+
+# 批量公告分析配置（可复用的无头浏览器池）
+BATCH_ANALYSIS_CONFIG = {
+    'pool_size': 4,  # 同时工作的浏览器数
+    'max_tasks_per_driver': 50,  # 每个浏览器处理多少篇后重建，避免内存增长
+    'max_retries': 2,  # 失败后换新浏览器重试的次数
+    'headless': True,
+    'page_load_timeout_s': 30,
+    'selector_wait_s': 5,  # 每个正文选择器的等待时间
+    'ai_analysis': True,  # 关闭时只提取正文和正则时间
+    'cookies_file': None,  # 登录态cookie（driver.get_cookies() 导出的JSON），每个新浏览器加载一次
+    'cookies_domain_url': 'https://weverse.io/',
+    'output_dir': 'data/batch',
+}
+
+# 共享HTTP客户端配置（AI请求、延迟探测共用按主机保持长连接的连接池）
+HTTP_CLIENT_CONFIG = {
+    'pool_connections': 10,  # 缓存多少个主机的连接池
+    'pool_maxsize': 10,  # 每个主机保持的最大长连接数（不小于并发探测数）
+    'pool_block': False,  # 连接用尽时新建临时连接而不是排队等待
+    'max_retries': 0,  # 调用方自己决定重试
+    'connect_timeout_s': 3.05,  # 调用方未指定超时时使用
+    'read_timeout_s': 30,
+    'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+}
+
 # 性能优化配置
 PERFORMANCE_CONFIG = {
     # 表单处理目标时间（毫秒）
@@ -115,6 +314,38 @@ def get_monitoring_config():
     """获取监控配置"""
     return MONITORING_CONFIG
 
+def get_network_emulation_profiles():
+    """获取网络条件模拟配置"""
+    return NETWORK_EMULATION_PROFILES
+
+def get_network_benchmark_config():
+    """获取网络基准测试配置"""
+    return NETWORK_BENCHMARK_CONFIG
+
+def get_request_blocking_config():
+    """获取资源拦截配置"""
+    return REQUEST_BLOCKING_CONFIG
+
+def get_logging_config():
+    """获取热路径日志配置"""
+    return LOGGING_CONFIG
+
+def get_snapshot_store_config():
+    """获取快照存储配置"""
+    return SNAPSHOT_STORE_CONFIG
+
+def get_offline_analysis_config():
+    """获取离线表单分析配置"""
+    return OFFLINE_ANALYSIS_CONFIG
+
+def get_batch_analysis_config():
+    """获取批量公告分析配置"""
+    return BATCH_ANALYSIS_CONFIG
+
+def get_http_client_config():
+    """获取共享HTTP客户端配置"""
+    return HTTP_CLIENT_CONFIG
+
 def get_performance_config():
     """获取性能配置"""
     return PERFORMANCE_CONFIG 
\ No newline at end of file
@@ -119,7 +119,7 @@ STATUS_MESSAGES = {
     'content_extracting': "📄 正在提取文章内容...",
     'content_extracted': "✅ 成功提取文章内容 ({} 字符)",
     'ai_analyzing': "🤖 正在进行AI分析...",
-    'ai_time_analyzing': "⏰ 正在使用AI分析时间信息...",
+    'ai_time_analyzing': "⏰ 正在分析时间信息（规则解析优先，必要时使用AI）...",
     'time_set': "🎯 自动设置目标时间: {} ({})",
     'countdown_start': "🚀 启动倒计时模式，目标时间: {}",
     'countdown_stop': "⏹️ 倒计时已停止",
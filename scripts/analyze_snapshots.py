@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线快照分析脚本
+不启动浏览器，用进程池并行分析目录下保存的页面快照（会话JSON / .html，监控会话按DOM检查点重建页面），
+输出候选选择器命中情况和 config/form_selectors.py 中选择器的回归检查结果
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.analysis.offline_analyzer import analyze_directory, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description='离线分析保存的页面快照')
+    parser.add_argument('directory', nargs='?', default=str(project_root / 'data'), help='快照目录（默认 data/）')
+    parser.add_argument('--workers', '-w', type=int, help='进程数（默认CPU核数）')
+    parser.add_argument('--output', '-o', help='完整分析结果输出路径（JSON）')
+    args = parser.parse_args()
+
+    start_time = time.time()
+    results = analyze_directory(args.directory, workers=args.workers)
+    summary = summarize(results)
+    elapsed = time.time() - start_time
+
+    print(f"📂 快照目录: {args.directory}")
+    print(f"📄 文件: {summary['files']} 个, 页面: {summary['pages']} 份, 用时 {elapsed:.2f}s")
+    for error in summary['errors']:
+        print(f"   ❌ {error['file']}: {error['error']}")
+
+    print("\n🎯 候选选择器（找到的页面数）")
+    for category, count in summary['candidates_found'].items():
+        print(f"   {category}: {count}/{summary['pages']}")
+
+    print("\n🔍 配置选择器命中（匹配到元素的页面数）")
+    for key, selectors in summary['configured_hits'].items():
+        print(f"   {key}:")
+        for selector, count in selectors.items():
+            print(f"      {'✅' if count else '❌'} {count}/{summary['pages']} {selector}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 分析结果已保存到: {args.output}")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量公告分析脚本
+从URL列表文件（每行一个）或标准输入读取公告URL，用可复用的无头浏览器池并行分析，
+每篇完成即写入JSONL结果文件
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.analysis.batch_analyzer import BatchNoticeAnalyzer, read_url_feed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量分析Weverse公告')
+    parser.add_argument('urls', nargs='?', default='-', help='URL列表文件（默认从标准输入读取）')
+    parser.add_argument('--pool-size', '-p', type=int, help='浏览器池大小')
+    parser.add_argument('--output', '-o', help='结果文件（JSONL，默认 data/batch/）')
+    parser.add_argument('--cookies', help='登录cookie文件（driver.get_cookies() 导出的JSON）')
+    parser.add_argument('--no-ai', action='store_true', help='只提取正文和时间，不调用AI')
+    parser.add_argument('--show-browser', action='store_true', help='显示浏览器窗口')
+    args = parser.parse_args()
+
+    config = {}
+    if args.pool_size:
+        config['pool_size'] = args.pool_size
+    if args.cookies:
+        config['cookies_file'] = args.cookies
+    if args.no_ai:
+        config['ai_analysis'] = False
+    if args.show_browser:
+        config['headless'] = False
+
+    def on_result(result):
+        if result['status'] == 'success':
+            print(f"✅ {result['url']} ({result['duration_s']:.1f}s, 浏览器#{result['driver']})")
+        else:
+            print(f"❌ {result['url']}: {result['error']}")
+
+    analyzer = BatchNoticeAnalyzer(config)
+    print(f"🚀 批量分析开始，浏览器池: {analyzer.config['pool_size']} 个")
+    source = sys.stdin if args.urls == '-' else args.urls
+    try:
+        stats = analyzer.run(read_url_feed(source), args.output, on_result=on_result)
+    except KeyboardInterrupt:
+        print("\n⚠️ 用户中断操作")
+        return 1
+
+    print("\n📊 批量分析统计")
+    print(f"   提交: {stats['submitted']}, 成功: {stats['succeeded']}, 失败: {stats['failed']}, 重试: {stats['retries']}")
+    print(f"   用时: {stats['duration_s']:.1f}s, 浏览器创建/回收: {stats['pool']['created']}/{stats['pool']['recycled']}")
+    print(f"📁 结果文件: {stats['output_file']}")
+    return 0 if not stats['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
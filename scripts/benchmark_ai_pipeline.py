@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI流水线基准测试脚本
+在本地模拟LLM服务上按不同配置（延迟、失败、卡住）运行 ContentAnalyzer，
+统计时间结果延迟、端到端延迟、重试次数和缓存命中率；不需要浏览器、DeepSeek密钥和外网
+"""
+
+import io
+import sys
+import json
+import time
+import tempfile
+import argparse
+import contextlib
+from pathlib import Path
+from unittest import mock
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config import ai_config
+from src.weverse.ai import hedging, response_cache
+from src.weverse.ai.hedging import LatencyHistory
+from src.weverse.ai.mock_server import MockLLMServer, get_mock_profiles, requests_by_outcome
+from src.weverse.ai.response_cache import AIResponseCache
+from src.weverse.core.mode_components import content_analyzer
+from src.weverse.core.mode_components.content_analyzer import ContentAnalyzer
+from src.weverse.network.emulation import percentile
+
+# 内置公告：一篇完整的多语言公告，一篇只有活动时间（规则解析置信度低，需要AI）
+SAMPLE_NOTICES = {
+    'fanmeeting': """[공지] 2025 FANMEETING 'HOME' 팬클럽 선예매 응모 안내
+안녕하세요. 위버스입니다. 아래 내용을 반드시 확인해 주시기 바랍니다.
+■ 응모 기간
+2025년 8월 20일(수) 20:00 ~ 8월 22일(금) 23:59 (KST)
+■ 당첨자 발표
+8월 25일(월) 18:00
+■ 공연 일시
+2025.09.06 (토) 오후 6시
+■ 유의사항
+- 본 응모는 팬클럽 멤버십 회원만 가능합니다. 멤버십 미가입 시 응모가 제한됩니다.
+- 티켓은 양도 및 재판매가 불가하며, 적발 시 입장이 제한됩니다.
+[Notice] Application Period
+2025년 8월 20일(수) 20:00 ~ 8월 22일(금) 23:59 (KST)""",
+    'broadcast': """[공지] 음악방송 사전녹화 안내
+녹화 일시: 2025-09-10T14:00
+자세한 참여 방법은 추후 안내드리겠습니다.""",
+}
+
+
+def load_notice_files(paths):
+    notices = {}
+    for path in map(Path, paths):
+        notices[path.stem] = path.read_text(encoding='utf-8')
+    return notices
+
+
+def run_profile(profile_name, notices, runs, config, use_rule_parser):
+    """在一个模拟配置下运行全部公告，返回每轮记录和服务端统计"""
+    records = []
+    with MockLLMServer(profile_name) as server, tempfile.TemporaryDirectory() as cache_dir:
+        cache = AIResponseCache(path=str(Path(cache_dir) / 'ai_cache.json'), config={'enabled': True})
+        current = {}
+        patches = [
+            mock.patch.dict(ai_config.DEEPSEEK_CONFIG, {'base_url': server.base_url}),
+            mock.patch.dict(ai_config.AI_STREAMING_CONFIG, {'first_token_timeout_s': config['first_token_timeout_s']}),
+            mock.patch.dict(ai_config.RULE_TIME_PARSER_CONFIG, {'enabled': use_rule_parser}),
+            mock.patch.object(response_cache, '_response_cache', cache),
+            mock.patch.object(hedging, '_latency_history', LatencyHistory(path=str(Path(cache_dir) / 'latency.json'))),
+            mock.patch.object(content_analyzer, 'extract_article_content', lambda driver, wait: current['content']),
+            mock.patch.object(ContentAnalyzer, '_save_analysis_data', lambda *args: None),
+        ]
+        for patch in patches:
+            patch.start()
+        try:
+            for run in range(runs):
+                for name, content in notices.items():
+                    current['content'] = content
+                    stats_before = server.get_stats()
+                    cache_before = dict(cache.stats)
+
+                    analyzer = ContentAnalyzer(driver=None, wait=None)
+                    start = time.time()
+                    _, time_data, _ = analyzer.analyze_page_content()
+                    time_ms = (time.time() - start) * 1000
+                    analysis = analyzer.wait_for_analysis(config['analysis_wait_timeout_s'])
+                    end_to_end_ms = (time.time() - start) * 1000
+
+                    log = server.get_stats()['log'][len(stats_before['log']):]
+                    time_requests = sum(requests_by_outcome(log, 'time_extraction').values())
+                    analysis_requests = sum(requests_by_outcome(log, 'content_analysis').values())
+                    records.append({
+                        'run': run + 1, 'notice': name,
+                        'time_ms': time_ms, 'end_to_end_ms': end_to_end_ms,
+                        'time_ok': bool(time_data and (time_data.get('申请开始时间') or time_data.get('活动时间'))),
+                        'time_source': (time_data or {}).get('来源', 'ai' if time_data else None),
+                        'analysis_ok': bool(analysis),
+                        'time_requests': time_requests,
+                        'analysis_requests': analysis_requests,
+                        'retries': max(0, time_requests - 1) + max(0, analysis_requests - 1),
+                        'failed_requests': sum(1 for entry in log if entry['outcome'] != 'ok'),
+                        'cache_hits': cache.stats['hits'] - cache_before['hits'],
+                        'cache_misses': cache.stats['misses'] - cache_before['misses'],
+                    })
+        finally:
+            for patch in reversed(patches):
+                patch.stop()
+        server_stats = server.get_stats()
+    server_stats.pop('log')
+    return records, server_stats
+
+
+def summarize(profile_name, records, server_stats):
+    time_values = [record['time_ms'] for record in records]
+    end_values = [record['end_to_end_ms'] for record in records]
+    hits = sum(record['cache_hits'] for record in records)
+    lookups = hits + sum(record['cache_misses'] for record in records)
+    return {
+        'profile': profile_name,
+        'runs': len(records),
+        'time_p50_ms': percentile(time_values, 50),
+        'time_p90_ms': percentile(time_values, 90),
+        'end_to_end_p50_ms': percentile(end_values, 50),
+        'end_to_end_p90_ms': percentile(end_values, 90),
+        'time_success_rate': sum(record['time_ok'] for record in records) / len(records),
+        'analysis_success_rate': sum(record['analysis_ok'] for record in records) / len(records),
+        'retries': sum(record['retries'] for record in records),
+        'cache_hit_rate': hits / lookups if lookups else 0.0,
+        'server': server_stats,
+    }
+
+
+def render_table(summaries):
+    lines = [f"{'配置':<14}{'时间p50':>10}{'时间p90':>10}{'端到端p50':>12}{'端到端p90':>12}"
+             f"{'时间成功':>10}{'分析成功':>10}{'重试':>6}{'缓存命中':>10}{'AI请求':>8}"]
+    for summary in summaries:
+        lines.append(
+            f"{summary['profile']:<14}{summary['time_p50_ms']:>9.0f}ms{summary['time_p90_ms']:>8.0f}ms"
+            f"{summary['end_to_end_p50_ms']:>10.0f}ms{summary['end_to_end_p90_ms']:>10.0f}ms"
+            f"{summary['time_success_rate']:>10.0%}{summary['analysis_success_rate']:>10.0%}"
+            f"{summary['retries']:>6}{summary['cache_hit_rate']:>10.0%}{summary['server']['requests']:>8}"
+        )
+    return '\n'.join(lines)
+
+
+def main():
+    config = dict(ai_config.AI_BENCHMARK_CONFIG)
+    profiles = get_mock_profiles()
+    parser = argparse.ArgumentParser(description='AI流水线基准测试（本地模拟LLM服务）')
+    parser.add_argument('--profiles', '-p', nargs='+', default=config['profiles'], choices=sorted(profiles),
+                        help='模拟配置')
+    parser.add_argument('--runs', '-n', type=int, default=config['runs_per_profile'], help='每篇公告运行次数')
+    parser.add_argument('--notices', nargs='+', help='公告文本文件（默认使用内置公告）')
+    parser.add_argument('--rule-parser', action='store_true', help='启用规则时间解析（默认关闭，测量AI路径）')
+    parser.add_argument('--first-token-timeout', type=float, default=config['first_token_timeout_s'],
+                        help='首token超时（秒）')
+    parser.add_argument('--verbose', '-v', action='store_true', help='显示分析过程输出')
+    parser.add_argument('--output', '-o', help='结果输出路径（JSON）')
+    args = parser.parse_args()
+
+    config['first_token_timeout_s'] = args.first_token_timeout
+    notices = load_notice_files(args.notices) if args.notices else SAMPLE_NOTICES
+
+    summaries = []
+    all_records = {}
+    for profile_name in args.profiles:
+        print(f"\n🤖 配置 {profile_name}: {profiles[profile_name].get('description', '')}")
+        output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            records, server_stats = run_profile(profile_name, notices, args.runs, config, args.rule_parser)
+        print(f"   完成 {len(records)} 轮, 服务端结果: {server_stats['outcomes']}")
+        all_records[profile_name] = records
+        summaries.append(summarize(profile_name, records, server_stats))
+
+    print("\n📊 AI流水线基准测试结果")
+    print(render_table(summaries))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'summaries': summaries, 'records': all_records}, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 结果已保存到: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
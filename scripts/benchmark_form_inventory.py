@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表单清单基准测试脚本
+对比逐元素WebDriver分析与页面内一次遍历的耗时，并检查两者结果一致
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.browser.setup import setup_driver
+from src.weverse.analysis.form_inventory import collect_form_inventory
+from src.weverse.core.mode_components.monitoring_handler import MonitoringHandler
+
+# 追加额外字段，模拟字段较多的表单页
+EXTRA_FIELDS_SCRIPT = """
+var form = document.getElementById('application-form');
+for (var i = 0; i < arguments[0]; i++) {
+    var group = document.createElement('div');
+    group.className = 'form-group extra-field';
+    var input = document.createElement('input');
+    input.type = i % 5 === 0 ? 'checkbox' : 'text';
+    input.name = 'extra_' + i;
+    input.placeholder = '추가 항목 ' + i;
+    if (i % 3 === 0) input.required = true;
+    group.appendChild(input);
+    form.insertBefore(group, form.lastElementChild);
+}
+return document.querySelectorAll('input, select, button, form').length;
+"""
+
+CATEGORIES = ['input_fields', 'select_fields', 'checkboxes', 'radio_buttons',
+              'buttons', 'form_containers', 'hidden_fields']
+
+
+def timed(fn, runs):
+    """返回每次耗时（毫秒）和最后一次结果"""
+    durations = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='表单清单基准测试')
+    parser.add_argument('--fields', '-f', type=int, default=50, help='追加的额外字段数')
+    parser.add_argument('--runs', '-n', type=int, default=3, help='重复次数')
+    parser.add_argument('--headless', action='store_true', help='无头模式')
+    args = parser.parse_args()
+
+    fixture = project_root / 'tests' / 'test_lightning_form.html'
+    driver = setup_driver(headless=args.headless)
+    try:
+        driver.get(f"file://{fixture}?page=form")
+        time.sleep(0.5)
+        element_count = driver.execute_script(EXTRA_FIELDS_SCRIPT, args.fields)
+        print(f"📋 表单元素总数: {element_count}")
+
+        handler = MonitoringHandler(driver)
+        legacy_times, legacy = timed(handler._deep_form_analysis_webdriver, args.runs)
+        inventory_times, inventory = timed(lambda: collect_form_inventory(driver), args.runs)
+    finally:
+        driver.quit()
+
+    legacy_ms = min(legacy_times)
+    inventory_ms = min(inventory_times)
+    print("\n📊 耗时对比（取最快一次）")
+    print(f"   逐元素WebDriver: {legacy_ms:.1f}ms")
+    print(f"   页面内一次遍历: {inventory_ms:.1f}ms")
+    print(f"   加速: {legacy_ms / max(inventory_ms, 0.001):.1f}x")
+
+    print("\n🔍 结果一致性")
+    consistent = True
+    for category in CATEGORIES:
+        legacy_ids = [item.get('xpath') for item in legacy.get(category, [])]
+        inventory_ids = [item.get('xpath') for item in inventory.get(category, [])]
+        same = legacy_ids == inventory_ids
+        consistent = consistent and same
+        print(f"   {'✅' if same else '❌'} {category}: {len(legacy_ids)} / {len(inventory_ids)}")
+
+    return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
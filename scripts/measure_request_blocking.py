@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+资源拦截测量脚本
+分别以 不拦截 / 逐类拦截 / 全部拦截 加载表单页，报告每个类别节省的字节和时间，
+并检查拦截后表单关键元素是否仍能出现 —— 启用拦截前先跑一遍
+"""
+
+import sys
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.form_selectors import get_form_selectors
+from src.weverse.browser.setup import setup_driver
+from src.weverse.network.request_blocking import RequestBlocker, measure_blocking_impact, render_blocking_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='资源拦截测量')
+    parser.add_argument('--url', '-u', required=True, help='表单页URL（需已登录时先在浏览器中登录）')
+    parser.add_argument('--selector', '-s', default=get_form_selectors()['birth_date'], help='表单就绪判定选择器')
+    parser.add_argument('--profile', '-p', help='拦截配置名称')
+    parser.add_argument('--runs', '-n', type=int, help='每组重复次数')
+    parser.add_argument('--headless', action='store_true', help='无头模式')
+    parser.add_argument('--output', '-o', help='报告JSON保存路径')
+    args = parser.parse_args()
+
+    driver = setup_driver(headless=args.headless)
+    try:
+        blocker = RequestBlocker(driver, profile=args.profile)
+        report = measure_blocking_impact(driver, args.url, args.selector, blocker=blocker, runs=args.runs)
+    finally:
+        driver.quit()
+
+    print("\n📊 资源拦截测量结果")
+    print(render_blocking_report(report))
+
+    if args.output:
+        report['timestamp'] = datetime.now().isoformat()
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 报告已保存: {args.output}")
+
+    broken = [name for name, row in report['categories'].items() if not row['form_ok']]
+    if broken or not report['all']['form_ok']:
+        print(f"\n❌ 以下类别拦截后表单异常，请从配置中移除: {', '.join(broken) or '(组合拦截)'}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟LLM服务脚本
+启动OpenAI兼容的模拟服务，配合 DEEPSEEK_BASE_URL 环境变量在没有密钥和外网时运行AI流程：
+
+    python scripts/mock_llm_server.py --profile flaky --port 8765
+    DEEPSEEK_BASE_URL=http://127.0.0.1:8765 python scripts/test_api.py
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.ai.mock_server import MockLLMServer, get_mock_profiles
+
+
+def main():
+    profiles = get_mock_profiles()
+    parser = argparse.ArgumentParser(description='本地模拟LLM服务')
+    parser.add_argument('--profile', '-p', default='typical', choices=sorted(profiles), help='模拟配置')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    parser.add_argument('--responses', help='自定义回复JSON文件（键: time_extraction / content_analysis / other）')
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses, 'r', encoding='utf-8') as f:
+            responses = json.load(f)
+
+    server = MockLLMServer(args.profile, responses=responses, host=args.host, port=args.port).start()
+    print(f"🤖 模拟LLM服务已启动: {server.base_url}（配置: {args.profile} - {profiles[args.profile].get('description', '')}）")
+    print(f"   export DEEPSEEK_BASE_URL={server.base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stats = server.get_stats()
+        print(f"\n📊 请求 {stats['requests']} 次, 流式 {stats['streamed']} 次, 结果: {stats['outcomes']}")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
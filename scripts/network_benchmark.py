@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网络条件基准测试脚本
+在本地夹具服务器上按不同网络配置重复执行 点击申请 → 填写 → 提交 全流程，
+输出每个配置的端到端延迟表，用于离线验证提前点击模型
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.browser.setup import setup_driver
+from src.weverse.core.mode_components.application_executor import ApplicationExecutor
+from src.weverse.network.emulation import (
+    LocalFixtureServer, apply_network_profile, clear_network_emulation, get_network_profile,
+    get_benchmark_config, default_form_fixture_path, summarize_runs, render_benchmark_table
+)
+
+
+def run_single(driver, server, profile, rng, submit_timeout_s):
+    """执行一轮：无模拟加载公告页 → 施加网络条件 → 走完整自动填写流程 → 等待服务端回执"""
+    clear_network_emulation(driver)
+    driver.get(server.notice_url)
+
+    conditions = apply_network_profile(driver, profile, rng)
+    submissions_before = len(server.get_submissions())
+
+    executor = ApplicationExecutor(driver)
+    start = time.time()
+    result = executor._execute_auto_fill_mode(0)
+
+    # 等待提交请求往返完成
+    ack_ms = None
+    deadline = time.time() + submit_timeout_s
+    while time.time() < deadline:
+        ack_ms = driver.execute_script("return window.__benchmarkSubmitAck;")
+        if ack_ms:
+            break
+        time.sleep(0.01)
+
+    run = {
+        'latency_ms': conditions['latency'],
+        'success': bool(ack_ms) and len(server.get_submissions()) > submissions_before,
+        'form_success': result.get('success', False),
+        'executor_total_ms': result.get('total_time_ms'),
+        'click_to_form_ms': None,
+        'end_to_end_ms': None,
+    }
+    if ack_ms:
+        run['end_to_end_ms'] = round(ack_ms - start * 1000, 1)
+    if executor.click_time and executor.form_ready_time:
+        run['click_to_form_ms'] = round((executor.form_ready_time - executor.click_time) * 1000, 1)
+    return run
+
+
+def main():
+    config = get_benchmark_config()
+
+    parser = argparse.ArgumentParser(description='网络条件基准测试')
+    parser.add_argument('--profiles', '-p', nargs='+', default=config['profiles'], help='网络配置名称')
+    parser.add_argument('--runs', '-n', type=int, default=config['runs_per_profile'], help='每个配置重复次数')
+    parser.add_argument('--headless', action='store_true', help='无头模式')
+    parser.add_argument('--output', '-o', help='结果JSON保存路径')
+    args = parser.parse_args()
+
+    profiles = {name: get_network_profile(name) for name in args.profiles}
+    rng = random.Random(config['random_seed'])
+
+    print("🌐 网络条件基准测试")
+    print("=" * 60)
+    for name, profile in profiles.items():
+        print(f"   {name}: {profile['latency_ms']}ms ±{profile['jitter_ms']}ms  {profile.get('description', '')}")
+
+    server = LocalFixtureServer(
+        default_form_fixture_path(),
+        bundle_kb=config['bundle_kb'],
+        server_delay_ms=config['server_delay_ms']
+    ).start()
+    print(f"📡 夹具服务器: {server.base_url}")
+
+    driver = None
+    all_runs = {}
+    try:
+        driver = setup_driver(headless=args.headless)
+        for name, profile in profiles.items():
+            print(f"\n🔄 配置 {name}: {args.runs} 轮")
+            runs = []
+            for i in range(args.runs):
+                run = run_single(driver, server, profile, rng, config['submit_timeout_s'])
+                runs.append(run)
+                status = f"{run['end_to_end_ms']:.1f}ms" if run['success'] else '❌ 未收到提交'
+                print(f"   第{i + 1}轮 (延迟 {run['latency_ms']}ms): {status}")
+            all_runs[name] = runs
+    finally:
+        if driver:
+            clear_network_emulation(driver)
+            driver.quit()
+        server.stop()
+
+    summaries = [summarize_runs(name, runs) for name, runs in all_runs.items()]
+    print("\n📊 端到端延迟（点击申请 → 服务端提交回执，毫秒）")
+    print(render_benchmark_table(summaries))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(),
+                'config': config,
+                'summaries': summaries,
+                'runs': all_runs
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 结果已保存: {args.output}")
+
+    return 0 if all(s['success'] for s in summaries) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DOM重建脚本
+从监控会话文件（data/monitoring_session_*.json）或会话日志（data/journal/*.jsonl）
+的DOM增量记录中重建任意检查点的页面HTML
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.core.mode_components.dom_diff_recorder import reconstruct_segment
+from src.weverse.core.mode_components.session_journal import rebuild_report
+from src.weverse.analysis.snapshot_store import load_session
+
+
+def load_recording(path: str) -> dict:
+    """读取会话文件或会话日志中的DOM记录"""
+    if path.endswith('.jsonl'):
+        return rebuild_report(path).get('dom_recording', {})
+    session = load_session(path, lazy=False)
+    return session.get('monitoring_data', session).get('dom_recording', {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='从DOM增量记录重建页面HTML')
+    parser.add_argument('session', help='会话文件(.json)或会话日志(.jsonl)')
+    parser.add_argument('--checkpoint', '-c', help='检查点名称（pre_click / form_page / final）')
+    parser.add_argument('--segment', '-s', type=int, default=-1, help='记录片段序号（默认最后一个）')
+    parser.add_argument('--seq', type=int, help='重建到的批次序号（默认最新）')
+    parser.add_argument('--output', '-o', help='输出HTML路径（默认打印检查点列表）')
+    args = parser.parse_args()
+
+    recording = load_recording(args.session)
+    segments = recording.get('segments', [])
+    checkpoints = recording.get('checkpoints', [])
+    if not segments:
+        print(f"❌ 未找到DOM增量记录: {args.session}")
+        return 1
+
+    print(f"📼 记录片段: {len(segments)} 个")
+    for segment in segments:
+        print(f"   [{segment['index']}] {segment['reason']} {segment['url']} ({len(segment['batches'])} 批变化)")
+    print(f"📍 检查点: {len(checkpoints)} 个")
+    for checkpoint in checkpoints:
+        print(f"   {checkpoint['label']}: 片段 {checkpoint['segment']} 序号 {checkpoint['seq']} ({checkpoint['timestamp']})")
+
+    if not args.output:
+        return 0
+
+    segment_index, seq = args.segment, args.seq
+    if args.checkpoint:
+        matches = [c for c in checkpoints if c['label'] == args.checkpoint]
+        if not matches:
+            print(f"❌ 未找到检查点: {args.checkpoint}")
+            return 1
+        segment_index, seq = matches[0]['segment'], matches[0]['seq']
+
+    page_html = reconstruct_segment(segments[segment_index], seq)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(page_html)
+    print(f"📁 重建的HTML已保存到: {args.output} ({len(page_html)} 字符)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+监控会话恢复脚本
+从会话日志（data/journal/*.jsonl）重建监控报告，用于崩溃或Ctrl+C中断后找回数据
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.core.mode_components.session_journal import rebuild_report
+
+
+def find_latest_journal(journal_dir: str) -> str:
+    """查找最新的会话日志"""
+    journals = sorted(glob.glob(os.path.join(journal_dir, 'monitoring_*.jsonl')), key=os.path.getmtime)
+    return journals[-1] if journals else ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='从会话日志恢复监控报告')
+    parser.add_argument('journal', nargs='?', help='日志文件路径（默认取最新的）')
+    parser.add_argument('--journal-dir', default='data/journal', help='日志目录')
+    parser.add_argument('--output', '-o', help='输出JSON路径')
+    args = parser.parse_args()
+
+    journal_path = args.journal or find_latest_journal(args.journal_dir)
+    if not journal_path or not os.path.exists(journal_path):
+        print(f"❌ 未找到会话日志: {journal_path or args.journal_dir}")
+        return 1
+
+    print(f"📓 读取会话日志: {journal_path}")
+    report = rebuild_report(journal_path)
+    metadata = report['metadata']
+    summary = report['summary']
+
+    print(f"   记录数: {metadata['journal_records']}")
+    print(f"   结束状态: {metadata['journal_end_status'] or '未正常结束'}")
+    if metadata['journal_truncated']:
+        print("   ⚠️ 最后一条记录被截断，已丢弃")
+    print(f"   网络请求: {summary['network_requests_count']} 个")
+    print(f"   用户操作: {len(report['data_collection']['user_actions'])} 个")
+    print(f"   DOM变化: {summary['dom_change_events']} 次")
+
+    session_name = os.path.splitext(os.path.basename(journal_path))[0].replace('monitoring_', '')
+    output = args.output or os.path.join('data', f"monitoring_session_{session_name}_recovered.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+    # 与 ModeOrchestrator._save_monitoring_data 的会话文件结构一致
+    session_data = {
+        'metadata': {
+            'timestamp': session_name,
+            'mode': 'monitoring',
+            'recovered': True
+        },
+        'monitoring_data': report
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(session_data, f, ensure_ascii=False, indent=2)
+
+    print(f"📁 恢复的会话数据已保存到: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
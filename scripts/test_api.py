@@ -16,6 +16,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.ai_config import DEEPSEEK_CONFIG
+from src.weverse.network.http_client import get_http_client
 
 def test_deepseek_api():
     """
@@ -54,7 +55,7 @@ def test_deepseek_api():
     try:
         # 发送请求
         print("📤 发送测试请求...")
-        response = requests.post(
+        response = get_http_client().post(
             f"{DEEPSEEK_CONFIG['base_url']}/chat/completions",
             headers=headers,
             json=data,
@@ -98,6 +99,7 @@ def main():
     print("=" * 50)
     
     success = test_deepseek_api()
+    get_http_client().print_stats()
     
     print("\n" + "=" * 50)
     if success:
@@ -16,6 +16,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.ai_config import DEEPSEEK_CONFIG
+from src.weverse.network.http_client import get_http_client
 from src.core.browser_setup import setup_driver, create_wait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
@@ -60,7 +61,7 @@ def test_api_connectivity():
     
     try:
         print("📤 发送测试请求...")
-        response = requests.post(
+        response = get_http_client().post(
             f"{DEEPSEEK_CONFIG['base_url']}/chat/completions",
             headers=headers,
             json=data,
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面爬取一致性校验脚本
+在测试页面上对比 PageCrawler 逐元素三种查找与页面内单次调用的结果和耗时
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.browser.setup import setup_driver
+from src.weverse.analysis.form_inventory import collect_crawler_elements
+from src.weverse.analysis.page_crawler import PageCrawler
+
+FIXTURES = [
+    'test_lightning_form.html?page=form',
+    'test_weverse_form.html',
+]
+
+FIELDS = ['tag_name', 'type', 'name', 'id', 'class', 'placeholder', 'value', 'text',
+          'required', 'disabled', 'visible', 'enabled', 'location', 'size', 'found_by']
+
+
+def crawl_webdriver(driver):
+    """逐元素爬取（原实现）"""
+    crawler = PageCrawler(driver)
+    crawler._crawl_form_elements_webdriver()
+    return crawler.page_data['form_elements']
+
+
+def timed(fn, runs):
+    """返回最快一次耗时（毫秒）和最后一次结果"""
+    durations = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return min(durations), result
+
+
+def compare(legacy, single):
+    """逐类别、逐字段对比，返回差异描述列表"""
+    differences = []
+    for category, legacy_items in legacy.items():
+        single_items = single.get(category, [])
+        if len(legacy_items) != len(single_items):
+            differences.append(f"{category}: 数量 {len(legacy_items)} / {len(single_items)}")
+            continue
+        for index, (old, new) in enumerate(zip(legacy_items, single_items)):
+            for field in FIELDS:
+                if old.get(field) != new.get(field):
+                    differences.append(f"{category}[{index}].{field}: {old.get(field)!r} / {new.get(field)!r}")
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description='页面爬取一致性校验')
+    parser.add_argument('--runs', '-n', type=int, default=3, help='重复次数')
+    parser.add_argument('--headless', action='store_true', help='无头模式')
+    args = parser.parse_args()
+
+    driver = setup_driver(headless=args.headless)
+    consistent = True
+    try:
+        for fixture in FIXTURES:
+            driver.get(f"file://{project_root / 'tests'}/{fixture}")
+            time.sleep(0.5)
+            legacy_ms, legacy = timed(lambda: crawl_webdriver(driver), args.runs)
+            single_ms, single = timed(lambda: collect_crawler_elements(driver), args.runs)
+
+            differences = compare(legacy, single)
+            consistent = consistent and not differences
+            total = sum(len(items) for items in legacy.values())
+            print(f"\n📄 {fixture}: {total} 个元素")
+            print(f"   逐元素WebDriver: {legacy_ms:.1f}ms")
+            print(f"   页面内单次调用: {single_ms:.1f}ms ({legacy_ms / max(single_ms, 0.001):.1f}x)")
+            if differences:
+                for difference in differences:
+                    print(f"   ❌ {difference}")
+            else:
+                print("   ✅ 结果一致")
+    finally:
+        driver.quit()
+
+    return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
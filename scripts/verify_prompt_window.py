@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提示词窗口验证脚本
+对保存的公告（data/weverse_analysis_*.json、批量分析JSONL、.txt）比较全文和相关窗口提取出的时间，
+统计节省的token；加 --ai 时同时用AI分别提取比较（会调用AI接口）
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.weverse.ai.prompt_window import TIME_FIELDS, verify_window
+
+
+def load_notices(paths):
+    """读取公告正文，返回 [(名称, 正文)]"""
+    notices = []
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix in ('.json', '.jsonl', '.txt')))
+        else:
+            files.append(path)
+
+    for path in files:
+        try:
+            if path.suffix == '.txt':
+                notices.append((path.name, path.read_text(encoding='utf-8')))
+            elif path.suffix == '.jsonl':
+                for number, line in enumerate(path.read_text(encoding='utf-8').splitlines(), 1):
+                    record = json.loads(line) if line.strip() else {}
+                    if record.get('content'):
+                        notices.append((f"{path.name}:{number}", record['content']))
+            else:
+                data = json.loads(path.read_text(encoding='utf-8'))
+                content = data.get('original_content') or data.get('content') if isinstance(data, dict) else None
+                if content:
+                    notices.append((path.name, content))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 跳过 {path}: {e}")
+    return notices
+
+
+def compare_ai(content):
+    """AI分别提取全文和窗口的时间（不经过缓存）"""
+    from src.weverse.ai.analyzer import _extract_time_with_ai
+    full_times = _extract_time_with_ai(content, use_window=False) or {}
+    window_times = _extract_time_with_ai(content, use_window=True) or {}
+    return {field: {'full': full_times.get(field), 'window': window_times.get(field)}
+            for field in TIME_FIELDS if full_times.get(field) != window_times.get(field)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='验证提示词窗口不改变提取出的时间')
+    parser.add_argument('paths', nargs='*', default=[str(project_root / 'data')], help='公告文件或目录（默认 data/）')
+    parser.add_argument('--ai', action='store_true', help='同时用AI比较全文和窗口的提取结果')
+    args = parser.parse_args()
+
+    notices = load_notices(args.paths)
+    if not notices:
+        print("❌ 没有找到保存的公告")
+        return 1
+
+    totals = {'original_tokens': 0, 'window_tokens': 0, 'mismatches': 0}
+    for name, content in notices:
+        result = verify_window(content)
+        differences = dict(result['differences'])
+        if args.ai:
+            differences.update({f"AI {field}": diff for field, diff in compare_ai(content).items()})
+
+        totals['original_tokens'] += result['original_tokens']
+        totals['window_tokens'] += result['window_tokens']
+        status = '✅' if not differences else '❌'
+        totals['mismatches'] += bool(differences)
+        print(f"{status} {name}: {result['original_tokens']} → {result['window_tokens']} tokens "
+              f"({result['kept']}/{result['sentences']} 句{'，未裁剪' if not result['applied'] else ''})")
+        for field, diff in differences.items():
+            print(f"      {field}: 全文 {diff['full']} / 窗口 {diff['window']}")
+
+    saved = totals['original_tokens'] - totals['window_tokens']
+    ratio = saved / totals['original_tokens'] * 100 if totals['original_tokens'] else 0
+    print(f"\n📊 公告 {len(notices)} 篇, 约节省 {saved} tokens ({ratio:.1f}%), 时间不一致 {totals['mismatches']} 篇")
+    return 1 if totals['mismatches'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
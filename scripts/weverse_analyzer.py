@@ -17,14 +17,18 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.ai_config import DEEPSEEK_CONFIG
+from src.weverse.ai.response_cache import get_response_cache
+from src.weverse.network.http_client import get_http_client
 from src.core.browser_setup import setup_driver, create_wait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
-import requests
 import json
 
+# 提示词变化时更新版本号，旧缓存自动失效
+ARTICLE_PROMPT_VERSION = 'article-v1'
+
 class WeverseAnalyzer:
     def __init__(self, headless=False):
         self.driver = None
@@ -265,7 +269,23 @@ class WeverseAnalyzer:
             return None
     
     def analyze_with_ai(self, content, url):
-        """使用AI分析文章内容"""
+        """使用AI分析文章内容（与 ContentAnalyzer 共用AI响应缓存，正文未变时跳过AI调用）"""
+        analysis = get_response_cache().get_or_compute(
+            'weverse_article', {'content': content, 'url': url},
+            DEEPSEEK_CONFIG['model_name'], ARTICLE_PROMPT_VERSION,
+            lambda: self._request_ai_analysis(content, url)
+        )
+        if not analysis:
+            return None
+        return {
+            'url': url,
+            'content': content,
+            'analysis': analysis,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
+    def _request_ai_analysis(self, content, url):
+        """调用AI分析文章内容，返回分析文本"""
         try:
             print("🤖 正在使用AI分析文章内容...")
             
@@ -305,7 +325,7 @@ class WeverseAnalyzer:
                 'temperature': 0.3
             }
             
-            response = requests.post(
+            response = get_http_client().post(
                 f"{DEEPSEEK_CONFIG['base_url']}/chat/completions",
                 headers=headers,
                 json=data,
@@ -317,12 +337,7 @@ class WeverseAnalyzer:
                 if 'choices' in result and len(result['choices']) > 0:
                     analysis = result['choices'][0]['message']['content']
                     print("✅ AI分析完成")
-                    return {
-                        'url': url,
-                        'content': content,
-                        'analysis': analysis,
-                        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-                    }
+                    return analysis
                 else:
                     print("❌ AI响应格式异常")
                     return None
@@ -367,6 +382,7 @@ def main():
     parser.add_argument('--password', '-p', help='Weverse密码')
     parser.add_argument('--headless', action='store_true', help='无头模式运行')
     parser.add_argument('--output', '-o', help='输出文件名')
+    parser.add_argument('--no-cache', action='store_true', help='忽略AI响应缓存，强制重新分析')
     
     args = parser.parse_args()
     
@@ -387,6 +403,9 @@ def main():
         print("❌ 用户名和密码不能为空")
         return 1
     
+    if args.no_cache:
+        get_response_cache().enabled = False
+    
     analyzer = WeverseAnalyzer(headless=args.headless)
     
     try:
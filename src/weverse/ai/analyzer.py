@@ -4,15 +4,113 @@ import requests
 import json
 import sys
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # 添加项目根目录到路径
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 from config import ai_config
+from .response_cache import get_response_cache
+from .prompt_window import build_prompt_window
+from .streaming import get_streaming_config, stream_chat_completion
+from .hedging import get_hedging_config, get_latency_history, hedged_call
+from ..analysis.korean_time_parser import parse_notice_times
+from ..network.http_client import get_http_client
+
+# 提示词或解析逻辑变化时更新版本号，旧缓存自动失效
+TIME_PROMPT_VERSION = 'time-v2'
+ANALYSIS_PROMPT_VERSION = 'analysis-v1'
+TIME_MODEL = "deepseek-chat"
+ANALYSIS_MODEL = "deepseek-chat"
+
+# JSON修复失败时返回的默认空结构（不写入缓存）
+EMPTY_TIME_DATA = {
+    "application_start_time": None,
+    "application_end_time": None,
+    "activity_time": None,
+    "gathering_time": None,
+    "timezone": "Asia/Seoul",
+    "key_times": []
+}
+
+_analysis_executor = None
+_shared_lock = threading.Lock()
+
+
+def _concurrency_config():
+    return getattr(ai_config, 'AI_CONCURRENCY_CONFIG', {'concurrent_analysis': True, 'analysis_workers': 2})
+
+
+def _get_session():
+    """获取共享的HTTP会话（与延迟探测共用连接池，并发的AI请求不必各自握手）"""
+    return get_http_client().session
+
+
+def _get_analysis_executor():
+    global _analysis_executor
+    with _shared_lock:
+        if _analysis_executor is None:
+            _analysis_executor = ThreadPoolExecutor(
+                max_workers=_concurrency_config().get('analysis_workers', 2),
+                thread_name_prefix='ai-analysis'
+            )
+        return _analysis_executor
+
+
+def submit_analysis(content, time_info=None) -> Future:
+    """在后台线程发起完整AI分析，立即返回 Future（与时间提取并发进行）"""
+    return _get_analysis_executor().submit(analyze_with_ai, content, time_info)
+
+
+def extract_time(content):
+    """
+    提取时间信息：先用规则解析器，置信度不足时才调用AI
+
+    AI调用失败时，如果规则解析找到了时间，返回规则解析结果
+    """
+    parser_config = getattr(ai_config, 'RULE_TIME_PARSER_CONFIG', {'enabled': True, 'min_confidence': 0.75})
+    parsed = None
+    if parser_config.get('enabled', True):
+        parsed = parse_notice_times(content)
+        if parsed['置信度'] >= parser_config.get('min_confidence', 0.75):
+            print(f"⚡ 规则解析时间信息（置信度 {parsed['置信度']:.2f}），跳过AI时间提取")
+            return parsed
+        print(f"🔍 规则解析置信度 {parsed['置信度']:.2f}，使用AI时间提取")
+
+    ai_time_data = extract_time_with_ai(content)
+    if not ai_time_data and parsed and parsed['关键时间点']:
+        print("⚠️ AI时间提取失败，使用规则解析结果")
+        return parsed
+    return ai_time_data
 
 
 def extract_time_with_ai(content):
-    """使用AI直接提取时间信息"""
+    """使用AI直接提取时间信息（正文未变时复用缓存结果）"""
+    return get_response_cache().get_or_compute(
+        'time_extraction', content, TIME_MODEL, TIME_PROMPT_VERSION,
+        lambda: _extract_time_with_ai(content),
+        cacheable=lambda time_data: time_data != EMPTY_TIME_DATA
+    )
+
+
+def analyze_with_ai(content, time_info=None):
+    """使用AI分析文章内容（正文和时间信息未变时复用缓存结果）"""
+    return get_response_cache().get_or_compute(
+        'content_analysis', {'content': content, 'time_info': time_info}, ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION,
+        lambda: _analyze_with_ai(content, time_info)
+    )
+
+
+def _extract_time_with_ai(content, use_window=True):
+    """使用AI直接提取时间信息（默认只发送日期时间和申请关键词附近的句子）"""
     try:
+        if use_window:
+            window = build_prompt_window(content)
+            if window['applied']:
+                print(f"✂️ 提示词窗口: {window['original_chars']} → {window['window_chars']} 字符, "
+                      f"约节省 {window['tokens_saved']} tokens ({window['kept']}/{window['sentences']} 句)")
+                content = window['text']
+
         # 构建时间提取提示
         prompt = f"""
 你是一个专业的时间信息提取助手。请仔细分析以下Weverse文章内容，提取所有相关的时间信息。
@@ -54,8 +152,12 @@ def extract_time_with_ai(content):
 请只返回JSON格式的结果，不要添加任何其他说明文字。
 """
         
+        hedging_config = get_hedging_config()
+        if hedging_config['enabled']:
+            return _hedged_time_extraction(prompt, hedging_config)
+        
         # 优先使用chat模式，失败后切换到推理模式
-        model_name = "deepseek-chat"  # 默认使用chat模式
+        model_name = TIME_MODEL  # 默认使用chat模式
         
         data = {
             "model": model_name,
@@ -72,19 +174,22 @@ def extract_time_with_ai(content):
         # 增加超时时间和重试机制
         max_retries = 3
         timeout_seconds = 60
+        stream_config = get_streaming_config()
         
         for attempt in range(max_retries):
             try:
                 print(f"🤖 正在调用AI进行时间提取... (尝试 {attempt + 1}/{max_retries}, 模型: {model_name}, 超时: {timeout_seconds}s)")
-                response = requests.post(
-                    f"{ai_config.DEEPSEEK_CONFIG['base_url']}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {ai_config.DEEPSEEK_CONFIG['api_key']}",
-                        "Content-Type": "application/json"
-                    },
-                    json=data,
-                    timeout=timeout_seconds
-                )
+                url = f"{ai_config.DEEPSEEK_CONFIG['base_url']}/chat/completions"
+                headers = {
+                    "Authorization": f"Bearer {ai_config.DEEPSEEK_CONFIG['api_key']}",
+                    "Content-Type": "application/json"
+                }
+                if stream_config['enabled']:
+                    # 流式：JSON完整即返回，首个token超时快速失败并进入重试
+                    response = stream_chat_completion(_get_session(), url, headers, data,
+                                                      dict(stream_config, total_timeout_s=timeout_seconds))
+                else:
+                    response = _get_session().post(url, headers=headers, json=data, timeout=timeout_seconds)
                 break  # 成功则跳出循环
             except requests.exceptions.Timeout:
                 if attempt < max_retries - 1:
@@ -113,6 +218,9 @@ def extract_time_with_ai(content):
                 else:
                     raise
         
+        if stream_config['enabled']:
+            return _handle_streamed_time_response(response)
+        
         if response.status_code == 200:
             result = response.json()
             print(f"🔍 API响应结构: {json.dumps(result, ensure_ascii=False, indent=2)[:500]}...")
@@ -120,100 +228,7 @@ def extract_time_with_ai(content):
             if 'choices' in result and len(result['choices']) > 0:
                 ai_response = result['choices'][0]['message']['content']
                 
-                # 检查空响应
-                if not ai_response or ai_response.strip() == "":
-                    print("❌ AI返回空响应")
-                    return None
-                
-                ai_response = ai_response.strip()
-                print(f"🔍 原始AI响应: {ai_response[:200]}...")
-                
-                try:
-                    # 清理AI响应，移除可能的markdown格式
-                    cleaned_response = ai_response.strip()
-                    
-                    # 如果包含```json标记，提取JSON部分
-                    if '```json' in cleaned_response:
-                        start = cleaned_response.find('```json') + 7
-                        end = cleaned_response.find('```', start)
-                        if end != -1:
-                            cleaned_response = cleaned_response[start:end].strip()
-                            print(f"🔍 提取JSON部分: {cleaned_response[:200]}...")
-                    elif '```' in cleaned_response:
-                        # 处理没有json标记的代码块
-                        start = cleaned_response.find('```') + 3
-                        end = cleaned_response.find('```', start)
-                        if end != -1:
-                            cleaned_response = cleaned_response[start:end].strip()
-                            print(f"🔍 提取代码块: {cleaned_response[:200]}...")
-                    
-                    # 移除可能的前后空白和换行
-                    cleaned_response = cleaned_response.strip()
-                    
-                    # 再次检查是否为空
-                    if not cleaned_response:
-                        print("❌ 清理后响应为空")
-                        return None
-                    
-                    print(f"🔍 最终清理后内容: {cleaned_response[:200]}...")
-                    
-                    # 尝试解析JSON
-                    time_data = json.loads(cleaned_response)
-                    print(f"✅ AI时间提取成功: {json.dumps(time_data, ensure_ascii=False, indent=2)}")
-                    return time_data
-                    
-                except json.JSONDecodeError as e:
-                    print(f"❌ AI返回的不是有效JSON: {ai_response[:500]}...")
-                    print(f"JSON解析错误: {e}")
-                    print(f"🔍 尝试解析的内容: '{cleaned_response[:200]}...'")
-                    
-                    # 尝试修复常见的JSON格式问题
-                    try:
-                        import re
-                        fixed_response = cleaned_response
-                        print(f"🔧 开始JSON修复，原内容: '{fixed_response[:100]}...'")
-                        
-                        # 1. 移除可能的注释
-                        fixed_response = re.sub(r'//.*?\n', '\n', fixed_response)
-                        fixed_response = re.sub(r'/\*.*?\*/', '', fixed_response, flags=re.DOTALL)
-                        
-                        # 2. 移除多余的空白字符
-                        fixed_response = re.sub(r'\s+', ' ', fixed_response)
-                        fixed_response = fixed_response.strip()
-                        
-                        # 3. 尝试提取可能的JSON对象
-                        json_match = re.search(r'\{.*\}', fixed_response, re.DOTALL)
-                        if json_match:
-                            fixed_response = json_match.group(0)
-                            print(f"🔧 提取JSON对象: '{fixed_response[:100]}...'")
-                        
-                        # 4. 修复常见的引号问题
-                        fixed_response = re.sub(r'([{,]\s*)(\w+)(:)', r'\1"\2"\3', fixed_response)
-                        
-                        # 5. 确保字符串值被正确引用
-                        fixed_response = re.sub(r':\s*([^"\[\{][^,}\]]*[^,}\]\s])', r': "\1"', fixed_response)
-                        
-                        print(f"🔧 修复后内容: '{fixed_response[:200]}...'")
-                        
-                        # 尝试再次解析
-                        time_data = json.loads(fixed_response)
-                        print(f"✅ JSON修复成功: {json.dumps(time_data, ensure_ascii=False, indent=2)}")
-                        return time_data
-                        
-                    except Exception as fix_error:
-                        print(f"❌ JSON修复失败: {fix_error}")
-                        print(f"🔧 修复尝试的内容: '{fixed_response[:200]}...' if 'fixed_response' in locals() else '无'")
-                        
-                        # 最后尝试：返回一个默认的空结构
-                        print("🔧 返回默认空结构")
-                        return {
-                            "application_start_time": None,
-                            "application_end_time": None,
-                            "activity_time": None,
-                            "gathering_time": None,
-                            "timezone": "Asia/Seoul",
-                            "key_times": []
-                        }
+                return _parse_time_response(ai_response)
             else:
                 print("❌ AI响应格式异常")
                 return None
@@ -229,7 +244,183 @@ def extract_time_with_ai(content):
         return None
 
 
-def analyze_with_ai(content, time_info=None):
+def _parse_time_response(ai_response):
+    """解析AI时间提取的文本输出（去掉markdown代码块，必要时修复JSON）"""
+    # 检查空响应
+    if not ai_response or ai_response.strip() == "":
+        print("❌ AI返回空响应")
+        return None
+
+    ai_response = ai_response.strip()
+    print(f"🔍 原始AI响应: {ai_response[:200]}...")
+
+    try:
+        # 清理AI响应，移除可能的markdown格式
+        cleaned_response = ai_response.strip()
+
+        # 如果包含```json标记，提取JSON部分
+        if '```json' in cleaned_response:
+            start = cleaned_response.find('```json') + 7
+            end = cleaned_response.find('```', start)
+            if end != -1:
+                cleaned_response = cleaned_response[start:end].strip()
+                print(f"🔍 提取JSON部分: {cleaned_response[:200]}...")
+        elif '```' in cleaned_response:
+            # 处理没有json标记的代码块
+            start = cleaned_response.find('```') + 3
+            end = cleaned_response.find('```', start)
+            if end != -1:
+                cleaned_response = cleaned_response[start:end].strip()
+                print(f"🔍 提取代码块: {cleaned_response[:200]}...")
+
+        # 移除可能的前后空白和换行
+        cleaned_response = cleaned_response.strip()
+
+        # 再次检查是否为空
+        if not cleaned_response:
+            print("❌ 清理后响应为空")
+            return None
+
+        print(f"🔍 最终清理后内容: {cleaned_response[:200]}...")
+
+        # 尝试解析JSON
+        time_data = json.loads(cleaned_response)
+        print(f"✅ AI时间提取成功: {json.dumps(time_data, ensure_ascii=False, indent=2)}")
+        return time_data
+
+    except json.JSONDecodeError as e:
+        print(f"❌ AI返回的不是有效JSON: {ai_response[:500]}...")
+        print(f"JSON解析错误: {e}")
+        print(f"🔍 尝试解析的内容: '{cleaned_response[:200]}...'")
+
+        # 尝试修复常见的JSON格式问题
+        try:
+            import re
+            fixed_response = cleaned_response
+            print(f"🔧 开始JSON修复，原内容: '{fixed_response[:100]}...'")
+
+            # 1. 移除可能的注释
+            fixed_response = re.sub(r'//.*?\n', '\n', fixed_response)
+            fixed_response = re.sub(r'/\*.*?\*/', '', fixed_response, flags=re.DOTALL)
+
+            # 2. 移除多余的空白字符
+            fixed_response = re.sub(r'\s+', ' ', fixed_response)
+            fixed_response = fixed_response.strip()
+
+            # 3. 尝试提取可能的JSON对象
+            json_match = re.search(r'\{.*\}', fixed_response, re.DOTALL)
+            if json_match:
+                fixed_response = json_match.group(0)
+                print(f"🔧 提取JSON对象: '{fixed_response[:100]}...'")
+
+            # 4. 修复常见的引号问题
+            fixed_response = re.sub(r'([{,]\s*)(\w+)(:)', r'\1"\2"\3', fixed_response)
+
+            # 5. 确保字符串值被正确引用
+            fixed_response = re.sub(r':\s*([^"\[\{][^,}\]]*[^,}\]\s])', r': "\1"', fixed_response)
+
+            print(f"🔧 修复后内容: '{fixed_response[:200]}...'")
+
+            # 尝试再次解析
+            time_data = json.loads(fixed_response)
+            print(f"✅ JSON修复成功: {json.dumps(time_data, ensure_ascii=False, indent=2)}")
+            return time_data
+
+        except Exception as fix_error:
+            print(f"❌ JSON修复失败: {fix_error}")
+            print(f"🔧 修复尝试的内容: '{fixed_response[:200]}...' if 'fixed_response' in locals() else '无'")
+
+            # 最后尝试：返回一个默认的空结构
+            print("🔧 返回默认空结构")
+            return dict(EMPTY_TIME_DATA, key_times=[])
+
+
+def _is_valid_time_data(time_data):
+    """AI返回了至少一个时间（修复失败的默认空结构不算）"""
+    if not isinstance(time_data, dict):
+        return False
+    fields = ('申请开始时间', '申请结束时间', '活动时间', '集合时间')
+    return any(time_data.get(field) for field in fields) or bool(time_data.get('关键时间点'))
+
+
+def _request_time_once(model_name, prompt, timeout_seconds, cancel_event=None):
+    """向指定模型发出一次时间提取请求，返回解析结果；网络错误和超时抛出异常"""
+    data = {
+        "model": model_name,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.0,
+        "max_tokens": 1000
+    }
+    if model_name == "deepseek-reasoner":
+        data["response_format"] = {"type": "json_object"}
+    url = f"{ai_config.DEEPSEEK_CONFIG['base_url']}/chat/completions"
+    headers = {
+        "Authorization": f"Bearer {ai_config.DEEPSEEK_CONFIG['api_key']}",
+        "Content-Type": "application/json"
+    }
+
+    stream_config = get_streaming_config()
+    if stream_config['enabled']:
+        streamed = stream_chat_completion(_get_session(), url, headers, data,
+                                          dict(stream_config, total_timeout_s=timeout_seconds),
+                                          cancel_event=cancel_event)
+        return _handle_streamed_time_response(streamed)
+
+    # 非流式请求无法中途取消，落后方的结果直接丢弃
+    response = _get_session().post(url, headers=headers, json=data, timeout=timeout_seconds)
+    if response.status_code != 200:
+        print(f"❌ AI时间提取失败: HTTP {response.status_code}")
+        return None
+    choices = response.json().get('choices') or []
+    if not choices:
+        print("❌ AI响应格式异常")
+        return None
+    return _parse_time_response(choices[0]['message']['content'])
+
+
+def _hedged_time_extraction(prompt, config):
+    """
+    竞速时间提取：先请求主模型，超过其历史p90延迟仍未返回（或已失败）时并行请求备用模型，
+    取最先返回的有效JSON并取消其余请求；两个都失败时再来一轮
+    """
+    history = get_latency_history()
+    primary, secondary = config['primary_model'], config['secondary_model']
+    timeouts = config['timeouts_s']
+    fallback = None
+
+    for round_index in range(config['max_rounds']):
+        hedge_delay = history.hedge_delay(primary)
+        print(f"🤖 正在调用AI进行时间提取... (第 {round_index + 1}/{config['max_rounds']} 轮, "
+              f"{primary}，{hedge_delay:.1f}s 未返回则并行请求 {secondary})")
+        outcome = hedged_call(
+            primary, secondary,
+            lambda model, cancel_event: _request_time_once(model, prompt, timeouts.get(model, 60), cancel_event),
+            _is_valid_time_data, hedge_delay, history
+        )
+        if outcome['winner']:
+            print(f"🏁 {outcome['winner']} 先返回有效结果（{outcome['elapsed_s']:.2f}s, 各请求: {outcome['attempts']}）")
+            return outcome['result']
+        fallback = fallback or outcome['result']
+        if fallback is not None:
+            # 模型正常返回但没有时间信息，重试也不会变
+            break
+        print(f"⚠️ 第 {round_index + 1} 轮两个模型都失败: {outcome['attempts']}")
+    return fallback
+
+
+def _handle_streamed_time_response(streamed):
+    """处理流式时间提取结果"""
+    if streamed['status_code'] != 200:
+        print(f"❌ AI时间提取失败: HTTP {streamed['status_code']}")
+        return None
+    if streamed['json'] is not None:
+        print(f"⚡ 流式JSON已完整（首token {streamed['first_token_s']:.2f}s, 共 {streamed['elapsed_s']:.2f}s），不再等待剩余输出")
+        print(f"✅ AI时间提取成功: {json.dumps(streamed['json'], ensure_ascii=False, indent=2)}")
+        return streamed['json']
+    return _parse_time_response(streamed['text'])
+
+
+def _analyze_with_ai(content, time_info=None):
     """使用AI分析文章内容"""
     try:
         # 构建分析提示
@@ -257,7 +448,7 @@ def analyze_with_ai(content, time_info=None):
         }
         
         data = {
-            "model": "deepseek-chat",
+            "model": ANALYSIS_MODEL,
             "messages": [
                 {
                     "role": "user",
@@ -268,7 +459,7 @@ def analyze_with_ai(content, time_info=None):
             "max_tokens": 1000
         }
         
-        response = requests.post(f"{ai_config.DEEPSEEK_CONFIG['base_url']}/chat/completions", headers=headers, json=data, timeout=30)
+        response = _get_session().post(f"{ai_config.DEEPSEEK_CONFIG['base_url']}/chat/completions", headers=headers, json=data, timeout=30)
         
         if response.status_code == 200:
             result = response.json()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+hedging.py
+模型竞速请求 - 主模型超过其历史p90延迟仍未返回（或已失败）时并行请求备用模型，
+取最先返回的有效结果并取消其余请求；各模型的延迟持久化保存，用于计算下次的竞速等待时间
+"""
+
+import os
+import json
+import queue
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..network.emulation import percentile
+
+# 导入竞速配置
+try:
+    from config.ai_config import AI_HEDGING_CONFIG
+    AI_HEDGING_CONFIG_AVAILABLE = True
+except ImportError:
+    AI_HEDGING_CONFIG_AVAILABLE = False
+
+DEFAULT_AI_HEDGING_CONFIG = {
+    'enabled': True,
+    'primary_model': 'deepseek-chat',
+    'secondary_model': 'deepseek-reasoner',
+    'timeouts_s': {'deepseek-chat': 60, 'deepseek-reasoner': 120},
+    'hedge_percentile': 90,
+    'default_hedge_delay_s': 8.0,
+    'min_hedge_delay_s': 1.0,
+    'max_hedge_delay_s': 30.0,
+    'min_samples': 5,
+    'history_size': 50,
+    'history_path': 'data/ai_latency_history.json',
+    'max_rounds': 2,
+}
+
+
+def get_hedging_config() -> Dict[str, Any]:
+    config = dict(DEFAULT_AI_HEDGING_CONFIG)
+    if AI_HEDGING_CONFIG_AVAILABLE:
+        config.update(AI_HEDGING_CONFIG)
+    return config
+
+
+class LatencyHistory:
+    """各模型请求的延迟记录（线程安全，原子写入）"""
+
+    def __init__(self, path: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.config = get_hedging_config()
+        if config:
+            self.config.update(config)
+        self.path = self.config['history_path'] if path is None else path  # 空字符串表示不持久化
+        self.lock = threading.Lock()
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.models = json.load(f).get('models', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 模型延迟记录读取失败，重新开始: {e}")
+            self.models = {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'models': self.models}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 模型延迟记录保存失败: {e}")
+
+    def _model(self, model: str) -> Dict[str, Any]:
+        return self.models.setdefault(model, {'latencies': [], 'wins': 0, 'failures': 0, 'hedged': 0})
+
+    def record(self, model: str, latency_s: Optional[float] = None, won: bool = False,
+               failed: bool = False, hedged: bool = False) -> None:
+        """
+        记录一次请求结果
+
+        latency_s 记录已返回请求的耗时；被取消的请求记录取消时已等待的时间（真实延迟的下限），
+        否则慢请求从不留下样本，p90 会偏低、竞速过早触发。连接失败等异常不记录延迟
+        """
+        with self.lock:
+            entry = self._model(model)
+            if latency_s is not None:
+                entry['latencies'].append(round(latency_s, 3))
+                del entry['latencies'][:-self.config['history_size']]
+            entry['wins'] += won
+            entry['failures'] += failed
+            entry['hedged'] += hedged
+            self._save()
+
+    def latency_percentile(self, model: str, pct: Optional[float] = None) -> Optional[float]:
+        """历史延迟百分位，样本不足时返回 None"""
+        with self.lock:
+            latencies = list(self.models.get(model, {}).get('latencies', []))
+        if len(latencies) < self.config['min_samples']:
+            return None
+        return percentile(latencies, self.config['hedge_percentile'] if pct is None else pct)
+
+    def hedge_delay(self, model: str) -> float:
+        """主模型等待多久后并行请求备用模型"""
+        observed = self.latency_percentile(model)
+        if observed is None:
+            return self.config['default_hedge_delay_s']
+        return min(max(observed, self.config['min_hedge_delay_s']), self.config['max_hedge_delay_s'])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            models = json.loads(json.dumps(self.models))
+        for model, entry in models.items():
+            latencies = entry.pop('latencies')
+            entry['samples'] = len(latencies)
+            entry['p50_s'] = percentile(latencies, 50) if latencies else None
+            entry['p90_s'] = percentile(latencies, 90) if latencies else None
+        return {'path': self.path, 'models': models}
+
+
+def hedged_call(primary: str, secondary: str, call: Callable[[str, threading.Event], Any],
+                is_valid: Callable[[Any], bool], hedge_delay_s: float,
+                history: Optional[LatencyHistory] = None) -> Dict[str, Any]:
+    """
+    竞速调用：先请求主模型，超过 hedge_delay_s 仍无有效结果或主模型已失败时请求备用模型
+
+    Args:
+        call: call(model, cancel_event) -> 结果；cancel_event 置位后应尽快放弃
+        is_valid: 判断结果是否有效
+
+    Returns:
+        {'result', 'winner', 'hedged': 是否发出了备用请求, 'elapsed_s', 'attempts': {模型: 状态}}
+    """
+    results: 'queue.Queue' = queue.Queue()
+    cancel_events = {}
+    started = {}
+    start_time = time.time()
+
+    def launch(model: str) -> None:
+        cancel_events[model] = threading.Event()
+        started[model] = time.time()
+
+        def run():
+            try:
+                results.put((model, call(model, cancel_events[model]), None))
+            except Exception as e:
+                results.put((model, None, e))
+
+        threading.Thread(target=run, name=f'hedge-{model}', daemon=True).start()
+
+    launch(primary)
+    hedge_at = start_time + hedge_delay_s
+    attempts = {primary: 'running'}
+    fallback = None
+    outcome = {'result': None, 'winner': None, 'hedged': False}
+
+    while 'running' in attempts.values() or secondary not in attempts:
+        if secondary not in attempts and 'running' not in attempts.values():
+            hedge_at = time.time()  # 主模型已失败，立即请求备用模型
+        timeout = None if secondary in attempts else max(0.0, hedge_at - time.time())
+        try:
+            model, result, error = results.get(timeout=timeout)
+        except queue.Empty:
+            if attempts[primary] == 'running':
+                print(f"⏱️ {primary} 超过 {hedge_delay_s:.1f}s 未返回，并行请求 {secondary}")
+                outcome['hedged'] = True
+            else:
+                print(f"🔄 {primary} 未返回有效结果，请求 {secondary}")
+            launch(secondary)
+            attempts[secondary] = 'running'
+            continue
+
+        elapsed = time.time() - started[model]
+        if error is None and is_valid(result):
+            attempts[model] = 'won'
+            outcome.update(result=result, winner=model)
+            if history:
+                history.record(model, elapsed, won=True, hedged=outcome['hedged'] and model == secondary)
+            break
+        attempts[model] = 'failed' if error is not None else 'invalid'
+        if error is not None:
+            print(f"❌ {model} 请求失败: {error}")
+        elif fallback is None and result is not None:
+            fallback = result
+        if history:
+            history.record(model, None if error is not None else elapsed, failed=True)
+
+    # 有结果后取消仍在进行的请求
+    for model, state in attempts.items():
+        if state == 'running':
+            cancel_events[model].set()
+            attempts[model] = 'cancelled'
+            if history:
+                history.record(model, time.time() - started[model])
+
+    if outcome['winner'] is None:
+        outcome['result'] = fallback
+    outcome['elapsed_s'] = time.time() - start_time
+    outcome['attempts'] = attempts
+    return outcome
+
+
+_latency_history: Optional[LatencyHistory] = None
+_latency_history_lock = threading.Lock()
+
+
+def get_latency_history() -> LatencyHistory:
+    """获取进程内共享的模型延迟记录"""
+    global _latency_history
+    with _latency_history_lock:
+        if _latency_history is None:
+            _latency_history = LatencyHistory()
+        return _latency_history
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mock_server.py
+本地模拟LLM服务 - OpenAI兼容的 /chat/completions，可配置首字节延迟、逐token间隔、失败/断连/卡住比例，
+支持SSE流式；时间提取请求用规则解析器按公告生成真实的JSON答案，不需要DeepSeek密钥和外网
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional
+
+from ..analysis.korean_time_parser import parse_notice_times
+
+# 导入模拟服务配置
+try:
+    from config.ai_config import MOCK_LLM_PROFILES
+    MOCK_LLM_PROFILES_AVAILABLE = True
+except ImportError:
+    MOCK_LLM_PROFILES_AVAILABLE = False
+
+DEFAULT_MOCK_LLM_PROFILES = {
+    'fast': {'latency_s': 0.05, 'token_interval_s': 0.002, 'jitter_s': 0, 'failure_rate': 0,
+             'disconnect_rate': 0, 'stall_rate': 0, 'stall_s': 0, 'description': '本机即时响应（基线）'},
+}
+
+DEFAULT_PROFILE = {
+    'latency_s': 0.0,  # 首字节前的等待
+    'model_latency_s': {},  # 按模型覆盖首字节等待（模拟主模型变慢）
+    'token_interval_s': 0.0,  # 流式时每个token间隔
+    'jitter_s': 0.0,  # 首字节延迟的随机抖动（均匀分布 ±jitter）
+    'failure_rate': 0.0,  # 返回HTTP 500/503的比例
+    'disconnect_rate': 0.0,  # 不回任何内容直接断开的比例
+    'stall_rate': 0.0,  # 只发keep-alive、迟迟不出token的比例
+    'stall_s': 0.0,  # 卡住多久
+    'tokens_per_chunk': 4,  # 流式时每个事件包含的字符数
+    'seed': 42,
+}
+
+ANALYSIS_RESPONSE = (
+    "1. 活动类型：粉丝见面会抽选，重要性高\n"
+    "2. 抢票难度：名额有限，难度较高\n"
+    "3. 最佳时机：申请开始前1分钟准备好页面，开始后立即提交\n"
+    "4. 注意事项：提前登录并确认会员资格，避免重复申请"
+)
+PING_RESPONSE = "API连接成功"
+TIME_FIELDS = ('申请开始时间', '申请结束时间', '活动时间', '集合时间', '时区', '关键时间点')
+
+
+def get_mock_profiles() -> Dict[str, Dict[str, Any]]:
+    return MOCK_LLM_PROFILES if MOCK_LLM_PROFILES_AVAILABLE else DEFAULT_MOCK_LLM_PROFILES
+
+
+def resolve_profile(profile: Any) -> Dict[str, Any]:
+    """配置名或字典 -> 完整的模拟参数"""
+    if isinstance(profile, str):
+        profiles = get_mock_profiles()
+        if profile not in profiles:
+            raise ValueError(f"未知的模拟配置: {profile}（可选: {', '.join(profiles)}）")
+        profile = profiles[profile]
+    return dict(DEFAULT_PROFILE, **(profile or {}))
+
+
+def _section(prompt: str, start_marker: str, end_marker: str) -> str:
+    start = prompt.find(start_marker)
+    if start < 0:
+        return ''
+    start += len(start_marker)
+    end = prompt.find(end_marker, start)
+    return prompt[start:end if end >= 0 else len(prompt)].strip()
+
+
+def classify_request(prompt: str) -> str:
+    """按提示词判断请求类型：time_extraction / content_analysis / other"""
+    if '时间信息提取助手' in prompt:
+        return 'time_extraction'
+    if '抢票策略' in prompt:
+        return 'content_analysis'
+    return 'other'
+
+
+def canned_response(kind: str, prompt: str, responses: Optional[Dict[str, str]] = None) -> str:
+    """生成回复：优先使用自定义回复，时间提取按公告内容用规则解析生成"""
+    if responses and kind in responses:
+        return responses[kind]
+    if kind == 'time_extraction':
+        parsed = parse_notice_times(_section(prompt, '文章内容：', '请按照以下JSON格式'))
+        answer = {field: parsed[field] for field in TIME_FIELDS}
+        return "```json\n" + json.dumps(answer, ensure_ascii=False, indent=2) + "\n```"
+    if kind == 'content_analysis':
+        return ANALYSIS_RESPONSE
+    return PING_RESPONSE
+
+
+class _MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.split('?', 1)[0].endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'not found'}})
+            return
+
+        server = self.server
+        prompt = ''.join(message.get('content', '') for message in body.get('messages', []))
+        kind = classify_request(prompt)
+        stream = bool(body.get('stream'))
+        with server.lock:
+            profile = dict(server.profile)
+            roll = server.random.random()
+            jitter = server.random.uniform(-profile['jitter_s'], profile['jitter_s']) if profile['jitter_s'] else 0
+            server.stats['requests'] += 1
+            server.stats['by_kind'][kind] = server.stats['by_kind'].get(kind, 0) + 1
+            server.stats['streamed'] += stream
+
+        # 按比例依次判定：断连 / HTTP错误 / 卡住
+        outcome = 'ok'
+        if roll < profile['disconnect_rate']:
+            outcome = 'disconnect'
+        elif roll < profile['disconnect_rate'] + profile['failure_rate']:
+            outcome = 'error'
+        elif roll < profile['disconnect_rate'] + profile['failure_rate'] + profile['stall_rate']:
+            outcome = 'stall'
+        server.record(outcome, kind)
+
+        model = body.get('model', 'deepseek-chat')
+        latency = profile['model_latency_s'].get(model, profile['latency_s'])
+        time.sleep(max(0.0, latency + jitter))
+        if outcome == 'disconnect':
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        if outcome == 'error':
+            self._send_json(503 if roll < profile['disconnect_rate'] + profile['failure_rate'] / 2 else 500,
+                            {'error': {'message': 'mock server overloaded'}})
+            return
+
+        text = canned_response(kind, prompt, server.responses)
+        try:
+            if stream:
+                self._stream(text, model, profile, stalled=outcome == 'stall')
+            else:
+                if outcome == 'stall':
+                    time.sleep(profile['stall_s'])
+                self._send_json(200, {
+                    'id': f"mock-{server.stats['requests']}",
+                    'object': 'chat.completion',
+                    'model': model,
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text},
+                                 'finish_reason': 'stop'}],
+                    'usage': {'prompt_tokens': len(prompt) // 2, 'completion_tokens': len(text) // 2},
+                })
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端拿到完整JSON后提前断开
+            with server.lock:
+                server.stats['client_closed'] += 1
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(b'%x\r\n' % len(data) + data + b'\r\n')
+        self.wfile.flush()
+
+    def _event(self, delta: Dict[str, Any], model: str) -> bytes:
+        chunk = {'object': 'chat.completion.chunk', 'model': model,
+                 'choices': [{'index': 0, 'delta': delta, 'finish_reason': None}]}
+        return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8')
+
+    def _stream(self, text: str, model: str, profile: Dict[str, Any], stalled: bool):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        if stalled:
+            # 模拟服务端排队：只有keep-alive
+            deadline = time.time() + profile['stall_s']
+            while time.time() < deadline:
+                self._write_chunk(b': keep-alive\n\n')
+                time.sleep(min(1.0, max(0.05, profile['stall_s'] / 10)))
+        if model == 'deepseek-reasoner':
+            self._write_chunk(self._event({'reasoning_content': '分析公告中的时间…'}, model))
+
+        size = max(1, profile['tokens_per_chunk'])
+        for index in range(0, len(text), size):
+            if profile['token_interval_s']:
+                time.sleep(profile['token_interval_s'])
+            self._write_chunk(self._event({'content': text[index:index + size]}, model))
+        self._write_chunk(b'data: [DONE]\n\n')
+        self._write_chunk(b'')
+
+    def log_message(self, format, *args):
+        # 静默，避免刷屏
+        pass
+
+
+class MockLLMServer:
+    """本地OpenAI兼容模拟服务"""
+
+    def __init__(self, profile: Any = 'fast', responses: Optional[Dict[str, str]] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            profile: MOCK_LLM_PROFILES 中的配置名，或参数字典
+            responses: 按请求类型（time_extraction / content_analysis / other）覆盖回复内容
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _MockLLMHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.responses = responses
+        self.httpd.record = self._record
+        self.thread = None
+        self.set_profile(profile)
+
+    def set_profile(self, profile: Any) -> None:
+        """切换模拟配置并重置统计和随机种子"""
+        resolved = resolve_profile(profile)
+        with self.httpd.lock:
+            self.httpd.profile = resolved
+            self.httpd.random = random.Random(resolved['seed'])
+            self.httpd.stats = {'requests': 0, 'streamed': 0, 'client_closed': 0, 'by_kind': {},
+                                'outcomes': {}, 'log': []}
+
+    def _record(self, outcome: str, kind: str) -> None:
+        with self.httpd.lock:
+            stats = self.httpd.stats
+            stats['outcomes'][outcome] = stats['outcomes'].get(outcome, 0) + 1
+            stats['log'].append({'kind': kind, 'outcome': outcome, 'at': time.time()})
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.httpd.lock:
+            stats = dict(self.httpd.stats)
+            stats['by_kind'] = dict(stats['by_kind'])
+            stats['outcomes'] = dict(stats['outcomes'])
+            stats['log'] = list(stats['log'])
+        return stats
+
+    def start(self) -> 'MockLLMServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='mock-llm-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def requests_by_outcome(log: List[Dict[str, Any]], kind: str) -> Dict[str, int]:
+    """统计某类请求的各种结果次数"""
+    counts: Dict[str, int] = {}
+    for entry in log:
+        if entry['kind'] == kind:
+            counts[entry['outcome']] = counts.get(entry['outcome'], 0) + 1
+    return counts
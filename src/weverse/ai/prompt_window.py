@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+prompt_window.py
+提示词相关窗口 - 把公告按句切分，只保留日期时间和申请关键词附近的句子，
+去掉其他语言重复的同一时间段，按长度上限截断，缩小AI时间提取的输入
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from ..analysis.korean_time_parser import DATETIME_RE, TIME_ONLY_RE, parse_notice_times
+
+# 导入窗口配置
+try:
+    from config.ai_config import PROMPT_WINDOW_CONFIG
+    PROMPT_WINDOW_CONFIG_AVAILABLE = True
+except ImportError:
+    PROMPT_WINDOW_CONFIG_AVAILABLE = False
+
+DEFAULT_PROMPT_WINDOW_CONFIG = {
+    'enabled': True,
+    'min_chars': 400,
+    'max_chars': 1500,
+    'head_sentences': 1,
+    'window_before': 1,
+    'window_after': 1,
+    'heading_max_chars': 30,
+    'dedupe_languages': True,
+    'require_application_time': True,
+    'keywords': ['신청', '응모', '마감', '참여', '접수', '기간', '일시', '발표', '입장', '집합',
+                 '申请', '报名', '截止', '时间', 'apply', 'application', 'registration', 'deadline', 'period'],
+}
+
+# 日期后面的 "." 不是句末（2025. 8. 20.）
+SENTENCE_END_RE = re.compile(r'(?<=[^\d\s][.!?。！？])\s+')
+OMITTED_MARK = '…'
+TIME_FIELDS = ('申请开始时间', '申请结束时间', '活动时间', '集合时间')
+
+SCRIPTS = {
+    'hangul': re.compile(r'[가-힣]'),
+    'kana': re.compile(r'[぀-ヿ]'),
+    'han': re.compile(r'[一-鿿]'),
+    'latin': re.compile(r'[A-Za-z]'),
+}
+CJK_RE = re.compile(r'[가-힣぀-ヿ一-鿿]')
+NUMBER_RE = re.compile(r'\d+')
+# 英文月份名（"may" 只在后面跟数字时算月份）
+MONTH_NAME_RE = re.compile(
+    r'\b(?:january|february|march|april|june|july|august|september|october|november|december|'
+    r'jan|feb|mar|apr|jun|jul|aug|sept?|oct|nov|dec)\b|\bmay\s+\d', re.IGNORECASE)
+
+
+def get_window_config() -> Dict[str, Any]:
+    config = dict(DEFAULT_PROMPT_WINDOW_CONFIG)
+    if PROMPT_WINDOW_CONFIG_AVAILABLE:
+        config.update(PROMPT_WINDOW_CONFIG)
+    return config
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算token数：韩中日字符约1个/字，其余约4字符1个"""
+    if not text:
+        return 0
+    cjk = len(CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def dominant_script(text: str) -> Optional[str]:
+    """句子的主要文字（韩文/日文假名/汉字优先于夹杂的英文，只有数字符号时为 None）"""
+    for name in ('hangul', 'kana', 'han'):
+        if len(SCRIPTS[name].findall(text)) >= 2:
+            return name
+    return 'latin' if SCRIPTS['latin'].search(text) else None
+
+
+def datetime_signature(text: str) -> frozenset:
+    """句中日期时间的数字组合（不同语言写同一时间得到相同签名）"""
+    return frozenset(tuple(int(number) for number in re.findall(r'\d+', match.group(0)))
+                     for match in DATETIME_RE.finditer(text))
+
+
+def split_sentences(content: str) -> List[Dict[str, Any]]:
+    """按行再按句末标点切分，记录所在行"""
+    sentences = []
+    for line_index, line in enumerate(content.replace('\r\n', '\n').split('\n')):
+        for text in SENTENCE_END_RE.split(line.strip()):
+            if text.strip():
+                sentences.append({'text': text.strip(), 'line': line_index})
+    return sentences
+
+
+def _has_time(text: str) -> bool:
+    if DATETIME_RE.search(text):
+        return True
+    match = TIME_ONLY_RE.search(text)
+    return bool(match and (match.group('h1') or match.group('h2') or match.group('noon')))
+
+
+def _has_date_hint(text: str) -> bool:
+    """含数字或月份名：规则解析器不认识的写法（"August 20 at 8 PM"）也可能是时间"""
+    return bool(NUMBER_RE.search(text) or MONTH_NAME_RE.search(text))
+
+
+def _is_heading(text: str, settings: Dict[str, Any]) -> bool:
+    """小标题：很短且不以句末标点结尾（"■ 응모 기간"）"""
+    return len(text) <= settings['heading_max_chars'] and not re.search(r'[.!?。！？]$', text)
+
+
+def _join(sentences: List[Dict[str, Any]]) -> str:
+    """同一行的句子用空格连接，换行保留，中间省略的部分用 … 标出"""
+    parts = []
+    previous = None
+    for sentence in sentences:
+        if previous is not None:
+            if sentence['index'] != previous['index'] + 1:
+                parts.append('\n' + OMITTED_MARK + '\n')
+            else:
+                parts.append(' ' if sentence['line'] == previous['line'] else '\n')
+        parts.append(sentence['text'])
+        previous = sentence
+    return ''.join(parts)
+
+
+def build_prompt_window(content: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    构建相关窗口
+
+    Returns:
+        {'text': 窗口文本, 'applied': 是否做了裁剪, 'sentences'/'kept': 句数,
+         'original_tokens'/'window_tokens'/'tokens_saved': 估算token}
+    """
+    settings = get_window_config()
+    if config:
+        settings.update(config)
+
+    content = content or ''
+    original_tokens = estimate_tokens(content)
+    result = {
+        'text': content, 'applied': False, 'sentences': 0, 'kept': 0,
+        'original_chars': len(content), 'window_chars': len(content),
+        'original_tokens': original_tokens, 'window_tokens': original_tokens, 'tokens_saved': 0,
+    }
+    if not settings['enabled'] or len(content) < settings['min_chars']:
+        return result
+    if settings['require_application_time']:
+        # 规则解析连申请时间都没找到时，时间写法多半是规则不认识的，裁剪可能恰好去掉它，原样发送
+        parsed = parse_notice_times(content)
+        if not parsed['申请开始时间'] and not parsed['申请结束时间']:
+            return result
+
+    sentences = split_sentences(content)
+    result['sentences'] = len(sentences)
+    keywords = [keyword.lower() for keyword in settings['keywords']]
+    for index, sentence in enumerate(sentences):
+        text = sentence['text']
+        sentence['index'] = index
+        sentence['script'] = dominant_script(text)
+        sentence['signature'] = datetime_signature(text)
+        sentence['has_time'] = _has_time(text)
+        sentence['has_keyword'] = any(keyword in text.lower() for keyword in keywords)
+
+    # 锚点：带日期时间的句子、含数字或月份名的关键词句，以及很短的关键词小标题；
+    # 其余只含关键词的句子（说明、注意事项）只作为上下文
+    anchors = [s for s in sentences if s['has_time'] or (s['has_keyword'] and (
+        _has_date_hint(s['text']) or _is_heading(s['text'], settings)))]
+    if not anchors:
+        return result
+
+    # 主要语言按带日期的句子统计；其他语言的句子只有带来新的日期时间时才保留
+    if settings['dedupe_languages']:
+        script_counts = {}
+        for sentence in sentences:
+            if sentence['signature'] and sentence['script']:
+                script_counts[sentence['script']] = script_counts.get(sentence['script'], 0) + 1
+        if script_counts:
+            primary = max(script_counts, key=script_counts.get)
+            primary_signatures = set()
+            for sentence in sentences:
+                if sentence['script'] in (primary, None):
+                    primary_signatures.update(sentence['signature'])
+            anchors = [s for s in anchors if s['script'] in (primary, None)
+                       or (s['signature'] and not s['signature'] <= primary_signatures)]
+
+    # 优先级：日期+关键词 > 日期 > 关键词 > 标题/上下文
+    priorities = {}
+    for sentence in sentences[:settings['head_sentences']]:
+        priorities[sentence['index']] = 1
+    for anchor in anchors:
+        priority = 2 * anchor['has_time'] + anchor['has_keyword'] + 1
+        priorities[anchor['index']] = max(priorities.get(anchor['index'], 0), priority)
+        # 上下文只取同一语言的相邻句（小标题、区间的另一半）
+        low = max(0, anchor['index'] - settings['window_before'])
+        high = min(len(sentences), anchor['index'] + settings['window_after'] + 1)
+        for neighbor in sentences[low:high]:
+            if neighbor['script'] in (anchor['script'], None):
+                priorities.setdefault(neighbor['index'], 0)
+
+    # 完全相同的句子只保留第一次出现
+    seen_texts = set()
+    for index in sorted(priorities):
+        normalized = re.sub(r'\s+', ' ', sentences[index]['text']).lower()
+        if normalized in seen_texts:
+            del priorities[index]
+        else:
+            seen_texts.add(normalized)
+
+    # 超出长度上限时按优先级保留
+    selected = set()
+    budget = settings['max_chars']
+    for index in sorted(priorities, key=lambda i: (-priorities[i], i)):
+        size = len(sentences[index]['text']) + 1
+        if size <= budget:
+            selected.add(index)
+            budget -= size
+
+    window = _join([sentences[index] for index in sorted(selected)])
+    if not window or len(window) >= len(content):
+        return result
+
+    window_tokens = estimate_tokens(window)
+    result.update({
+        'text': window, 'applied': True, 'kept': len(selected), 'window_chars': len(window),
+        'window_tokens': window_tokens, 'tokens_saved': original_tokens - window_tokens,
+    })
+    return result
+
+
+def _keyword_numbers(content: str, settings: Dict[str, Any]) -> set:
+    """含关键词的句子中出现的全部数字"""
+    keywords = [keyword.lower() for keyword in settings['keywords']]
+    numbers = set()
+    for sentence in split_sentences(content):
+        if any(keyword in sentence['text'].lower() for keyword in keywords):
+            numbers.update(NUMBER_RE.findall(sentence['text']))
+    return numbers
+
+
+def verify_window(content: str, config: Optional[Dict[str, Any]] = None, now=None) -> Dict[str, Any]:
+    """
+    验证裁剪没有丢失时间信息：规则解析器比较全文和窗口提取出的时间，
+    并检查关键词句中的每个数字都还在窗口里（规则解析器不认识的写法也能发现）
+    """
+    settings = get_window_config()
+    if config:
+        settings.update(config)
+    window = build_prompt_window(content, config)
+    full_times = parse_notice_times(content, now=now)
+    window_times = parse_notice_times(window['text'], now=now)
+    differences = {field: {'full': full_times[field], 'window': window_times[field]}
+                   for field in TIME_FIELDS if full_times[field] != window_times[field]}
+    missing_numbers = sorted(_keyword_numbers(content, settings) - set(NUMBER_RE.findall(window['text'])),
+                             key=lambda number: (len(number), number))
+    if missing_numbers:
+        differences['关键词句中的数字'] = {'full': missing_numbers, 'window': '缺失'}
+    return dict(window, match=not differences, differences=differences, missing_numbers=missing_numbers)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+response_cache.py
+AI响应缓存 - 以（规范化正文、提示词版本、模型）的哈希为键持久化AI结果，
+带有效期和条目上限（最久未使用的先淘汰），公告正文未变时直接复用上次结果
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+# 导入缓存配置
+try:
+    from config.ai_config import AI_CACHE_CONFIG
+    AI_CACHE_CONFIG_AVAILABLE = True
+except ImportError:
+    AI_CACHE_CONFIG_AVAILABLE = False
+
+DEFAULT_AI_CACHE_CONFIG = {
+    'enabled': True,
+    'path': 'data/ai_cache.json',
+    'ttl_seconds': 7 * 24 * 3600,
+    'max_entries': 500,
+}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return re.sub(r'\s+', ' ', value).strip()
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def normalize_content(content: Any) -> str:
+    """规范化正文：合并空白，结构化数据（正文 + 时间信息等）按键排序序列化"""
+    if isinstance(content, str):
+        return _normalize(content)
+    return json.dumps(_normalize(content), ensure_ascii=False, sort_keys=True, default=str)
+
+
+def cache_key(kind: str, content: Any, model: str, prompt_version: str) -> str:
+    """缓存键：sha256(类型, 提示词版本, 模型, 规范化正文)"""
+    raw = json.dumps([kind, prompt_version, model, normalize_content(content)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class AIResponseCache:
+    """持久化的AI响应缓存（线程安全）"""
+
+    def __init__(self, path: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.config = dict(DEFAULT_AI_CACHE_CONFIG)
+        if AI_CACHE_CONFIG_AVAILABLE:
+            self.config.update(AI_CACHE_CONFIG)
+        if config:
+            self.config.update(config)
+
+        self.enabled = bool(self.config['enabled'])
+        self.path = path or self.config['path']
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.enabled or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 文件中按最近使用顺序保存
+            for entry in sorted(data.get('entries', []), key=lambda e: e.get('last_used', 0)):
+                self.entries[entry['key']] = entry
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ AI缓存读取失败，重新开始: {e}")
+            self.entries.clear()
+
+    def _save(self) -> None:
+        """原子写入（先写临时文件再改名）"""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'entries': list(self.entries.values())}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry['created'] > self.config['ttl_seconds']
+
+    def get(self, kind: str, content: Any, model: str, prompt_version: str) -> Optional[Any]:
+        """读取缓存，未命中或过期返回 None"""
+        if not self.enabled:
+            return None
+        key = cache_key(kind, content, model, prompt_version)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            if self._expired(entry, now):
+                del self.entries[key]
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            entry['last_used'] = now
+            entry['hits'] = entry.get('hits', 0) + 1
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry['value']
+
+    def put(self, kind: str, content: Any, model: str, prompt_version: str, value: Any) -> None:
+        """写入缓存并持久化，超出上限时淘汰最久未使用的条目"""
+        if not self.enabled or value is None:
+            return
+        key = cache_key(kind, content, model, prompt_version)
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {
+                'key': key, 'kind': kind, 'model': model, 'prompt_version': prompt_version,
+                'created': now, 'last_used': now, 'hits': 0, 'value': value
+            }
+            self.entries.move_to_end(key)
+            for stale_key in [k for k, e in self.entries.items() if self._expired(e, now)]:
+                del self.entries[stale_key]
+                self.stats['expired'] += 1
+            while len(self.entries) > self.config['max_entries']:
+                self.entries.popitem(last=False)
+                self.stats['evicted'] += 1
+            try:
+                self._save()
+            except OSError as e:
+                print(f"⚠️ AI缓存保存失败: {e}")
+
+    def get_or_compute(self, kind: str, content: Any, model: str, prompt_version: str,
+                       compute: Callable[[], Any], cacheable: Callable[[Any], bool] = None) -> Any:
+        """
+        命中缓存直接返回，否则调用 compute() 并缓存结果
+
+        Args:
+            cacheable: 判断结果是否可缓存（默认非 None 即缓存）
+        """
+        cached = self.get(kind, content, model, prompt_version)
+        if cached is not None:
+            print(f"⚡ 命中AI缓存（{kind}），跳过AI调用")
+            return cached
+        value = compute()
+        if value is not None and (cacheable is None or cacheable(value)):
+            self.put(kind, content, model, prompt_version, value)
+        return value
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, entries=len(self.entries), path=self.path)
+
+
+_response_cache: Optional[AIResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> AIResponseCache:
+    """获取进程内共享的AI响应缓存"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = AIResponseCache()
+        return _response_cache
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+streaming.py
+AI流式响应 - 读取OpenAI兼容接口的SSE流，边收边增量解析JSON，
+JSON对象在语法上完整时立即返回并断开连接；首个token迟迟不来时快速失败
+"""
+
+import json
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+import urllib3
+
+# 导入流式配置
+try:
+    from config.ai_config import AI_STREAMING_CONFIG
+    AI_STREAMING_CONFIG_AVAILABLE = True
+except ImportError:
+    AI_STREAMING_CONFIG_AVAILABLE = False
+
+DEFAULT_AI_STREAMING_CONFIG = {
+    'enabled': True,
+    'connect_timeout_s': 5,
+    'first_token_timeout_s': 10,
+    'total_timeout_s': 60,
+}
+
+
+class RequestCancelled(Exception):
+    """请求被调用方取消"""
+
+
+class FirstTokenTimeout(requests.exceptions.Timeout):
+    """等待首个token超时（按超时处理，沿用重试和切换模型的逻辑）"""
+
+
+class StreamTimeout(requests.exceptions.Timeout):
+    """流式响应总时长超时"""
+
+
+def get_streaming_config() -> Dict[str, Any]:
+    config = dict(DEFAULT_AI_STREAMING_CONFIG)
+    if AI_STREAMING_CONFIG_AVAILABLE:
+        config.update(AI_STREAMING_CONFIG)
+    return config
+
+
+class IncrementalJSONExtractor:
+    """
+    增量JSON提取器：逐段喂入模型输出，跳过 ```json 之类的前缀，
+    第一个顶层对象的括号配平时解析并返回
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.position = 0
+        self.start = -1
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.result: Optional[Any] = None
+
+    def feed(self, chunk: str) -> Optional[Any]:
+        """追加一段文本，对象完整时返回解析结果，否则返回 None"""
+        if self.result is not None:
+            return self.result
+        self.buffer += chunk
+        text = self.buffer
+        for index in range(self.position, len(text)):
+            char = text[index]
+            if self.start < 0:
+                if char == '{':
+                    self.start = index
+                    self.depth = 1
+                continue
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.position = index + 1
+                    return self._complete(text[self.start:index + 1])
+        self.position = len(text)
+        return None
+
+    def _complete(self, candidate: str) -> Optional[Any]:
+        try:
+            self.result = json.loads(candidate)
+        except ValueError:
+            # 括号配平但不是合法JSON（注释、单引号等），交给完整文本的修复逻辑
+            self.start = -1
+            return None
+        return self.result
+
+
+def _iter_raw_lines(response) -> Iterator[bytes]:
+    """按到达的数据分行（iter_lines 会攒满 chunk_size 才返回，SSE需要收到就处理）"""
+    raw = response.raw
+    buffer = b''
+    while True:
+        if hasattr(raw, 'read1'):
+            chunk = raw.read1(8192, decode_content=True)
+        else:
+            chunk = raw.read(1, decode_content=True)
+        if not chunk:
+            break
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line.rstrip(b'\r')
+    if buffer:
+        yield buffer
+
+
+def iter_sse_data(response) -> Iterator[Optional[str]]:
+    """
+    逐条产出SSE的 data 内容；空行和 ": keep-alive" 注释产出 None，
+    便于调用方在等待期间检查超时
+    """
+    # SSE固定为UTF-8（text/event-stream 没有charset时requests会按Latin-1解码）
+    for raw_line in _iter_raw_lines(response):
+        line = raw_line.decode('utf-8', errors='replace')
+        if not line or line.startswith(':'):
+            yield None
+            continue
+        if not line.startswith('data:'):
+            continue
+        data = line[5:].strip()
+        if data == '[DONE]':
+            return
+        yield data
+
+
+def stream_chat_completion(session, url: str, headers: Dict[str, str], payload: Dict[str, Any],
+                           config: Optional[Dict[str, Any]] = None, extract_json: bool = True,
+                           cancel_event=None) -> Dict[str, Any]:
+    """
+    以流式方式调用chat/completions
+
+    Args:
+        extract_json: JSON对象完整时立即返回，不等剩余token
+        cancel_event: 置位后在收到下一段数据时断开连接并抛出 RequestCancelled（竞速请求中的落后方）
+
+    Returns:
+        {'status_code', 'text': 已收到的正文, 'json': 解析出的对象或 None, 'early': 是否提前结束,
+         'first_token_s', 'elapsed_s', 'error': 非200时的响应内容}
+    """
+    settings = get_streaming_config()
+    if config:
+        settings.update(config)
+
+    payload = dict(payload, stream=True)
+    start_time = time.time()
+    # 读超时（两次收到数据的最大间隔）同样用首token超时：服务端排队时也会发送 keep-alive 空行
+    read_timeout = settings['first_token_timeout_s']
+    try:
+        response = session.post(url, headers=headers, json=payload, stream=True,
+                                timeout=(settings['connect_timeout_s'], read_timeout))
+    except requests.exceptions.ReadTimeout as e:
+        raise FirstTokenTimeout(f"{settings['first_token_timeout_s']}s 内没有收到响应") from e
+
+    result = {'status_code': response.status_code, 'text': '', 'json': None, 'early': False,
+              'first_token_s': None, 'elapsed_s': None, 'error': None}
+    try:
+        if response.status_code != 200:
+            result['error'] = response.text
+            return result
+
+        extractor = IncrementalJSONExtractor() if extract_json else None
+        parts = []
+        try:
+            for data in iter_sse_data(response):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RequestCancelled("已有其他请求返回结果")
+                now = time.time()
+                if result['first_token_s'] is None and now - start_time > settings['first_token_timeout_s']:
+                    raise FirstTokenTimeout(f"{settings['first_token_timeout_s']}s 内没有收到首个token")
+                if now - start_time > settings['total_timeout_s']:
+                    raise StreamTimeout(f"流式响应超过 {settings['total_timeout_s']}s")
+                if data is None:
+                    continue
+
+                chunk = json.loads(data)
+                choices = chunk.get('choices') or [{}]
+                delta = choices[0].get('delta') or {}
+                content = delta.get('content') or ''
+                # 推理模型先输出 reasoning_content，也算已开始响应
+                if result['first_token_s'] is None and (content or delta.get('reasoning_content')):
+                    result['first_token_s'] = now - start_time
+                if not content:
+                    continue
+
+                parts.append(content)
+                if extractor and extractor.feed(content) is not None:
+                    result['json'] = extractor.result
+                    result['early'] = True
+                    break
+        except (urllib3.exceptions.ReadTimeoutError, requests.exceptions.ConnectionError) as e:
+            if result['first_token_s'] is None:
+                raise FirstTokenTimeout(f"{settings['first_token_timeout_s']}s 内没有收到首个token") from e
+            raise StreamTimeout(f"流式响应中断超过 {read_timeout}s") from e
+
+        result['text'] = ''.join(parts)
+        result['elapsed_s'] = time.time() - start_time
+        return result
+    finally:
+        # 提前结束时关闭连接，不再接收剩余token
+        response.close()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+batch_analyzer.py
+批量公告分析 - 公告URL经队列分发给固定数量的工作线程，每个线程从浏览器池取可复用的无头浏览器，
+出错的浏览器回收后换新浏览器重试，每篇分析完成立即追加写入JSONL结果文件
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from ..browser.setup import setup_driver, create_wait
+from ..browser.driver_pool import DriverPool
+from .content_extractor import extract_article_content
+from .time_processor import extract_time_info
+from .korean_time_parser import parse_notice_times
+
+# 导入批量分析配置
+try:
+    from config.latency_config import get_batch_analysis_config
+    BATCH_CONFIG_AVAILABLE = True
+except ImportError:
+    BATCH_CONFIG_AVAILABLE = False
+
+DEFAULT_BATCH_CONFIG = {
+    'pool_size': 4,
+    'max_tasks_per_driver': 50,
+    'max_retries': 2,
+    'headless': True,
+    'page_load_timeout_s': 30,
+    'selector_wait_s': 5,
+    'ai_analysis': True,
+    'cookies_file': None,
+    'cookies_domain_url': 'https://weverse.io/',
+    'output_dir': 'data/batch',
+}
+
+_DONE = object()
+
+
+def load_cookies(driver, cookies_file: str, domain_url: str) -> None:
+    """给新浏览器加载登录cookie（需先打开同域页面）"""
+    with open(cookies_file, 'r', encoding='utf-8') as f:
+        cookies = json.load(f)
+    driver.get(domain_url)
+    for cookie in cookies:
+        if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+            cookie.pop('sameSite', None)
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            continue
+
+
+def analyze_content(content: str, use_ai: bool = True, executor: Optional[Executor] = None) -> Dict[str, Any]:
+    """
+    正文分析（与 ContentAnalyzer 相同：AI分析与规则/AI时间提取并发，时间失败时正则兜底）
+
+    Args:
+        executor: 运行完整AI分析的线程池（批量分析按浏览器数配置）；不传时为本次调用单独起一个线程，
+                  不占用进程共享的 ai-analysis 线程池，多个工作线程不会排队等它
+    """
+    if not use_ai:
+        return {'time_info': parse_notice_times(content), 'analysis': None}
+
+    from ..ai.analyzer import analyze_with_ai, extract_time
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notice-analysis')
+    try:
+        analysis_future = executor.submit(analyze_with_ai, content)
+        ai_time_data = extract_time(content)
+        time_info = None if ai_time_data else extract_time_info(content)
+        return {
+            'time_info': ai_time_data or time_info,
+            'analysis': analysis_future.result()
+        }
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+class BatchNoticeAnalyzer:
+    """批量公告分析器"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 driver_factory: Optional[Callable[[], Any]] = None,
+                 task: Optional[Callable[[Any, str], Dict[str, Any]]] = None,
+                 analyze: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        """
+        Args:
+            config: 覆盖 BATCH_ANALYSIS_CONFIG 的配置
+            driver_factory: 创建浏览器的函数（默认按配置的无头 setup_driver）
+            task: 需要浏览器的单篇处理函数 task(driver, url) -> dict（默认打开页面并提取正文）
+            analyze: 浏览器归还后对 task 结果的处理 analyze(result) -> dict
+                     （默认流程为AI/规则分析；自定义 task 且不传时不做处理）
+        """
+        self.config = dict(DEFAULT_BATCH_CONFIG)
+        if BATCH_CONFIG_AVAILABLE:
+            self.config.update(get_batch_analysis_config())
+        if config:
+            self.config.update(config)
+
+        factory = driver_factory or self._create_driver
+        prepare = None
+        if self.config['cookies_file']:
+            prepare = lambda driver: load_cookies(driver, self.config['cookies_file'], self.config['cookies_domain_url'])
+        self.pool = DriverPool(self.config['pool_size'], factory, prepare, self.config['max_tasks_per_driver'])
+        self.task = task or self.fetch_notice
+        self.analyze = analyze if analyze is not None else (self.analyze_fetched if task is None else None)
+        # 每个工作线程同时最多一个完整AI分析，线程数与浏览器数一致
+        self.analysis_executor = ThreadPoolExecutor(max_workers=self.config['pool_size'],
+                                                    thread_name_prefix='batch-analysis')
+
+        self.write_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {'submitted': 0, 'succeeded': 0, 'failed': 0, 'retries': 0}
+
+    def _create_driver(self):
+        driver = setup_driver(headless=self.config['headless'])
+        driver.set_page_load_timeout(self.config['page_load_timeout_s'])
+        return driver
+
+    def fetch_notice(self, driver, url: str) -> Dict[str, Any]:
+        """打开公告页并提取正文（只有这一步占用浏览器）"""
+        timings = {}
+        start_time = time.time()
+        driver.get(url)
+        create_wait(driver, self.config['page_load_timeout_s']).until(
+            EC.presence_of_element_located((By.TAG_NAME, 'body'))
+        )
+        timings['load_s'] = time.time() - start_time
+
+        start_time = time.time()
+        content = extract_article_content(driver, create_wait(driver, self.config['selector_wait_s']))
+        timings['extract_s'] = time.time() - start_time
+        if not content:
+            raise RuntimeError("未能提取到文章内容")
+        return {'final_url': driver.current_url, 'title': driver.title, 'content': content, 'timings': timings}
+
+    def analyze_fetched(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """分析已提取的正文（不占用浏览器，AI调用可能要30~120秒）"""
+        start_time = time.time()
+        result = analyze_content(page['content'], self.config['ai_analysis'], self.analysis_executor)
+        timings = dict(page.get('timings', {}), analysis_s=time.time() - start_time)
+        return dict(page, **result, timings=timings)
+
+    def _process(self, url: str) -> Dict[str, Any]:
+        """处理一篇：浏览器步骤出错时回收浏览器并换新浏览器重试；提取完立即归还浏览器再做分析"""
+        attempts = self.config['max_retries'] + 1
+        last_error = None
+        for attempt in range(attempts):
+            try:
+                pooled = self.pool.acquire()
+            except Exception as e:
+                last_error = f"浏览器启动失败: {e}"
+                continue
+
+            start_time = time.time()
+            try:
+                result = self.task(pooled.driver, url)
+            except Exception as e:
+                self.pool.release(pooled, healthy=False)
+                last_error = str(e)
+                if attempt < attempts - 1:
+                    with self.stats_lock:
+                        self.stats['retries'] += 1
+                    print(f"🔄 [{url}] 第{attempt + 1}次失败，换新浏览器重试: {e}")
+                continue
+
+            self.pool.release(pooled)
+            if self.analyze:
+                try:
+                    result = self.analyze(result or {})
+                except Exception as e:
+                    return {'url': url, 'status': 'failed', 'attempts': attempt + 1, 'error': f"分析失败: {e}"}
+            return dict(result or {}, url=url, status='success', attempts=attempt + 1,
+                        driver=pooled.index, duration_s=time.time() - start_time)
+
+        return {'url': url, 'status': 'failed', 'attempts': attempts, 'error': last_error}
+
+    def _write(self, output, result: Dict[str, Any]) -> None:
+        result['finished_at'] = datetime.now().isoformat()
+        line = json.dumps(result, ensure_ascii=False, default=str)
+        with self.write_lock:
+            output.write(line + '\n')
+            output.flush()
+
+    def _worker(self, work: 'queue.Queue', output, on_result) -> None:
+        while True:
+            url = work.get()
+            if url is _DONE:
+                return
+            result = self._process(url)
+            with self.stats_lock:
+                self.stats['succeeded' if result['status'] == 'success' else 'failed'] += 1
+            self._write(output, result)
+            if on_result:
+                on_result(result)
+
+    def run(self, urls: Iterable[str], output_file: Optional[str] = None,
+            on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        分析一批公告（urls 可以是持续产生URL的迭代器，边读边分发）
+
+        Returns:
+            统计信息，包含结果文件路径
+        """
+        if not output_file:
+            os.makedirs(self.config['output_dir'], exist_ok=True)
+            output_file = os.path.join(self.config['output_dir'],
+                                       f"batch_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+
+        # 队列有界：URL来源比处理快时不会一次读入全部
+        work = queue.Queue(maxsize=self.config['pool_size'] * 2)
+        start_time = time.time()
+        with open(output_file, 'a', encoding='utf-8') as output:
+            workers = [threading.Thread(target=self._worker, args=(work, output, on_result),
+                                        name=f'batch-worker-{i}', daemon=True)
+                       for i in range(self.config['pool_size'])]
+            for worker in workers:
+                worker.start()
+            try:
+                for url in urls:
+                    url = url.strip()
+                    if url and not url.startswith('#'):
+                        self.stats['submitted'] += 1
+                        work.put(url)
+            finally:
+                for _ in workers:
+                    work.put(_DONE)
+                for worker in workers:
+                    worker.join()
+                self.pool.close()
+                self.analysis_executor.shutdown(wait=False)
+
+        return dict(self.stats, duration_s=time.time() - start_time,
+                    output_file=output_file, pool=self.pool.get_stats())
+
+
+def read_url_feed(source) -> Iterable[str]:
+    """逐行读取URL（文件对象或路径；stdin 可边写边读）"""
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8') as f:
+            yield from f
+    else:
+        yield from source
+
+
+def load_results(output_file: str) -> List[Dict[str, Any]]:
+    """读取JSONL结果文件"""
+    with open(output_file, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
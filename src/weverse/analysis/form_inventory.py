@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+form_inventory.py
+表单元素清单 - 页面内一次遍历收集全部表单元素（属性、可见性、XPath、CSS选择器、选项），
+一次 execute_script 返回完整JSON，替代逐元素的WebDriver往返
+"""
+
+from typing import Dict, Any
+
+# 字段与 MonitoringHandler._deep_form_analysis 原实现保持一致
+FORM_INVENTORY_SCRIPT = """
+function xpathOf(element) {
+    if (element && element.id) {
+        return '//*[@id="' + element.id + '"]';
+    }
+    var path = '';
+    while (element) {
+        var tagName = element.tagName.toLowerCase();
+        var sibling = element;
+        var nth = 1;
+        while ((sibling = sibling.previousElementSibling)) {
+            if (sibling.tagName.toLowerCase() === tagName) nth++;
+        }
+        path = '/' + tagName + '[' + nth + ']' + path;
+        element = element.parentElement;
+    }
+    return path;
+}
+
+function cssOf(element) {
+    if (element.getAttribute('id')) return '#' + element.getAttribute('id');
+    if (element.getAttribute('name')) return "[name='" + element.getAttribute('name') + "']";
+    var cls = element.getAttribute('class');
+    if (cls && cls.trim()) return '.' + cls.trim().split(/\\s+/).join('.');
+    return element.tagName.toLowerCase();
+}
+
+function isVisible(element) {
+    if (!element.getClientRects().length) return false;
+    var style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+}
+
+var analysis = {
+    input_fields: [], select_fields: [], checkboxes: [], radio_buttons: [],
+    buttons: [], form_containers: [], validation_messages: [], hidden_fields: []
+};
+
+var nodes = document.querySelectorAll('input, select, button, form, [role="alert"], [aria-live="assertive"]');
+for (var i = 0; i < nodes.length; i++) {
+    var el = nodes[i];
+    var tag = el.tagName.toLowerCase();
+
+    if (tag === 'input') {
+        var type = (el.type || 'text').toLowerCase();
+        var field = {
+            tag: tag, type: type, name: el.name, id: el.id, 'class': el.className,
+            placeholder: el.placeholder, required: el.required, value: el.value,
+            maxlength: el.getAttribute('maxlength'), pattern: el.getAttribute('pattern'),
+            xpath: xpathOf(el), css_selector: cssOf(el),
+            is_visible: isVisible(el), is_enabled: !el.disabled
+        };
+        if (type === 'checkbox') {
+            field.checked = el.checked;
+            analysis.checkboxes.push(field);
+        } else if (type === 'radio') {
+            field.checked = el.checked;
+            analysis.radio_buttons.push(field);
+        } else if (type === 'hidden') {
+            analysis.hidden_fields.push(field);
+        } else {
+            analysis.input_fields.push(field);
+        }
+        // 提交/普通按钮同时计入按钮清单（与原XPath //input[@type='submit'] | //input[@type='button'] 一致）
+        if (type !== 'submit' && type !== 'button') continue;
+    }
+
+    if (tag === 'select') {
+        var options = [];
+        for (var j = 0; j < el.options.length; j++) {
+            options.push({value: el.options[j].value, text: el.options[j].text});
+        }
+        analysis.select_fields.push({
+            tag: tag, name: el.name, id: el.id, 'class': el.className,
+            options: options, selected_value: el.value,
+            xpath: xpathOf(el), css_selector: cssOf(el)
+        });
+    } else if (tag === 'button' || tag === 'input') {
+        var visible = isVisible(el);
+        analysis.buttons.push({
+            tag: tag, type: el.type, text: visible ? (el.innerText || '').trim() : '',
+            value: el.value, 'class': el.className, onclick: el.getAttribute('onclick'),
+            xpath: xpathOf(el), css_selector: cssOf(el),
+            is_visible: visible, is_enabled: !el.disabled
+        });
+    } else if (tag === 'form') {
+        analysis.form_containers.push({
+            tag: tag, action: el.action, method: el.method, id: el.id,
+            'class': el.className, xpath: xpathOf(el)
+        });
+    } else {
+        var text = (el.innerText || '').trim();
+        if (text) {
+            analysis.validation_messages.push({text: text.substring(0, 200), xpath: xpathOf(el)});
+        }
+    }
+}
+return analysis;
+"""
+
+
+def collect_form_inventory(driver) -> Dict[str, Any]:
+    """一次往返收集页面全部表单元素"""
+    return driver.execute_script(FORM_INVENTORY_SCRIPT)
+
+
+# PageCrawler 的三种查找方式（标签名、CSS选择器、XPath）在页面内按原顺序合并、分类、去重，
+# 每个元素只提取一次属性；分类规则和去重键与 PageCrawler 逐元素实现一致
+CRAWLER_CSS_SELECTORS = [
+    'input[type="text"]',
+    'input[type="email"]',
+    'input[type="tel"]',
+    'input[type="date"]',
+    'input[type="number"]',
+    'input[type="password"]',
+    'input[type="checkbox"]',
+    'input[type="radio"]',
+    'input[type="submit"]',
+    'input[type="button"]',
+    'button[type="submit"]',
+    'button[class*="submit"]',
+    'button[class*="confirm"]',
+    '.form-control',
+    '.form-input',
+    '.checkbox',
+    '.radio'
+]
+
+CRAWLER_XPATHS = [
+    "//input[@type='text' or @type='email' or @type='tel' or @type='date']",
+    "//input[@type='checkbox']",
+    "//input[@type='radio']",
+    "//button[contains(text(), '제출') or contains(text(), '확인') or contains(text(), '신청')]",
+    "//button[contains(@class, 'submit') or contains(@class, 'confirm')]",
+    "//input[contains(@placeholder, '생년월일') or contains(@placeholder, '전화번호')]",
+    "//input[contains(@name, 'birth') or contains(@name, 'phone') or contains(@name, 'mobile')]",
+    "//textarea",
+    "//select"
+]
+
+CRAWLER_ELEMENTS_SCRIPT = """
+var cssSelectors = arguments[0], xpaths = arguments[1];
+var result = {
+    input_fields: [], checkboxes: [], radio_buttons: [],
+    select_dropdowns: [], textareas: [], buttons: []
+};
+var seen = {};
+Object.keys(result).forEach(function (k) { seen[k] = {}; });
+var cache = new Map();
+
+function isVisible(el) {
+    if (!el.getClientRects().length) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+}
+
+// 与 WebElement.get_attribute 一致：优先取属性值（property），没有再取HTML属性
+function prop(el, name) {
+    var value = el[name];
+    if (value === undefined || value === null) value = el.getAttribute(name);
+    return value === null || value === undefined ? '' : String(value);
+}
+
+function extract(el) {
+    if (cache.has(el)) return cache.get(el);
+    var rect = el.getBoundingClientRect();
+    var visible = isVisible(el);
+    var data = {
+        tag_name: el.tagName.toLowerCase(),
+        type: prop(el, 'type'),
+        name: prop(el, 'name'),
+        id: el.id || '',
+        'class': typeof el.className === 'string' ? el.className : (el.getAttribute('class') || ''),
+        placeholder: prop(el, 'placeholder'),
+        value: prop(el, 'value'),
+        text: visible ? (el.innerText || '').trim() : '',
+        required: el.hasAttribute('required') || el.required === true,
+        disabled: el.hasAttribute('disabled') || el.disabled === true,
+        visible: visible,
+        enabled: !el.matches(':disabled'),
+        location: {x: rect.left + window.pageXOffset, y: rect.top + window.pageYOffset},
+        size: {height: rect.height, width: rect.width}
+    };
+    cache.set(el, data);
+    return data;
+}
+
+function add(category, el, foundBy) {
+    var key = el.tagName.toLowerCase() + '_' + prop(el, 'type') + '_' + prop(el, 'name') + '_' + (el.id || '');
+    if (seen[category][key]) return;
+    seen[category][key] = true;
+    var data = Object.assign({}, extract(el));
+    data.found_by = foundBy;
+    result[category].push(data);
+}
+
+// 方法1: 标签名
+var inputs = document.getElementsByTagName('input');
+for (var i = 0; i < inputs.length; i++) {
+    var type = prop(inputs[i], 'type');
+    add(type === 'checkbox' ? 'checkboxes' : type === 'radio' ? 'radio_buttons' : 'input_fields', inputs[i], 'tag_name');
+}
+[['select', 'select_dropdowns'], ['textarea', 'textareas'], ['button', 'buttons']].forEach(function (pair) {
+    var nodes = document.getElementsByTagName(pair[0]);
+    for (var j = 0; j < nodes.length; j++) add(pair[1], nodes[j], 'tag_name');
+});
+
+// 方法2: CSS选择器
+cssSelectors.forEach(function (selector) {
+    var nodes;
+    try { nodes = document.querySelectorAll(selector); } catch (e) { return; }
+    for (var k = 0; k < nodes.length; k++) {
+        var t = prop(nodes[k], 'type');
+        var category = (selector.indexOf('checkbox') >= 0 || t === 'checkbox') ? 'checkboxes'
+            : (selector.indexOf('radio') >= 0 || t === 'radio') ? 'radio_buttons'
+            : (selector.indexOf('submit') >= 0 || selector.indexOf('button') >= 0) ? 'buttons'
+            : 'input_fields';
+        add(category, nodes[k], 'css: ' + selector);
+    }
+});
+
+// 方法3: XPath
+xpaths.forEach(function (xpath) {
+    var snapshot;
+    try {
+        snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) { return; }
+    var category = xpath.indexOf('checkbox') >= 0 ? 'checkboxes'
+        : xpath.indexOf('radio') >= 0 ? 'radio_buttons'
+        : xpath.indexOf('button') >= 0 ? 'buttons'
+        : xpath.indexOf('textarea') >= 0 ? 'textareas'
+        : xpath.indexOf('select') >= 0 ? 'select_dropdowns'
+        : 'input_fields';
+    for (var n = 0; n < snapshot.snapshotLength; n++) {
+        add(category, snapshot.snapshotItem(n), 'xpath: ' + xpath);
+    }
+});
+return result;
+"""
+
+
+def collect_crawler_elements(driver) -> Dict[str, Any]:
+    """一次往返完成 PageCrawler 的表单元素爬取（输出结构与逐元素实现相同）"""
+    form_elements = driver.execute_script(CRAWLER_ELEMENTS_SCRIPT, CRAWLER_CSS_SELECTORS, CRAWLER_XPATHS)
+    for elements in form_elements.values():
+        for element in elements:
+            # 与 WebElement.location / size 的取整方式一致
+            location, size = element['location'], element['size']
+            element['location'] = {'x': round(location['x']), 'y': round(location['y'])}
+            element['size'] = {'height': int(size['height']), 'width': int(size['width'])}
+    return form_elements
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+korean_time_parser.py
+规则时间解析器 - 解析公告中的韩文/ISO/点号/斜杠/中文日期时间（星期标注、"~" 区间、KST/CST标记、
+省略年份推断），按附近关键词标注申请/截止/活动/集合时间，输出与AI时间提取相同的结构并给出置信度；
+置信度足够时不需要调用AI
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+# 导入规则解析配置
+try:
+    from config.ai_config import RULE_TIME_PARSER_CONFIG
+    RULE_PARSER_CONFIG_AVAILABLE = True
+except ImportError:
+    RULE_PARSER_CONFIG_AVAILABLE = False
+
+DEFAULT_RULE_PARSER_CONFIG = {
+    'enabled': True,
+    'min_confidence': 0.75,
+    'labels': {
+        'application': ['신청', '응모', '접수', '참여', '申请', '报名', 'apply', 'application'],
+        'activity': ['공연', '행사', '팬미팅', '콘서트', '녹화', '방송', '사인회', '活动', '演出', 'concert', 'event'],
+        'gathering': ['집합', '입장', '모임', '집결', '集合', '入场'],
+        'announcement': ['발표', '당첨', '公布', '公告'],
+    },
+    'end_markers': ['마감', '종료', '까지', '截止', '结束', 'deadline'],
+    'start_markers': ['시작', '오픈', '부터', '开始', 'open'],
+}
+
+TIME_FORMAT = '%Y-%m-%d %H:%M'
+
+WEEKDAYS = {
+    '월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6,
+    '一': 0, '二': 1, '三': 2, '四': 3, '五': 4, '六': 5, '日': 6, '天': 6,
+    'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6,
+}
+
+# 换算为KST需要加的小时数
+TIMEZONE_OFFSETS = {'KST': 0, 'JST': 0, 'CST': 1}
+
+DATE_PATTERN = (
+    r'(?<!\d)(?:'
+    r'(?P<y1>\d{4})\s*[년年]\s*(?P<m1>\d{1,2})\s*[월月]\s*(?P<d1>\d{1,2})\s*[일日号]?'
+    r'|(?P<m2>\d{1,2})\s*[월月]\s*(?P<d2>\d{1,2})\s*[일日号]'
+    r'|(?P<y3>\d{4}|\d{2})\s*[-./]\s*(?P<m3>\d{1,2})\s*[-./]\s*(?P<d3>\d{1,2})(?!\d)\.?'
+    r'|(?P<m4>\d{1,2})\s*[./]\s*(?P<d4>\d{1,2})(?![\d.:])'
+    r')'
+)
+WEEKDAY_PATTERN = (
+    r'(?:\s*[(（]\s*(?P<wd>[월화수목금토일]|(?:周|星期)[一二三四五六日天]|(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)[a-z]{0,6})\.?\s*[)）]'
+    r'|\s+(?P<wdk>[월화수목금토일])요일)?'
+)
+TIME_PATTERN = (
+    r'(?P<ap1>오전|오후|AM|PM|am|pm|上午|下午|晚上)?\s*(?:'
+    r'(?P<h1>\d{1,2})\s*:\s*(?P<mi1>\d{2})'
+    r'|(?P<h2>\d{1,2})\s*[시点時](?:\s*(?P<mi2>\d{1,2})\s*[분分]|\s*(?P<half>반|半))?'
+    r'|(?P<noon>정오|자정)'
+    r')(?:\s*(?P<ap2>AM|PM|am|pm)(?![A-Za-z]))?'
+)
+TZ_PATTERN = (
+    r'(?:\s*[(（\[]?\s*(?P<tz>KST|CST|JST|한국\s*시간|중국\s*시간|韩国时间|北京时间|中国时间|'
+    r'(?:UTC|GMT)\s*\+\s*0?[89](?::?00)?)\s*[)）\]]?)?'
+)
+
+DATETIME_RE = re.compile(DATE_PATTERN + WEEKDAY_PATTERN + r'(?:(?:\s*,?\s*|T)' + TIME_PATTERN + r')?' + TZ_PATTERN)
+TIME_ONLY_RE = re.compile(TIME_PATTERN + TZ_PATTERN)
+RANGE_RE = re.compile(r'\s*(?:[~～〜–—]|-(?!\d{2}\b))\s*')
+
+
+def get_parser_config() -> Dict[str, Any]:
+    config = dict(DEFAULT_RULE_PARSER_CONFIG)
+    if RULE_PARSER_CONFIG_AVAILABLE:
+        config.update(RULE_TIME_PARSER_CONFIG)
+    return config
+
+
+def _weekday(match) -> Optional[int]:
+    raw = match.group('wd') or match.group('wdk')
+    if not raw:
+        return None
+    if raw[0] in ('周', '星'):
+        raw = raw[-1]
+    return WEEKDAYS.get(raw.lower()[:3] if raw.isascii() else raw)
+
+
+def _timezone(match) -> Optional[str]:
+    tz = match.group('tz')
+    if not tz:
+        return None
+    tz = re.sub(r'\s+', '', tz)
+    if tz in ('CST', '중국시간', '北京时间', '中国时间') or '+8' in tz or '+08' in tz:
+        return 'CST'
+    if tz == 'JST':
+        return 'JST'
+    return 'KST'
+
+
+def _clock(match) -> Optional[tuple]:
+    """返回 (小时, 分钟)，小时可能为24（자정）"""
+    if match.group('noon'):
+        return (12, 0) if match.group('noon') == '정오' else (24, 0)
+    hour_text = match.group('h1') or match.group('h2')
+    if hour_text is None:
+        return None
+    hour = int(hour_text)
+    minute = int(match.group('mi1') or match.group('mi2') or (30 if match.group('half') else 0))
+    meridiem = (match.group('ap1') or match.group('ap2') or '').lower()
+    if meridiem in ('오후', 'pm', '下午', '晚上') and hour < 12:
+        hour += 12
+    elif meridiem in ('오전', 'am', '上午') and hour == 12:
+        hour = 0
+    if hour > 24 or minute > 59:
+        return None
+    return hour, minute
+
+
+class _Span:
+    """一个解析出的时间点"""
+
+    def __init__(self, when: datetime, start: int, end: int, has_time: bool,
+                 explicit_year: bool, weekday_ok: Optional[bool], timezone: Optional[str]):
+        self.when = when
+        self.start = start
+        self.end = end
+        self.has_time = has_time
+        self.explicit_year = explicit_year
+        self.weekday_ok = weekday_ok
+        self.timezone = timezone
+        self.label: Optional[str] = None
+        self.role: Optional[str] = None  # 'start' / 'end'
+        self.range_end: Optional['_Span'] = None
+
+    def apply_timezone(self) -> None:
+        """换算为KST"""
+        self.when += timedelta(hours=TIMEZONE_OFFSETS.get(self.timezone or 'KST', 0))
+        self.timezone = 'KST' if self.timezone else None
+
+    @property
+    def confidence(self) -> float:
+        score = 0.4
+        score += 0.15 if self.has_time else 0
+        score += 0.15 if self.explicit_year else 0
+        if self.weekday_ok is True:
+            score += 0.15
+        elif self.weekday_ok is False:
+            score -= 0.3
+        score += 0.1 if self.timezone else 0
+        score += 0.2 if self.label else 0
+        return max(0.0, min(1.0, score))
+
+
+class KoreanTimeParser:
+    """规则时间解析器"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, now: Optional[datetime] = None):
+        self.config = get_parser_config()
+        if config:
+            self.config.update(config)
+        self.now = now or datetime.now()
+
+    def _infer_year(self, month: int, day: int, weekday: Optional[int], context_year: Optional[int]) -> tuple:
+        """推断省略的年份，返回 (年份, 星期是否一致)"""
+        candidates = [context_year] if context_year else []
+        candidates += [self.now.year, self.now.year + 1, self.now.year - 1]
+        valid = []
+        for year in dict.fromkeys(candidates):
+            try:
+                valid.append((year, datetime(year, month, day)))
+            except ValueError:
+                continue
+        if not valid:
+            return None, None
+
+        if weekday is not None:
+            matching = [(year, date) for year, date in valid if date.weekday() == weekday]
+            if matching:
+                # 星期一致的年份里取离现在最近的
+                year = min(matching, key=lambda item: abs((item[1] - self.now).days))[0]
+                return year, True
+            return valid[0][0], False
+
+        if context_year:
+            return context_year, None
+        # 公告一般预告未来的时间：超过半年前的日期视为明年
+        year = self.now.year
+        if datetime(year, month, day) < self.now - timedelta(days=180):
+            year += 1
+        return year, None
+
+    def _build_span(self, match, context_year: Optional[int], base_date: Optional[datetime] = None) -> Optional[_Span]:
+        groups = match.groupdict()
+        explicit_year = False
+        weekday = _weekday(match) if 'wd' in groups else None
+        weekday_ok = None
+
+        if groups.get('y1') or groups.get('y3'):
+            year = int(groups.get('y1') or groups.get('y3'))
+            year = year + 2000 if year < 100 else year
+            month = int(groups.get('m1') or groups.get('m3'))
+            day = int(groups.get('d1') or groups.get('d3'))
+            explicit_year = True
+        elif groups.get('m2') or groups.get('m4'):
+            month = int(groups.get('m2') or groups.get('m4'))
+            day = int(groups.get('d2') or groups.get('d4'))
+            year = None
+        elif base_date is not None:
+            year, month, day = base_date.year, base_date.month, base_date.day
+            explicit_year = True
+        else:
+            return None
+
+        clock = _clock(match)
+        # 只有月/日的简写必须带星期或时间，避免把小数、版本号当成日期
+        if groups.get('m4') and weekday is None and clock is None:
+            return None
+
+        if year is None:
+            year, weekday_ok = self._infer_year(month, day, weekday, context_year)
+            if year is None:
+                return None
+        try:
+            when = datetime(year, month, day)
+        except ValueError:
+            return None
+        if explicit_year and weekday is not None and base_date is None:
+            weekday_ok = when.weekday() == weekday
+
+        hour, minute = clock if clock else (0, 0)
+        when += timedelta(hours=hour, minutes=minute)
+        return _Span(when, match.start(), match.end(), clock is not None,
+                     explicit_year and base_date is None, weekday_ok, _timezone(match))
+
+    def _find_spans(self, text: str) -> List[_Span]:
+        spans = []
+        context_year = None
+        position = 0
+        while True:
+            match = DATETIME_RE.search(text, position)
+            if not match:
+                break
+            span = self._build_span(match, context_year)
+            position = match.end()
+            if span is None:
+                position = match.start() + 1
+                continue
+            if span.explicit_year:
+                context_year = span.when.year
+
+            # 区间："~" 后面是完整日期时间，或只有时间（沿用开始日期）
+            separator = RANGE_RE.match(text, match.end())
+            if separator:
+                end_match = DATETIME_RE.match(text, separator.end())
+                end_span = self._build_span(end_match, span.when.year) if end_match else None
+                if end_span is None:
+                    end_match = TIME_ONLY_RE.match(text, separator.end())
+                    end_span = self._build_span(end_match, None, span.when.replace(hour=0, minute=0)) if end_match else None
+                if end_span is not None:
+                    if end_span.when < span.when:
+                        if end_match.re is TIME_ONLY_RE:
+                            end_span.when += timedelta(days=1)  # 跨午夜
+                        elif not end_span.explicit_year:
+                            end_span.when = end_span.when.replace(year=end_span.when.year + 1)  # 跨年
+                    span.range_end = end_span
+                    span.timezone = span.timezone or end_span.timezone
+                    end_span.timezone = end_span.timezone or span.timezone
+                    position = end_match.end()
+            spans.append(span)
+        return spans
+
+    def _keyword_position(self, text: str, keywords: List[str]) -> int:
+        return max((text.rfind(keyword) for keyword in keywords), default=-1)
+
+    def _label(self, text: str, span: _Span) -> None:
+        """按时间点前面最近的关键词确定类别（同一行没有时看上一行标题，再看后面的文字）"""
+        line_start = text.rfind('\n', 0, span.start) + 1
+        line_end = text.find('\n', span.end)
+        line_end = len(text) if line_end < 0 else line_end
+        before = text[line_start:span.start]
+        end_offset = span.range_end.end if span.range_end else span.end
+        after = text[end_offset:min(line_end if line_end > end_offset else end_offset, end_offset + 20)]
+
+        previous_line = ''
+        if line_start > 0:
+            previous_start = text.rfind('\n', 0, line_start - 1) + 1
+            previous_line = text[previous_start:line_start - 1]
+
+        labels = self.config['labels']
+        for context in (before.lower(), after.lower(), previous_line.lower()):
+            positions = {name: self._keyword_position(context, keywords) for name, keywords in labels.items()}
+            best = max(positions, key=positions.get)
+            if positions[best] >= 0:
+                span.label = best
+                break
+
+        around = (before[-12:] + ' ' + after).lower()
+        if span.range_end is None:
+            if any(marker in after.lower() or marker in before[-12:].lower() for marker in self.config['end_markers']):
+                span.role = 'end'
+            elif any(marker in around for marker in self.config['start_markers']):
+                span.role = 'start'
+        # "마감" 单独出现时指申请截止
+        if span.label is None and span.role == 'end':
+            span.label = 'application'
+
+    def parse(self, content: str) -> Dict[str, Any]:
+        """解析公告正文，返回与AI时间提取相同的结构（附加 置信度 / 来源）"""
+        result = {
+            '申请开始时间': None,
+            '申请结束时间': None,
+            '活动时间': None,
+            '集合时间': None,
+            '时区': 'KST',
+            '关键时间点': [],
+            '置信度': 0.0,
+            '来源': 'rule'
+        }
+        if not content:
+            return result
+
+        text = content.replace('\r\n', '\n')
+        spans = self._find_spans(text)
+        confidences = {}
+
+        # 只有日期没有时间的申请开始时间（如 "8PM" 等未识别的写法）按 00:00 输出，不能作为倒计时目标
+        date_only_cap = self.config['min_confidence'] * 0.6
+
+        def assign(field, span, confidence=None):
+            if result[field] is None:
+                result[field] = span.when.strftime(TIME_FORMAT)
+                confidences[field] = span.confidence if confidence is None else confidence
+                if field == '申请开始时间' and not span.has_time:
+                    confidences[field] = min(confidences[field], date_only_cap)
+
+        descriptions = {'application': '申请', 'activity': '活动', 'gathering': '集合', 'announcement': '公布'}
+        for span in spans:
+            span.apply_timezone()
+            if span.range_end:
+                span.range_end.apply_timezone()
+            self._label(text, span)
+            snippet = text[span.start:(span.range_end or span).end].strip()
+
+            if span.label == 'application':
+                if span.range_end:
+                    assign('申请开始时间', span)
+                    assign('申请结束时间', span.range_end, min(span.confidence, span.range_end.confidence + 0.2))
+                elif span.role == 'end':
+                    assign('申请结束时间', span)
+                else:
+                    assign('申请开始时间', span)
+            elif span.label == 'activity':
+                assign('活动时间', span)
+            elif span.label == 'gathering':
+                assign('集合时间', span)
+
+            importance = '高' if span.label == 'application' else '中'
+            label = descriptions.get(span.label, '时间')
+            result['关键时间点'].append({
+                '描述': f"{label}{'开始' if span.range_end else ('截止' if span.role == 'end' else '')}: {snippet}",
+                '时间': span.when.strftime(TIME_FORMAT),
+                '重要性': importance
+            })
+            if span.range_end:
+                result['关键时间点'].append({
+                    '描述': f"{label}结束: {snippet}",
+                    '时间': span.range_end.when.strftime(TIME_FORMAT),
+                    '重要性': importance
+                })
+
+        if '申请开始时间' in confidences:
+            confidence = confidences['申请开始时间']
+        elif '申请结束时间' in confidences:
+            confidence = confidences['申请结束时间'] * 0.6
+        elif spans:
+            confidence = max(span.confidence for span in spans) * 0.3
+        else:
+            confidence = 0.0
+        result['置信度'] = round(confidence, 2)
+        return result
+
+
+def parse_notice_times(content: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """解析公告中的时间信息（AI时间提取的规则快速路径）"""
+    return KoreanTimeParser(now=now).parse(content)
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+offline_analyzer.py
+离线表单分析 - 用lxml解析保存的HTML快照（会话JSON中的 html_content / page_source、
+由 dom_recording 重建的各DOM检查点，或 .html 文件），输出与 PageCrawler / _deep_form_analysis 相同结构的表单清单和候选选择器，不需要启动浏览器；
+目录中的快照用进程池并行分析，便于修改选择器后批量回归检查
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import lxml.html
+from lxml import etree
+from bs4 import BeautifulSoup
+
+from .form_inventory import CRAWLER_CSS_SELECTORS, CRAWLER_XPATHS
+from .snapshot_store import load_session
+from ..core.mode_components.dom_diff_recorder import reconstruct_segment
+
+# 可选：cssselect（完整CSS选择器支持，未安装时只支持简单选择器）
+try:
+    from cssselect import HTMLTranslator
+    CSSSELECT_AVAILABLE = True
+except ImportError:
+    CSSSELECT_AVAILABLE = False
+
+# 导入离线分析配置
+try:
+    from config.latency_config import get_offline_analysis_config
+    OFFLINE_CONFIG_AVAILABLE = True
+except ImportError:
+    OFFLINE_CONFIG_AVAILABLE = False
+
+# 导入表单选择器配置（用于回归检查）
+try:
+    from config.form_selectors import get_form_selectors
+    FORM_SELECTORS_AVAILABLE = True
+except ImportError:
+    FORM_SELECTORS_AVAILABLE = False
+
+DEFAULT_OFFLINE_CONFIG = {
+    'workers': None,
+    'chunksize': 4,
+    'patterns': ['*.json', '*.html'],
+    'html_keys': ['html_content', 'page_source'],
+}
+
+# 关键词与 LightningFormProcessor 的通用识别规则一致
+BIRTH_KEYWORDS = ['생년월일', 'birth', 'birthday', 'date']
+PHONE_KEYWORDS = ['phone', '전화', '연락처', '휴대폰']
+SUBMIT_KEYWORDS = ['참여 신청', '제출', '확인', '신청']
+
+BUTTON_TYPES = ('submit', 'reset', 'button')
+HIDDEN_STYLE = re.compile(r'(display\s*:\s*none|visibility\s*:\s*hidden|opacity\s*:\s*0(\.0*)?\s*(;|$))', re.I)
+SIMPLE_CSS = re.compile(r'^(?P<tag>[a-z]+)?(?:\[(?P<attr>[\w-]+)(?P<op>\*?=)"(?P<value>[^"]*)"\])?$')
+
+
+def get_config() -> Dict[str, Any]:
+    """合并默认配置和 config/latency_config.py 中的配置"""
+    config = dict(DEFAULT_OFFLINE_CONFIG)
+    if OFFLINE_CONFIG_AVAILABLE:
+        config.update(get_offline_analysis_config())
+    return config
+
+
+def css_to_xpath(selector: str) -> str:
+    """CSS选择器转XPath；未安装cssselect时只支持 tag[attr="v"] / tag[attr*="v"] / .class / #id"""
+    if CSSSELECT_AVAILABLE:
+        return HTMLTranslator().css_to_xpath(selector)
+
+    if selector.startswith('#') and re.fullmatch(r'#[\w-]+', selector):
+        return f"descendant-or-self::*[@id='{selector[1:]}']"
+    if selector.startswith('.') and re.fullmatch(r'\.[\w-]+', selector):
+        return f"descendant-or-self::*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+    match = SIMPLE_CSS.match(selector)
+    if not match or not (match.group('tag') or match.group('attr')):
+        raise ValueError(f"不支持的CSS选择器（需要安装cssselect）: {selector}")
+    xpath = f"descendant-or-self::{match.group('tag') or '*'}"
+    if match.group('attr'):
+        attr, value = match.group('attr'), match.group('value')
+        if match.group('op') == '*=':
+            xpath += f"[contains(@{attr}, '{value}')]"
+        else:
+            xpath += f"[@{attr}='{value}']"
+    return xpath
+
+
+def _attr(el, name: str) -> str:
+    return el.get(name) or ''
+
+
+def _dom_type(el) -> str:
+    """与浏览器 element.type 属性一致的类型"""
+    tag = el.tag
+    if tag == 'input':
+        return (el.get('type') or 'text').strip().lower() or 'text'
+    if tag == 'button':
+        button_type = (el.get('type') or '').strip().lower()
+        return button_type if button_type in BUTTON_TYPES else 'submit'
+    if tag == 'select':
+        return 'select-multiple' if el.get('multiple') is not None else 'select-one'
+    if tag == 'textarea':
+        return 'textarea'
+    return _attr(el, 'type')
+
+
+def _dom_value(el) -> str:
+    """与浏览器 element.value 属性一致的值"""
+    if el.tag == 'input' and el.get('value') is None and _dom_type(el) in ('checkbox', 'radio'):
+        return 'on'
+    if el.tag == 'textarea':
+        return el.text or ''
+    if el.tag == 'select':
+        return _selected_value(el)
+    return _attr(el, 'value')
+
+
+def _option_value(option) -> str:
+    value = option.get('value')
+    return value if value is not None else ' '.join(option.text_content().split())
+
+
+def _selected_value(select) -> str:
+    options = select.findall('.//option')
+    for option in options:
+        if option.get('selected') is not None:
+            return _option_value(option)
+    if options and select.get('multiple') is None:
+        return _option_value(options[0])
+    return ''
+
+
+def _is_visible(el) -> bool:
+    """无布局信息时的可见性近似：自身及祖先没有 hidden 属性或隐藏样式"""
+    if el.tag == 'input' and _dom_type(el) == 'hidden':
+        return False
+    node = el
+    while node is not None:
+        if node.tag in ('head', 'template', 'script', 'style', 'noscript'):
+            return False
+        if node.get('hidden') is not None or HIDDEN_STYLE.search(node.get('style') or ''):
+            return False
+        node = node.getparent()
+    return True
+
+
+def _text(el) -> str:
+    return ' '.join(el.text_content().split())
+
+
+def xpath_of(el) -> str:
+    """与页面内 xpathOf 相同的XPath生成规则"""
+    if el.get('id'):
+        return f'//*[@id="{el.get("id")}"]'
+    path = ''
+    while el is not None and isinstance(el.tag, str):
+        nth = 1 + sum(1 for sibling in el.itersiblings(preceding=True)
+                      if isinstance(sibling.tag, str) and sibling.tag == el.tag)
+        path = f'/{el.tag}[{nth}]{path}'
+        el = el.getparent()
+    return path
+
+
+def css_of(el) -> str:
+    """与页面内 cssOf 相同的CSS选择器生成规则"""
+    if el.get('id'):
+        return f"#{el.get('id')}"
+    if el.get('name'):
+        return f"[name='{el.get('name')}']"
+    if (el.get('class') or '').strip():
+        return '.' + '.'.join(el.get('class').split())
+    return el.tag
+
+
+def parse_html(html: str):
+    """解析HTML（去掉XML编码声明，lxml不接受带声明的str）"""
+    html = re.sub(r'^\s*<\?xml[^>]*\?>', '', html)
+    return lxml.html.document_fromstring(html)
+
+
+def deep_form_analysis(root) -> Dict[str, Any]:
+    """与 MonitoringHandler._deep_form_analysis 结构相同的表单分析"""
+    analysis = {
+        'input_fields': [], 'select_fields': [], 'checkboxes': [], 'radio_buttons': [],
+        'buttons': [], 'form_containers': [], 'validation_messages': [], 'hidden_fields': []
+    }
+
+    for el in root.iter(tag=etree.Element):
+        tag = el.tag
+        if tag == 'input':
+            input_type = _dom_type(el)
+            field = {
+                'tag': tag, 'type': input_type, 'name': _attr(el, 'name'), 'id': _attr(el, 'id'),
+                'class': _attr(el, 'class'), 'placeholder': _attr(el, 'placeholder'),
+                'required': el.get('required') is not None, 'value': _dom_value(el),
+                'maxlength': el.get('maxlength'), 'pattern': el.get('pattern'),
+                'xpath': xpath_of(el), 'css_selector': css_of(el),
+                'is_visible': _is_visible(el), 'is_enabled': el.get('disabled') is None
+            }
+            if input_type in ('checkbox', 'radio'):
+                field['checked'] = el.get('checked') is not None
+                analysis['checkboxes' if input_type == 'checkbox' else 'radio_buttons'].append(field)
+            elif input_type == 'hidden':
+                analysis['hidden_fields'].append(field)
+            else:
+                analysis['input_fields'].append(field)
+            if input_type not in ('submit', 'button'):
+                continue
+
+        if tag == 'select':
+            analysis['select_fields'].append({
+                'tag': tag, 'name': _attr(el, 'name'), 'id': _attr(el, 'id'), 'class': _attr(el, 'class'),
+                'options': [{'value': _option_value(option), 'text': _text(option)} for option in el.iter('option')],
+                'selected_value': _selected_value(el),
+                'xpath': xpath_of(el), 'css_selector': css_of(el)
+            })
+        elif tag in ('button', 'input'):
+            visible = _is_visible(el)
+            analysis['buttons'].append({
+                'tag': tag, 'type': _dom_type(el), 'text': _text(el) if visible else '',
+                'value': _dom_value(el), 'class': _attr(el, 'class'), 'onclick': el.get('onclick'),
+                'xpath': xpath_of(el), 'css_selector': css_of(el),
+                'is_visible': visible, 'is_enabled': el.get('disabled') is None
+            })
+        elif tag == 'form':
+            analysis['form_containers'].append({
+                'tag': tag, 'action': _attr(el, 'action'), 'method': (el.get('method') or 'get').lower(),
+                'id': _attr(el, 'id'), 'class': _attr(el, 'class'), 'xpath': xpath_of(el)
+            })
+        elif el.get('role') == 'alert' or el.get('aria-live') == 'assertive':
+            text = _text(el)
+            if text:
+                analysis['validation_messages'].append({'text': text[:200], 'xpath': xpath_of(el)})
+
+    return analysis
+
+
+def _element_data(el, found_by: str) -> Dict[str, Any]:
+    """与 PageCrawler._extract_element_data 相同的字段（离线没有布局，location / size 为 None）"""
+    visible = _is_visible(el)
+    return {
+        'tag_name': el.tag,
+        'type': _dom_type(el),
+        'name': _attr(el, 'name'),
+        'id': _attr(el, 'id'),
+        'class': _attr(el, 'class'),
+        'placeholder': _attr(el, 'placeholder'),
+        'value': _dom_value(el),
+        'text': _text(el) if visible else '',
+        'required': el.get('required') is not None,
+        'disabled': el.get('disabled') is not None,
+        'visible': visible,
+        'enabled': el.get('disabled') is None,
+        'location': None,
+        'size': None,
+        'found_by': found_by
+    }
+
+
+def crawl_form_elements(root) -> Dict[str, List[Dict[str, Any]]]:
+    """与 PageCrawler 三种查找方式相同的顺序、分类和去重"""
+    form_elements = {
+        'input_fields': [], 'checkboxes': [], 'radio_buttons': [],
+        'select_dropdowns': [], 'textareas': [], 'buttons': []
+    }
+    seen = {category: set() for category in form_elements}
+
+    def add(category, el, found_by):
+        identifier = f"{el.tag}_{_dom_type(el)}_{_attr(el, 'name')}_{_attr(el, 'id')}"
+        if identifier not in seen[category]:
+            seen[category].add(identifier)
+            form_elements[category].append(_element_data(el, found_by))
+
+    # 方法1: 标签名
+    for el in root.iter('input'):
+        input_type = _dom_type(el)
+        add('checkboxes' if input_type == 'checkbox' else 'radio_buttons' if input_type == 'radio' else 'input_fields',
+            el, 'tag_name')
+    for tag, category in (('select', 'select_dropdowns'), ('textarea', 'textareas'), ('button', 'buttons')):
+        for el in root.iter(tag):
+            add(category, el, 'tag_name')
+
+    # 方法2: CSS选择器
+    for selector in CRAWLER_CSS_SELECTORS:
+        try:
+            elements = root.xpath(css_to_xpath(selector))
+        except (ValueError, etree.XPathError):
+            continue
+        for el in elements:
+            input_type = _dom_type(el)
+            if 'checkbox' in selector or input_type == 'checkbox':
+                category = 'checkboxes'
+            elif 'radio' in selector or input_type == 'radio':
+                category = 'radio_buttons'
+            elif 'submit' in selector or 'button' in selector:
+                category = 'buttons'
+            else:
+                category = 'input_fields'
+            add(category, el, f'css: {selector}')
+
+    # 方法3: XPath
+    for xpath in CRAWLER_XPATHS:
+        if 'checkbox' in xpath:
+            category = 'checkboxes'
+        elif 'radio' in xpath:
+            category = 'radio_buttons'
+        elif 'button' in xpath:
+            category = 'buttons'
+        elif 'textarea' in xpath:
+            category = 'textareas'
+        elif 'select' in xpath:
+            category = 'select_dropdowns'
+        else:
+            category = 'input_fields'
+        for el in root.xpath(xpath):
+            add(category, el, f'xpath: {xpath}')
+
+    return form_elements
+
+
+def _candidate(field: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: field.get(key) for key in ('css_selector', 'xpath', 'name', 'id', 'placeholder', 'text')
+            if field.get(key) is not None}
+
+
+def candidate_selectors(form_analysis: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """按 LightningFormProcessor 的通用识别规则给出生日、手机号、复选框、提交按钮的候选选择器"""
+    def keyword_match(field, keywords):
+        text = f"{field.get('placeholder', '')} {field.get('name', '')} {field.get('id', '')}".lower()
+        return any(keyword in text for keyword in keywords)
+
+    input_fields = form_analysis.get('input_fields', [])
+    buttons = form_analysis.get('buttons', [])
+    submit = [button for button in buttons
+              if any(keyword in f"{button.get('text', '')} {button.get('value', '')}" for keyword in SUBMIT_KEYWORDS)]
+    if not submit and buttons:
+        # 没有匹配文字时与处理器一样退回最后一个按钮
+        submit = [dict(buttons[-1], fallback=True)]
+
+    return {
+        'birth_date': [_candidate(field) for field in input_fields
+                       if field.get('type') in ('text', 'date', 'tel') and keyword_match(field, BIRTH_KEYWORDS)],
+        'phone_number': [_candidate(field) for field in input_fields
+                         if field.get('type') in ('text', 'tel', 'number') and keyword_match(field, PHONE_KEYWORDS)],
+        'checkboxes': [_candidate(field) for field in form_analysis.get('checkboxes', [])],
+        'submit_button': [dict(_candidate(button), fallback=button.get('fallback', False)) for button in submit]
+    }
+
+
+def check_configured_selectors(html: str, root, selectors: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Optional[int]]]:
+    """
+    统计 config/form_selectors.py 中每个选择器的匹配数（无法解析的选择器为 None）
+
+    未安装cssselect时用BeautifulSoup（soupsieve）解析复杂选择器
+    """
+    if selectors is None:
+        if not FORM_SELECTORS_AVAILABLE:
+            return {}
+        selectors = get_form_selectors()
+
+    soup = None
+    result = {}
+    for key, value in selectors.items():
+        result[key] = {}
+        for selector in (value if isinstance(value, list) else [value]):
+            try:
+                result[key][selector] = len(root.xpath(css_to_xpath(selector)))
+                continue
+            except Exception:
+                pass
+            try:
+                if soup is None:
+                    soup = BeautifulSoup(html, 'lxml')
+                result[key][selector] = len(soup.select(selector.replace(':contains(', ':-soup-contains(')))
+            except Exception:
+                result[key][selector] = None
+    return result
+
+
+def analyze_html(html: str, selectors: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """分析一份HTML，返回表单清单、爬取元素、候选选择器和配置选择器检查结果"""
+    root = parse_html(html)
+    form_analysis = deep_form_analysis(root)
+    title = root.find('.//title')
+    return {
+        'page_title': _text(title) if title is not None else '',
+        'form_analysis': form_analysis,
+        'form_elements': crawl_form_elements(root),
+        'candidate_selectors': candidate_selectors(form_analysis),
+        'configured_selectors': check_configured_selectors(html, root, selectors)
+    }
+
+
+def _find_html(data: Any, html_keys: List[str], path: str = '') -> List[tuple]:
+    """在会话数据中查找保存的HTML（返回 [(字段路径, html)]）"""
+    found = []
+    if isinstance(data, dict):
+        for key, value in data.items():
+            key_path = f'{path}.{key}' if path else key
+            if key in html_keys and isinstance(value, str) and '<' in value:
+                found.append((key_path, value))
+            else:
+                found.extend(_find_html(value, html_keys, key_path))
+    elif isinstance(data, list):
+        for index, item in enumerate(data):
+            found.extend(_find_html(item, html_keys, f'{path}[{index}]'))
+    return found
+
+
+def _rebuild_checkpoints(data: Any) -> List[tuple]:
+    """监控会话只保存 dom_recording（基线 + 变化批次），按各检查点重建DOM（返回 [(字段路径, html)]）"""
+    recording = data.get('dom_recording') if isinstance(data, dict) else None
+    if not isinstance(recording, dict):
+        return []
+    segments = {segment['index']: segment for segment in recording.get('segments', [])}
+    found = []
+    for checkpoint in recording.get('checkpoints', []):
+        segment = segments.get(checkpoint.get('segment'))
+        if segment is not None:
+            found.append((f"dom_recording.checkpoints.{checkpoint['label']}",
+                          reconstruct_segment(segment, checkpoint['seq'])))
+    return found
+
+
+def analyze_file(filename: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """分析一个快照文件（.html 或会话JSON中的每份HTML）；在进程池工作进程中运行"""
+    config = config or get_config()
+    result = {'file': str(filename), 'pages': [], 'error': None}
+    try:
+        if str(filename).endswith('.json'):
+            session = load_session(str(filename), lazy=False)
+            pages = _find_html(session, config['html_keys']) + _rebuild_checkpoints(session)
+        else:
+            with open(filename, 'r', encoding='utf-8') as f:
+                pages = [('', f.read())]
+
+        for key, html in pages:
+            page = analyze_html(html)
+            page['key'] = key
+            result['pages'].append(page)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def find_snapshot_files(directory: str, patterns: Optional[List[str]] = None) -> List[str]:
+    """递归查找目录下的快照文件"""
+    patterns = patterns or get_config()['patterns']
+    files = set()
+    for pattern in patterns:
+        files.update(str(path) for path in Path(directory).rglob(pattern) if path.is_file())
+    return sorted(files)
+
+
+def analyze_directory(directory: str, workers: Optional[int] = None,
+                      config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """用进程池并行分析目录下的全部快照（workers=1 时在当前进程顺序执行）"""
+    merged = get_config()
+    if config:
+        merged.update(config)
+    files = find_snapshot_files(directory, merged['patterns'])
+    workers = workers or merged['workers'] or os.cpu_count() or 1
+
+    if workers == 1 or len(files) <= 1:
+        return [analyze_file(filename, merged) for filename in files]
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as executor:
+        return list(executor.map(partial(analyze_file, config=merged), files, chunksize=merged['chunksize']))
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """汇总：页面数、各类候选选择器的命中页面数、配置选择器的命中页面数"""
+    pages = [page for result in results for page in result['pages']]
+    summary = {
+        'files': len(results),
+        'errors': [{'file': result['file'], 'error': result['error']} for result in results if result['error']],
+        'pages': len(pages),
+        'candidates_found': {},
+        'configured_hits': {}
+    }
+    for page in pages:
+        for category, candidates in page['candidate_selectors'].items():
+            summary['candidates_found'][category] = summary['candidates_found'].get(category, 0) + bool(candidates)
+        for key, counts in page['configured_selectors'].items():
+            for selector, count in counts.items():
+                hits = summary['configured_hits'].setdefault(key, {}).setdefault(selector, 0)
+                summary['configured_hits'][key][selector] = hits + bool(count)
+    return summary
@@ -15,6 +15,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from typing import Dict, Any, Optional
 
+from .snapshot_store import SnapshotStore
+from .form_inventory import collect_crawler_elements, CRAWLER_CSS_SELECTORS, CRAWLER_XPATHS
+
 
 class PageCrawler:
     """页面内容爬取器"""
@@ -113,9 +116,24 @@ class PageCrawler:
             return self.page_data
     
     def _crawl_form_elements(self):
-        """爬取所有表单元素"""
+        """爬取所有表单元素（页面内一次调用完成三种查找、分类和去重）"""
         print("🔍 正在爬取表单元素...")
         
+        try:
+            start_time = time.time()
+            self.page_data['form_elements'] = collect_crawler_elements(self.driver)
+            print(f"⚡ 单次调用爬取完成，用时 {(time.time() - start_time) * 1000:.1f}ms")
+            return
+        except Exception as e:
+            print(f"⚠️ 单次调用爬取失败，回退到逐元素爬取: {e}")
+        
+        self._crawl_form_elements_webdriver()
+    
+    def _crawl_form_elements_webdriver(self):
+        """逐元素爬取所有表单元素（单次调用不可用时的回退路径）"""
+        for category in self.page_data['form_elements']:
+            self.page_data['form_elements'][category] = []
+        
         # 方法1: 通过标签名查找
         self._crawl_by_tag_names()
         
@@ -167,25 +185,7 @@ class PageCrawler:
         """方法2: 通过CSS选择器爬取元素"""
         try:
             # 常见的表单选择器
-            selectors = [
-                'input[type="text"]',
-                'input[type="email"]',
-                'input[type="tel"]',
-                'input[type="date"]',
-                'input[type="number"]',
-                'input[type="password"]',
-                'input[type="checkbox"]',
-                'input[type="radio"]',
-                'input[type="submit"]',
-                'input[type="button"]',
-                'button[type="submit"]',
-                'button[class*="submit"]',
-                'button[class*="confirm"]',
-                '.form-control',
-                '.form-input',
-                '.checkbox',
-                '.radio'
-            ]
+            selectors = CRAWLER_CSS_SELECTORS
             
             for selector in selectors:
                 try:
@@ -214,17 +214,7 @@ class PageCrawler:
         """方法3: 通过XPath爬取元素"""
         try:
             # 常见的XPath表达式
-            xpaths = [
-                "//input[@type='text' or @type='email' or @type='tel' or @type='date']",
-                "//input[@type='checkbox']",
-                "//input[@type='radio']",
-                "//button[contains(text(), '제출') or contains(text(), '확인') or contains(text(), '신청')]",
-                "//button[contains(@class, 'submit') or contains(@class, 'confirm')]",
-                "//input[contains(@placeholder, '생년월일') or contains(@placeholder, '전화번호')]",
-                "//input[contains(@name, 'birth') or contains(@name, 'phone') or contains(@name, 'mobile')]",
-                "//textarea",
-                "//select"
-            ]
+            xpaths = CRAWLER_XPATHS
             
             for xpath in xpaths:
                 try:
@@ -309,8 +299,7 @@ class PageCrawler:
             
             filepath = os.path.join(data_dir, filename)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.page_data, f, ensure_ascii=False, indent=2)
+            SnapshotStore(root=os.path.join(data_dir, 'snapshots')).dump_json(self.page_data, filepath)
             
             print(f"📁 页面数据已保存到: {filepath}")
             return filepath
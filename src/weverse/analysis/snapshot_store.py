@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+snapshot_store.py
+快照存储 - HTML快照按内容哈希寻址、压缩存放（zstd，不可用时gzip），
+会话JSON中只保留引用，相同页面跨会话只存一份，读取时按需解压
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional, Union
+
+# 可选：zstd压缩（更快、压缩率更高）
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# 导入快照存储配置
+try:
+    from config.latency_config import get_snapshot_store_config
+    SNAPSHOT_CONFIG_AVAILABLE = True
+except ImportError:
+    SNAPSHOT_CONFIG_AVAILABLE = False
+
+DEFAULT_SNAPSHOT_CONFIG = {
+    'enabled': True,
+    'dir': 'data/snapshots',
+    'codec': 'auto',
+    'level': 6,
+    'min_size': 1024,
+    'text_keys': ['html_content', 'page_source'],
+    'json_keys': ['baseline'],
+}
+
+REF_KEY = 'snapshot_ref'
+CODEC_EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+
+
+def is_snapshot_ref(value: Any) -> bool:
+    """是否为快照引用"""
+    return isinstance(value, dict) and REF_KEY in value
+
+
+class LazySnapshot:
+    """快照引用的惰性视图 - 首次访问 text / value 时才读取并解压"""
+
+    def __init__(self, store: 'SnapshotStore', ref: Dict[str, Any]):
+        self.store = store
+        self.ref = ref
+        self._data: Optional[bytes] = None
+
+    def _load(self) -> bytes:
+        if self._data is None:
+            self._data = self.store.read_bytes(self.ref)
+        return self._data
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def text(self) -> str:
+        return self._load().decode('utf-8')
+
+    @property
+    def value(self) -> Any:
+        """文本快照返回字符串，JSON快照返回解码后的对象"""
+        if self.ref.get('kind') == 'json':
+            return json.loads(self.text)
+        return self.text
+
+    def __len__(self) -> int:
+        return self.ref.get('size', 0)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"LazySnapshot({self.ref[REF_KEY][:12]}, {self.ref.get('size', 0)} bytes)"
+
+
+class SnapshotStore:
+    """内容寻址的压缩快照存储"""
+
+    def __init__(self, root: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.config = dict(DEFAULT_SNAPSHOT_CONFIG)
+        if SNAPSHOT_CONFIG_AVAILABLE:
+            self.config.update(get_snapshot_store_config())
+        if config:
+            self.config.update(config)
+
+        self.enabled = bool(self.config['enabled'])
+        self.root = root or self.config['dir']
+        codec = self.config['codec']
+        if codec == 'auto' or (codec == 'zstd' and not ZSTD_AVAILABLE):
+            codec = 'zstd' if ZSTD_AVAILABLE else 'gzip'
+        self.codec = codec
+        self.stats = {'written': 0, 'deduplicated': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+
+    def _blob_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + CODEC_EXTENSIONS[codec])
+
+    def _find_blob(self, digest: str) -> Optional[tuple]:
+        """查找已有的blob（不同编码写入的同一内容也算命中）"""
+        for codec in CODEC_EXTENSIONS:
+            path = self._blob_path(digest, codec)
+            if os.path.exists(path):
+                return path, codec
+        return None
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=self.config['level']).compress(data)
+        return gzip.compress(data, compresslevel=self.config['level'], mtime=0)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == 'zstd':
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("快照使用zstd压缩，但未安装zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def put(self, content: Union[str, bytes], kind: str = 'text') -> Dict[str, Any]:
+        """
+        写入快照（内容已存在时只返回引用）
+
+        Returns:
+            {'snapshot_ref': sha256, 'codec', 'kind', 'size'}
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        self.stats['raw_bytes'] += len(data)
+
+        existing = self._find_blob(digest)
+        if existing:
+            codec = existing[1]
+            self.stats['deduplicated'] += 1
+        else:
+            codec = self.codec
+            path = self._blob_path(digest, codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = self._compress(data)
+            # 先写临时文件再改名，并发写入同一内容也不会留下半个文件
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            self.stats['written'] += 1
+            self.stats['stored_bytes'] += len(compressed)
+
+        return {REF_KEY: digest, 'codec': codec, 'kind': kind, 'size': len(data)}
+
+    def read_bytes(self, ref: Union[Dict[str, Any], str]) -> bytes:
+        """按引用或哈希读取并解压"""
+        digest = ref[REF_KEY] if isinstance(ref, dict) else ref
+        found = self._find_blob(digest)
+        if not found:
+            raise FileNotFoundError(f"快照不存在: {digest}")
+        path, codec = found
+        with open(path, 'rb') as f:
+            return self._decompress(f.read(), codec)
+
+    def get(self, ref: Union[Dict[str, Any], str]) -> str:
+        """读取文本快照"""
+        return self.read_bytes(ref).decode('utf-8')
+
+    def externalize(self, data: Any) -> Any:
+        """
+        把数据中的大HTML字符串和DOM基线换成快照引用（返回新对象，不修改原数据）
+        """
+        if not self.enabled:
+            return data
+        if isinstance(data, list):
+            return [self.externalize(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+
+        result = {}
+        for key, value in data.items():
+            if key in self.config['text_keys'] and isinstance(value, str) and len(value) >= self.config['min_size']:
+                result[key] = self.put(value)
+            elif key in self.config['json_keys'] and isinstance(value, (dict, list)):
+                result[key] = self.put(json.dumps(value, ensure_ascii=False, sort_keys=True), kind='json')
+            else:
+                result[key] = self.externalize(value)
+        return result
+
+    def resolve(self, data: Any, lazy: bool = True) -> Any:
+        """把快照引用换回内容；lazy=True 时换成 LazySnapshot，访问时才解压"""
+        if is_snapshot_ref(data):
+            snapshot = LazySnapshot(self, data)
+            return snapshot if lazy else snapshot.value
+        if isinstance(data, list):
+            return [self.resolve(item, lazy) for item in data]
+        if isinstance(data, dict):
+            return {key: self.resolve(value, lazy) for key, value in data.items()}
+        return data
+
+    def dump_json(self, data: Any, filename: str, **json_kwargs) -> Dict[str, Any]:
+        """快照外置后写入会话JSON，返回本次写入统计"""
+        before = dict(self.stats)
+        externalized = self.externalize(data)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(externalized, f, ensure_ascii=False, indent=2, **json_kwargs)
+        return {key: self.stats[key] - before[key] for key in self.stats}
+
+
+def load_session(filename: str, lazy: bool = True, store: Optional[SnapshotStore] = None) -> Any:
+    """读取会话JSON并解析其中的快照引用（默认从会话文件同目录的 snapshots/ 读取）"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if store is None:
+        store = SnapshotStore(root=os.path.join(os.path.dirname(filename) or '.', 'snapshots'))
+    return store.resolve(data, lazy)
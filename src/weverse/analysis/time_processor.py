@@ -11,9 +11,10 @@ from datetime import datetime, timedelta
 import pytz
 from typing import Dict, List, Optional, Any, Tuple
 import statistics
-import requests
 from concurrent.futures import ThreadPoolExecutor
 
+from ..network.http_client import get_http_client
+
 # 导入延迟配置
 try:
     from config.latency_config import get_latency_config, get_optimized_preclick_ms
@@ -22,6 +23,16 @@ except ImportError:
     LATENCY_CONFIG_AVAILABLE = False
     print("⚠️ 延迟配置文件不可用，使用默认值")
 
+try:
+    from config.latency_config import get_logging_config
+    LOGGING_CONFIG_AVAILABLE = True
+except ImportError:
+    LOGGING_CONFIG_AVAILABLE = False
+
+from ..core.hot_logging import get_logger, enter_silent_section, exit_silent_section, in_silent_section
+
+countdown_logger = get_logger('countdown')
+
 # 导入新的VPN优化器
 try:
     from ..vpn.shanghai_korea_optimizer import ShanghaiKoreaOptimizer
@@ -117,12 +128,13 @@ def test_real_network_latency(duration: int = 30, test_url: str = "https://www.w
     latencies = []
     start_time = time.time()
     test_count = 0
+    client = get_http_client()  # 长连接复用，测得的是与页面内请求相近的往返延迟
     
     def single_latency_test():
         """单次延迟测试"""
         try:
             test_start = time.perf_counter()
-            response = requests.head(test_url, timeout=5, allow_redirects=False)
+            response = client.head(test_url, timeout=5, allow_redirects=False)
             test_end = time.perf_counter()
             latency = test_end - test_start
             return latency * 1000  # 转换为毫秒
@@ -309,35 +321,55 @@ def show_countdown_with_dynamic_timing(target_time: datetime, enable_latency_tes
     print(f"⚡ 动态提前时间: {recommended_advance_ms:.0f}ms ({recommended_advance_s:.3f}秒)")
     print("=" * 70)
     
+    # 倒计时显示经日志队列输出，最后1秒进入静默关键区，不再做任何终端I/O
+    if LOGGING_CONFIG_AVAILABLE:
+        logging_config = get_logging_config()
+        silent_lead_s = logging_config.get('silent_section_lead_s', 1.0)
+        refresh_s = logging_config.get('countdown_refresh_s', 0.1)
+    else:
+        silent_lead_s = 1.0
+        refresh_s = 0.1
+    last_display = 0.0
+    
     try:
         while True:
             current_time = datetime.now(target_time.tzinfo)
             time_diff = (target_time - current_time).total_seconds()
             
             if time_diff <= 0:
-                print(f"\r🎉 目标时间已到！立即执行！        ")
+                countdown_logger.info("🎉 目标时间已到！立即执行！")
+                enter_silent_section()
                 return 0
             
             # 检查是否到达动态提前点击时间
             if time_diff <= recommended_advance_s:
-                print(f"\r⚡ 动态提前时间到！立即点击！剩余: {time_diff:.3f}秒        ")
+                countdown_logger.info(f"⚡ 动态提前时间到！立即点击！剩余: {time_diff:.3f}秒")
+                enter_silent_section()  # 提前量超过静默提前量时在此进入
                 return recommended_advance_s
             
-            # 显示精确倒计时
-            hours = int(time_diff // 3600)
-            minutes = int((time_diff % 3600) // 60)
-            seconds = time_diff % 60
-            
-            if hours > 0:
-                countdown_str = f"⏳ 倒计时: {hours:02d}:{minutes:02d}:{seconds:06.3f}"
-            else:
-                countdown_str = f"⏳ 倒计时: {minutes:02d}:{seconds:06.3f}"
-            
-            current_str = f"🕐 当前: {current_time.strftime('%H:%M:%S.%f')[:-3]}"
-            target_str = f"🎯 目标: {target_time.strftime('%H:%M:%S.%f')[:-3]}"
-            advance_str = f"⚡ 提前: {recommended_advance_ms:.0f}ms"
-            
-            print(f"\r{countdown_str} | {current_str} | {target_str} | {advance_str}", end="", flush=True)
+            if time_diff <= silent_lead_s:
+                if not in_silent_section():
+                    countdown_logger.info(f"🔇 进入静默关键区（T-{silent_lead_s:.1f}秒），提交完成前只输出错误")
+                    enter_silent_section()
+            elif time.perf_counter() - last_display >= refresh_s:
+                last_display = time.perf_counter()
+                
+                # 显示精确倒计时
+                hours = int(time_diff // 3600)
+                minutes = int((time_diff % 3600) // 60)
+                seconds = time_diff % 60
+                
+                if hours > 0:
+                    countdown_str = f"⏳ 倒计时: {hours:02d}:{minutes:02d}:{seconds:06.3f}"
+                else:
+                    countdown_str = f"⏳ 倒计时: {minutes:02d}:{seconds:06.3f}"
+                
+                current_str = f"🕐 当前: {current_time.strftime('%H:%M:%S.%f')[:-3]}"
+                target_str = f"🎯 目标: {target_time.strftime('%H:%M:%S.%f')[:-3]}"
+                advance_str = f"⚡ 提前: {recommended_advance_ms:.0f}ms"
+                
+                countdown_logger.info(f"{countdown_str} | {current_str} | {target_str} | {advance_str}",
+                                      extra={'inline': True})
             
             # 精确控制更新频率
             if time_diff > 10:
@@ -348,7 +380,8 @@ def show_countdown_with_dynamic_timing(target_time: datetime, enable_latency_tes
                 time.sleep(0.001)
                 
     except KeyboardInterrupt:
-        print(f"\n⏹️ 倒计时被用户中断")
+        exit_silent_section()
+        countdown_logger.warning("⏹️ 倒计时被用户中断")
         return None
     
     return recommended_advance_s
@@ -358,6 +391,7 @@ def show_countdown_with_dynamic_timing(target_time: datetime, enable_latency_tes
 def show_countdown(target_time: datetime) -> None:
     """兼容性接口：显示倒计时"""
     show_countdown_with_dynamic_timing(target_time, enable_latency_test=False)
+    exit_silent_section()
 
 
 def get_time_input():
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+driver_pool.py
+浏览器池 - 有上限的可复用WebDriver池，按需并行冷启动，出错或处理次数用满的浏览器回收重建
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from .setup import setup_driver
+
+
+class PooledDriver:
+    """池中的一个浏览器及其使用计数"""
+
+    def __init__(self, driver: Any, index: int):
+        self.driver = driver
+        self.index = index
+        self.tasks = 0
+
+
+class DriverPool:
+    """有界WebDriver池"""
+
+    def __init__(self, size: int, factory: Optional[Callable[[], Any]] = None,
+                 prepare: Optional[Callable[[Any], None]] = None, max_tasks_per_driver: int = 0):
+        """
+        Args:
+            size: 浏览器数量上限
+            factory: 创建浏览器的函数，默认无头 setup_driver
+            prepare: 新浏览器创建后执行一次（如加载登录cookie）
+            max_tasks_per_driver: 每个浏览器处理多少任务后重建，0 为不限
+        """
+        self.size = size
+        self.factory = factory or (lambda: setup_driver(headless=True))
+        self.prepare = prepare
+        self.max_tasks_per_driver = max_tasks_per_driver
+        self.idle: 'queue.LifoQueue[PooledDriver]' = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.closed = False
+        self.created = 0
+        self.stats = {'created': 0, 'recycled': 0, 'failed_starts': 0}
+
+    def _create(self) -> PooledDriver:
+        with self.lock:
+            self.created += 1
+            index = self.created
+        driver = self.factory()
+        try:
+            if self.prepare:
+                self.prepare(driver)
+        except Exception:
+            self._quit(driver)
+            raise
+        with self.lock:
+            self.stats['created'] += 1
+        return PooledDriver(driver, index)
+
+    @staticmethod
+    def _quit(driver: Any) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self) -> PooledDriver:
+        """取一个空闲浏览器；没有空闲且未达上限时新建（冷启动在调用线程上进行，多个线程可并行启动）"""
+        self.slots.acquire()
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._create()
+        except Exception:
+            with self.lock:
+                self.stats['failed_starts'] += 1
+            self.slots.release()
+            raise
+
+    def release(self, pooled: PooledDriver, healthy: bool = True) -> None:
+        """归还浏览器；出错或用满的浏览器直接关闭，下次 acquire 时重建"""
+        pooled.tasks += 1
+        worn_out = self.max_tasks_per_driver and pooled.tasks >= self.max_tasks_per_driver
+        if not healthy or worn_out or self.closed:
+            self._quit(pooled.driver)
+            with self.lock:
+                self.stats['recycled'] += 1
+        else:
+            self.idle.put(pooled)
+        self.slots.release()
+
+    def close(self) -> None:
+        """关闭全部空闲浏览器"""
+        self.closed = True
+        while True:
+            try:
+                self._quit(self.idle.get_nowait().driver)
+            except queue.Empty:
+                break
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, size=self.size, idle=self.idle.qsize())
@@ -8,6 +8,10 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
+from ..core.hot_logging import get_logger
+
+logger = get_logger('browser')
+
 
 def setup_driver(headless=False):
     """设置并返回Chrome WebDriver，优化反检测功能和网络连接"""
@@ -284,6 +288,8 @@ def click_element_with_fallback(driver, selector, fallback_text=None, timeout=5)
         fallback_text: 备用文本（用于按文本查找）
         timeout: 超时时间
     
+    在T-1秒到提交完成的静默关键区内调用，输出走日志队列，静默期间只显示错误
+    
     Returns:
         bool: 是否点击成功
     """
@@ -299,10 +305,10 @@ def click_element_with_fallback(driver, selector, fallback_text=None, timeout=5)
         try:
             element = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
             element.click()
-            print(f"✅ 使用CSS选择器成功点击: {selector}")
+            logger.info(f"✅ 使用CSS选择器成功点击: {selector}")
             return True
         except (TimeoutException, ElementClickInterceptedException):
-            print(f"⚠️ CSS选择器点击失败: {selector}")
+            logger.warning(f"⚠️ CSS选择器点击失败: {selector}")
         
         # 策略2: 如果有备用文本，使用文本查找
         if fallback_text:
@@ -320,21 +326,21 @@ def click_element_with_fallback(driver, selector, fallback_text=None, timeout=5)
                         element = driver.find_element(By.XPATH, xpath)
                         if element.is_displayed() and element.is_enabled():
                             element.click()
-                            print(f"✅ 使用文本查找成功点击: {fallback_text}")
+                            logger.info(f"✅ 使用文本查找成功点击: {fallback_text}")
                             return True
                     except:
                         continue
             except Exception as text_error:
-                print(f"⚠️ 文本查找点击失败: {text_error}")
+                logger.warning(f"⚠️ 文本查找点击失败: {text_error}")
         
         # 策略3: JavaScript点击
         try:
             element = driver.find_element(By.CSS_SELECTOR, selector)
             driver.execute_script("arguments[0].click();", element)
-            print(f"✅ 使用JavaScript成功点击: {selector}")
+            logger.info(f"✅ 使用JavaScript成功点击: {selector}")
             return True
         except Exception as js_error:
-            print(f"⚠️ JavaScript点击失败: {js_error}")
+            logger.warning(f"⚠️ JavaScript点击失败: {js_error}")
         
         # 策略4: 强制点击（忽略遮挡）
         try:
@@ -344,14 +350,14 @@ def click_element_with_fallback(driver, selector, fallback_text=None, timeout=5)
                 arguments[0].style.display = 'block';
                 arguments[0].click();
             """, element)
-            print(f"✅ 使用强制点击成功: {selector}")
+            logger.info(f"✅ 使用强制点击成功: {selector}")
             return True
         except Exception as force_error:
-            print(f"⚠️ 强制点击失败: {force_error}")
+            logger.warning(f"⚠️ 强制点击失败: {force_error}")
         
-        print(f"❌ 所有点击策略都失败: {selector}")
+        logger.error(f"❌ 所有点击策略都失败: {selector}")
         return False
         
     except Exception as e:
-        print(f"❌ 点击元素失败: {e}")
+        logger.error(f"❌ 点击元素失败: {e}")
         return False
\ No newline at end of file
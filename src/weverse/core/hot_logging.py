@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+hot_logging.py
+热路径日志 - 分级、按模块过滤的日志，经 QueueHandler 交给后台线程格式化和输出，
+热循环里只做一次入队；"静默关键区"期间（T-1秒到提交完成）只放行错误级别
+"""
+
+import sys
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+# 导入日志配置
+try:
+    from config.latency_config import get_logging_config
+    LOGGING_CONFIG_AVAILABLE = True
+except ImportError:
+    LOGGING_CONFIG_AVAILABLE = False
+
+DEFAULT_LOGGING_CONFIG = {
+    'level': 'INFO',
+    'module_levels': {},
+    'queue_size': 10000,
+    'format': '%(message)s',
+    'silent_critical_section': True,
+}
+
+ROOT_LOGGER_NAME = 'weverse'
+
+
+class SilentSectionFilter(logging.Filter):
+    """静默关键区过滤器 - 激活时丢弃 ERROR 以下的记录并计数"""
+
+    def __init__(self):
+        super().__init__()
+        self.active = False
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.active and record.levelno < logging.ERROR:
+            self.suppressed += 1
+            return False
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """队列满时直接丢弃记录并计数（默认的 handleError 会同步打印整段 traceback 到 stderr）"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """终端输出 - extra={'inline': True} 的记录用回车覆盖同一行（倒计时等状态行）"""
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self.inline_pending = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record)
+            if getattr(record, 'inline', False):
+                self.stream.write('\r' + msg)
+                self.inline_pending = True
+            else:
+                if self.inline_pending:
+                    self.stream.write('\n')
+                    self.inline_pending = False
+                self.stream.write(msg + self.terminator)
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class _HotLogging:
+    """进程内唯一的日志队列、后台监听线程和静默过滤器"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.config: Dict[str, Any] = dict(DEFAULT_LOGGING_CONFIG)
+        self.queue: Optional[queue.Queue] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.queue_handler: Optional[DroppingQueueHandler] = None
+        self.silent_filter = SilentSectionFilter()
+
+    def setup(self, config: Optional[Dict[str, Any]] = None, stream=None) -> None:
+        with self.lock:
+            if self.listener is not None:
+                self._stop_locked()
+
+            self.config = dict(DEFAULT_LOGGING_CONFIG)
+            if LOGGING_CONFIG_AVAILABLE:
+                self.config.update(get_logging_config())
+            if config:
+                self.config.update(config)
+
+            # 队列满时 DroppingQueueHandler 丢弃记录并计数，热路径不会被阻塞或输出 traceback
+            self.queue = queue.Queue(maxsize=self.config['queue_size'])
+            stream_handler = ConsoleHandler(stream or sys.stdout)
+            stream_handler.setFormatter(logging.Formatter(self.config['format']))
+            self.listener = logging.handlers.QueueListener(self.queue, stream_handler, respect_handler_level=True)
+
+            self.queue_handler = DroppingQueueHandler(self.queue)
+            self.queue_handler.addFilter(self.silent_filter)
+
+            root = logging.getLogger(ROOT_LOGGER_NAME)
+            root.handlers = [self.queue_handler]
+            root.propagate = False
+            root.setLevel(self.config['level'])
+            for name, level in self.config['module_levels'].items():
+                logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}").setLevel(level)
+
+            self.listener.start()
+
+    def ensure_setup(self) -> None:
+        if self.listener is None:
+            self.setup()
+
+    def flush(self) -> None:
+        """停止监听线程（会先输出完队列中剩余记录）后重新启动"""
+        with self.lock:
+            if self.listener is None:
+                return
+            self.listener.stop()
+            self.listener.start()
+
+    def shutdown(self) -> None:
+        with self.lock:
+            self._stop_locked()
+
+    def _stop_locked(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+
+_state = _HotLogging()
+atexit.register(_state.shutdown)
+
+
+def setup_logging(config: Optional[Dict[str, Any]] = None, stream=None) -> None:
+    """
+    初始化（或按新配置重建）日志队列
+
+    Args:
+        config: 覆盖 LOGGING_CONFIG 的配置项
+        stream: 输出流，默认 sys.stdout
+    """
+    _state.setup(config, stream)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """获取 weverse.<name> 日志器，首次调用时自动初始化"""
+    _state.ensure_setup()
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def flush_logging() -> None:
+    """等待队列中的记录全部输出"""
+    _state.flush()
+
+
+def shutdown_logging() -> None:
+    """输出剩余记录并停止后台线程"""
+    _state.shutdown()
+
+
+def dropped_log_count() -> int:
+    """队列满时被丢弃的记录数"""
+    return _state.queue_handler.dropped if _state.queue_handler else 0
+
+
+def enter_silent_section() -> None:
+    """进入静默关键区：之后只输出 ERROR 及以上"""
+    _state.ensure_setup()
+    if _state.silent_filter.active or not _state.config.get('silent_critical_section', True):
+        return
+    _state.silent_filter.suppressed = 0
+    _state.silent_filter.active = True
+
+
+def exit_silent_section() -> int:
+    """退出静默关键区，返回期间被丢弃的记录数"""
+    was_active = _state.silent_filter.active
+    _state.silent_filter.active = False
+    suppressed = _state.silent_filter.suppressed
+    if was_active and suppressed:
+        logging.getLogger(ROOT_LOGGER_NAME).info(f"🔇 静默关键区结束，期间省略 {suppressed} 条日志")
+    return suppressed
+
+
+def in_silent_section() -> bool:
+    """是否处于静默关键区"""
+    return _state.silent_filter.active
+
+
+@contextmanager
+def silent_section():
+    """静默关键区上下文"""
+    enter_silent_section()
+    try:
+        yield
+    finally:
+        exit_silent_section()
@@ -10,25 +10,32 @@ from datetime import datetime
 from typing import Dict, Any
 
 from config.mode_config import get_time_config, get_button_selectors, get_status_message
-from config.latency_config import get_optimized_preclick_ms
+from config.latency_config import get_optimized_preclick_ms, get_monitoring_config
 from ...analysis.time_processor import show_countdown_with_dynamic_timing
 from config.user_data import get_user_data
 from ...browser.setup import click_element_with_fallback
+from ..hot_logging import get_logger, exit_silent_section
+
+logger = get_logger('application')
 
 
 class ApplicationExecutor:
     """申请执行器"""
     
-    def __init__(self, driver):
+    def __init__(self, driver, network_monitor=None):
         self.driver = driver
+        self.network_monitor = network_monitor
         self.time_config = get_time_config()
         self.button_config = get_button_selectors()
+        self.critical_path_config = get_monitoring_config().get('critical_path_analysis', {})
+        self.click_time = None  # 申请按钮点击完成时间
+        self.form_ready_time = None  # 表单关键元素首次出现时间
     
     def execute_countdown_and_application(self, target_time: datetime, auto_fill_mode: bool) -> bool:
         """执行动态倒计时和申请流程（根据模式选择）"""
         try:
-            print(get_status_message('countdown_start', target_time))
-            print("按 Ctrl+C 可以停止倒计时")
+            logger.info(get_status_message('countdown_start', target_time))
+            logger.info("按 Ctrl+C 可以停止倒计时")
             
             # 启动动态精确倒计时（使用真实网络延迟检测）
             advance_time = show_countdown_with_dynamic_timing(
@@ -37,31 +44,34 @@ class ApplicationExecutor:
             )
             
             if advance_time is None:
-                print("❌ 倒计时被中断")
+                logger.error("❌ 倒计时被中断")
                 return False
             
             # 根据模式选择执行不同流程
             if auto_fill_mode:
-                print("🤖 执行自动填写模式...")
+                logger.info("🤖 执行自动填写模式...")
                 results = self._execute_auto_fill_mode(advance_time)
             else:
-                print("👁️ 执行监控模式...")
+                logger.info("👁️ 执行监控模式...")
                 results = self._execute_monitoring_mode(advance_time)
             
             return results.get('success', False)
             
         except KeyboardInterrupt:
-            print(get_status_message('countdown_stop'))
+            logger.info(get_status_message('countdown_stop'))
             return False
         except Exception as e:
-            print(f"❌ 动态倒计时和申请执行失败: {e}")
+            logger.error(f"❌ 动态倒计时和申请执行失败: {e}")
             return False
+        finally:
+            # 倒计时在T-1秒进入静默关键区，任何退出路径都要恢复输出
+            exit_silent_section()
     
     def _execute_auto_fill_mode(self, advance_time: float) -> Dict[str, Any]:
         """执行自动填写模式 - 纯粹的表单填写，不捕获任何数据"""
-        print(get_status_message('application_start'))
-        print(f"⚡ 使用动态计算的提前时间: {advance_time:.3f}秒")
-        print("🎯 全自动填写模式 - 专注于任务完成，不捕获数据")
+        logger.info(get_status_message('application_start'))
+        logger.info(f"⚡ 使用动态计算的提前时间: {advance_time:.3f}秒")
+        logger.info("🎯 全自动填写模式 - 专注于任务完成，不捕获数据")
         
         application_start = time.time()
         
@@ -77,13 +87,14 @@ class ApplicationExecutor:
             # 步骤2: 快速检测页面跳转（最多等待0.5秒）
             page_ready = self._quick_page_transition_detection()
             if not page_ready:
-                print("⚠️ 页面跳转检测超时，直接尝试表单填写")
+                logger.warning("⚠️ 页面跳转检测超时，直接尝试表单填写")
             
             # 步骤3: 纯粹的表单填写（不捕获数据）
-            print("⚡ 启动闪电表单填写...")
+            logger.info("⚡ 启动闪电表单填写...")
             form_result = self._pure_form_filling()
             
             total_time = (time.time() - application_start) * 1000
+            exit_silent_section()  # 提交已完成，恢复正常输出
             
             results = {
                 'success': form_result.get('success', False),
@@ -100,15 +111,19 @@ class ApplicationExecutor:
                 }
             }
             
-            print(f"🎉 自动填写模式完成!")
-            print(f"   总耗时: {total_time:.1f}ms")
-            print(f"   表单处理: {form_result.get('processing_time', 0) * 1000:.1f}ms")
-            print(f"   目标达成: {'✅ 是' if total_time <= 500 else '❌ 否'}")
+            logger.info(f"🎉 自动填写模式完成!")
+            logger.info(f"   总耗时: {total_time:.1f}ms")
+            logger.info(f"   表单处理: {form_result.get('processing_time', 0) * 1000:.1f}ms")
+            logger.info(f"   目标达成: {'✅ 是' if total_time <= 500 else '❌ 否'}")
+            
+            # 提交完成后再做关键路径分析，不占用抢票时间
+            if self.critical_path_config.get('enabled'):
+                results['critical_path'] = self._analyze_critical_path()
             
             return results
             
         except Exception as e:
-            print(f"❌ 自动填写模式执行失败: {e}")
+            logger.error(f"❌ 自动填写模式执行失败: {e}")
             return {'success': False, 'error': str(e)}
     
     def _pure_form_filling(self) -> Dict[str, Any]:
@@ -130,7 +145,7 @@ class ApplicationExecutor:
             return result
             
         except Exception as e:
-            print(f"❌ 纯粹表单填写失败: {e}")
+            logger.error(f"❌ 纯粹表单填写失败: {e}")
             return {
                 'success': False,
                 'error': str(e),
@@ -139,8 +154,8 @@ class ApplicationExecutor:
     
     def _execute_monitoring_mode(self, advance_time: float) -> Dict[str, Any]:
         """执行监控模式 - 只点击申请按钮，然后返回让监控处理器处理"""
-        print(f"⚡ 使用动态计算的提前时间: {advance_time:.3f}秒")
-        print("🔘 点击申请按钮...")
+        logger.info(f"⚡ 使用动态计算的提前时间: {advance_time:.3f}秒")
+        logger.info("🔘 点击申请按钮...")
         
         application_start = time.time()
         
@@ -150,11 +165,12 @@ class ApplicationExecutor:
             fallback_text = self.button_config['fallback_texts'][0]
             
             click_result = self._click_core_button_instantly(core_selector, fallback_text)
+            exit_silent_section()  # 监控模式由用户手动提交，点击后即恢复输出
             if not click_result.get('success'):
                 return {'success': False, 'error': '申请按钮点击失败'}
             
-            print("✅ 申请按钮点击成功!")
-            print("📱 表单页面已打开")
+            logger.info("✅ 申请按钮点击成功!")
+            logger.info("📱 表单页面已打开")
             
             total_time = (time.time() - application_start) * 1000
             
@@ -167,7 +183,7 @@ class ApplicationExecutor:
             }
             
         except Exception as e:
-            print(f"❌ 监控模式执行失败: {e}")
+            logger.error(f"❌ 监控模式执行失败: {e}")
             return {'success': False, 'error': str(e)}
     
     def _click_core_button_instantly(self, selector: str, fallback_text: str) -> Dict[str, Any]:
@@ -181,8 +197,9 @@ class ApplicationExecutor:
                 fallback_text=fallback_text,
                 timeout=5
             )
+            self.click_time = time.time()
             
-            click_time = (time.time() - click_start) * 1000  # 毫秒
+            click_time = (self.click_time - click_start) * 1000  # 毫秒
             
             return {
                 'success': success,
@@ -193,16 +210,38 @@ class ApplicationExecutor:
             
         except Exception as e:
             click_time = (time.time() - click_start) * 1000
-            print(f"❌ 按钮点击失败: {e}")
+            logger.error(f"❌ 按钮点击失败: {e}")
             return {
                 'success': False,
                 'error': str(e),
                 'click_time_ms': click_time
             }
     
+    def _analyze_critical_path(self) -> Dict[str, Any]:
+        """分析点击申请到生日输入框出现之间的关键请求链"""
+        if not self.click_time:
+            return {}
+        
+        try:
+            from config.form_selectors import get_form_selectors
+            from ...network.critical_path import analyze_post_click_path
+            
+            logger.info("\n🔗 分析点击后关键路径...")
+            return analyze_post_click_path(
+                self.driver,
+                self.click_time,
+                self.form_ready_time,
+                network_monitor=self.network_monitor,
+                form_selector=get_form_selectors()['birth_date'],
+                save=self.critical_path_config.get('save_report', True)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 关键路径分析失败: {e}")
+            return {'error': str(e)}
+    
     def _quick_page_transition_detection(self) -> bool:
         """超高频智能页面跳转检测 - 0.05秒检测，一发现元素立即开始填写"""
-        print("🔄 启动超高频智能检测 - 0.05秒间隔，一发现元素立即填写...")
+        logger.info("🔄 启动超高频智能检测 - 0.05秒间隔，一发现元素立即填写...")
         
         start_time = time.time()
         max_wait = 3.0  # 最多等待3秒（应对网络延迟）
@@ -215,9 +254,9 @@ class ApplicationExecutor:
         try:
             # 记录初始URL
             initial_url = self.driver.current_url
-            print(f"📍 初始URL: {initial_url}")
-            print(f"🎯 主要目标: 生日输入框 {selectors['birth_date']}")
-            print(f"🚀 策略: 一发现任何表单元素立即开始填写")
+            logger.info(f"📍 初始URL: {initial_url}")
+            logger.info(f"🎯 主要目标: 生日输入框 {selectors['birth_date']}")
+            logger.info(f"🚀 策略: 一发现任何表单元素立即开始填写")
             
             check_count = 0
             elements_found = False
@@ -230,11 +269,11 @@ class ApplicationExecutor:
                 
                 # 每20次检测显示一次进度（约1秒）
                 if check_count % 20 == 0:
-                    print(f"🔍 检测中... {current_time:.1f}s (第{check_count}次检测，频率:{1/check_interval:.0f}Hz)")
+                    logger.info(f"🔍 检测中... {current_time:.1f}s (第{check_count}次检测，频率:{1/check_interval:.0f}Hz)")
                 
                 # 1. 检测URL变化（可能的页面跳转）
                 if current_url != initial_url:
-                    print(f"✅ URL变化: {initial_url} → {current_url}")
+                    logger.info(f"✅ URL变化: {initial_url} → {current_url}")
                     # URL变化后，给DOM一点时间加载，然后立即检测元素
                     time.sleep(0.02)  # 20ms等待DOM更新
                 
@@ -242,8 +281,9 @@ class ApplicationExecutor:
                 try:
                     birth_input = self.driver.find_element("css selector", selectors['birth_date'])
                     if birth_input and birth_input.is_displayed() and birth_input.is_enabled():
-                        print(f"🎉 关键元素已出现! 生日输入框 (第{check_count}次检测，{current_time:.1f}s)")
-                        print(f"⚡ 立即启动表单填写，无需等待其他元素...")
+                        self.form_ready_time = time.time()
+                        logger.info(f"🎉 关键元素已出现! 生日输入框 (第{check_count}次检测，{current_time:.1f}s)")
+                        logger.info(f"⚡ 立即启动表单填写，无需等待其他元素...")
                         elements_found = True
                         break
                 except:
@@ -255,8 +295,8 @@ class ApplicationExecutor:
                     try:
                         phone_input = self.driver.find_element("css selector", selectors['phone_number'])
                         if phone_input and phone_input.is_displayed() and phone_input.is_enabled():
-                            print(f"🎉 备选元素已出现! 手机号输入框 (第{check_count}次检测，{current_time:.1f}s)")
-                            print(f"⚡ 立即启动表单填写...")
+                            logger.info(f"🎉 备选元素已出现! 手机号输入框 (第{check_count}次检测，{current_time:.1f}s)")
+                            logger.info(f"⚡ 立即启动表单填写...")
                             elements_found = True
                             break
                     except:
@@ -266,8 +306,8 @@ class ApplicationExecutor:
                     try:
                         submit_btn = self.driver.find_element("css selector", selectors['submit_button_selectors'][0])
                         if submit_btn and submit_btn.is_displayed() and submit_btn.is_enabled():
-                            print(f"🎉 提交按钮已出现! (第{check_count}次检测，{current_time:.1f}s)")
-                            print(f"⚡ 立即启动表单填写...")
+                            logger.info(f"🎉 提交按钮已出现! (第{check_count}次检测，{current_time:.1f}s)")
+                            logger.info(f"⚡ 立即启动表单填写...")
                             elements_found = True
                             break
                     except:
@@ -279,8 +319,8 @@ class ApplicationExecutor:
                         # 检测是否有任何form元素出现
                         form_element = self.driver.find_element("tag name", "form")
                         if form_element and form_element.is_displayed():
-                            print(f"🔥 激进模式: 检测到form元素! (第{check_count}次检测，{current_time:.1f}s)")
-                            print(f"⚡ 尝试启动表单填写...")
+                            logger.info(f"🔥 激进模式: 检测到form元素! (第{check_count}次检测，{current_time:.1f}s)")
+                            logger.info(f"⚡ 尝试启动表单填写...")
                             elements_found = True
                             break
                     except:
@@ -290,17 +330,17 @@ class ApplicationExecutor:
                 time.sleep(check_interval)
             
             if elements_found:
-                print(f"🎉 检测成功! 总检测次数: {check_count}, 耗时: {time.time() - start_time:.2f}s")
-                print(f"📊 检测频率: {check_count/(time.time() - start_time):.1f} 次/秒")
+                logger.info(f"🎉 检测成功! 总检测次数: {check_count}, 耗时: {time.time() - start_time:.2f}s")
+                logger.info(f"📊 检测频率: {check_count/(time.time() - start_time):.1f} 次/秒")
                 return True
             else:
-                print(f"⚠️ 检测超时 ({max_wait}秒，共检测{check_count}次)")
-                print("🔥 强制启动表单填写（可能元素已存在但检测失败）...")
+                logger.warning(f"⚠️ 检测超时 ({max_wait}秒，共检测{check_count}次)")
+                logger.info("🔥 强制启动表单填写（可能元素已存在但检测失败）...")
                 return False
             
         except Exception as e:
-            print(f"❌ 检测过程异常: {e}")
-            print("🔥 发生异常，强制启动表单填写...")
+            logger.error(f"❌ 检测过程异常: {e}")
+            logger.info("🔥 发生异常，强制启动表单填写...")
             import traceback
             traceback.print_exc()
             return False
\ No newline at end of file
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+async_monitor.py
+异步监控循环 - 在一个asyncio事件循环上同时等待终端输入、页面事件（用户操作、DOM变化、
+网络请求完成、页面跳转）和心跳，事件到达立即处理，没有固定的轮询间隔
+"""
+
+import sys
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+DEFAULT_EVENT_LOOP_CONFIG = {
+    'max_wait_ms': 1000,
+    'coalesce_ms': 30,
+    'error_backoff_s': 0.5,
+}
+
+# 页面内等待下一个事件：跟踪器和DOM观察器通过 window.__monitorWake 通知，
+# 网络请求完成由 PerformanceObserver 感知；同一波事件在 coalesce 窗口内合并返回
+WAIT_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var cursor = arguments[0], domCount = arguments[1], timeoutMs = arguments[2], coalesceMs = arguments[3];
+var settled = false, pending = false, reasons = [], observer = null, deadline = null;
+
+function onHide() { wake('navigation', true); }
+function onNavigate() { wake('navigation'); }
+
+function settle() {
+    if (settled) return;
+    settled = true;
+    clearTimeout(deadline);
+    if (observer) observer.disconnect();
+    window.removeEventListener('pagehide', onHide);
+    window.removeEventListener('popstate', onNavigate);
+    window.removeEventListener('hashchange', onNavigate);
+    if (window.__monitorWake === wake) window.__monitorWake = null;
+    done({reasons: reasons, href: location.href});
+}
+
+function wake(reason, immediate) {
+    if (settled) return;
+    if (reasons.indexOf(reason) < 0) reasons.push(reason);
+    if (immediate) { settle(); return; }
+    if (!pending) { pending = true; setTimeout(settle, coalesceMs); }
+}
+
+if (typeof window.recordUserAction !== 'function') {
+    reasons.push('no_tracker');
+    settle();
+    return;
+}
+
+window.__monitorWake = wake;
+window.addEventListener('pagehide', onHide);
+window.addEventListener('popstate', onNavigate);
+window.addEventListener('hashchange', onNavigate);
+try {
+    observer = new PerformanceObserver(function () { wake('network'); });
+    observer.observe({type: 'resource'});
+} catch (e) {
+    observer = null;
+}
+deadline = setTimeout(function () { wake('timeout', true); }, timeoutMs);
+
+// 等待开始前已经发生的事件
+if ((window.actionId || 0) > cursor) wake('action');
+if (window.__domWatch && window.__domWatch.count > domCount) wake('dom');
+"""
+
+
+class AsyncMonitorLoop:
+    """基于asyncio的多路复用监控循环"""
+
+    def __init__(self, handler, config: Optional[Dict[str, Any]] = None, stdin=None):
+        self.handler = handler
+        self.config = dict(DEFAULT_EVENT_LOOP_CONFIG)
+        if config:
+            self.config.update(config)
+        self.stdin = stdin or sys.stdin
+        self.stop_event: Optional[asyncio.Event] = None
+        # 所有WebDriver命令都在同一个线程上串行执行，避免并发命令互相阻塞
+        self.driver_lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix='webdriver')
+        self.stats = {'wakes': 0, 'ticks': 0, 'errors': 0, 'reasons': {}}
+
+    def wait_for_page_event(self) -> Dict[str, Any]:
+        """在页面内阻塞等待下一个事件（运行在WebDriver线程上）"""
+        try:
+            result = self.handler.driver.execute_async_script(
+                WAIT_SCRIPT,
+                self.handler.action_cursor,
+                self.handler.dom_watcher.last_count,
+                self.config['max_wait_ms'],
+                self.config['coalesce_ms']
+            )
+            return result or {'reasons': ['timeout']}
+        except Exception as e:
+            # 等待期间页面卸载，脚本结果丢失
+            return {'reasons': ['navigation'], 'error': str(e)}
+
+    def _watch_stdin(self, loop: asyncio.AbstractEventLoop) -> None:
+        """终端输入可读时结束监控；不支持 add_reader 时用一个阻塞读线程"""
+        def on_readable():
+            self.stdin.readline()
+            loop.remove_reader(self.stdin)
+            self.stop_event.set()
+
+        try:
+            loop.add_reader(self.stdin, on_readable)
+        except (NotImplementedError, ValueError, OSError, AttributeError):
+            future = loop.run_in_executor(None, self.stdin.readline)
+            future.add_done_callback(lambda _: self.stop_event.set())
+
+    async def run(self) -> Dict[str, Any]:
+        """运行直到用户按回车"""
+        loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        self._watch_stdin(loop)
+        stop_task = asyncio.ensure_future(self.stop_event.wait())
+        consecutive_errors = 0
+
+        try:
+            while not self.stop_event.is_set():
+                wait_task = loop.run_in_executor(self.driver_lane, self.wait_for_page_event)
+                await asyncio.wait({wait_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+
+                # 用户结束时页面等待最多再持续一个心跳，取回结果后做最后一次处理
+                event = await wait_task
+                reasons = event.get('reasons', [])
+                self.stats['wakes'] += 1
+                for reason in reasons:
+                    self.stats['reasons'][reason] = self.stats['reasons'].get(reason, 0) + 1
+
+                try:
+                    await loop.run_in_executor(self.driver_lane, self.handler._process_monitor_tick, reasons)
+                    self.stats['ticks'] += 1
+                    consecutive_errors = 0
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    consecutive_errors += 1
+                    self.handler._report_monitor_error(e)
+                    if consecutive_errors > 1:
+                        await asyncio.sleep(self.config['error_backoff_s'])
+
+                # 跟踪器缺失时页面内等待会立即返回；本次处理已尝试重新注入，退避后再等，避免空转占满CPU和chromedriver
+                if reasons == ['no_tracker']:
+                    await asyncio.wait({stop_task}, timeout=self.config['error_backoff_s'])
+        finally:
+            stop_task.cancel()
+            try:
+                loop.remove_reader(self.stdin)
+            except Exception:
+                pass
+            self.driver_lane.shutdown(wait=True)
+
+        return self.stats
+
+
+def run_monitor_loop(handler, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """同步入口：运行异步监控循环直到用户按回车"""
+    driver = handler.driver
+    loop_config = dict(DEFAULT_EVENT_LOOP_CONFIG)
+    if config:
+        loop_config.update(config)
+
+    # 页面内等待最长 max_wait_ms，脚本超时要留出余量
+    previous_timeout = None
+    try:
+        previous_timeout = driver.timeouts.script
+    except Exception:
+        pass
+    driver.set_script_timeout(loop_config['max_wait_ms'] / 1000 + 5)
+
+    started = time.time()
+    try:
+        stats = asyncio.run(AsyncMonitorLoop(handler, loop_config).run())
+    finally:
+        if previous_timeout is not None:
+            driver.set_script_timeout(previous_timeout)
+    stats['duration_s'] = time.time() - started
+    return stats
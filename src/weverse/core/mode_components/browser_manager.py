@@ -14,6 +14,13 @@ from config.mode_config import get_browser_config, get_network_monitor_config, g
 from ...browser.setup import setup_driver, create_wait
 from ...auth.login_handler import click_login_button_only, click_confirm_login_button, wait_for_manual_login
 
+# 导入资源拦截配置
+try:
+    from config.latency_config import get_request_blocking_config
+    BLOCKING_CONFIG_AVAILABLE = True
+except ImportError:
+    BLOCKING_CONFIG_AVAILABLE = False
+
 
 class BrowserManager:
     """浏览器管理器"""
@@ -22,6 +29,7 @@ class BrowserManager:
         self.driver: Optional[Any] = None
         self.wait: Optional[Any] = None
         self.network_monitor: Optional[Any] = None
+        self.request_blocker: Optional[Any] = None
         self.browser_config = get_browser_config()
         self.network_config = get_network_monitor_config()
     
@@ -30,12 +38,26 @@ class BrowserManager:
         try:
             self.driver = setup_driver()
             self.wait = create_wait(self.driver, self.browser_config['page_load_wait'])
+            self._apply_request_blocking()
             print("✅ 浏览器初始化成功")
             return True
         except Exception as e:
             print(f"❌ 浏览器初始化失败: {e}")
             return False
     
+    def _apply_request_blocking(self) -> None:
+        """按配置拦截非必要资源（字体、统计、追踪、媒体、第三方脚本）"""
+        if not BLOCKING_CONFIG_AVAILABLE or not get_request_blocking_config().get('enabled'):
+            return
+        
+        try:
+            from ...network.request_blocking import RequestBlocker
+            self.request_blocker = RequestBlocker(self.driver)
+            patterns = self.request_blocker.apply()
+            print(f"🚫 已拦截非必要资源: {self.request_blocker.profile_name} ({len(patterns)} 条规则)")
+        except Exception as e:
+            print(f"⚠️ 资源拦截设置失败，继续执行: {e}")
+    
     def initialize_network_monitor(self, enable_monitor: bool = False) -> bool:
         """初始化网络监控（如果启用）"""
         if not enable_monitor:
@@ -6,13 +6,26 @@ content_analyzer.py
 """
 
 import json
+from concurrent.futures import Future
 from typing import Dict, Optional, Tuple, Any
 
 from config.mode_config import get_status_message
 from ...analysis.content_extractor import extract_article_content
 from ...analysis.time_processor import extract_time_info
-from ...ai.analyzer import analyze_with_ai, extract_time_with_ai
 from ...analysis.data_saver import save_analysis
+from ...ai.analyzer import analyze_with_ai, extract_time, submit_analysis
+
+# 导入并发配置
+try:
+    from config.ai_config import AI_CONCURRENCY_CONFIG
+    AI_CONCURRENCY_CONFIG_AVAILABLE = True
+except ImportError:
+    AI_CONCURRENCY_CONFIG_AVAILABLE = False
+
+DEFAULT_AI_CONCURRENCY_CONFIG = {
+    'concurrent_analysis': True,
+    'analysis_wait_timeout_s': 120,
+}
 
 
 class ContentAnalyzer:
@@ -21,9 +34,20 @@ class ContentAnalyzer:
     def __init__(self, driver: Any, wait: Any):
         self.driver = driver
         self.wait = wait
+        self.config = dict(DEFAULT_AI_CONCURRENCY_CONFIG)
+        if AI_CONCURRENCY_CONFIG_AVAILABLE:
+            self.config.update(AI_CONCURRENCY_CONFIG)
+        self.analysis_future: Optional[Future] = None
+        self.analysis_context: Optional[Tuple[str, Optional[Dict]]] = None  # 后台分析对应的正文和时间信息
     
     def analyze_page_content(self) -> Tuple[Optional[str], Optional[Dict], Optional[str]]:
-        """分析页面内容"""
+        """
+        分析页面内容
+        
+        并发模式下完整AI分析与时间提取同时发出，时间信息一到就返回，
+        此时分析结果为 None；后台线程不做任何输出（可能正处于倒计时或静默关键区），
+        结果在 wait_for_analysis 中打印并保存
+        """
         try:
             # 提取文章内容
             print(get_status_message('content_extracting'))
@@ -35,9 +59,16 @@ class ContentAnalyzer:
             
             print(get_status_message('content_extracted', len(article_content)))
             
-            # 使用AI提取时间信息
+            concurrent = self.config.get('concurrent_analysis', True)
+            if concurrent:
+                # 完整分析不依赖时间结果，先在后台发出
+                print(get_status_message('ai_analyzing'))
+                self.analysis_context = None
+                self.analysis_future = submit_analysis(article_content)
+            
+            # 提取时间信息（规则解析置信度不足时使用AI）
             print(get_status_message('ai_time_analyzing'))
-            ai_time_data = extract_time_with_ai(article_content)
+            ai_time_data = extract_time(article_content)
             
             # 备用方案：传统时间提取
             time_info = None
@@ -45,6 +76,11 @@ class ContentAnalyzer:
                 print("⚠️ AI时间提取失败，使用传统正则表达式方法...")
                 time_info = extract_time_info(article_content)
             
+            if concurrent:
+                time_data = ai_time_data or time_info
+                self.analysis_context = (article_content, time_data)
+                return article_content, time_data, None
+            
             # AI分析
             print(get_status_message('ai_analyzing'))
             analysis_result = analyze_with_ai(article_content, time_info)
@@ -61,6 +97,30 @@ class ContentAnalyzer:
             print(f"❌ 内容分析失败: {e}")
             return None, None, None
     
+    def wait_for_analysis(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        等待后台AI分析完成，在调用线程打印并保存结果（结束前调用），超时或失败返回 None
+        """
+        if self.analysis_future is None:
+            return None
+        if timeout is None:
+            timeout = self.config.get('analysis_wait_timeout_s', 120)
+        try:
+            analysis_result = self.analysis_future.result(timeout=timeout)
+        except Exception as e:
+            print(f"⚠️ 后台AI分析未完成: {e}")
+            return None
+
+        # 只打印和保存一次
+        context, self.analysis_context = self.analysis_context, None
+        if analysis_result and context:
+            article_content, time_info = context
+            print("\n📊 AI分析结果（后台完成）:")
+            print(analysis_result)
+            self._save_analysis_data(article_content, analysis_result, time_info)
+            print("\n💾 分析结果已保存")
+        return analysis_result
+    
     def _save_analysis_data(self, article_content: str, analysis_result: str, time_info: Optional[Dict]) -> None:
         """保存分析数据"""
         try:
@@ -10,6 +10,8 @@ import os
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from ...analysis.snapshot_store import SnapshotStore, load_session
+
 
 class DataManager:
     """数据管理器"""
@@ -17,6 +19,7 @@ class DataManager:
     def __init__(self):
         self.data_dir = "data"
         self._ensure_data_directory()
+        self.snapshot_store = SnapshotStore(root=os.path.join(self.data_dir, 'snapshots'))
     
     def _ensure_data_directory(self) -> None:
         """确保数据目录存在"""
@@ -42,8 +45,7 @@ class DataManager:
                 'monitoring_data': monitoring_data
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
+            self.snapshot_store.dump_json(save_data, filename)
             
             print(f"📁 监控数据已保存到: {filename}")
             return filename
@@ -74,8 +76,7 @@ class DataManager:
                 'application_results': application_results
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(unified_data, f, ensure_ascii=False, indent=2)
+            self.snapshot_store.dump_json(unified_data, filename)
             
             print(f"📁 申请数据已保存到: {filename}")
             return filename
@@ -90,8 +91,7 @@ class DataManager:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = os.path.join(self.data_dir, f"unified_session_{timestamp}.json")
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, ensure_ascii=False, indent=2)
+            self.snapshot_store.dump_json(session_data, filename)
             
             print(f"📁 会话数据已保存到: {filename}")
             return filename
@@ -130,7 +130,7 @@ class DataManager:
             
             # 文件大小
             try:
-                data_size = len(json.dumps(data, ensure_ascii=False))
+                data_size = len(json.dumps(data, ensure_ascii=False, default=lambda v: getattr(v, 'ref', str(v))))
                 print(f"   📏 数据大小: {data_size} 字符")
             except:
                 pass
@@ -156,8 +156,7 @@ class DataManager:
             # 按修改时间排序，获取最新的文件
             latest_file = max(files, key=lambda x: x[1])[0]
             
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_session(latest_file, store=self.snapshot_store)
             
             print(f"📁 已加载最新数据: {latest_file}")
             return data
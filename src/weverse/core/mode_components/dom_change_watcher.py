@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dom_change_watcher.py
+DOM变化监视器 - 页面内MutationObserver维护变化计数和摘要，
+监控循环每次只读取一个整数，检测到变化后才获取完整页面源码
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+# 导入监控配置
+try:
+    from config.latency_config import get_monitoring_config
+    MONITORING_CONFIG_AVAILABLE = True
+except ImportError:
+    MONITORING_CONFIG_AVAILABLE = False
+
+DEFAULT_DOM_TRACKING_CONFIG = {
+    'enabled': True,
+    'max_subtrees': 20,
+    'capture_page_source': True,
+}
+
+# 安装观察器：同一文档重复注入时保留已有计数
+INSTALL_SCRIPT = """
+var maxSubtrees = arguments[0];
+var w = window.__domWatch;
+if (w && w.observer) { return w.count; }
+
+w = window.__domWatch = {count: 0, digest: 2166136261, subtrees: []};
+
+function describe(node) {
+    if (!node || node.nodeType !== 1) return '#text';
+    var desc = node.tagName.toLowerCase();
+    if (node.id) return desc + '#' + node.id;
+    if (typeof node.className === 'string' && node.className.trim()) {
+        desc += '.' + node.className.trim().split(/\\s+/).slice(0, 2).join('.');
+    }
+    return desc;
+}
+
+// FNV-1a 滚动摘要：相同计数下区分不同的变化序列
+function mix(hash, text) {
+    for (var i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 16777619) >>> 0;
+    }
+    return hash;
+}
+
+w.observer = new MutationObserver(function (records) {
+    for (var i = 0; i < records.length; i++) {
+        var r = records[i];
+        var target = r.target.nodeType === 1 ? r.target : r.target.parentElement;
+        var key = describe(target);
+        w.count++;
+        w.digest = mix(w.digest, r.type + '|' + key + '|' + r.addedNodes.length + '|' +
+                                 r.removedNodes.length + '|' + (r.attributeName || ''));
+        if (maxSubtrees > 0) {
+            w.subtrees.push({
+                seq: w.count, type: r.type, target: key,
+                added: r.addedNodes.length, removed: r.removedNodes.length,
+                attribute: r.attributeName || null
+            });
+            if (w.subtrees.length > maxSubtrees) w.subtrees.shift();
+        }
+    }
+    // 唤醒正在等待页面事件的监控循环
+    if (window.__monitorWake) window.__monitorWake('dom');
+});
+w.observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+return 0;
+"""
+
+# 轮询：无变化时只返回计数；观察器不存在（页面已跳转）返回null
+POLL_SCRIPT = """
+var w = window.__domWatch;
+if (!w || !w.observer) return null;
+var since = arguments[0];
+if (w.count === since) return w.count;
+return {
+    count: w.count,
+    digest: w.digest,
+    subtrees: w.subtrees.filter(function (s) { return s.seq > since; })
+};
+"""
+
+
+class DomChangeWatcher:
+    """DOM变化监视器"""
+
+    def __init__(self, driver, config: Optional[Dict[str, Any]] = None):
+        self.driver = driver
+        self.config = dict(DEFAULT_DOM_TRACKING_CONFIG)
+        if MONITORING_CONFIG_AVAILABLE:
+            self.config.update(get_monitoring_config().get('dom_change_tracking', {}))
+        if config:
+            self.config.update(config)
+
+        self.enabled = bool(self.config['enabled'])
+        self.last_count = 0
+        self.installs = 0
+
+    def install(self) -> bool:
+        """注入观察器（页面跳转后需重新注入）"""
+        if not self.enabled:
+            return False
+        try:
+            self.last_count = int(self.driver.execute_script(INSTALL_SCRIPT, self.config['max_subtrees']) or 0)
+            self.installs += 1
+            return True
+        except Exception as e:
+            print(f"⚠️ DOM变化观察器注入失败: {e}")
+            return False
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """
+        检查是否有DOM变化
+
+        Returns:
+            无变化返回None，有变化返回变化记录
+        """
+        if not self.enabled:
+            return None
+
+        result = self.driver.execute_script(POLL_SCRIPT, self.last_count)
+        if result is None:
+            # 新文档没有观察器，重新注入，变化从下一次轮询开始计
+            self.install()
+            return None
+        if isinstance(result, (int, float)):
+            return None
+
+        change = {
+            'timestamp': datetime.now().isoformat(),
+            'mutation_count': result['count'],
+            'new_mutations': result['count'] - self.last_count,
+            'digest': format(int(result['digest']), '08x'),
+            'subtrees': result.get('subtrees', [])
+        }
+        self.last_count = result['count']
+
+        if self.config['capture_page_source']:
+            page_source = self.driver.page_source
+            change['page_source_length'] = len(page_source)
+            change['page_source_hash'] = hashlib.md5(page_source.encode('utf-8')).hexdigest()
+
+        return change
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dom_diff_recorder.py
+DOM增量记录器 - 每个文档只取一次基线快照，之后只记录变化（子节点增删、属性、文本），
+可重建任意记录点的DOM，替代各阶段重复保存完整页面源码
+"""
+
+import copy
+import json
+import html
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+# 导入监控配置
+try:
+    from config.latency_config import get_monitoring_config
+    MONITORING_CONFIG_AVAILABLE = True
+except ImportError:
+    MONITORING_CONFIG_AVAILABLE = False
+
+DEFAULT_DOM_RECORDING_CONFIG = {
+    'enabled': True,
+    'max_pending_batches': 2000,
+}
+
+# 节点格式: 元素 {i, t, a: {属性}, c: [子节点]}，文本 {i, x}
+# 变化批次: {s: 序号, ts: 毫秒时间戳, ops: [...]}，一个批次对应一次MutationObserver回调，
+#   {o:'c', i, c:[子节点或 {r: 已有节点id}]} 子节点列表替换
+#   {o:'a', i, n, v} 属性变化（v为null表示删除）
+#   {o:'t', i, v} 文本变化
+# 返回基线；同一文档重复注入时重新取基线，已有节点id保持不变
+INSTALL_SCRIPT = """
+var maxPending = arguments[0];
+var r = window.__domRec;
+if (!r) {
+    r = window.__domRec = {ids: new WeakMap(), nextId: 1, seq: 0, batches: [], lost: false};
+}
+
+function idOf(node) {
+    var id = r.ids.get(node);
+    if (!id) { id = r.nextId++; r.ids.set(node, id); }
+    return id;
+}
+
+function ser(node) {
+    if (node.nodeType === 3) return {i: idOf(node), x: node.data};
+    if (node.nodeType !== 1) return null;
+    var attrs = {};
+    for (var k = 0; k < node.attributes.length; k++) {
+        attrs[node.attributes[k].name] = node.attributes[k].value;
+    }
+    var children = [];
+    if (node.tagName !== 'IFRAME') {
+        for (var child = node.firstChild; child; child = child.nextSibling) {
+            var s = ser(child);
+            if (s) children.push(s);
+        }
+    }
+    return {i: idOf(node), t: node.tagName.toLowerCase(), a: attrs, c: children};
+}
+r.ser = ser;
+
+if (!r.observer) {
+    r.observer = new MutationObserver(function (records) {
+        var ops = [];
+        var targets = [];
+        var added = new Set();
+        for (var k = 0; k < records.length; k++) {
+            var m = records[k];
+            var id = r.ids.get(m.target);
+            if (m.type === 'childList') {
+                if (targets.indexOf(m.target) < 0) targets.push(m.target);
+                for (var j = 0; j < m.addedNodes.length; j++) added.add(m.addedNodes[j]);
+            } else if (!id) {
+                continue;  // 本批次新增的节点，序列化时已包含最新状态
+            } else if (m.type === 'attributes') {
+                ops.push({o: 'a', i: id, n: m.attributeName, v: m.target.getAttribute(m.attributeName)});
+            } else if (m.type === 'characterData') {
+                ops.push({o: 't', i: id, v: m.target.data});
+            }
+        }
+        for (var t = 0; t < targets.length; t++) {
+            var target = targets[t];
+            var targetId = r.ids.get(target);
+            if (!targetId) continue;  // 位于新增子树内，祖先的序列化已覆盖
+            var children = [];
+            for (var child = target.firstChild; child; child = child.nextSibling) {
+                if (added.has(child) || !r.ids.get(child)) {
+                    var s = ser(child);
+                    if (s) children.push(s);
+                } else if (child.nodeType === 1 || child.nodeType === 3) {
+                    children.push({r: r.ids.get(child)});
+                }
+            }
+            ops.push({o: 'c', i: targetId, c: children});
+        }
+        if (!ops.length) return;
+        r.batches.push({s: ++r.seq, ts: Date.now(), ops: ops});
+        if (r.batches.length > maxPending) {
+            r.batches.shift();
+            r.lost = true;
+        }
+    });
+    r.observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+r.batches = [];
+r.lost = false;
+return {seq: r.seq, ts: Date.now(), url: location.href, root: ser(document.documentElement)};
+"""
+
+# 取走游标之后的批次；观察器不存在（页面已跳转）返回null
+DRAIN_SCRIPT = """
+var r = window.__domRec;
+if (!r || !r.observer) return null;
+var cursor = arguments[0];
+var start = 0;
+while (start < r.batches.length && r.batches[start].s <= cursor) start++;
+var batches = r.batches.slice(start);
+r.batches = batches.slice();
+var lost = r.lost;
+r.lost = false;
+return {seq: r.seq, batches: batches, lost: lost};
+"""
+
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr'
+}
+RAW_TEXT_ELEMENTS = {'script', 'style'}
+
+
+def _index(node: Dict[str, Any], nodes: Dict[int, Dict[str, Any]]) -> None:
+    """把子树中所有节点登记到 id 索引"""
+    nodes[node['i']] = node
+    for child in node.get('c', []):
+        _index(child, nodes)
+
+
+def apply_batch(root: Dict[str, Any], nodes: Dict[int, Dict[str, Any]], batch: Dict[str, Any]) -> None:
+    """在重建中的节点树上应用一个变化批次"""
+    for op in batch['ops']:
+        node = nodes.get(op['i'])
+        if node is None:
+            continue
+        if op['o'] == 'a':
+            if op['v'] is None:
+                node['a'].pop(op['n'], None)
+            else:
+                node['a'][op['n']] = op['v']
+        elif op['o'] == 't':
+            node['x'] = op['v']
+        elif op['o'] == 'c':
+            children = []
+            for entry in op['c']:
+                if 'r' in entry:
+                    if entry['r'] in nodes:
+                        children.append(nodes[entry['r']])
+                else:
+                    subtree = copy.deepcopy(entry)
+                    _index(subtree, nodes)
+                    children.append(subtree)
+            node['c'] = children
+
+
+def to_html(node: Dict[str, Any], raw_text: bool = False) -> str:
+    """节点树序列化为HTML"""
+    if 'x' in node:
+        return node['x'] if raw_text else html.escape(node['x'], quote=False)
+    tag = node['t']
+    attrs = ''.join(f' {name}="{html.escape(value, quote=True)}"' for name, value in node['a'].items())
+    if tag in VOID_ELEMENTS:
+        return f'<{tag}{attrs}>'
+    inner = ''.join(to_html(child, tag in RAW_TEXT_ELEMENTS) for child in node.get('c', []))
+    return f'<{tag}{attrs}>{inner}</{tag}>'
+
+
+def reconstruct_segment(segment: Dict[str, Any], seq: Optional[int] = None) -> str:
+    """
+    重建某个文档片段在指定序号时的DOM
+
+    Args:
+        segment: 记录片段（基线 + 变化批次）
+        seq: 应用到的最大批次序号，None 表示最新
+
+    Returns:
+        HTML字符串
+    """
+    root = copy.deepcopy(segment['baseline'])
+    nodes: Dict[int, Dict[str, Any]] = {}
+    _index(root, nodes)
+    for batch in segment['batches']:
+        if seq is not None and batch['s'] > seq:
+            break
+        apply_batch(root, nodes, batch)
+    return '<!DOCTYPE html>' + to_html(root)
+
+
+class DomDiffRecorder:
+    """DOM增量记录器"""
+
+    def __init__(self, driver, config: Optional[Dict[str, Any]] = None):
+        self.driver = driver
+        self.config = dict(DEFAULT_DOM_RECORDING_CONFIG)
+        if MONITORING_CONFIG_AVAILABLE:
+            self.config.update(get_monitoring_config().get('dom_diff_recording', {}))
+        if config:
+            self.config.update(config)
+
+        self.enabled = bool(self.config['enabled'])
+        self.segments: List[Dict[str, Any]] = []
+        self.checkpoints: List[Dict[str, Any]] = []
+        self.cursor = 0
+
+    def start(self, reason: str = 'start') -> Optional[Dict[str, Any]]:
+        """取基线快照，开始新的记录片段"""
+        if not self.enabled:
+            return None
+        try:
+            baseline = self.driver.execute_script(INSTALL_SCRIPT, self.config['max_pending_batches'])
+        except Exception as e:
+            print(f"⚠️ DOM增量记录器注入失败: {e}")
+            return None
+
+        self.cursor = baseline['seq']
+        segment = {
+            'index': len(self.segments),
+            'reason': reason,
+            'url': baseline['url'],
+            'timestamp': datetime.now().isoformat(),
+            'baseline_seq': baseline['seq'],
+            'baseline': baseline['root'],
+            'batches': []
+        }
+        self.segments.append(segment)
+        return segment
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        取走新的变化批次
+
+        Returns:
+            新批次列表；文档已切换或页面内缓冲溢出时自动重新取基线
+        """
+        if not self.enabled or not self.segments:
+            return []
+
+        result = self.driver.execute_script(DRAIN_SCRIPT, self.cursor)
+        if result is None:
+            self.start('navigation')
+            return []
+        if result['lost']:
+            # 有批次未被取走就被丢弃，之后的变化无法回放，从新基线继续
+            self.start('overflow')
+            return []
+
+        batches = result['batches']
+        if batches:
+            self.segments[-1]['batches'].extend(batches)
+            self.cursor = batches[-1]['s']
+        return batches
+
+    def checkpoint(self, label: str) -> Optional[Dict[str, Any]]:
+        """记录一个可重建的时间点（替代保存一份完整页面源码）"""
+        if not self.enabled:
+            return None
+        try:
+            if self.segments:
+                self.poll()
+            else:
+                self.start(label)
+        except Exception as e:
+            print(f"⚠️ DOM检查点记录失败: {e}")
+        if not self.segments:
+            return None
+
+        checkpoint = {
+            'label': label,
+            'timestamp': datetime.now().isoformat(),
+            'segment': self.segments[-1]['index'],
+            'seq': self.cursor
+        }
+        self.checkpoints.append(checkpoint)
+        return checkpoint
+
+    def reconstruct(self, segment_index: int = -1, seq: Optional[int] = None) -> str:
+        """重建指定片段、指定序号时的DOM"""
+        return reconstruct_segment(self.segments[segment_index], seq)
+
+    def reconstruct_checkpoint(self, label: str) -> Optional[str]:
+        """按检查点名称重建DOM"""
+        for checkpoint in self.checkpoints:
+            if checkpoint['label'] == label:
+                return self.reconstruct(checkpoint['segment'], checkpoint['seq'])
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """基线与变化记录的体积统计"""
+        baseline_bytes = sum(len(json.dumps(s['baseline'], ensure_ascii=False)) for s in self.segments)
+        diff_bytes = sum(len(json.dumps(s['batches'], ensure_ascii=False)) for s in self.segments)
+        return {
+            'segments': len(self.segments),
+            'batches': sum(len(s['batches']) for s in self.segments),
+            'operations': sum(len(b['ops']) for s in self.segments for b in s['batches']),
+            'baseline_bytes': baseline_bytes,
+            'diff_bytes': diff_bytes,
+            'checkpoints': len(self.checkpoints)
+        }
+
+    def export(self) -> Dict[str, Any]:
+        """导出为可写入报告的结构"""
+        return {
+            'segments': self.segments,
+            'checkpoints': self.checkpoints,
+            'stats': self.get_stats()
+        }
@@ -8,11 +8,26 @@ monitoring_handler.py
 
 import time
 import json
-import threading
 from datetime import datetime
 from typing import Dict, Any, List
 
 from ...analysis.page_crawler import crawl_page_content
+from ...analysis.form_inventory import collect_form_inventory
+from ...network.request_classifier import get_request_classifier
+from .dom_change_watcher import DomChangeWatcher
+from .dom_diff_recorder import DomDiffRecorder
+from .session_journal import SessionJournal
+from .async_monitor import run_monitor_loop
+from ..hot_logging import get_logger, flush_logging
+
+# 导入监控配置
+try:
+    from config.latency_config import get_monitoring_config
+    MONITORING_CONFIG_AVAILABLE = True
+except ImportError:
+    MONITORING_CONFIG_AVAILABLE = False
+
+logger = get_logger('monitoring')
 
 
 class MonitoringHandler:
@@ -21,6 +36,23 @@ class MonitoringHandler:
     def __init__(self, driver: Any, network_monitor: Any = None):
         self.driver = driver
         self.network_monitor = network_monitor
+        self.request_classifier = get_request_classifier()
+        self.dom_watcher = DomChangeWatcher(driver)
+        self.dom_changes: List[Dict[str, Any]] = []
+        self.dom_recorder = DomDiffRecorder(driver)
+        self.dom_journal_position = (-1, 0)  # 已写入会话日志的 (片段序号, 批次数)
+        self.action_tracking_config = {'ring_size': 500, 'backup_flush_ms': 1000}
+        self.event_loop_config = {}
+        self.snapshot_interval_s = 10
+        if MONITORING_CONFIG_AVAILABLE:
+            monitoring_config = get_monitoring_config()
+            self.action_tracking_config.update(monitoring_config.get('user_action_tracking', {}))
+            self.event_loop_config = monitoring_config.get('event_loop', {})
+            self.snapshot_interval_s = monitoring_config.get('snapshot_interval_s', 10)
+        self.action_cursor = 0  # 已取走的最大操作序号
+        self.tracker_state = None  # 上一次的跟踪器状态，只在变化时打印诊断
+        self.monitor_state: Dict[str, Any] = {}  # 监控循环的计数和上次URL
+        self.journal = None  # 会话日志，中断后可恢复
         self.monitoring_start_time = None
         self.collected_data = {
             'pre_click_data': {},
@@ -38,16 +70,23 @@ class MonitoringHandler:
         print("📊 收集目标：点击申请 → 跳转页面 → 表单元素 → 网络请求 → 用户操作")
         
         self.monitoring_start_time = time.time()
+        self.journal = SessionJournal()
+        if self.journal.enabled:
+            print(f"📓 会话日志: {self.journal.path}")
+        journal_status = 'interrupted'
         
         try:
             # 阶段1: 收集点击前的页面状态
             self._collect_pre_click_data()
+            self._journal('pre_click_data', self.collected_data['pre_click_data'])
             
             # 阶段2: 监控申请点击后的跳转
             self._monitor_post_click_transition()
+            self._journal('post_click_data', self.collected_data['post_click_data'])
             
             # 阶段3: 深度分析表单页面
             self._analyze_form_page_structure()
+            self._journal('form_page_data', self.collected_data['form_page_data'])
             
             # 阶段4: 持续监控用户操作和网络请求
             self._continuous_monitoring_loop()
@@ -56,13 +95,53 @@ class MonitoringHandler:
             self._collect_final_data()
             
             print("\n✅ 综合监控完成！")
+            journal_status = 'completed'
             return self._generate_monitoring_report()
             
         except Exception as e:
             print(f"❌ 综合监控失败: {e}")
             import traceback
             traceback.print_exc()
+            journal_status = 'failed'
             return {'error': str(e), 'partial_data': self.collected_data}
+        
+        finally:
+            # Ctrl+C 等中断也会写入结束标记并落盘
+            self.journal.close(journal_status)
+    
+    def _journal(self, event_type: str, data: Any) -> None:
+        """追加会话日志事件"""
+        if self.journal:
+            self.journal.append(event_type, data)
+    
+    def _page_snapshot(self, label: str, content_key: str = 'page_content') -> Dict[str, Any]:
+        """记录DOM检查点；增量记录器不可用时退回保存完整页面内容"""
+        checkpoint = self.dom_recorder.checkpoint(label)
+        self._journal_dom_recording()
+        if checkpoint:
+            self._journal('dom_checkpoint', checkpoint)
+            return {'dom_checkpoint': checkpoint}
+        return {content_key: crawl_page_content(self.driver)}
+    
+    def _poll_dom_recorder(self) -> None:
+        """取回新的DOM变化批次"""
+        try:
+            self.dom_recorder.poll()
+            self._journal_dom_recording()
+        except Exception as e:
+            logger.warning(f"⚠️ DOM增量记录失败: {e}")
+    
+    def _journal_dom_recording(self) -> None:
+        """把尚未写入会话日志的基线和变化批次追加到日志"""
+        journaled_segment, journaled_batches = self.dom_journal_position
+        for segment in self.dom_recorder.segments[max(journaled_segment, 0):]:
+            if segment['index'] > journaled_segment:
+                self._journal('dom_segment', {k: v for k, v in segment.items() if k != 'batches'})
+                journaled_segment, journaled_batches = segment['index'], 0
+            for batch in segment['batches'][journaled_batches:]:
+                self._journal('dom_diff', {'segment': segment['index'], 'batch': batch})
+            journaled_batches = len(segment['batches'])
+        self.dom_journal_position = (journaled_segment, journaled_batches)
     
     def _collect_pre_click_data(self) -> None:
         """收集点击申请按钮前的页面数据"""
@@ -73,7 +152,7 @@ class MonitoringHandler:
                 'timestamp': datetime.now().isoformat(),
                 'url': self.driver.current_url,
                 'title': self.driver.title,
-                'page_content': crawl_page_content(self.driver),
+                **self._page_snapshot('pre_click'),
                 'cookies': self.driver.get_cookies(),
                 'local_storage': self._get_local_storage(),
                 'session_storage': self._get_session_storage()
@@ -121,9 +200,6 @@ class MonitoringHandler:
             # 等待表单元素完全加载
             time.sleep(1)
             
-            # 爬取完整页面内容
-            page_content = crawl_page_content(self.driver)
-            
             # 深度分析表单结构
             form_analysis = self._deep_form_analysis()
             
@@ -131,9 +207,8 @@ class MonitoringHandler:
                 'timestamp': datetime.now().isoformat(),
                 'url': self.driver.current_url,
                 'title': self.driver.title,
-                'page_content': page_content,
+                **self._page_snapshot('form_page'),
                 'form_analysis': form_analysis,
-                'page_source_length': len(self.driver.page_source),
                 'dom_elements_count': self._count_dom_elements()
             }
             
@@ -144,7 +219,15 @@ class MonitoringHandler:
             print(f"⚠️ 表单页面分析失败: {e}")
     
     def _deep_form_analysis(self) -> Dict[str, Any]:
-        """深度表单分析 - 收集所有可能的表单元素"""
+        """深度表单分析 - 页面内一次遍历收集所有表单元素"""
+        try:
+            return collect_form_inventory(self.driver)
+        except Exception as e:
+            print(f"⚠️ 页面内表单清单收集失败，回退逐元素分析: {e}")
+            return self._deep_form_analysis_webdriver()
+    
+    def _deep_form_analysis_webdriver(self) -> Dict[str, Any]:
+        """逐元素WebDriver分析（备用方案，每个属性一次往返）"""
         try:
             analysis = {
                 'input_fields': [],
@@ -275,104 +358,127 @@ class MonitoringHandler:
         self._ensure_network_monitoring()
         
         # 记录初始状态
-        last_url = self.driver.current_url
-        last_page_source_hash = hash(self.driver.page_source)
-        request_count = 0
-        tracked_elements = set()  # 跟踪用户交互过的元素
-        
-        # 创建停止监控的事件
-        stop_monitoring = threading.Event()
-        
-        def input_listener():
-            """监听用户输入"""
-            input()  # 等待用户按回车
-            stop_monitoring.set()
+        self.monitor_state = {
+            'last_url': self.driver.current_url,
+            'request_count': 0,
+            'tracked_count': 0,  # 已记录的用户操作数（按游标增量拉取，无需去重）
+            'last_snapshot': time.time()
+        }
+        self.dom_watcher.install()
         
-        # 启动输入监听线程
-        input_thread = threading.Thread(target=input_listener)
-        input_thread.daemon = True
-        input_thread.start()
+        # 网络日志改由事件循环在唤醒时读取，不再单独开线程轮询
+        if self.network_monitor and hasattr(self.network_monitor, 'detach_background'):
+            self.network_monitor.detach_background()
         
         # 注入JavaScript监听器来跟踪用户操作
         self._inject_user_action_tracker()
         
-        print("🔍 开始实时监控...")
+        logger.info("🔍 开始实时监控...")
         
-        # 监控循环
-        monitor_count = 0
-        while not stop_monitoring.is_set():
-            try:
-                monitor_count += 1
-                
-                # 检查页面URL变化
-                current_url = self.driver.current_url
-                if current_url != last_url:
-                    print(f"📍 页面跳转: {last_url} → {current_url}")
-                    self._record_page_change(last_url, current_url)
-                    last_url = current_url
-                    
-                    # 页面跳转后重新注入用户操作跟踪器
-                    time.sleep(0.5)  # 等待页面加载
-                    self._inject_user_action_tracker()
-                    print(f"🔄 重新注入跟踪器（新页面: {current_url}）")
-                
-                # 检查DOM变化
-                current_page_source_hash = hash(self.driver.page_source)
-                if current_page_source_hash != last_page_source_hash:
-                    print(f"📄 DOM内容已更新")
-                    last_page_source_hash = current_page_source_hash
-                
-                # 获取用户操作的元素
-                user_actions = self._get_user_actions()
-                for action in user_actions:
-                    if action['element_id'] not in tracked_elements:
-                        tracked_elements.add(action['element_id'])
-                        self._record_user_action(action)
-                        print(f"👆 用户操作: {action['type']} - {action['description']}")
-                
-                # 检查网络请求变化
-                if self.network_monitor:
-                    current_requests = self.network_monitor.get_captured_requests()
-                    if len(current_requests) > request_count:
-                        new_requests = current_requests[request_count:]
-                        for req in new_requests:
-                            method = req.get('method', 'GET')
-                            url = req.get('url', '')
-                            status = req.get('status', 'Unknown')
-                            
-                            # 详细记录重要请求
-                            if method in ['POST', 'PUT'] or 'api' in url.lower():
-                                print(f"🌐 重要请求: {method} {url[:80]}...")
-                                print(f"   状态: {status}")
-                                if req.get('request_body'):
-                                    print(f"   请求数据: {str(req['request_body'])[:100]}...")
-                                if req.get('response_body'):
-                                    print(f"   响应数据: {str(req['response_body'])[:100]}...")
-                            else:
-                                print(f"🌐 新请求: {method} {url[:50]}... (状态: {status})")
-                        
-                        request_count = len(current_requests)
-                
-                # 定期保存监控数据快照
-                if monitor_count % 20 == 0:  # 每10秒保存一次
-                    self._save_monitoring_snapshot()
-                
-                # 短暂休息避免CPU过载
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"⚠️ 监控循环错误: {e}")
-                import traceback
-                traceback.print_exc()
-                # 继续监控，不要中断
-                time.sleep(1)  # 出错时等待更长时间
-                continue
+        # 事件循环：同时等待回车、页面事件和心跳，事件到达立即处理
+        loop_stats = run_monitor_loop(self, self.event_loop_config)
+        
+        state = self.monitor_state
+        logger.info("\n✅ 用户已结束监控")
+        logger.info(f"📊 监控统计：")
+        logger.info(f"   - 事件唤醒次数: {loop_stats['wakes']} ({loop_stats['wakes'] / max(loop_stats['duration_s'], 0.001):.1f} 次/秒)")
+        logger.info(f"   - 唤醒原因: {loop_stats['reasons']}")
+        logger.info(f"   - 捕获网络请求: {state['request_count']}个")
+        logger.info(f"   - 用户操作元素: {state['tracked_count']}个")
+        logger.info(f"   - DOM变化记录: {len(self.dom_changes)}次")
+        dom_stats = self.dom_recorder.get_stats()
+        logger.info(f"   - DOM增量记录: 基线 {dom_stats['baseline_bytes'] / 1024:.0f}KB + "
+                    f"变化 {dom_stats['diff_bytes'] / 1024:.0f}KB（{dom_stats['batches']}批）")
+        flush_logging()  # 之后的阶段直接print，先输出完队列避免乱序
+    
+    def _process_monitor_tick(self, reasons: List[str]) -> None:
+        """处理一次唤醒：心跳只读网络日志和快照，其他事件刷新页面状态"""
+        state = self.monitor_state
+        if reasons != ['timeout']:
+            self._process_page_events(state)
+        self._process_network_events(state)
         
-        print("\n✅ 用户已结束监控")
-        print(f"📊 监控统计：")
-        print(f"   - 监控循环次数: {monitor_count}")
-        print(f"   - 捕获网络请求: {request_count}个")
-        print(f"   - 用户操作元素: {len(tracked_elements)}个")
+        # 定期保存监控数据快照
+        if time.time() - state['last_snapshot'] >= self.snapshot_interval_s:
+            self._save_monitoring_snapshot()
+            state['last_snapshot'] = time.time()
+    
+    def _process_page_events(self, state: Dict[str, Any]) -> None:
+        """页面跳转、DOM变化和用户操作"""
+        # 一次往返取回跟踪器状态、新操作和当前URL
+        tracker = self._poll_tracker()
+        
+        # 检查页面URL变化
+        current_url = tracker.get('href') or self.driver.current_url
+        url_changed = current_url != state['last_url']
+        if url_changed:
+            logger.info(f"📍 页面跳转: {state['last_url']} → {current_url}")
+            self._record_page_change(state['last_url'], current_url)
+            state['last_url'] = current_url
+            time.sleep(0.5)  # 等待页面加载
+        
+        # 页面跳转或跟踪器丢失（同URL刷新、上次注入失败）后重新注入，
+        # 否则页面内等待脚本每次都立即以 no_tracker 返回
+        if url_changed or not tracker.get('installed'):
+            self._inject_user_action_tracker()
+            self.dom_watcher.install()
+            self._poll_dom_recorder()
+            reason = f"新页面: {current_url}" if url_changed else "跟踪器已丢失"
+            logger.info(f"🔄 重新注入跟踪器（{reason}）")
+            tracker = self._poll_tracker()
+        
+        # 检查DOM变化（页面内计数器，有变化才取回增量记录）
+        dom_change = self.dom_watcher.poll()
+        if dom_change:
+            dom_change['url'] = current_url
+            self.dom_changes.append(dom_change)
+            self._journal('dom_change', dom_change)
+            self._poll_dom_recorder()
+            targets = ', '.join(sorted({s['target'] for s in dom_change['subtrees']})[:3])
+            logger.info(f"📄 DOM内容已更新: {dom_change['new_mutations']} 处变化" + (f" ({targets})" if targets else ""))
+        
+        # 获取用户操作的元素
+        user_actions = self._get_user_actions(tracker)
+        for action in user_actions:
+            state['tracked_count'] += 1
+            self._record_user_action(action)
+            logger.info(f"👆 用户操作: {action['type']} - {action['description']}")
+    
+    def _process_network_events(self, state: Dict[str, Any]) -> None:
+        """读取新的网络请求"""
+        if not self.network_monitor:
+            return
+        if hasattr(self.network_monitor, 'pump'):
+            self.network_monitor.pump()
+        
+        current_requests = self.network_monitor.get_captured_requests()
+        if len(current_requests) <= state['request_count']:
+            return
+        
+        for req in current_requests[state['request_count']:]:
+            self._journal('network_request', req)
+            method = req.get('method', 'GET')
+            url = req.get('url', '')
+            status = req.get('status', 'Unknown')
+            
+            # 详细记录重要请求
+            if self.request_classifier.is_detailed(method, url):
+                logger.info(f"🌐 重要请求: {method} {url[:80]}...")
+                logger.info(f"   状态: {status}")
+                if req.get('request_body'):
+                    logger.info(f"   请求数据: {str(req['request_body'])[:100]}...")
+                if req.get('response_body'):
+                    logger.info(f"   响应数据: {str(req['response_body'])[:100]}...")
+            else:
+                logger.info(f"🌐 新请求: {method} {url[:50]}... (状态: {status})")
+        
+        state['request_count'] = len(current_requests)
+    
+    def _report_monitor_error(self, error: Exception) -> None:
+        """监控循环出错时记录，继续监控不中断"""
+        logger.warning(f"⚠️ 监控循环错误: {error}")
+        import traceback
+        traceback.print_exc()
     
     def _inject_user_action_tracker(self) -> None:
         """注入JavaScript来跟踪用户操作"""
@@ -397,8 +503,40 @@ class MonitoringHandler:
             console.log('🚀 开始注入用户操作跟踪器...');
             
             // 确保全局变量存在
-            window.userActions = window.userActions || [];
-            window.actionId = window.actionId || 0;
+            var ringSize = arguments[0] || 500;
+            var flushMs = arguments[1] || 1000;
+            window.userActionRingSize = ringSize;
+            if (!window.userActions) {
+                // 同源跳转后从备份恢复环形缓冲并续接序号，保证游标单调递增
+                try {
+                    window.userActions = JSON.parse(sessionStorage.getItem('userActions') || '[]');
+                    window.actionId = parseInt(sessionStorage.getItem('userActionSeq') || '0', 10) || 0;
+                } catch(seq_error) {
+                    window.userActions = [];
+                    window.actionId = 0;
+                }
+            }
+            
+            function flushUserActionBackup() {
+                window.userActionBackupTimer = null;
+                try {
+                    sessionStorage.setItem('userActions', JSON.stringify(window.userActions));
+                    sessionStorage.setItem('userActionSeq', String(window.actionId));
+                } catch(storage_error) {
+                    console.log('⚠️ sessionStorage备份失败:', storage_error);
+                }
+            }
+            
+            // 离开页面前立即写入未备份的操作
+            if (!window.userActionPagehideBound) {
+                window.addEventListener('pagehide', function() {
+                    if (window.userActionBackupTimer) {
+                        clearTimeout(window.userActionBackupTimer);
+                        flushUserActionBackup();
+                    }
+                });
+                window.userActionPagehideBound = true;
+            }
             window.trackingActive = true;
             window.injectionTime = new Date().toISOString();
             
@@ -416,6 +554,52 @@ class MonitoringHandler:
                 console.log('🗑️ 移除旧的输入监听器');
             }
             
+            // 记录操作：分配序号、写入环形缓冲、延迟批量备份
+            window.recordUserAction = function(action) {
+                window.actionId++;
+                action.id = window.actionId;
+                window.userActions.push(action);
+                var overflow = window.userActions.length - window.userActionRingSize;
+                if (overflow > 0) {
+                    window.userActions.splice(0, overflow);
+                }
+                
+                if (!window.userActionBackupTimer) {
+                    window.userActionBackupTimer = setTimeout(flushUserActionBackup, flushMs);
+                }
+                // 唤醒正在等待页面事件的监控循环
+                if (window.__monitorWake) window.__monitorWake('action');
+                return action;
+            };
+            
+            // 按游标取走新操作：只返回序号大于cursor的记录
+            window.drainUserActions = function(cursor) {
+                var reset = window.actionId < cursor;  // 新文档序号重新开始
+                if (reset) cursor = 0;
+                var actions = window.userActions;
+                var start = actions.length;
+                while (start > 0 && actions[start - 1].id > cursor) start--;
+                var missed = 0;
+                if (start === 0 && actions.length && actions[0].id > cursor + 1) {
+                    missed = actions[0].id - cursor - 1;  // 环形缓冲已覆盖
+                }
+                return {seq: window.actionId, actions: actions.slice(start), missed: missed, reset: reset};
+            };
+            
+            // 单次轮询接口：状态、健康信息和新操作一次返回
+            window.pollTracker = function(cursor) {
+                return {
+                    installed: true,
+                    readyState: document.readyState,
+                    href: window.location.href,
+                    active: !!window.trackingActive,
+                    hasClickHandler: typeof window.clickHandler === 'function',
+                    ringLength: window.userActions.length,
+                    injectionTime: window.injectionTime,
+                    drain: window.drainUserActions(cursor)
+                };
+            };
+            
             // 测试函数
             window.testTracker = function() {
                 console.log('🧪 跟踪器测试 - 当前操作数:', window.userActions.length);
@@ -437,9 +621,7 @@ class MonitoringHandler:
                 }
                 
                 try {
-                    window.actionId++;
-                    const action = {
-                        id: window.actionId,
+                    const action = window.recordUserAction({
                         type: 'click',
                         timestamp: new Date().toISOString(),
                         pageUrl: window.location.href,
@@ -455,19 +637,8 @@ class MonitoringHandler:
                         cssSelector: getCSSSelector(e.target),
                         clientX: e.clientX || 0,
                         clientY: e.clientY || 0
-                    };
-                    
-                    window.userActions.push(action);
+                    });
                     console.log('✅ 点击捕获成功:', action);
-                    console.log('📊 当前总操作数:', window.userActions.length);
-                    
-                    // 立即保存到sessionStorage作为备份
-                    try {
-                        sessionStorage.setItem('userActions', JSON.stringify(window.userActions));
-                        console.log('💾 操作已备份到sessionStorage');
-                    } catch(storage_error) {
-                        console.log('⚠️ sessionStorage备份失败:', storage_error);
-                    }
                     
                 } catch(error) {
                     console.error('❌ 点击处理错误:', error);
@@ -481,9 +652,7 @@ class MonitoringHandler:
                 if (!window.trackingActive) return;
                 
                 try {
-                    window.actionId++;
-                    const action = {
-                        id: window.actionId,
+                    const action = window.recordUserAction({
                         type: 'input',
                         timestamp: new Date().toISOString(),
                         pageUrl: window.location.href,
@@ -497,18 +666,9 @@ class MonitoringHandler:
                         value: e.target.type === 'password' ? '[PASSWORD]' : (e.target.value || '').substring(0, 50),
                         xpath: getXPath(e.target),
                         cssSelector: getCSSSelector(e.target)
-                    };
-                    
-                    window.userActions.push(action);
+                    });
                     console.log('✅ 输入捕获成功:', action);
                     
-                    // 备份到sessionStorage
-                    try {
-                        sessionStorage.setItem('userActions', JSON.stringify(window.userActions));
-                    } catch(storage_error) {
-                        console.log('⚠️ sessionStorage备份失败:', storage_error);
-                    }
-                    
                 } catch(error) {
                     console.error('❌ 输入处理错误:', error);
                 }
@@ -613,7 +773,11 @@ class MonitoringHandler:
             """
             
             # 执行注入脚本
-            injection_result = self.driver.execute_script(tracker_script)
+            injection_result = self.driver.execute_script(
+                tracker_script,
+                self.action_tracking_config['ring_size'],
+                self.action_tracking_config['backup_flush_ms']
+            )
             
             # 验证注入是否成功
             time.sleep(0.5)  # 等待脚本执行
@@ -671,116 +835,73 @@ class MonitoringHandler:
             traceback.print_exc()
             return False
     
-    def _get_user_actions(self) -> List[Dict]:
-        """获取用户操作记录"""
+    def _poll_tracker(self) -> Dict[str, Any]:
+        """一次execute_script取回跟踪器状态和新操作"""
+        try:
+            payload = self.driver.execute_script("""
+                if (typeof window.pollTracker === 'function') {
+                    return window.pollTracker(arguments[0]);
+                }
+                return {installed: false, readyState: document.readyState, href: window.location.href};
+            """, self.action_cursor)
+            return payload or {'installed': False}
+        except Exception as e:
+            return {'installed': False, 'error': str(e)[:200]}
+    
+    def _report_tracker_state(self, tracker: Dict[str, Any]) -> None:
+        """跟踪器状态变化时才打印诊断信息"""
+        state = (
+            tracker.get('installed', False),
+            tracker.get('readyState'),
+            tracker.get('active', False),
+            tracker.get('hasClickHandler', False),
+            tracker.get('error')
+        )
+        if state == self.tracker_state:
+            return
+        self.tracker_state = state
+        
+        if tracker.get('error'):
+            logger.warning(f"⚠️ 跟踪器轮询失败: {tracker['error']}")
+        elif not tracker.get('installed'):
+            logger.error(f"❌ 跟踪器不可用 (页面状态: {tracker.get('readyState')})")
+        else:
+            logger.info(f"🔍 跟踪器状态变化:")
+            logger.info(f"   - 页面状态: {tracker.get('readyState')}")
+            logger.info(f"   - 激活状态: {tracker.get('active')}")
+            logger.info(f"   - 点击处理器: {tracker.get('hasClickHandler')}")
+            logger.info(f"   - 缓冲操作数: {tracker.get('ringLength')}")
+            logger.info(f"   - 注入时间: {tracker.get('injectionTime')}")
+    
+    def _get_user_actions(self, tracker: Dict[str, Any] = None) -> List[Dict]:
+        """获取用户操作记录（按游标增量拉取）"""
         try:
             # 检查driver是否还有效
             if not self.driver:
-                print("⚠️ WebDriver不可用")
+                logger.warning("⚠️ WebDriver不可用")
                 return []
             
-            # 检查页面是否已加载
-            try:
-                ready_state = self.driver.execute_script("return document.readyState;")
-                print(f"📄 页面状态: {ready_state}")
-            except Exception:
-                print("⚠️ 页面未准备好，跳过用户操作检测")
-                return []
+            if tracker is None:
+                tracker = self._poll_tracker()
+            self._report_tracker_state(tracker)
             
-            # 检查跟踪器状态
-            try:
-                tracker_status = self.driver.execute_script("""
-                    return {
-                        trackingActive: window.trackingActive || false,
-                        userActionsCount: (window.userActions || []).length,
-                        hasClickHandler: typeof window.clickHandler === 'function',
-                        hasTestTracker: typeof window.testTracker === 'function'
-                    };
-                """)
-                print(f"🔍 跟踪器状态检查:")
-                print(f"   - 激活状态: {tracker_status.get('trackingActive')}")
-                print(f"   - 操作记录数: {tracker_status.get('userActionsCount')}")
-                print(f"   - 点击处理器: {tracker_status.get('hasClickHandler')}")
-                print(f"   - 测试函数: {tracker_status.get('hasTestTracker')}")
-            except Exception as status_error:
-                print(f"⚠️ 跟踪器状态检查失败: {status_error}")
-            
-            # 获取JavaScript中的用户操作记录
-            js_actions = []
-            try:
-                js_actions = self.driver.execute_script("""
-                    var actions = window.userActions || [];
-                    console.log('📊 获取操作记录，当前数量:', actions.length);
-                    
-                    // 不清空数组，保留记录用于调试
-                    return actions;
-                """)
-                print(f"📋 从JavaScript获取到 {len(js_actions)} 个操作记录")
-                
-                if js_actions:
-                    print(f"   最新操作预览:")
-                    for i, action in enumerate(js_actions[-3:]):  # 显示最后3个操作
-                        action_type = action.get('type', 'unknown')
-                        element = action.get('element', 'unknown')
-                        text = action.get('elementText', '')[:30]
-                        timestamp = action.get('timestamp', '')
-                        print(f"     {i+1}. [{timestamp}] {action_type} {element}: {text}")
-                
-            except Exception as js_error:
-                print(f"⚠️ JavaScript操作记录获取失败: {js_error}")
+            drained = tracker.get('drain')
+            if not tracker.get('installed') or drained is None:
+                return []
             
-            # 从sessionStorage获取备份数据
-            backup_actions = []
-            try:
-                backup_data = self.driver.execute_script("""
-                    var backupData = sessionStorage.getItem('userActions');
-                    if (backupData) {
-                        try {
-                            return JSON.parse(backupData);
-                        } catch(e) {
-                            console.log('⚠️ 备份数据解析失败:', e);
-                            return [];
-                        }
-                    }
-                    return [];
-                """)
-                
-                if backup_data:
-                    backup_actions = backup_data
-                    print(f"💾 从sessionStorage获取到 {len(backup_actions)} 个备份操作记录")
-                else:
-                    print("💾 sessionStorage中无备份数据")
-                    
-            except Exception as backup_error:
-                print(f"⚠️ sessionStorage备份数据获取失败: {backup_error}")
+            if drained.get('reset'):
+                logger.info("🔄 跟踪器序号已重新开始（新页面），游标归零")
+            if drained.get('missed'):
+                logger.warning(f"⚠️ 环形缓冲已覆盖 {drained['missed']} 个未取走的操作")
             
-            # 合并数据源，优先使用JavaScript数据，备份数据作为补充
-            all_actions = js_actions if js_actions else backup_actions
+            all_actions = drained.get('actions') or []
+            self.action_cursor = drained.get('seq', self.action_cursor)
             
             if not all_actions:
-                print("❌ 所有数据源都无操作记录")
-                
-                # 尝试手动测试跟踪器
-                try:
-                    manual_test_result = self.driver.execute_script("""
-                        if (window.testTracker) {
-                            return window.testTracker();
-                        }
-                        return null;
-                    """)
-                    if manual_test_result:
-                        print(f"🧪 手动测试结果: {manual_test_result}")
-                    else:
-                        print("🧪 测试函数不可用")
-                except Exception as test_error:
-                    print(f"🧪 手动测试失败: {test_error}")
-                
                 return []
             
             # 处理每个操作
             processed_actions = []
-            print(f"🔄 处理 {len(all_actions)} 个操作记录")
-            
             for i, action in enumerate(all_actions):
                 if action and isinstance(action, dict):
                     try:
@@ -791,22 +912,14 @@ class MonitoringHandler:
                             'raw_data': action
                         }
                         processed_actions.append(processed_action)
-                        
-                        # 详细记录重要操作
-                        if action.get('type') == 'click':
-                            element_text = action.get('elementText', '').strip()
-                            element = action.get('element', 'unknown')
-                            print(f"   ✅ 处理点击操作 {i+1}: {element} - '{element_text[:30]}...'")
-                        
                     except Exception as process_error:
-                        print(f"⚠️ 处理操作 {i+1} 失败: {process_error}")
+                        logger.warning(f"⚠️ 处理操作 {i+1} 失败: {process_error}")
                         continue
             
-            print(f"✅ 成功处理 {len(processed_actions)} 个操作记录")
             return processed_actions
             
         except Exception as e:
-            print(f"❌ 获取用户操作失败: {e}")
+            logger.error(f"❌ 获取用户操作失败: {e}")
             import traceback
             traceback.print_exc()
             return []
@@ -838,10 +951,12 @@ class MonitoringHandler:
     
     def _record_user_action(self, action: Dict) -> None:
         """记录用户操作"""
-        self.collected_data['user_actions'].append({
+        record = {
             'timestamp': datetime.now().isoformat(),
             'action': action
-        })
+        }
+        self.collected_data['user_actions'].append(record)
+        self._journal('user_action', record)
     
     def _save_monitoring_snapshot(self) -> None:
         """保存监控数据快照"""
@@ -852,6 +967,9 @@ class MonitoringHandler:
                 'network_requests_count': len(self.collected_data.get('network_requests', [])),
                 'user_actions_count': len(self.collected_data.get('user_actions', []))
             }
+            self._journal('snapshot', snapshot_data)
+            if self.journal:
+                self.journal.flush(fsync=True)
             print(f"💾 保存监控快照: {snapshot_data['network_requests_count']}个请求, {snapshot_data['user_actions_count']}个操作")
         except Exception as e:
             print(f"⚠️ 保存快照失败: {e}")
@@ -866,42 +984,26 @@ class MonitoringHandler:
             for action in final_user_actions:
                 self._record_user_action(action)
             
-            # 从JavaScript中收集所有剩余的操作记录
-            try:
-                all_js_actions = self.driver.execute_script("""
-                    return window.userActions || [];
-                """)
-                print(f"📋 从JavaScript收集到 {len(all_js_actions)} 个操作记录")
-                
-                # 将JavaScript中的操作记录也保存到collected_data中
-                if all_js_actions:
-                    for js_action in all_js_actions:
-                        processed_action = {
-                            'element_id': f"{js_action.get('type', 'unknown')}_{js_action.get('id', 0)}",
-                            'type': js_action.get('type', 'unknown'),
-                            'description': self._format_action_description(js_action),
-                            'raw_data': js_action
-                        }
-                        self._record_user_action(processed_action)
-                        
-            except Exception as js_error:
-                print(f"⚠️ 收集JavaScript操作记录失败: {js_error}")
-            
-            # 收集最终网络请求
+            # 收集最终网络请求（后台轮询已停止，先读一次最后一次唤醒之后的日志，如最后的表单提交）
             if self.network_monitor:
+                if hasattr(self.network_monitor, 'pump'):
+                    self.network_monitor.pump()
                 self.collected_data['network_requests'] = self.network_monitor.get_captured_requests()
+                # 最终列表包含后台抓取到的响应体，恢复时以此为准
+                self._journal('network_requests', self.collected_data['network_requests'])
             
             # 收集最终页面状态
             self.collected_data['final_data'] = {
                 'timestamp': datetime.now().isoformat(),
                 'url': self.driver.current_url,
                 'title': self.driver.title,
-                'final_page_content': crawl_page_content(self.driver),
+                **self._page_snapshot('final', content_key='final_page_content'),
                 'cookies': self.driver.get_cookies(),
                 'local_storage': self._get_local_storage(),
                 'session_storage': self._get_session_storage(),
                 'monitoring_duration': time.time() - self.monitoring_start_time
             }
+            self._journal('final_data', self.collected_data['final_data'])
             
             # 显示详细的用户操作汇总
             self._print_user_actions_summary()
@@ -1030,12 +1132,15 @@ class MonitoringHandler:
                     'mode': 'comprehensive_monitoring'
                 },
                 'data_collection': self.collected_data,
+                'dom_changes': self.dom_changes,
+                'dom_recording': self.dom_recorder.export(),
                 'summary': {
                     'network_requests_count': len(self.collected_data.get('network_requests', [])),
                     'form_fields_discovered': len(self.collected_data.get('form_page_data', {}).get('form_analysis', {}).get('input_fields', [])),
                     'buttons_discovered': len(self.collected_data.get('form_page_data', {}).get('form_analysis', {}).get('buttons', [])),
                     'checkboxes_discovered': len(self.collected_data.get('form_page_data', {}).get('form_analysis', {}).get('checkboxes', [])),
                     'page_transitions': len([x for x in self.collected_data.get('user_actions', []) if x.get('type') == 'page_change']),
+                    'dom_change_events': len(self.dom_changes),
                     'data_quality': 'complete' if all(self.collected_data.values()) else 'partial'
                 },
                 'recommendations': self._generate_recommendations()
@@ -1167,20 +1272,24 @@ class MonitoringHandler:
     
     def _record_page_change(self, from_url: str, to_url: str) -> None:
         """记录页面变化"""
-        self.collected_data['user_actions'].append({
+        record = {
             'type': 'page_change',
             'timestamp': datetime.now().isoformat(),
             'from_url': from_url,
             'to_url': to_url
-        })
+        }
+        self.collected_data['user_actions'].append(record)
+        self._journal('page_change', record)
     
     def _record_title_change(self, new_title: str) -> None:
         """记录标题变化"""
-        self.collected_data['user_actions'].append({
+        record = {
             'type': 'title_change',
             'timestamp': datetime.now().isoformat(),
             'new_title': new_title
-        })
+        }
+        self.collected_data['user_actions'].append(record)
+        self._journal('title_change', record)
     
     def _print_form_analysis(self, form_analysis: Dict) -> None:
         """打印表单分析结果"""
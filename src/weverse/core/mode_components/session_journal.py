@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+session_journal.py
+监控会话日志 - 只追加的JSON Lines日志，缓冲写入并定期fsync，
+会话崩溃或被中断后可从部分日志重建最终报告
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+# 导入监控配置
+try:
+    from config.latency_config import get_monitoring_config
+    MONITORING_CONFIG_AVAILABLE = True
+except ImportError:
+    MONITORING_CONFIG_AVAILABLE = False
+
+DEFAULT_JOURNAL_CONFIG = {
+    'enabled': True,
+    'dir': 'data/journal',
+    'buffer_records': 64,
+    'flush_interval_s': 1,
+    'fsync_interval_s': 5,
+}
+
+JOURNAL_VERSION = 1
+
+
+class SessionJournal:
+    """监控会话日志"""
+
+    def __init__(self, session_id: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.config = dict(DEFAULT_JOURNAL_CONFIG)
+        if MONITORING_CONFIG_AVAILABLE:
+            self.config.update(get_monitoring_config().get('session_journal', {}))
+        if config:
+            self.config.update(config)
+
+        self.enabled = bool(self.config['enabled'])
+        self.session_id = session_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.path = os.path.join(self.config['dir'], f"monitoring_{self.session_id}.jsonl")
+
+        self.lock = threading.Lock()
+        self.buffer: List[str] = []
+        self.seq = 0
+        self.file = None
+        self.last_flush = time.time()
+        self.last_fsync = time.time()
+        self.closed = False
+
+        if self.enabled:
+            os.makedirs(self.config['dir'], exist_ok=True)
+            self.file = open(self.path, 'a', encoding='utf-8')
+            self.append('session_start', {'version': JOURNAL_VERSION, 'session_id': self.session_id})
+
+    def append(self, event_type: str, data: Any = None) -> None:
+        """追加一条事件（缓冲，不阻塞在磁盘I/O上）"""
+        if not self.enabled or self.closed:
+            return
+
+        with self.lock:
+            self.seq += 1
+            record = {'seq': self.seq, 'ts': datetime.now().isoformat(), 'type': event_type, 'data': data}
+            self.buffer.append(json.dumps(record, ensure_ascii=False, default=str))
+
+            now = time.time()
+            if (len(self.buffer) >= self.config['buffer_records']
+                    or now - self.last_flush >= self.config['flush_interval_s']):
+                self._flush_locked(fsync=now - self.last_fsync >= self.config['fsync_interval_s'])
+
+    def flush(self, fsync: bool = False) -> None:
+        """写出缓冲；fsync=True 时强制落盘"""
+        if not self.enabled or self.closed:
+            return
+        with self.lock:
+            self._flush_locked(fsync)
+
+    def _flush_locked(self, fsync: bool) -> None:
+        if self.buffer:
+            self.file.write('\n'.join(self.buffer) + '\n')
+            self.buffer = []
+        self.file.flush()
+        self.last_flush = time.time()
+        if fsync:
+            os.fsync(self.file.fileno())
+            self.last_fsync = self.last_flush
+
+    def close(self, status: str = 'completed') -> None:
+        """写入会话结束标记并关闭"""
+        if not self.enabled or self.closed:
+            return
+        self.append('session_end', {'status': status})
+        with self.lock:
+            self._flush_locked(fsync=True)
+            self.file.close()
+            self.closed = True
+
+
+def read_journal(path: str) -> Dict[str, Any]:
+    """
+    读取日志，容忍最后一行被截断
+
+    Returns:
+        {'records': [...], 'truncated': bool, 'complete': bool, 'end_status': str}
+    """
+    records = []
+    truncated = False
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # 崩溃时写了一半的行，之后不会再有有效记录
+                truncated = True
+                break
+
+    end_status = None
+    if records and records[-1].get('type') == 'session_end':
+        end_status = (records[-1].get('data') or {}).get('status')
+    return {'records': records, 'truncated': truncated, 'complete': end_status is not None, 'end_status': end_status}
+
+
+def rebuild_report(path: str) -> Dict[str, Any]:
+    """从（可能不完整的）日志重建监控报告，结构与 MonitoringHandler 报告一致"""
+    journal = read_journal(path)
+    records = journal['records']
+
+    collected_data = {
+        'pre_click_data': {},
+        'post_click_data': {},
+        'form_page_data': {},
+        'network_requests': [],
+        'user_actions': [],
+        'final_data': {}
+    }
+    dom_changes = []
+    snapshots = []
+    dom_segments = {}
+    dom_checkpoints = []
+
+    for record in records:
+        event_type = record.get('type')
+        data = record.get('data')
+        if event_type in ('pre_click_data', 'post_click_data', 'form_page_data', 'final_data'):
+            collected_data[event_type] = data or {}
+        elif event_type in ('user_action', 'page_change', 'title_change'):
+            collected_data['user_actions'].append(data)
+        elif event_type == 'network_request':
+            collected_data['network_requests'].append(data)
+        elif event_type == 'network_requests':
+            collected_data['network_requests'] = data or []
+        elif event_type == 'dom_change':
+            dom_changes.append(data)
+        elif event_type == 'snapshot':
+            snapshots.append(data)
+        elif event_type == 'dom_segment':
+            dom_segments[data['index']] = dict(data, batches=[])
+        elif event_type == 'dom_diff':
+            if data['segment'] in dom_segments:
+                dom_segments[data['segment']]['batches'].append(data['batch'])
+        elif event_type == 'dom_checkpoint':
+            dom_checkpoints.append(data)
+
+    start_ts = records[0]['ts'] if records else None
+    end_ts = records[-1]['ts'] if records else None
+    duration = 0.0
+    if start_ts and end_ts:
+        duration = (datetime.fromisoformat(end_ts) - datetime.fromisoformat(start_ts)).total_seconds()
+
+    form_analysis = collected_data['form_page_data'].get('form_analysis', {}) or {}
+    return {
+        'metadata': {
+            'monitoring_start': start_ts,
+            'monitoring_end': end_ts,
+            'total_duration': duration,
+            'mode': 'comprehensive_monitoring',
+            'recovered_from': path,
+            'journal_complete': journal['complete'],
+            'journal_end_status': journal['end_status'],
+            'journal_truncated': journal['truncated'],
+            'journal_records': len(records)
+        },
+        'data_collection': collected_data,
+        'dom_changes': dom_changes,
+        'dom_recording': {
+            'segments': [dom_segments[index] for index in sorted(dom_segments)],
+            'checkpoints': dom_checkpoints
+        },
+        'snapshots': snapshots,
+        'summary': {
+            'network_requests_count': len(collected_data['network_requests']),
+            'form_fields_discovered': len(form_analysis.get('input_fields', [])),
+            'buttons_discovered': len(form_analysis.get('buttons', [])),
+            'checkboxes_discovered': len(form_analysis.get('checkboxes', [])),
+            'page_transitions': len([x for x in collected_data['user_actions'] if x and x.get('type') == 'page_change']),
+            'dom_change_events': len(dom_changes),
+            'data_quality': 'complete' if journal['end_status'] == 'completed' else 'partial'
+        }
+    }
@@ -15,6 +15,7 @@ from .mode_components.content_analyzer import ContentAnalyzer
 from .mode_components.time_handler import TimeHandler
 from .mode_components.application_executor import ApplicationExecutor
 from .mode_components.monitoring_handler import MonitoringHandler
+from ..analysis.snapshot_store import SnapshotStore
 
 
 class ModeOrchestrator:
@@ -117,7 +118,7 @@ class ModeOrchestrator:
         network_monitor = self.browser_manager.get_network_monitor()
         
         self.content_analyzer = ContentAnalyzer(driver, wait)
-        self.application_executor = ApplicationExecutor(driver)
+        self.application_executor = ApplicationExecutor(driver, network_monitor)
         self.monitoring_handler = MonitoringHandler(driver, network_monitor)
         
         print("✅ 浏览器和网络设置完成")
@@ -146,6 +147,7 @@ class ModeOrchestrator:
         
         article_content, ai_time_data, analysis_result = self.content_analyzer.analyze_page_content()
         
+        # 并发模式下 analysis_result 为 None，完整分析在后台完成后单独打印
         if article_content and ai_time_data:
             self.content_analyzer.print_analysis_summary(ai_time_data, analysis_result or "")
         
@@ -207,6 +209,10 @@ class ModeOrchestrator:
         if self.browser_manager:
             self.browser_manager.cleanup()
         
+        # 等待后台AI分析完成并保存
+        if self.content_analyzer:
+            self.content_analyzer.wait_for_analysis()
+        
         print("✅ 清理完成")
     
     def _save_monitoring_data(self, monitoring_data: Dict[str, Any]) -> None:
@@ -237,10 +243,11 @@ class ModeOrchestrator:
                 'monitoring_data': monitoring_data
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, ensure_ascii=False, indent=2)
+            # HTML快照和DOM基线外置到 data/snapshots，按内容哈希去重
+            store_stats = SnapshotStore(root=os.path.join(data_dir, 'snapshots')).dump_json(session_data, filename)
             
             print(f"📁 监控会话数据已保存到: {filename}")
+            print(f"🗜️ 快照: 新写入 {store_stats['written']} 个, 复用 {store_stats['deduplicated']} 个")
             
             # 打印数据摘要
             self._print_session_summary(session_data)
@@ -19,6 +19,10 @@ from typing import Dict, List, Any, Optional, Tuple
 
 # 导入表单选择器配置
 from config.form_selectors import get_form_selectors
+from ..core.hot_logging import get_logger
+from ..analysis.snapshot_store import SnapshotStore
+
+logger = get_logger('lightning_form')
 
 
 class LightningFormProcessor:
@@ -38,7 +42,7 @@ class LightningFormProcessor:
     def process_form_lightning_fast(self, birth_date='19900101', phone_number='01012345678') -> Dict[str, Any]:
         """闪电般快速处理表单 - 优化版：边检测边处理，无等待"""
         self.start_time = time.time()
-        print(f"\n⚡ 开始闪电表单处理 - 边检测边处理策略")
+        logger.info(f"\n⚡ 开始闪电表单处理 - 边检测边处理策略")
         
         try:
             # 更新表单数据
@@ -47,24 +51,24 @@ class LightningFormProcessor:
             
             # 策略1: 极限优化 - 一次JavaScript调用（如果页面完全加载）
             if self._quick_element_check():
-                print("🚀 页面已完全加载，使用极限优化策略...")
+                logger.info("🚀 页面已完全加载，使用极限优化策略...")
                 extreme_result = self._process_form_extreme_speed()
                 if extreme_result and extreme_result.get('success'):
                     return extreme_result
             
             # 策略2: 智能渐进式处理 - 边发现边处理
-            print("🔄 使用智能渐进式处理策略...")
+            logger.info("🔄 使用智能渐进式处理策略...")
             progressive_result = self._progressive_form_processing()
             if progressive_result:
                 return progressive_result
             
             # 策略3: 传统备用方案
-            print("🔄 使用传统备用处理方案...")
+            logger.info("🔄 使用传统备用处理方案...")
             return self._fallback_form_processing()
             
         except Exception as e:
             total_time = time.time() - self.start_time
-            print(f"❌ 所有策略都失败: {e}, 耗时: {total_time:.3f}秒")
+            logger.error(f"❌ 所有策略都失败: {e}, 耗时: {total_time:.3f}秒")
             return self._create_result(False, f"处理失败: {e}")
     
     def _quick_element_check(self) -> bool:
@@ -81,7 +85,7 @@ class LightningFormProcessor:
     
     def _progressive_form_processing(self) -> Dict[str, Any]:
         """渐进式表单处理 - 边发现元素边处理，无需等待全部加载"""
-        print("🔄 启动渐进式处理 - 发现一个处理一个...")
+        logger.info("🔄 启动渐进式处理 - 发现一个处理一个...")
         
         processing_results = {
             'birth_filled': False,
@@ -105,7 +109,7 @@ class LightningFormProcessor:
                             birth_input.clear()
                             birth_input.send_keys(self.form_data['birth_date'])
                             processing_results['birth_filled'] = True
-                            print(f"✅ 生日填写完成 ({current_time:.2f}s)")
+                            logger.info(f"✅ 生日填写完成 ({current_time:.2f}s)")
                     except:
                         pass
                 
@@ -117,9 +121,9 @@ class LightningFormProcessor:
                             current_value = phone_input.get_attribute('value').strip()
                             if not current_value:  # 只在空白时填写
                                 phone_input.send_keys(self.form_data['phone'])
-                                print(f"✅ 手机号填写完成 ({current_time:.2f}s)")
+                                logger.info(f"✅ 手机号填写完成 ({current_time:.2f}s)")
                             else:
-                                print(f"⏭️ 手机号已预填 ({current_value}) - 跳过 ({current_time:.2f}s)")
+                                logger.info(f"⏭️ 手机号已预填 ({current_value}) - 跳过 ({current_time:.2f}s)")
                             processing_results['phone_handled'] = True
                     except:
                         pass
@@ -133,7 +137,7 @@ class LightningFormProcessor:
                                 if checkbox and checkbox.is_displayed():
                                     checkbox.click()
                                     processing_results['checkboxes_checked'] += 1
-                                    print(f"✅ 复选框{i+1}勾选完成 ({current_time:.2f}s)")
+                                    logger.info(f"✅ 复选框{i+1}勾选完成 ({current_time:.2f}s)")
                             except:
                                 pass
                 
@@ -148,7 +152,7 @@ class LightningFormProcessor:
                             if submit_btn and submit_btn.is_displayed() and submit_btn.is_enabled():
                                 submit_btn.click()
                                 processing_results['submitted'] = True
-                                print(f"🚀 表单提交完成 ({current_time:.2f}s)")
+                                logger.info(f"🚀 表单提交完成 ({current_time:.2f}s)")
                                 break
                         except:
                             continue
@@ -166,7 +170,7 @@ class LightningFormProcessor:
                 time.sleep(attempt_interval)
                 
             except Exception as e:
-                print(f"⚠️ 渐进处理第{attempt+1}次尝试失败: {e}")
+                logger.warning(f"⚠️ 渐进处理第{attempt+1}次尝试失败: {e}")
                 time.sleep(attempt_interval)
                 continue
         
@@ -174,14 +178,14 @@ class LightningFormProcessor:
         success = processing_results['birth_filled'] and processing_results['submitted']
         
         if success:
-            print(f"🎉 渐进式处理成功! 总耗时: {total_time:.3f}秒")
-            print(f"   处理详情: 生日✅ 手机号✅ 复选框{processing_results['checkboxes_checked']}/2 提交✅")
+            logger.info(f"🎉 渐进式处理成功! 总耗时: {total_time:.3f}秒")
+            logger.info(f"   处理详情: 生日✅ 手机号✅ 复选框{processing_results['checkboxes_checked']}/2 提交✅")
         else:
-            print(f"⚠️ 渐进式处理部分完成: 总耗时: {total_time:.3f}秒")
-            print(f"   处理状态: 生日{'✅' if processing_results['birth_filled'] else '❌'} "
-                  f"手机号{'✅' if processing_results['phone_handled'] else '❌'} "
-                  f"复选框{processing_results['checkboxes_checked']}/2 "
-                  f"提交{'✅' if processing_results['submitted'] else '❌'}")
+            logger.warning(f"⚠️ 渐进式处理部分完成: 总耗时: {total_time:.3f}秒")
+            logger.warning(f"   处理状态: 生日{'✅' if processing_results['birth_filled'] else '❌'} "
+                           f"手机号{'✅' if processing_results['phone_handled'] else '❌'} "
+                           f"复选框{processing_results['checkboxes_checked']}/2 "
+                           f"提交{'✅' if processing_results['submitted'] else '❌'}")
         
         return self._create_result(success, f"渐进式处理完成，耗时{total_time:.3f}秒", {
             'processing_results': processing_results,
@@ -191,13 +195,13 @@ class LightningFormProcessor:
     
     def _fallback_form_processing(self) -> Dict[str, Any]:
         """传统备用处理方案"""
-        print("🔄 启动传统备用处理...")
+        logger.info("🔄 启动传统备用处理...")
         
         try:
             # 阶段1: 快速元素识别
             elements = self._rapid_element_detection_with_selectors()
             detection_time = time.time() - self.start_time
-            print(f"🔍 元素识别完成: {detection_time:.3f}秒")
+            logger.info(f"🔍 元素识别完成: {detection_time:.3f}秒")
             
             if not elements:
                 return self._create_result(False, "未找到表单元素")
@@ -205,12 +209,12 @@ class LightningFormProcessor:
             # 阶段2: 并行填写
             fill_success = self._parallel_form_filling(elements)
             fill_time = time.time() - self.start_time
-            print(f"📝 表单填写完成: {fill_time:.3f}秒")
+            logger.info(f"📝 表单填写完成: {fill_time:.3f}秒")
             
             # 阶段3: 提交表单
             submit_success = self._instant_submit(elements.get('submit_button'))
             submit_time = time.time() - self.start_time
-            print(f"🚀 表单提交完成: {submit_time:.3f}秒")
+            logger.info(f"🚀 表单提交完成: {submit_time:.3f}秒")
             
             total_time = time.time() - self.start_time
             success = fill_success and submit_success
@@ -330,35 +334,35 @@ class LightningFormProcessor:
             total_time = (time.perf_counter() - start_perf) * 1000  # 毫秒
             
             if result['success']:
-                print(f"🚀 极限处理成功!")
-                print(f"   JavaScript执行: {result['jsTime']:.2f}ms")
-                print(f"   Python总耗时: {total_time:.2f}ms")
-                print(f"   完成操作: {', '.join(result['operations'])}")
+                logger.info(f"🚀 极限处理成功!")
+                logger.info(f"   JavaScript执行: {result['jsTime']:.2f}ms")
+                logger.info(f"   Python总耗时: {total_time:.2f}ms")
+                logger.info(f"   完成操作: {', '.join(result['operations'])}")
                 
                 # 显示详细信息
                 details = result.get('details', {})
                 if 'birth_value' in details:
-                    print(f"   ✅ 生日输入: {details['birth_value']}")
+                    logger.info(f"   ✅ 生日输入: {details['birth_value']}")
                 if 'phone_value' in details:
                     phone_action = details.get('phone_action', 'unknown')
                     if phone_action == 'filled_empty_field':
-                        print(f"   ✅ 手机号填写: {details['phone_value']}")
+                        logger.info(f"   ✅ 手机号填写: {details['phone_value']}")
                     elif phone_action == 'skipped_prefilled':
-                        print(f"   📱 手机号已预填: {details['phone_value']} (跳过)")
+                        logger.info(f"   📱 手机号已预填: {details['phone_value']} (跳过)")
                     else:
-                        print(f"   ✅ 手机号处理: {details['phone_value']}")
+                        logger.info(f"   ✅ 手机号处理: {details['phone_value']}")
                 if 'checkboxes_count' in details:
-                    print(f"   ✅ 复选框: {details['checkboxes_count']}个已勾选")
+                    logger.info(f"   ✅ 复选框: {details['checkboxes_count']}个已勾选")
                 if 'submit_button' in details:
-                    print(f"   ✅ 提交按钮: {details['submit_button']}已点击")
+                    logger.info(f"   ✅ 提交按钮: {details['submit_button']}已点击")
                 
                 # 显示错误信息
                 if 'birth_error' in details:
-                    print(f"   ❌ 生日错误: {details['birth_error']}")
+                    logger.warning(f"   ❌ 生日错误: {details['birth_error']}")
                 if 'phone_error' in details:
-                    print(f"   ❌ 手机错误: {details['phone_error']}")
+                    logger.warning(f"   ❌ 手机错误: {details['phone_error']}")
                 if 'submit_error' in details:
-                    print(f"   ❌ 提交错误: {details['submit_error']}")
+                    logger.warning(f"   ❌ 提交错误: {details['submit_error']}")
                 
                 return self._create_result(True, f"极限处理完成，耗时{total_time:.2f}ms", {
                     'total_time_ms': total_time,
@@ -371,7 +375,7 @@ class LightningFormProcessor:
                 raise Exception(result.get('error', 'Unknown error'))
                 
         except Exception as e:
-            print(f"⚠️ 极限优化失败，使用备用方案: {e}")
+            logger.warning(f"⚠️ 极限优化失败，使用备用方案: {e}")
             # 失败时返回None，让主函数使用传统方法
             return None
     
@@ -410,7 +414,7 @@ class LightningFormProcessor:
                             else:
                                 elements[key] = result
                     except Exception as e:
-                        print(f"⚠️ {key} 查找失败: {e}")
+                        logger.warning(f"⚠️ {key} 查找失败: {e}")
                 
                 if checkboxes:
                     elements['checkboxes'] = checkboxes
@@ -418,7 +422,7 @@ class LightningFormProcessor:
             return elements
             
         except Exception as e:
-            print(f"⚠️ 选择器检测失败，使用备用方法: {e}")
+            logger.warning(f"⚠️ 选择器检测失败，使用备用方法: {e}")
             return self._rapid_element_detection()
     
     def _find_element_by_selector(self, selector: str, element_name: str) -> Optional[Any]:
@@ -426,10 +430,11 @@ class LightningFormProcessor:
         try:
             element = self.driver.find_element(By.CSS_SELECTOR, selector)
             if element and element.is_displayed():
-                print(f"✅ 找到{element_name}: {selector}")
+                logger.info(f"✅ 找到{element_name}: {selector}")
                 return element
         except Exception as e:
-            print(f"❌ {element_name}未找到: {e}")
+            # 依次尝试多个选择器，未找到是预期情况，不在静默关键区输出
+            logger.debug(f"❌ {element_name}未找到: {e}")
         return None
     
     def _find_checkbox_parent(self, svg_selector: str, checkbox_name: str) -> Optional[Any]:
@@ -448,21 +453,21 @@ class LightningFormProcessor:
                     try:
                         checkbox_input = parent.find_element(By.CSS_SELECTOR, 'input[type="checkbox"]')
                         if checkbox_input:
-                            print(f"✅ 找到{checkbox_name}的input元素")
+                            logger.info(f"✅ 找到{checkbox_name}的input元素")
                             return checkbox_input
                     except:
                         pass
                     
                     # 如果没有找到input，返回可点击的父元素
                     if parent.is_displayed() and parent.is_enabled():
-                        print(f"✅ 找到{checkbox_name}的可点击元素: {tag_name}")
+                        logger.info(f"✅ 找到{checkbox_name}的可点击元素: {tag_name}")
                         return parent
             
-            print(f"⚠️ {checkbox_name}未找到可点击的父元素，使用SVG元素")
+            logger.warning(f"⚠️ {checkbox_name}未找到可点击的父元素，使用SVG元素")
             return svg_element
             
         except Exception as e:
-            print(f"❌ {checkbox_name}查找失败: {e}")
+            logger.warning(f"❌ {checkbox_name}查找失败: {e}")
             return None
     
     def _find_submit_button_fast(self) -> Optional[Any]:
@@ -493,25 +498,25 @@ class LightningFormProcessor:
             button = self.driver.execute_script(js_script, self.form_selectors['submit_button_selectors'])
             if button:
                 element_type = button.tag_name.lower()
-                print(f"✅ 找到提交按钮 ({element_type})")
+                logger.info(f"✅ 找到提交按钮 ({element_type})")
                 return button
             
         except Exception as e:
-            print(f"⚠️ JavaScript查找按钮失败: {e}")
+            logger.warning(f"⚠️ JavaScript查找按钮失败: {e}")
         
         # 备用方法：查找button或input[type="submit"]
         try:
             # 先查找input[type="submit"]
             submit_inputs = self.driver.find_elements(By.CSS_SELECTOR, 'input[type="submit"]')
             if submit_inputs:
-                print(f"✅ 找到input类型的提交按钮")
+                logger.info(f"✅ 找到input类型的提交按钮")
                 return submit_inputs[0]
             
             # 再查找button
             buttons = self.driver.find_elements(By.TAG_NAME, 'button')
             if buttons:
                 last_button = buttons[-1]
-                print(f"✅ 使用最后一个button作为提交按钮")
+                logger.info(f"✅ 使用最后一个button作为提交按钮")
                 return last_button
         except:
             pass
@@ -573,7 +578,7 @@ class LightningFormProcessor:
             return elements
             
         except Exception as e:
-            print(f"⚠️ 通用JavaScript检测失败: {e}")
+            logger.warning(f"⚠️ 通用JavaScript检测失败: {e}")
             return {}
     
     def _find_birth_input_generic(self, inputs: List[Dict]) -> Optional[Dict]:
@@ -646,12 +651,12 @@ class LightningFormProcessor:
                         if future.result():
                             success_count += 1
                     except Exception as e:
-                        print(f"⚠️ 并行任务失败: {e}")
+                        logger.warning(f"⚠️ 并行任务失败: {e}")
                 
                 return success_count > 0
                 
         except Exception as e:
-            print(f"❌ 并行填写失败: {e}")
+            logger.error(f"❌ 并行填写失败: {e}")
             return False
     
     def _fill_birth_input(self, element) -> bool:
@@ -664,10 +669,10 @@ class LightningFormProcessor:
                 arguments[0].dispatchEvent(new Event('change', {bubbles: true}));
                 arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
             """, element)
-            print(f"✅ 生日填写完成: {self.form_data['birth_date']}")
+            logger.info(f"✅ 生日填写完成: {self.form_data['birth_date']}")
             return True
         except Exception as e:
-            print(f"❌ 生日填写失败: {e}")
+            logger.error(f"❌ 生日填写失败: {e}")
             return False
     
     def _fill_phone_input(self, element) -> bool:
@@ -676,7 +681,7 @@ class LightningFormProcessor:
             # 检查当前值是否为空
             current_value = element.get_attribute('value')
             if current_value and current_value.strip():
-                print(f"📱 手机号已预填，跳过填写: {current_value}")
+                logger.info(f"📱 手机号已预填，跳过填写: {current_value}")
                 return True
             
             # 为空时才填写
@@ -686,10 +691,10 @@ class LightningFormProcessor:
                 arguments[0].dispatchEvent(new Event('change', {bubbles: true}));
                 arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
             """, element)
-            print(f"✅ 手机号填写完成: {self.form_data['phone']}")
+            logger.info(f"✅ 手机号填写完成: {self.form_data['phone']}")
             return True
         except Exception as e:
-            print(f"❌ 手机号处理失败: {e}")
+            logger.error(f"❌ 手机号处理失败: {e}")
             return False
     
     def _check_all_checkboxes(self, checkboxes: List) -> bool:
@@ -702,21 +707,21 @@ class LightningFormProcessor:
                         # 使用JavaScript点击，最快
                         self.driver.execute_script("arguments[0].click();", checkbox)
                         success_count += 1
-                        print(f"✅ 复选框{i+1}勾选完成")
+                        logger.info(f"✅ 复选框{i+1}勾选完成")
                 except Exception as e:
-                    print(f"⚠️ 复选框{i+1}勾选失败: {e}")
+                    logger.warning(f"⚠️ 复选框{i+1}勾选失败: {e}")
             
             return success_count > 0
             
         except Exception as e:
-            print(f"❌ 复选框处理失败: {e}")
+            logger.error(f"❌ 复选框处理失败: {e}")
             return False
     
     def _instant_submit(self, submit_button) -> bool:
         """瞬间提交表单"""
         try:
             if not submit_button:
-                print("❌ 未找到提交按钮")
+                logger.error("❌ 未找到提交按钮")
                 return False
             
             # 开始网络监控
@@ -725,7 +730,7 @@ class LightningFormProcessor:
             
             # 使用JavaScript点击提交按钮，最快
             self.driver.execute_script("arguments[0].click();", submit_button)
-            print("🚀 表单提交完成")
+            logger.info("🚀 表单提交完成")
             
             # 短暂等待网络请求
             time.sleep(0.1)
@@ -733,7 +738,7 @@ class LightningFormProcessor:
             return True
             
         except Exception as e:
-            print(f"❌ 表单提交失败: {e}")
+            logger.error(f"❌ 表单提交失败: {e}")
             return False
     
     def _create_result(self, success: bool, message: str, extra_data: Dict = None) -> Dict[str, Any]:
@@ -783,8 +788,7 @@ class LightningFormProcessor:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = os.path.join(data_dir, f"lightning_form_data_{timestamp}.json")
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            SnapshotStore(root=os.path.join(data_dir, 'snapshots')).dump_json(data, filename)
             
             print(f"📁 数据已保存到: {filename}")
             
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+body_fetcher.py
+选择性响应体抓取 - 只对关键请求调用 Network.getResponseBody，后台线程池执行
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, Optional
+
+from .request_classifier import get_request_classifier
+
+# 导入监控配置
+try:
+    from config.latency_config import get_monitoring_config
+    MONITORING_CONFIG_AVAILABLE = True
+except ImportError:
+    MONITORING_CONFIG_AVAILABLE = False
+
+DEFAULT_BODY_CAPTURE_CONFIG = {
+    'enabled': True,
+    'max_workers': 2,
+    'byte_budget': 5 * 1024 * 1024,
+    'max_body_bytes': 256 * 1024,
+    'drain_timeout_s': 2,
+}
+
+
+class ResponseBodyFetcher:
+    """响应体抓取器 - 不阻塞日志捕获循环"""
+
+    def __init__(self, driver, classifier=None, config: Optional[Dict[str, Any]] = None):
+        self.driver = driver
+        self.classifier = classifier or get_request_classifier()
+
+        self.config = dict(DEFAULT_BODY_CAPTURE_CONFIG)
+        if MONITORING_CONFIG_AVAILABLE:
+            self.config.update(get_monitoring_config().get('response_body_capture', {}))
+        if config:
+            self.config.update(config)
+
+        self.enabled = bool(self.config['enabled'])
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config['max_workers'],
+            thread_name_prefix='body-fetcher'
+        )
+        self.lock = threading.Lock()
+
+        # requestId → 关联记录 {'request': {...}, 'response': {...}}
+        self.records: Dict[str, Dict[str, Any]] = {}
+        # 等待 loadingFinished 的关键请求
+        self.pending: set = set()
+        # 未完成的抓取任务（完成后在下次提交时清理）
+        self.futures = []
+
+        # 已挂到记录上的字节数（按截断后的实际内容计算）
+        self.bytes_reserved = 0
+        self.stats = {
+            'queued': 0,
+            'fetched': 0,
+            'failed': 0,
+            'skipped_budget': 0,
+            'truncated': 0,
+            'bytes_fetched': 0
+        }
+
+    def on_request(self, request_id: str, record: Dict[str, Any], params: Dict[str, Any]) -> None:
+        """处理 Network.requestWillBeSent"""
+        if not self.enabled or not request_id:
+            return
+
+        request = params.get('request', {})
+        if not self.classifier.is_detailed(request.get('method', 'GET'), request.get('url', '')):
+            return
+
+        with self.lock:
+            self.records.setdefault(request_id, {})['request'] = record
+
+        post_data = request.get('postData')
+        if post_data:
+            record['request_body'] = post_data
+        elif request.get('hasPostData'):
+            # 请求体过大时日志中不带 postData，需要单独抓取（同样受字节预算限制）
+            if self._budget_exhausted(record, 'request_body'):
+                return
+            self._submit(self._fetch_request_body, request_id, record)
+
+    def on_response(self, request_id: str, record: Dict[str, Any], params: Dict[str, Any]) -> None:
+        """处理 Network.responseReceived - 标记为待抓取，等加载完成再取响应体"""
+        if not self.enabled or not request_id:
+            return
+
+        response = params.get('response', {})
+        with self.lock:
+            correlated = self.records.get(request_id)
+            method = record.get('method', 'GET')
+            if correlated and correlated.get('request'):
+                # 响应日志里的方法不可靠，以请求记录为准
+                method = correlated['request'].get('method', method)
+                record['method'] = method
+
+        if not self.classifier.is_detailed(method, response.get('url', '')):
+            with self.lock:
+                self.records.pop(request_id, None)
+            return
+
+        with self.lock:
+            correlated = self.records.setdefault(request_id, {})
+            correlated['response'] = record
+            request_record = correlated.get('request')
+            if request_record and request_record.get('request_body'):
+                record['request_body'] = request_record['request_body']
+            self.pending.add(request_id)
+
+    def on_loading_finished(self, params: Dict[str, Any]) -> None:
+        """处理 Network.loadingFinished - 响应体就绪后排队抓取"""
+        request_id = params.get('requestId')
+        with self.lock:
+            # 请求已结束，关联记录不再需要
+            correlated = self.records.pop(request_id, {})
+            if request_id not in self.pending:
+                return
+            self.pending.discard(request_id)
+            record = correlated.get('response')
+
+        # encodedDataLength 是压缩后的大小，无法预估解码后的大小；
+        # 这里只拦截预算已用完的情况，实际占用在挂载时按解码后的长度计算
+        if record is None or self._budget_exhausted(record, 'response_body'):
+            return
+        self._submit(self._fetch_response_body, request_id, record)
+
+    def on_loading_failed(self, params: Dict[str, Any]) -> None:
+        """处理 Network.loadingFailed - 放弃抓取"""
+        request_id = params.get('requestId')
+        with self.lock:
+            self.pending.discard(request_id)
+            self.records.pop(request_id, None)
+
+    def _budget_exhausted(self, record: Dict[str, Any], key: str) -> bool:
+        """预算已用完时标记记录并跳过抓取"""
+        with self.lock:
+            if self.bytes_reserved < self.config['byte_budget']:
+                return False
+            self.stats['skipped_budget'] += 1
+            record[f'{key}_skipped'] = 'byte_budget'
+            return True
+
+    def _submit(self, fn, request_id: str, record: Dict[str, Any]) -> None:
+        """提交抓取任务"""
+        with self.lock:
+            self.stats['queued'] += 1
+            self.futures = [future for future in self.futures if not future.done()]
+            try:
+                self.futures.append(self.executor.submit(fn, request_id, record))
+            except RuntimeError:
+                # 线程池已关闭
+                self.stats['failed'] += 1
+
+    def _fetch_response_body(self, request_id: str, record: Dict[str, Any]) -> None:
+        """后台线程：抓取响应体并挂到关联记录上"""
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            extra = {'response_body_base64': True} if result.get('base64Encoded') else {}
+            self._attach(record, 'response_body', result.get('body', ''), extra)
+        except Exception as e:
+            with self.lock:
+                self.stats['failed'] += 1
+                record['response_body_error'] = str(e)[:200]
+
+    def _fetch_request_body(self, request_id: str, record: Dict[str, Any]) -> None:
+        """后台线程：抓取日志中缺失的请求体"""
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getRequestPostData', {'requestId': request_id})
+            self._attach(record, 'request_body', result.get('postData', ''))
+        except Exception as e:
+            with self.lock:
+                self.stats['failed'] += 1
+                record['request_body_error'] = str(e)[:200]
+
+    def _attach(self, record: Dict[str, Any], key: str, body: str,
+                extra: Optional[Dict[str, Any]] = None) -> None:
+        """按单个上限和剩余预算截断后挂到记录上，按截断后的长度占用字节预算"""
+        # 记录会被会话日志在其他线程序列化，修改都在锁内完成
+        with self.lock:
+            remaining = self.config['byte_budget'] - self.bytes_reserved
+            if remaining <= 0:
+                self.stats['skipped_budget'] += 1
+                record[f'{key}_skipped'] = 'byte_budget'
+                return
+            max_bytes = min(self.config['max_body_bytes'], remaining)
+            truncated = len(body) > max_bytes
+            if truncated:
+                body = body[:max_bytes]
+            self.bytes_reserved += len(body)
+
+            if truncated:
+                record[f'{key}_truncated'] = True
+                self.stats['truncated'] += 1
+            record[key] = body
+            if extra:
+                record.update(extra)
+            self.stats['fetched'] += 1
+            self.stats['bytes_fetched'] += len(body)
+
+    def drain(self, timeout: Optional[float] = None) -> None:
+        """等待已排队的抓取完成并关闭线程池"""
+        if timeout is None:
+            timeout = self.config['drain_timeout_s']
+        with self.lock:
+            futures = list(self.futures)
+        if futures:
+            wait(futures, timeout=timeout)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取抓取统计"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['pending'] = len(self.pending)
+            stats['bytes_reserved'] = self.bytes_reserved
+            return stats
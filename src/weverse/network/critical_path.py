@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+critical_path.py
+点击后关键路径分析 - 结合网络记录与页面里程碑，找出阻塞表单出现的请求链
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+# 需要保留的性能日志事件
+TIMELINE_EVENTS = {
+    'Network.requestWillBeSent',
+    'Network.responseReceived',
+    'Network.loadingFinished',
+    'Network.loadingFailed',
+    'Page.domContentEventFired',
+    'Page.loadEventFired',
+}
+
+# 页面里程碑事件 -> 报告字段
+MILESTONE_EVENTS = {
+    'Page.domContentEventFired': 'dom_content_loaded',
+    'Page.loadEventFired': 'load_event',
+}
+
+# 时间线事件默认保留条数（监控期间只保留最近的事件）
+DEFAULT_MAX_TIMELINE_EVENTS = 20000
+
+# 会阻塞表单渲染的资源类型（图片、字体等不计入）
+GATING_RESOURCE_TYPES = {'Document', 'Script', 'XHR', 'Fetch', 'Stylesheet'}
+
+
+def compact_timeline_event(event: str, params: Dict[str, Any], log_timestamp: int) -> Optional[Dict[str, Any]]:
+    """
+    将性能日志事件压缩为分析所需的最小字段
+
+    Args:
+        event: CDP事件名
+        params: 事件参数
+        log_timestamp: 日志时间戳（毫秒，墙上时间）
+
+    Returns:
+        压缩后的事件，非时间线事件返回None
+    """
+    if event not in TIMELINE_EVENTS:
+        return None
+
+    compact = {'event': event, 'ts': log_timestamp, 'requestId': params.get('requestId')}
+
+    if event == 'Network.requestWillBeSent':
+        request = params.get('request', {})
+        initiator = params.get('initiator', {})
+        initiator_url = initiator.get('url', '')
+        if not initiator_url:
+            # 脚本发起的请求取调用栈顶部的脚本URL
+            call_frames = (initiator.get('stack') or {}).get('callFrames') or []
+            if call_frames:
+                initiator_url = call_frames[0].get('url', '')
+        compact.update({
+            'url': request.get('url', ''),
+            'method': request.get('method', 'GET'),
+            'resourceType': params.get('type', 'Other'),
+            'initiatorType': initiator.get('type', 'other'),
+            'initiatorUrl': initiator_url,
+        })
+    elif event == 'Network.responseReceived':
+        response = params.get('response', {})
+        compact.update({
+            'status': response.get('status'),
+            'fromCache': bool(response.get('fromDiskCache') or response.get('fromServiceWorker')),
+        })
+    elif event == 'Network.loadingFinished':
+        compact['encodedDataLength'] = int(params.get('encodedDataLength') or 0)
+    elif event == 'Network.loadingFailed':
+        compact['errorText'] = params.get('errorText', '')
+        compact['blocked'] = bool(params.get('blockedReason'))
+
+    return compact
+
+
+class CriticalPathAnalyzer:
+    """关键路径分析器"""
+
+    def __init__(self, events: List[Dict[str, Any]], click_time_ms: float,
+                 form_ready_ms: Optional[float] = None, form_selector: str = ''):
+        """
+        Args:
+            events: compact_timeline_event 生成的事件列表
+            click_time_ms: 点击申请按钮的时间（毫秒，墙上时间）
+            form_ready_ms: 表单关键元素首次出现的时间（毫秒，墙上时间）
+            form_selector: 表单关键元素选择器（仅用于报告）
+        """
+        self.events = sorted(events, key=lambda e: e['ts'])
+        self.click_time_ms = click_time_ms
+        self.form_ready_ms = form_ready_ms
+        self.form_selector = form_selector
+
+    def _build_records(self) -> List[Dict[str, Any]]:
+        """按requestId关联请求的开始、响应、结束事件"""
+        records: Dict[str, Dict[str, Any]] = {}
+        milestones = {}
+
+        for event in self.events:
+            name = event['event']
+            if name in MILESTONE_EVENTS:
+                # 只取点击之后的第一次（点击前的事件属于上一个页面）
+                if event['ts'] >= self.click_time_ms:
+                    milestones.setdefault(MILESTONE_EVENTS[name], event['ts'])
+                continue
+
+            request_id = event.get('requestId')
+            if not request_id:
+                continue
+
+            if name == 'Network.requestWillBeSent':
+                previous = records.get(request_id)
+                records[request_id] = {
+                    'requestId': request_id,
+                    'url': event['url'],
+                    'method': event['method'],
+                    'resourceType': event['resourceType'],
+                    'initiatorType': event['initiatorType'],
+                    'initiatorUrl': event['initiatorUrl'],
+                    'start_ts': event['ts'],
+                    'response_ts': None,
+                    'end_ts': None,
+                    'status': None,
+                    'bytes': 0,
+                    'failed': False,
+                    'fromCache': False,
+                }
+                if previous:
+                    # 重定向复用同一requestId：保留最终URL，起点算到第一次请求
+                    records[request_id]['start_ts'] = previous['start_ts']
+                    records[request_id]['redirected'] = True
+                continue
+
+            record = records.get(request_id)
+            if not record:
+                continue
+            if name == 'Network.responseReceived':
+                record['response_ts'] = event['ts']
+                record['status'] = event.get('status')
+                record['fromCache'] = event.get('fromCache', False)
+            elif name == 'Network.loadingFinished':
+                record['end_ts'] = event['ts']
+                record['bytes'] = event.get('encodedDataLength', 0)
+            elif name == 'Network.loadingFailed':
+                record['end_ts'] = event['ts']
+                record['failed'] = True
+                record['errorText'] = event.get('errorText', '')
+
+        self._milestones = milestones
+        return list(records.values())
+
+    def _rel(self, ts: Optional[float]) -> Optional[float]:
+        """转换为相对点击时间的毫秒数"""
+        if ts is None:
+            return None
+        return round(ts - self.click_time_ms, 1)
+
+    def _find_parent(self, record: Dict[str, Any], by_url: Dict[str, List[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """根据initiator找到发起该请求的父请求（同URL中最近一次更早开始的）"""
+        candidates = by_url.get(record['initiatorUrl'] or '', [])
+        parent = None
+        for candidate in candidates:
+            if candidate is record or candidate['start_ts'] > record['start_ts']:
+                continue
+            if parent is None or candidate['start_ts'] > parent['start_ts']:
+                parent = candidate
+        return parent
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        计算关键路径
+
+        Returns:
+            可直接保存为JSON的分析报告
+        """
+        records = self._build_records()
+        window_end = self.form_ready_ms
+        if window_end is None:
+            ends = [r['end_ts'] for r in records if r['end_ts'] is not None]
+            window_end = max(ends) if ends else self.click_time_ms
+
+        by_url: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_url.setdefault(record['url'], []).append(record)
+
+        # 与 [点击, 表单出现] 窗口重叠、且类型会阻塞渲染的请求
+        gating = []
+        for record in records:
+            end_ts = record['end_ts'] if record['end_ts'] is not None else window_end
+            if record['resourceType'] not in GATING_RESOURCE_TYPES:
+                continue
+            if end_ts < self.click_time_ms or record['start_ts'] > window_end:
+                continue
+            gating.append(record)
+
+        # 关键链：窗口内最晚完成的阻塞请求，沿initiator回溯
+        critical_chain = []
+        finished_in_window = [r for r in gating if r['end_ts'] is not None and r['end_ts'] <= window_end]
+        if finished_in_window:
+            tail = max(finished_in_window, key=lambda r: r['end_ts'])
+            seen = set()
+            node = tail
+            while node and node['requestId'] not in seen:
+                seen.add(node['requestId'])
+                critical_chain.append(node)
+                node = self._find_parent(node, by_url)
+            critical_chain.reverse()
+        chain_ids = {r['requestId'] for r in critical_chain}
+
+        def describe(record: Dict[str, Any]) -> Dict[str, Any]:
+            start = self._rel(record['start_ts'])
+            end = self._rel(record['end_ts'])
+            response = self._rel(record['response_ts'])
+            return {
+                'url': record['url'],
+                'method': record['method'],
+                'resource_type': record['resourceType'],
+                'initiator': record['initiatorUrl'] or record['initiatorType'],
+                'status': record['status'],
+                'start_ms': start,
+                'ttfb_ms': round(response - start, 1) if response is not None else None,
+                'end_ms': end,
+                'duration_ms': round(end - start, 1) if end is not None else None,
+                'bytes': record['bytes'],
+                'from_cache': record['fromCache'],
+                'failed': record['failed'],
+                'on_critical_path': record['requestId'] in chain_ids,
+            }
+
+        gating.sort(key=lambda r: r['start_ts'])
+        chain_described = [describe(r) for r in critical_chain]
+
+        by_type: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            stats = by_type.setdefault(record['resourceType'], {'count': 0, 'bytes': 0, 'total_ms': 0.0})
+            stats['count'] += 1
+            stats['bytes'] += record['bytes']
+            if record['end_ts'] is not None:
+                stats['total_ms'] = round(stats['total_ms'] + record['end_ts'] - record['start_ts'], 1)
+
+        form_ready_rel = self._rel(self.form_ready_ms)
+        chain_end = chain_described[-1]['end_ms'] if chain_described else None
+
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'click_time': datetime.fromtimestamp(self.click_time_ms / 1000).isoformat(),
+            'form_selector': self.form_selector,
+            'milestones_ms': {
+                'click': 0.0,
+                'dom_content_loaded': self._rel(self._milestones.get('dom_content_loaded')),
+                'load_event': self._rel(self._milestones.get('load_event')),
+                'form_ready': form_ready_rel,
+            },
+            'total_requests': len(records),
+            'gating_request_count': len(gating),
+            'gating_requests': [describe(r) for r in gating],
+            'critical_path': chain_described,
+            'critical_path_end_ms': chain_end,
+            # 关键链结束到表单出现之间的时间：JS执行、渲染和检测间隔
+            'post_network_ms': round(form_ready_rel - chain_end, 1)
+            if form_ready_rel is not None and chain_end is not None else None,
+            'by_resource_type': by_type,
+        }
+
+
+def render_waterfall(report: Dict[str, Any], width: int = 60) -> str:
+    """
+    渲染文本瀑布图
+
+    Args:
+        report: CriticalPathAnalyzer.analyze() 的结果
+        width: 时间轴宽度（字符）
+
+    Returns:
+        瀑布图文本
+    """
+    rows = report.get('gating_requests', [])
+    milestones = report.get('milestones_ms', {})
+    candidates = [r['end_ms'] for r in rows if r['end_ms'] is not None]
+    candidates += [v for v in milestones.values() if v is not None]
+    span = max(candidates) if candidates else 0
+    span = max(span, 1.0)
+    scale = width / span
+
+    def column(ms: float) -> int:
+        return max(0, min(width - 1, int(ms * scale)))
+
+    lines = [f"⏱️ 点击后关键路径瀑布图 (0 → {span:.0f}ms, 每格 {span / width:.0f}ms)"]
+
+    # 里程碑刻度
+    marker_line = [' '] * width
+    marker_legend = []
+    for key, symbol in (('dom_content_loaded', 'D'), ('load_event', 'L'), ('form_ready', 'F')):
+        value = milestones.get(key)
+        if value is not None and value >= 0:
+            marker_line[column(value)] = symbol
+            marker_legend.append(f"{symbol}={key} {value:.0f}ms")
+    lines.append(f"{'':>44}|{''.join(marker_line)}|")
+
+    for row in rows:
+        start = max(0.0, row['start_ms'] or 0.0)
+        end = row['end_ms'] if row['end_ms'] is not None else span
+        bar = [' '] * width
+        first, last = column(start), column(end)
+        fill = '█' if row['on_critical_path'] else '▒'
+        for i in range(first, last + 1):
+            bar[i] = fill
+        label = row['url'].split('?')[0][-34:]
+        duration = f"{row['duration_ms']:.0f}ms" if row['duration_ms'] is not None else '未完成'
+        lines.append(f"{row['resource_type'][:8]:<8} {label:<35}|{''.join(bar)}| {duration}")
+
+    lines.append(f"{'':>44}  {' | '.join(marker_legend)}")
+    lines.append("█ = 关键路径  ▒ = 其他阻塞请求")
+
+    chain = report.get('critical_path', [])
+    if chain:
+        lines.append(f"🔗 关键链 ({len(chain)} 个请求):")
+        for i, item in enumerate(chain, 1):
+            lines.append(f"   {i}. {item['method']} {item['url'][:80]} "
+                         f"({item['start_ms']:.0f}→{item['end_ms']:.0f}ms, TTFB {item['ttfb_ms'] or 0:.0f}ms)")
+        if report.get('post_network_ms') is not None:
+            lines.append(f"   网络结束后到表单出现: {report['post_network_ms']:.0f}ms (JS执行/渲染/检测间隔)")
+
+    return '\n'.join(lines)
+
+
+def save_critical_path_report(report: Dict[str, Any], data_dir: str = "data") -> str:
+    """保存关键路径报告（JSON + 瀑布图文本）"""
+    try:
+        os.makedirs(data_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        json_path = os.path.join(data_dir, f"critical_path_{timestamp}.json")
+        text_path = os.path.join(data_dir, f"critical_path_{timestamp}.txt")
+
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(render_waterfall(report))
+
+        print(f"📁 关键路径报告已保存到: {json_path}")
+        return json_path
+    except Exception as e:
+        print(f"❌ 保存关键路径报告失败: {e}")
+        return ""
+
+
+def analyze_post_click_path(driver, click_time: float, form_ready_time: Optional[float],
+                            network_monitor=None, form_selector: str = '',
+                            save: bool = True) -> Dict[str, Any]:
+    """
+    分析点击申请到表单出现之间的关键路径
+
+    Args:
+        driver: WebDriver实例
+        click_time: 点击时间（time.time()秒）
+        form_ready_time: 表单关键元素出现时间（time.time()秒），未检测到为None
+        network_monitor: 正在运行的EnhancedNetworkMonitor（它会消费性能日志，需从它取事件）
+        form_selector: 表单关键元素选择器
+        save: 是否保存报告
+
+    Returns:
+        分析报告
+    """
+    events = []
+    if network_monitor is not None and hasattr(network_monitor, 'get_timeline_events'):
+        events = network_monitor.get_timeline_events()
+    else:
+        try:
+            for log in driver.get_log('performance'):
+                try:
+                    message = json.loads(log['message'])['message']
+                    compact = compact_timeline_event(message['method'], message.get('params', {}), log['timestamp'])
+                    if compact:
+                        events.append(compact)
+                except Exception:
+                    continue
+        except Exception as e:
+            print(f"⚠️ 性能日志读取失败: {e}")
+
+    analyzer = CriticalPathAnalyzer(
+        events,
+        click_time_ms=click_time * 1000,
+        form_ready_ms=form_ready_time * 1000 if form_ready_time else None,
+        form_selector=form_selector
+    )
+    report = analyzer.analyze()
+    print(render_waterfall(report))
+
+    if save:
+        report['saved_to'] = save_critical_path_report(report)
+    return report
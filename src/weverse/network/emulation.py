@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+emulation.py
+网络条件模拟 - 通过CDP施加延迟/带宽/抖动配置，配合本地夹具服务器离线验证提前点击模型
+"""
+
+import os
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+
+# 导入延迟配置
+try:
+    from config.latency_config import (
+        get_network_emulation_profiles, get_network_benchmark_config, get_optimized_preclick_ms
+    )
+    LATENCY_CONFIG_AVAILABLE = True
+except ImportError:
+    LATENCY_CONFIG_AVAILABLE = False
+
+DEFAULT_EMULATION_PROFILES = {
+    'lan': {'latency_ms': 0, 'download_kbps': 0, 'upload_kbps': 0, 'jitter_ms': 0,
+            'description': '本机回环，无额外延迟（基线）'},
+}
+
+DEFAULT_BENCHMARK_CONFIG = {
+    'runs_per_profile': 5,
+    'profiles': ['lan'],
+    'bundle_kb': 300,
+    'server_delay_ms': 20,
+    'submit_timeout_s': 10,
+    'random_seed': 42,
+}
+
+# 与 BUTTON_SELECTORS['core_application'] 结构一致的公告页
+NOTICE_PAGE_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="UTF-8"><title>공지사항</title></head>
+<body>
+    <div id="modal">
+        <div>
+            <div class="NoticeModalView_notice_wrap__fhTTz">
+                <h1>이벤트 참여 안내</h1>
+                <div class="NoticeModalView_floating__Mx9Cs">
+                    <a href="/form?page=form">참여 신청하기</a>
+                </div>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# 注入表单页：阻塞主脚本 + 提交时发送真实POST并记录回执时间
+FORM_BENCHMARK_INJECTION = """
+    <script src="/static/app.js"></script>
+    <script>
+        window.__benchmarkSubmitAck = null;
+        document.addEventListener('submit', function () {
+            var form = document.getElementById('application-form');
+            var payload = {};
+            new FormData(form).forEach(function (v, k) { payload[k] = v; });
+            fetch('/api/submit', {method: 'POST', body: JSON.stringify(payload)})
+                .then(function () { window.__benchmarkSubmitAck = Date.now(); });
+        }, true);
+    </script>
+"""
+
+
+def get_network_profile(name: str) -> Dict[str, Any]:
+    """按名称获取网络配置"""
+    profiles = get_network_emulation_profiles() if LATENCY_CONFIG_AVAILABLE else DEFAULT_EMULATION_PROFILES
+    if name not in profiles:
+        raise ValueError(f"未知的网络配置: {name}，可选: {', '.join(profiles)}")
+    return profiles[name]
+
+
+def sample_latency_ms(profile: Dict[str, Any], rng: Optional[random.Random] = None) -> float:
+    """按抖动范围采样本轮延迟（CDP只支持固定延迟，抖动在轮次之间体现）"""
+    rng = rng or random
+    jitter = profile.get('jitter_ms', 0)
+    latency = profile.get('latency_ms', 0)
+    if jitter:
+        latency += rng.uniform(-jitter, jitter)
+    return max(0.0, round(latency, 1))
+
+
+def apply_network_profile(driver, profile: Dict[str, Any], rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """
+    施加网络条件
+
+    Returns:
+        实际下发的CDP参数（含本轮采样延迟）
+    """
+    def to_bytes_per_second(kbps):
+        # CDP要求字节/秒，-1 表示不限速
+        return kbps * 1024 / 8 if kbps else -1
+
+    conditions = {
+        'offline': False,
+        'latency': sample_latency_ms(profile, rng),
+        'downloadThroughput': to_bytes_per_second(profile.get('download_kbps', 0)),
+        'uploadThroughput': to_bytes_per_second(profile.get('upload_kbps', 0)),
+    }
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.emulateNetworkConditions', conditions)
+    return conditions
+
+
+def clear_network_emulation(driver) -> None:
+    """恢复正常网络"""
+    try:
+        driver.execute_cdp_cmd('Network.emulateNetworkConditions', {
+            'offline': False, 'latency': 0, 'downloadThroughput': -1, 'uploadThroughput': -1
+        })
+    except Exception as e:
+        print(f"⚠️ 恢复网络条件失败: {e}")
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """夹具请求处理 - 公告页 → 表单页（阻塞脚本） → 提交API"""
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path in ('/', '/notice'):
+            self._send(NOTICE_PAGE_HTML.encode('utf-8'), 'text/html; charset=utf-8')
+        elif path == '/form':
+            self._send(self.server.form_html, 'text/html; charset=utf-8')
+        elif path == '/static/app.js':
+            self._send(self.server.bundle, 'application/javascript')
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self.path.split('?', 1)[0] != '/api/submit':
+            self.send_error(404)
+            return
+        with self.server.lock:
+            self.server.submissions.append({'received_at': time.time(), 'bytes': len(body)})
+        self._send(json.dumps({'success': True}).encode('utf-8'), 'application/json')
+
+    def _send(self, payload: bytes, content_type: str):
+        delay_ms = self.server.server_delay_ms
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Cache-Control', 'no-store')  # 每轮都走网络，不吃缓存
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # 静默，避免刷屏
+        pass
+
+
+class LocalFixtureServer:
+    """本地夹具服务器 - file:// 页面不经过网络栈，无法被模拟，必须走HTTP"""
+
+    def __init__(self, form_html_path: str, bundle_kb: int = 300, server_delay_ms: int = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        with open(form_html_path, 'r', encoding='utf-8') as f:
+            form_html = f.read()
+        form_html = form_html.replace('</head>', FORM_BENCHMARK_INJECTION + '</head>', 1)
+
+        self.httpd = ThreadingHTTPServer((host, port), _FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.form_html = form_html.encode('utf-8')
+        # 填充注释模拟打包后的主脚本体积
+        padding = '/*' + 'x' * max(0, bundle_kb * 1024 - 64) + '*/'
+        self.httpd.bundle = (padding + '\nwindow.__bundleLoaded = Date.now();\n').encode('utf-8')
+        self.httpd.server_delay_ms = server_delay_ms
+        self.httpd.submissions = []
+        self.httpd.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def notice_url(self) -> str:
+        return f"{self.base_url}/notice"
+
+    def get_submissions(self) -> List[Dict[str, Any]]:
+        """获取服务端收到的提交"""
+        with self.httpd.lock:
+            return list(self.httpd.submissions)
+
+    def start(self) -> 'LocalFixtureServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='fixture-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """线性插值百分位"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def summarize_runs(profile_name: str, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """汇总单个配置的多轮结果"""
+    latencies = [run['end_to_end_ms'] for run in runs if run.get('success')]
+    summary = {
+        'profile': profile_name,
+        'runs': len(runs),
+        'success': len(latencies),
+        'mean_ms': round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p90_ms': round(percentile(latencies, 90), 1),
+        'max_ms': round(max(latencies), 1) if latencies else 0.0,
+    }
+    click_to_form = [run['click_to_form_ms'] for run in runs if run.get('click_to_form_ms') is not None]
+    summary['click_to_form_p50_ms'] = round(percentile(click_to_form, 50), 1)
+    summary['click_to_form_p90_ms'] = round(percentile(click_to_form, 90), 1)
+    return summary
+
+
+def render_benchmark_table(summaries: List[Dict[str, Any]]) -> str:
+    """渲染端到端延迟表，并与提前点击模型对比"""
+    lines = [
+        f"{'配置':<26}{'成功':>7}{'平均':>9}{'P50':>9}{'P90':>9}{'最大':>9}{'点击→表单':>11}",
+        '-' * 80,
+    ]
+    for s in summaries:
+        lines.append(
+            f"{s['profile']:<26}{s['success']:>3}/{s['runs']:<3}"
+            f"{s['mean_ms']:>9.1f}{s['p50_ms']:>9.1f}{s['p90_ms']:>9.1f}{s['max_ms']:>9.1f}"
+            f"{s['click_to_form_p50_ms']:>11.1f}"
+        )
+
+    if LATENCY_CONFIG_AVAILABLE:
+        internal = get_optimized_preclick_ms('internal')
+        external = get_optimized_preclick_ms('external')
+        lines.append('-' * 80)
+        lines.append(f"提前点击模型: 页面内跳转 {internal}ms / 外部请求 {external}ms")
+        for s in summaries:
+            if not s['success']:
+                continue
+            # 提前量应覆盖点击→表单就绪；P90 超出说明模型偏乐观
+            observed = s['click_to_form_p90_ms']
+            verdict = '✅ 覆盖' if observed <= internal else (
+                '⚠️ 需外部模型' if observed <= external else '❌ 模型不足')
+            lines.append(f"   {s['profile']:<26}点击→表单 P90 {observed:.1f}ms  {verdict}")
+    return '\n'.join(lines)
+
+
+def get_benchmark_config() -> Dict[str, Any]:
+    """获取基准测试配置"""
+    config = dict(DEFAULT_BENCHMARK_CONFIG)
+    if LATENCY_CONFIG_AVAILABLE:
+        config.update(get_network_benchmark_config())
+    return config
+
+
+def default_form_fixture_path() -> str:
+    """默认表单夹具（tests/test_lightning_form.html）"""
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    return os.path.join(project_root, 'tests', 'test_lightning_form.html')
@@ -8,27 +8,50 @@ enhanced_monitor.py
 import time
 import json
 import threading
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from concurrent.futures import ThreadPoolExecutor
 
+from .request_classifier import get_request_classifier
+from .body_fetcher import ResponseBodyFetcher
+from .critical_path import compact_timeline_event, DEFAULT_MAX_TIMELINE_EVENTS
+
+# 导入监控配置
+try:
+    from config.latency_config import get_monitoring_config
+    MONITORING_CONFIG_AVAILABLE = True
+except ImportError:
+    MONITORING_CONFIG_AVAILABLE = False
+
 class EnhancedNetworkMonitor:
     """增强网络监控器"""
     
-    def __init__(self, driver):
+    def __init__(self, driver, capture_bodies: bool = True):
         self.driver = driver
         self.captured_requests = []
         self.monitoring = False
         self.monitor_thread = None
         self.start_time = None
+        self.classifier = get_request_classifier()
+        self.capture_bodies = capture_bodies
+        self.body_fetcher = None
+        self.max_timeline_events = DEFAULT_MAX_TIMELINE_EVENTS
+        if MONITORING_CONFIG_AVAILABLE:
+            self.max_timeline_events = get_monitoring_config().get('critical_path_analysis', {}).get(
+                'max_timeline_events', DEFAULT_MAX_TIMELINE_EVENTS)
+        # 压缩后的时间线事件，供关键路径分析使用（只保留最近的，长时间监控不会无限增长）
+        self.timeline_events = deque(maxlen=self.max_timeline_events)
         
     def start_monitoring(self):
         """开始网络监控"""
         print("📡 启动增强网络监控...")
         self.captured_requests = []
+        self.timeline_events = deque(maxlen=self.max_timeline_events)
         self.monitoring = True
         self.start_time = time.time()
+        self.body_fetcher = self._create_body_fetcher()
         
         # 启动监控线程
         self.monitor_thread = threading.Thread(target=self._monitor_network)
@@ -43,12 +66,42 @@ class EnhancedNetworkMonitor:
         if self.monitor_thread:
             self.monitor_thread.join(timeout=2)
         
+        # 等待已排队的响应体抓取完成
+        if self.body_fetcher:
+            self.body_fetcher.drain()
+            print(f"📦 响应体抓取统计: {self.body_fetcher.get_stats()}")
+        
         return self.captured_requests.copy()
     
+    def detach_background(self) -> None:
+        """停止后台轮询线程，之后由调用方在事件到达时调用 pump() 读取日志"""
+        if self.monitor_thread and self.monitor_thread.is_alive():
+            self.monitoring = False
+            self.monitor_thread.join(timeout=2)
+        self.monitor_thread = None
+    
+    def pump(self) -> int:
+        """读取一次性能日志，返回新增的请求记录数"""
+        before = len(self.captured_requests)
+        try:
+            logs = self.driver.get_log('performance')
+        except Exception:
+            return 0
+        for log in logs:
+            try:
+                self._process_log_entry(log, self.captured_requests)
+            except:
+                continue
+        return len(self.captured_requests) - before
+    
     def get_captured_requests(self) -> List[Dict[str, Any]]:
         """获取已捕获的请求（不停止监控）"""
         return self.captured_requests.copy()
     
+    def get_timeline_events(self) -> List[Dict[str, Any]]:
+        """获取时间线事件（请求开始/响应/结束、DOMContentLoaded等）"""
+        return list(self.timeline_events)
+    
     def capture_post_submit_requests(self, duration: float = 10.0) -> Dict[str, Any]:
         """
         捕获提交后的所有网络请求
@@ -61,9 +114,12 @@ class EnhancedNetworkMonitor:
         """
         print(f"🌐 开始捕获提交后网络请求 ({duration}秒)...")
         capture_start = time.time()
+        self.body_fetcher = self._create_body_fetcher()
         
         # 获取浏览器日志
         requests = self._capture_browser_logs(duration)
+        if self.body_fetcher:
+            self.body_fetcher.drain()
         
         # 分析请求类型
         analysis = self._analyze_requests(requests)
@@ -99,11 +155,7 @@ class EnhancedNetworkMonitor:
                 
                 for log in logs:
                     try:
-                        message = json.loads(log['message'])
-                        if message['message']['method'] in ['Network.responseReceived', 'Network.requestWillBeSent']:
-                            request_data = self._extract_request_info(message, log['timestamp'])
-                            if request_data:
-                                requests.append(request_data)
+                        self._process_log_entry(log, requests)
                     except:
                         continue
                 
@@ -114,6 +166,41 @@ class EnhancedNetworkMonitor:
         
         return requests
     
+    def _create_body_fetcher(self) -> Optional[ResponseBodyFetcher]:
+        """创建响应体抓取器（未启用时返回None）"""
+        if not self.capture_bodies:
+            return None
+        fetcher = ResponseBodyFetcher(self.driver, classifier=self.classifier)
+        return fetcher if fetcher.enabled else None
+    
+    def _process_log_entry(self, log: Dict[str, Any], sink: List[Dict[str, Any]]) -> None:
+        """处理单条性能日志：提取请求记录，并把关键请求交给响应体抓取器"""
+        message = json.loads(log['message'])
+        event = message['message']['method']
+        params = message['message'].get('params', {})
+        
+        timeline_event = compact_timeline_event(event, params, log['timestamp'])
+        if timeline_event:
+            self.timeline_events.append(timeline_event)
+        
+        if event in ['Network.responseReceived', 'Network.requestWillBeSent']:
+            request_data = self._extract_request_info(message, log['timestamp'])
+            if not request_data:
+                return
+            sink.append(request_data)
+            
+            if self.body_fetcher:
+                if event == 'Network.requestWillBeSent':
+                    self.body_fetcher.on_request(params.get('requestId'), request_data, params)
+                else:
+                    self.body_fetcher.on_response(params.get('requestId'), request_data, params)
+        
+        elif self.body_fetcher:
+            if event == 'Network.loadingFinished':
+                self.body_fetcher.on_loading_finished(params)
+            elif event == 'Network.loadingFailed':
+                self.body_fetcher.on_loading_failed(params)
+    
     def _extract_request_info(self, message: Dict, timestamp: int) -> Optional[Dict[str, Any]]:
         """提取请求信息"""
         try:
@@ -123,6 +210,7 @@ class EnhancedNetworkMonitor:
                 request = msg['params']['request']
                 return {
                     'type': 'request',
+                    'requestId': msg['params'].get('requestId', ''),
                     'method': request['method'],
                     'url': request['url'],
                     'headers': request.get('headers', {}),
@@ -135,6 +223,7 @@ class EnhancedNetworkMonitor:
                 response = msg['params']['response']
                 return {
                     'type': 'response',
+                    'requestId': msg['params'].get('requestId', ''),
                     'method': response.get('requestHeaders', {}).get(':method', 'GET'),
                     'url': response['url'],
                     'status': response['status'],
@@ -150,58 +239,8 @@ class EnhancedNetworkMonitor:
         return None
     
     def _analyze_requests(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """分析请求类型和重要性"""
-        analysis = {
-            'get_count': 0,
-            'post_count': 0,
-            'put_count': 0,
-            'delete_count': 0,
-            'important_count': 0,
-            'important_requests': [],
-            'api_requests': [],
-            'static_requests': []
-        }
-        
-        important_keywords = [
-            'apply', 'submit', 'join', 'register', 'signup',
-            '신청', '참여', '등록', '제출', '가입',
-            'api', 'ajax', 'json', 'form'
-        ]
-        
-        static_extensions = ['.css', '.js', '.png', '.jpg', '.gif', '.ico', '.woff']
-        
-        for req in requests:
-            method = req.get('method', 'GET').upper()
-            url = req.get('url', '').lower()
-            
-            # 统计方法类型
-            if method == 'GET':
-                analysis['get_count'] += 1
-            elif method == 'POST':
-                analysis['post_count'] += 1
-            elif method == 'PUT':
-                analysis['put_count'] += 1
-            elif method == 'DELETE':
-                analysis['delete_count'] += 1
-            
-            # 判断是否为重要请求
-            is_important = False
-            for keyword in important_keywords:
-                if keyword in url:
-                    is_important = True
-                    break
-            
-            if is_important or method in ['POST', 'PUT', 'DELETE']:
-                analysis['important_count'] += 1
-                analysis['important_requests'].append(req)
-            
-            # 分类请求
-            if any(ext in url for ext in static_extensions):
-                analysis['static_requests'].append(req)
-            elif 'api' in url or method != 'GET':
-                analysis['api_requests'].append(req)
-        
-        return analysis
+        """分析请求类型和重要性（使用预编译的分类器，一次遍历完成）"""
+        return self.classifier.classify_batch(requests)
     
     def _monitor_network(self):
         """网络监控主循环"""
@@ -212,11 +251,7 @@ class EnhancedNetworkMonitor:
                 
                 for log in logs:
                     try:
-                        message = json.loads(log['message'])
-                        if message['message']['method'] in ['Network.responseReceived', 'Network.requestWillBeSent']:
-                            request_data = self._extract_request_info(message, log['timestamp'])
-                            if request_data:
-                                self.captured_requests.append(request_data)
+                        self._process_log_entry(log, self.captured_requests)
                     except:
                         continue
                 
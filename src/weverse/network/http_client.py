@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+http_client.py
+共享HTTP客户端 - AI请求和延迟探测共用一个按主机保持长连接的连接池，
+省去对同一主机重复的TCP+TLS握手，并统计每个主机的连接复用情况
+"""
+
+import threading
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 导入HTTP客户端配置
+try:
+    from config.latency_config import get_http_client_config
+    HTTP_CLIENT_CONFIG_AVAILABLE = True
+except ImportError:
+    HTTP_CLIENT_CONFIG_AVAILABLE = False
+
+DEFAULT_HTTP_CLIENT_CONFIG = {
+    'pool_connections': 10,
+    'pool_maxsize': 10,
+    'pool_block': False,
+    'max_retries': 0,
+    'connect_timeout_s': 3.05,
+    'read_timeout_s': 30,
+    'user_agent': None,
+}
+
+HTTP_VERSIONS = {10: 'HTTP/1.0', 11: 'HTTP/1.1', 20: 'HTTP/2'}
+
+
+class ConnectionMetrics:
+    """按主机统计请求数、新建连接数和复用次数（线程安全）"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        self._seen_connections = weakref.WeakKeyDictionary()  # 连接池 -> 已统计的新建连接数
+
+    def _host(self, host: str) -> Dict[str, Any]:
+        return self.hosts.setdefault(host, {'requests': 0, 'errors': 0, 'new_connections': 0,
+                                            'total_ms': 0.0, 'http_versions': {}})
+
+    def record(self, host: str, pool, response: requests.Response) -> None:
+        with self.lock:
+            entry = self._host(host)
+            entry['requests'] += 1
+            entry['total_ms'] += response.elapsed.total_seconds() * 1000
+            version = HTTP_VERSIONS.get(getattr(response.raw, 'version', None), 'unknown')
+            entry['http_versions'][version] = entry['http_versions'].get(version, 0) + 1
+            if pool is not None:
+                # 同一连接池的并发请求只按差值累计，总数不会重复计算
+                created = pool.num_connections - self._seen_connections.get(pool, 0)
+                self._seen_connections[pool] = pool.num_connections
+                entry['new_connections'] += max(0, created)
+
+    def record_error(self, host: str) -> None:
+        with self.lock:
+            self._host(host)['errors'] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            hosts = {host: dict(entry, http_versions=dict(entry['http_versions']))
+                     for host, entry in self.hosts.items()}
+        totals = {'requests': 0, 'errors': 0, 'new_connections': 0, 'reused': 0}
+        for entry in hosts.values():
+            entry['reused'] = max(0, entry['requests'] - entry['new_connections'])
+            entry['reuse_rate'] = entry['reused'] / entry['requests'] if entry['requests'] else 0.0
+            entry['avg_ms'] = entry.pop('total_ms') / entry['requests'] if entry['requests'] else 0.0
+            for key in totals:
+                totals[key] += entry[key]
+        totals['reuse_rate'] = totals['reused'] / totals['requests'] if totals['requests'] else 0.0
+        return {'hosts': hosts, 'totals': totals}
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """记录连接复用情况的连接池适配器"""
+
+    def __init__(self, metrics: ConnectionMetrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = urlsplit(request.url).netloc
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            self.metrics.record_error(host)
+            raise
+        self.metrics.record(host, getattr(response.raw, '_pool', None), response)
+        return response
+
+
+class SharedHTTPClient:
+    """共享HTTP客户端 - 按主机保持长连接，未指定超时时使用配置的连接/读取超时"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = dict(DEFAULT_HTTP_CLIENT_CONFIG)
+        if HTTP_CLIENT_CONFIG_AVAILABLE:
+            self.config.update(get_http_client_config())
+        if config:
+            self.config.update(config)
+
+        self.metrics = ConnectionMetrics()
+        self.adapter = PooledHTTPAdapter(
+            self.metrics,
+            pool_connections=self.config['pool_connections'],
+            pool_maxsize=self.config['pool_maxsize'],
+            pool_block=self.config['pool_block'],
+            max_retries=self.config['max_retries'],
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        if self.config['user_agent']:
+            self.session.headers['User-Agent'] = self.config['user_agent']
+
+    @property
+    def default_timeout(self):
+        return (self.config['connect_timeout_s'], self.config['read_timeout_s'])
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.default_timeout
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """各主机的请求数、新建连接数、复用率、平均响应头耗时和HTTP版本"""
+        return self.metrics.snapshot()
+
+    def print_stats(self) -> None:
+        stats = self.get_stats()
+        totals = stats['totals']
+        print(f"🔌 HTTP连接复用: {totals['requests']} 次请求, 新建 {totals['new_connections']} 个连接, "
+              f"复用率 {totals['reuse_rate']:.0%}")
+        for host, entry in stats['hosts'].items():
+            versions = ', '.join(entry['http_versions']) or '-'
+            print(f"   {host}: {entry['requests']} 次, 新建 {entry['new_connections']}, "
+                  f"失败 {entry['errors']}, 平均 {entry['avg_ms']:.0f}ms ({versions})")
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_http_client: Optional[SharedHTTPClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> SharedHTTPClient:
+    """获取进程内共享的HTTP客户端"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = SharedHTTPClient()
+        return _http_client
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+request_blocking.py
+非必要资源拦截 - 通过 Network.setBlockedURLs 拦截字体/统计/追踪/媒体/第三方脚本，
+并提供测量模式，按类别报告节省的字节和时间，拦截破坏表单时报警
+"""
+
+import re
+import json
+import time
+import statistics
+from typing import Dict, Any, List, Optional
+
+from .critical_path import GATING_RESOURCE_TYPES
+
+# 导入拦截配置
+try:
+    from config.latency_config import get_request_blocking_config
+    BLOCKING_CONFIG_AVAILABLE = True
+except ImportError:
+    BLOCKING_CONFIG_AVAILABLE = False
+
+DEFAULT_BLOCKING_CONFIG = {
+    'enabled': False,
+    'profile': 'weverse_form',
+    'profiles': {
+        'weverse_form': {
+            'fonts': ['*.woff', '*.woff2', '*.ttf', '*.otf'],
+            'analytics': ['*google-analytics.com*', '*googletagmanager.com*'],
+        },
+    },
+    'essential_patterns': ['*weverse.io*', '*apis.naver.com*'],
+    'measurement': {'runs': 3, 'timeout_s': 15},
+}
+
+
+def _compile_wildcards(patterns: List[str]):
+    """把CDP通配符模式编译为一个正则（* 匹配任意字符，与 setBlockedURLs 语义一致）"""
+    if not patterns:
+        return None
+    parts = ['.*'.join(re.escape(chunk) for chunk in pattern.split('*')) for pattern in patterns]
+    return re.compile('^(?:' + '|'.join(parts) + ')$', re.IGNORECASE)
+
+
+class RequestBlocker:
+    """资源拦截器"""
+
+    def __init__(self, driver, config: Optional[Dict[str, Any]] = None, profile: Optional[str] = None):
+        self.driver = driver
+        self.config = dict(DEFAULT_BLOCKING_CONFIG)
+        if BLOCKING_CONFIG_AVAILABLE:
+            self.config.update(get_request_blocking_config())
+        if config:
+            self.config.update(config)
+
+        profile_name = profile or self.config['profile']
+        if profile_name not in self.config['profiles']:
+            raise ValueError(f"未知的拦截配置: {profile_name}")
+        self.profile_name = profile_name
+        self.categories: Dict[str, List[str]] = self.config['profiles'][profile_name]
+
+        self._category_patterns = {
+            category: _compile_wildcards(patterns) for category, patterns in self.categories.items()
+        }
+        self._essential_pattern = _compile_wildcards(self.config.get('essential_patterns', []))
+        self.active_categories: List[str] = []
+
+    def get_patterns(self, categories: Optional[List[str]] = None) -> List[str]:
+        """获取指定类别（默认全部）的拦截模式"""
+        selected = self.categories.keys() if categories is None else categories
+        patterns = []
+        for category in selected:
+            if category not in self.categories:
+                raise ValueError(f"未知的拦截类别: {category}")
+            patterns.extend(self.categories[category])
+        return patterns
+
+    def apply(self, categories: Optional[List[str]] = None) -> List[str]:
+        """下发拦截列表，返回实际生效的模式"""
+        patterns = self.get_patterns(categories)
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        self.active_categories = list(self.categories) if categories is None else list(categories)
+        return patterns
+
+    def clear(self) -> None:
+        """清除拦截列表"""
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+        self.active_categories = []
+
+    def categorize(self, url: str) -> Optional[str]:
+        """返回URL所属的拦截类别，不属于任何类别返回None"""
+        for category, pattern in self._category_patterns.items():
+            if pattern and pattern.match(url):
+                return category
+        return None
+
+    def is_essential(self, url: str, resource_type: str = '') -> bool:
+        """必要请求：命中必要域名且属于会阻塞表单的资源类型"""
+        if not self._essential_pattern or not self._essential_pattern.match(url):
+            return False
+        return not resource_type or resource_type in GATING_RESOURCE_TYPES
+
+    def summarize_performance_log(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """按类别统计一次页面加载的请求数、字节数和被拦截数"""
+        requests: Dict[str, Dict[str, Any]] = {}
+        categories = {
+            category: {'requests': 0, 'bytes': 0, 'blocked': 0} for category in self.categories
+        }
+        summary = {'categories': categories, 'total_requests': 0, 'total_bytes': 0, 'blocked_essential': []}
+
+        for log in logs:
+            try:
+                message = json.loads(log['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get('method', '')
+            params = message.get('params', {})
+            request_id = params.get('requestId')
+
+            if method == 'Network.requestWillBeSent':
+                url = params.get('request', {}).get('url', '')
+                requests[request_id] = {
+                    'url': url,
+                    'type': params.get('type', ''),
+                    'category': self.categorize(url)
+                }
+                summary['total_requests'] += 1
+                if requests[request_id]['category']:
+                    categories[requests[request_id]['category']]['requests'] += 1
+
+            elif method == 'Network.loadingFinished' and request_id in requests:
+                size = int(params.get('encodedDataLength') or 0)
+                summary['total_bytes'] += size
+                category = requests[request_id]['category']
+                if category:
+                    categories[category]['bytes'] += size
+
+            elif method == 'Network.loadingFailed' and request_id in requests:
+                if not params.get('blockedReason'):
+                    continue
+                request = requests[request_id]
+                if request['category']:
+                    categories[request['category']]['blocked'] += 1
+                if self.is_essential(request['url'], params.get('type') or request['type']):
+                    summary['blocked_essential'].append(request['url'])
+
+        return summary
+
+
+def _load_once(driver, blocker: RequestBlocker, url: str, form_selector: str,
+               categories: Optional[List[str]], timeout_s: float) -> Dict[str, Any]:
+    """清缓存后按指定拦截类别加载一次页面，记录表单就绪时间"""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+    if categories:
+        blocker.apply(categories)
+    else:
+        blocker.clear()
+    driver.get_log('performance')  # 丢弃之前的日志
+
+    start = time.time()
+    driver.get(url)
+    form_ready_ms = None
+    while time.time() - start < timeout_s:
+        if driver.find_elements('css selector', form_selector):
+            form_ready_ms = (time.time() - start) * 1000
+            break
+        time.sleep(0.02)
+
+    result = blocker.summarize_performance_log(driver.get_log('performance'))
+    result['form_ready_ms'] = form_ready_ms
+    return result
+
+
+def measure_blocking_impact(driver, url: str, form_selector: str, blocker: Optional[RequestBlocker] = None,
+                            runs: Optional[int] = None, timeout_s: Optional[float] = None) -> Dict[str, Any]:
+    """
+    测量模式：基线 / 逐类拦截 / 全部拦截 分别加载，报告每个类别节省的字节和时间
+
+    Returns:
+        {'baseline': {...}, 'categories': {类别: {...}}, 'all': {...}}
+    """
+    blocker = blocker or RequestBlocker(driver)
+    measurement = blocker.config.get('measurement', {})
+    runs = runs or measurement.get('runs', 3)
+    timeout_s = timeout_s or measurement.get('timeout_s', 15)
+
+    def measure(categories):
+        passes = [_load_once(driver, blocker, url, form_selector, categories, timeout_s) for _ in range(runs)]
+        ready = [p['form_ready_ms'] for p in passes if p['form_ready_ms'] is not None]
+        blocked_essential = sorted({u for p in passes for u in p['blocked_essential']})
+        return {
+            'passes': passes,
+            'form_ready_ms': round(statistics.median(ready), 1) if ready else None,
+            'form_ok': len(ready) == runs and not blocked_essential,
+            'blocked_essential': blocked_essential,
+            'blocked_requests': {
+                category: max(p['categories'][category]['blocked'] for p in passes)
+                for category in blocker.categories
+            }
+        }
+
+    print(f"📏 测量资源拦截影响: {url} (每组 {runs} 次)")
+    baseline = measure(None)
+    baseline_bytes = {
+        category: statistics.median(p['categories'][category]['bytes'] for p in baseline['passes'])
+        for category in blocker.categories
+    }
+
+    def compare(result, categories):
+        time_saved = None
+        if baseline['form_ready_ms'] is not None and result['form_ready_ms'] is not None:
+            time_saved = round(baseline['form_ready_ms'] - result['form_ready_ms'], 1)
+        return {
+            'bytes_saved': int(sum(baseline_bytes[c] for c in categories)),
+            'requests_blocked': sum(result['blocked_requests'][c] for c in categories),
+            'time_saved_ms': time_saved,
+            'form_ready_ms': result['form_ready_ms'],
+            'form_ok': result['form_ok'],
+            'blocked_essential': result['blocked_essential'],
+        }
+
+    report = {
+        'url': url,
+        'profile': blocker.profile_name,
+        'runs': runs,
+        'baseline': {
+            'form_ready_ms': baseline['form_ready_ms'],
+            'form_ok': baseline['form_ok'],
+            'total_bytes': int(statistics.median(p['total_bytes'] for p in baseline['passes'])),
+        },
+        'categories': {}
+    }
+    for category in blocker.categories:
+        print(f"   🔄 仅拦截 {category}")
+        report['categories'][category] = compare(measure([category]), [category])
+    print("   🔄 拦截全部类别")
+    report['all'] = compare(measure(list(blocker.categories)), list(blocker.categories))
+
+    blocker.clear()
+    return report
+
+
+def render_blocking_report(report: Dict[str, Any]) -> str:
+    """渲染测量报告"""
+    def fmt_ms(value):
+        return f"{value:.1f}" if value is not None else '-'
+
+    baseline = report['baseline']
+    lines = [
+        f"基线: 表单就绪 {fmt_ms(baseline['form_ready_ms'])}ms, 共 {baseline['total_bytes'] / 1024:.1f}KB",
+        f"{'类别':<22}{'拦截数':>8}{'节省KB':>10}{'节省ms':>10}{'表单':>6}",
+        '-' * 60,
+    ]
+    rows = list(report['categories'].items()) + [('(全部)', report['all'])]
+    for category, row in rows:
+        lines.append(
+            f"{category:<22}{row['requests_blocked']:>8}{row['bytes_saved'] / 1024:>10.1f}"
+            f"{fmt_ms(row['time_saved_ms']):>10}{'✅' if row['form_ok'] else '❌':>6}"
+        )
+        for url in row['blocked_essential']:
+            lines.append(f"   ⚠️ 拦截了必要请求: {url}")
+    return '\n'.join(lines)
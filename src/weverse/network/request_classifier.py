@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+request_classifier.py
+请求分类器 - 关键词编译为单个正则、扩展名查后缀表，按URL缓存分类结果
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+# 导入监控配置
+try:
+    from config.latency_config import get_monitoring_config
+    MONITORING_CONFIG_AVAILABLE = True
+except ImportError:
+    MONITORING_CONFIG_AVAILABLE = False
+
+# 配置不可用时的默认规则（与原 _analyze_requests 中的硬编码列表一致）
+DEFAULT_CLASSIFICATION_RULES = {
+    'important_keywords': [
+        'apply', 'submit', 'join', 'register', 'signup',
+        '신청', '참여', '등록', '제출', '가입',
+        'api', 'ajax', 'json', 'form'
+    ],
+    'important_methods': ['POST', 'PUT', 'DELETE'],
+    'api_keywords': ['api'],
+    'static_extensions': ['css', 'js', 'png', 'jpg', 'gif', 'ico', 'woff', 'woff2'],
+    'cache_size': 4096,
+}
+
+DEFAULT_DETAILED_LOGGING = {
+    'enabled': True,
+    'methods': ['POST', 'PUT'],
+    'keywords': ['api'],
+}
+
+
+def _compile_keywords(keywords: List[str]) -> Optional[re.Pattern]:
+    """将关键词列表编译为一个不区分大小写的正则（长词优先）"""
+    keywords = [k for k in keywords if k]
+    if not keywords:
+        return None
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile('|'.join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+
+class RequestClassifier:
+    """请求分类器 - 规则只编译一次，同一URL只分类一次"""
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None,
+                 detailed_logging: Optional[Dict[str, Any]] = None):
+        if MONITORING_CONFIG_AVAILABLE:
+            monitoring_config = get_monitoring_config()
+            base_rules = monitoring_config.get('request_classification', DEFAULT_CLASSIFICATION_RULES)
+            base_detailed = monitoring_config.get('detailed_request_logging', DEFAULT_DETAILED_LOGGING)
+        else:
+            base_rules = DEFAULT_CLASSIFICATION_RULES
+            base_detailed = DEFAULT_DETAILED_LOGGING
+
+        self.rules = dict(DEFAULT_CLASSIFICATION_RULES)
+        self.rules.update(base_rules)
+        if rules:
+            self.rules.update(rules)
+
+        self.detailed_logging = dict(DEFAULT_DETAILED_LOGGING)
+        self.detailed_logging.update(base_detailed)
+        if detailed_logging:
+            self.detailed_logging.update(detailed_logging)
+
+        # 编译规则
+        self._important_re = _compile_keywords(self.rules['important_keywords'])
+        self._api_re = _compile_keywords(self.rules['api_keywords'])
+        self._detailed_re = _compile_keywords(self.detailed_logging.get('keywords', []))
+        self._static_suffixes = frozenset(ext.lower().lstrip('.') for ext in self.rules['static_extensions'])
+        self._important_methods = frozenset(m.upper() for m in self.rules['important_methods'])
+        self._detailed_methods = frozenset(m.upper() for m in self.detailed_logging.get('methods', []))
+
+        # URL → 与方法无关的分类结果（LRU，超出上限淘汰最久未用的）
+        self._url_cache: 'OrderedDict[str, Dict[str, bool]]' = OrderedDict()
+        self._cache_size = self.rules.get('cache_size', 4096)
+        self._cache_lock = threading.Lock()  # 日志捕获线程和监控循环共用同一个分类器
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _classify_url(self, url: str) -> Dict[str, bool]:
+        """分类URL（只依赖URL的部分，结果缓存）"""
+        with self._cache_lock:
+            cached = self._url_cache.get(url)
+            if cached is not None:
+                self.cache_hits += 1
+                self._url_cache.move_to_end(url)
+                return cached
+            self.cache_misses += 1
+
+        # 扩展名按路径后缀查表，不再对整个URL做子串匹配（避免 .js 误匹配 .json）
+        try:
+            path = urlsplit(url).path
+        except ValueError:
+            path = url
+        last_segment = path.rsplit('/', 1)[-1]
+        suffix = last_segment.rsplit('.', 1)[-1].lower() if '.' in last_segment else ''
+
+        result = {
+            'keyword_match': bool(self._important_re and self._important_re.search(url)),
+            'api_keyword_match': bool(self._api_re and self._api_re.search(url)),
+            'detailed_keyword_match': bool(self._detailed_re and self._detailed_re.search(url)),
+            'static': suffix in self._static_suffixes,
+        }
+
+        with self._cache_lock:
+            self._url_cache[url] = result
+            while len(self._url_cache) > self._cache_size:
+                self._url_cache.popitem(last=False)
+        return result
+
+    def classify(self, method: str, url: str) -> Dict[str, bool]:
+        """
+        分类单个请求
+
+        Returns:
+            {'important', 'static', 'api', 'detailed'} 布尔标记
+        """
+        method = (method or 'GET').upper()
+        url_flags = self._classify_url(url or '')
+
+        important = url_flags['keyword_match'] or method in self._important_methods
+        static = url_flags['static']
+        api = not static and (url_flags['api_keyword_match'] or method != 'GET')
+        detailed = bool(self.detailed_logging.get('enabled', True)) and (
+            method in self._detailed_methods or url_flags['detailed_keyword_match']
+        )
+
+        return {
+            'important': important,
+            'static': static,
+            'api': api,
+            'detailed': detailed
+        }
+
+    def is_detailed(self, method: str, url: str) -> bool:
+        """是否需要详细记录（监控循环打印 / 抓取响应体）"""
+        return self.classify(method, url)['detailed']
+
+    def classify_batch(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        一次遍历完成批量分类和统计
+
+        Returns:
+            与原 _analyze_requests 相同结构的分析结果
+        """
+        analysis = {
+            'get_count': 0,
+            'post_count': 0,
+            'put_count': 0,
+            'delete_count': 0,
+            'important_count': 0,
+            'important_requests': [],
+            'api_requests': [],
+            'static_requests': []
+        }
+
+        method_counters = {
+            'GET': 'get_count',
+            'POST': 'post_count',
+            'PUT': 'put_count',
+            'DELETE': 'delete_count'
+        }
+
+        for req in requests:
+            method = (req.get('method') or 'GET').upper()
+            flags = self.classify(method, req.get('url', ''))
+
+            counter = method_counters.get(method)
+            if counter:
+                analysis[counter] += 1
+
+            if flags['important']:
+                analysis['important_count'] += 1
+                analysis['important_requests'].append(req)
+
+            if flags['static']:
+                analysis['static_requests'].append(req)
+            elif flags['api']:
+                analysis['api_requests'].append(req)
+
+        return analysis
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """获取缓存统计"""
+        return {
+            'cached_urls': len(self._url_cache),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses
+        }
+
+
+_default_classifier: Optional[RequestClassifier] = None
+
+
+def get_request_classifier() -> RequestClassifier:
+    """获取共享的请求分类器实例（按配置编译一次）"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = RequestClassifier()
+    return _default_classifier
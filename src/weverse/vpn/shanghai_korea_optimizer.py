@@ -6,13 +6,14 @@ shanghai_korea_optimizer.py
 """
 
 import time
-import requests
 import statistics
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import logging
 
+from ..network.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +29,7 @@ class ShanghaiKoreaOptimizer:
         ]
         self.test_duration = 30  # 30秒测试时间
         self.concurrent_tests = 5  # 并发测试数量
+        self.http_client = get_http_client()
     
     def detect_real_latency(self) -> Dict[str, float]:
         """检测到韩国服务器的真实延迟"""
@@ -85,6 +87,7 @@ class ShanghaiKoreaOptimizer:
         print(f"   最小延迟: {min_latency:.1f}ms") 
         print(f"   最大延迟: {max_latency:.1f}ms")
         print(f"   标准差: {std_dev:.1f}ms")
+        self.http_client.print_stats()
         
         # 评估网络质量
         quality = self._assess_network_quality(avg_latency, std_dev)
@@ -106,8 +109,8 @@ class ShanghaiKoreaOptimizer:
         """单次延迟测试 - 使用轻量HEAD请求"""
         try:
             start_time = time.perf_counter()
-            # 使用HEAD请求减少数据传输，更准确测试延迟
-            response = requests.head(url, timeout=3, headers={
+            # 使用HEAD请求减少数据传输，共享连接池复用长连接，测得的是往返延迟而非每次握手
+            response = self.http_client.head(url, timeout=3, headers={
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
             }, allow_redirects=False)
             end_time = time.perf_counter()
@@ -332,13 +335,13 @@ class ShanghaiKoreaOptimizer:
             print("🌍 检测当前网络位置...")
             
             # 获取公网IP
-            response = requests.get('https://api.ipify.org?format=json', timeout=5)
+            response = self.http_client.get('https://api.ipify.org?format=json', timeout=5)
             ip_data = response.json()
             current_ip = ip_data['ip']
             print(f"📍 当前IP: {current_ip}")
             
             # 获取地理位置
-            geo_response = requests.get(f'http://ip-api.com/json/{current_ip}', timeout=5)
+            geo_response = self.http_client.get(f'http://ip-api.com/json/{current_ip}', timeout=5)
             geo_data = geo_response.json()
             
             if geo_data.get('status') == 'success':
@@ -466,7 +469,7 @@ class ShanghaiKoreaOptimizer:
     def _get_ip_geolocation(self, ip: str) -> Optional[Dict]:
         """获取IP地理位置信息"""
         try:
-            response = requests.get(f'http://ip-api.com/json/{ip}', timeout=5)
+            response = self.http_client.get(f'http://ip-api.com/json/{ip}', timeout=5)
             geo_data = response.json()
             
             if geo_data.get('status') == 'success':
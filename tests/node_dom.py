@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+node_dom.py
+测试辅助 - 用 node 执行页面内脚本（execute_script 的脚本体），DOM 由 lxml 解析的HTML构造，
+可见性、element.type / value 与 offline_analyzer 的近似一致，CSS选择器和XPath查询结果由 lxml 预先算好；
+没有浏览器时用来验证页面内脚本的分类、去重和返回结构
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from lxml import etree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.analysis.offline_analyzer import (
+    _dom_type, _dom_value, _is_visible, _option_value, _text, parse_html
+)
+
+NODE = shutil.which('node')
+
+# 页面内脚本用到的最小 DOM 接口
+DOM_SHIM = r"""
+const data = JSON.parse(require('fs').readFileSync(0, 'utf-8'));
+const FORM_CONTROLS = ['input', 'select', 'button', 'textarea'];
+
+class Element {
+    constructor(node) {
+        Object.assign(this, node.props);
+        this._node = node;
+        this.tagName = node.tag.toUpperCase();
+        this.id = node.attrs.id || '';
+        this.className = node.attrs['class'] || '';
+        this.innerText = node.visible ? node.text : '';
+        this.parentElement = null;
+        this.previousElementSibling = null;
+    }
+    getAttribute(name) { return name in this._node.attrs ? this._node.attrs[name] : null; }
+    hasAttribute(name) { return name in this._node.attrs; }
+    getClientRects() { return this._node.visible ? [this.getBoundingClientRect()] : []; }
+    getBoundingClientRect() {
+        const shown = this._node.visible;
+        return {left: shown ? 8.5 : 0, top: shown ? 20.25 * (this._node.index + 1) : 0,
+                width: shown ? 200.75 : 0, height: shown ? 30.5 : 0};
+    }
+    matches(selector) {
+        if (selector !== ':disabled') throw new Error('unsupported selector ' + selector);
+        return FORM_CONTROLS.includes(this._node.tag) && this.hasAttribute('disabled');
+    }
+}
+
+const elements = data.nodes.map(node => new Element(node));
+data.nodes.forEach((node, i) => {
+    if (node.parent !== null) elements[i].parentElement = elements[node.parent];
+    if (node.previous !== null) elements[i].previousElementSibling = elements[node.previous];
+});
+const pick = indexes => indexes.map(i => elements[i]);
+
+global.window = {
+    pageXOffset: 0, pageYOffset: 0,
+    getComputedStyle: () => ({visibility: 'visible', display: 'block', opacity: '1'})
+};
+global.XPathResult = {ORDERED_NODE_SNAPSHOT_TYPE: 7};
+global.document = {
+    getElementsByTagName: tag => elements.filter(el => el._node.tag === tag),
+    querySelectorAll: selector => {
+        if (!(selector in data.css)) throw new Error('SyntaxError: ' + selector);
+        return pick(data.css[selector]);
+    },
+    evaluate: xpath => {
+        if (!(xpath in data.xpath)) throw new Error('SyntaxError: ' + xpath);
+        const items = pick(data.xpath[xpath]);
+        return {snapshotLength: items.length, snapshotItem: i => items[i]};
+    }
+};
+
+const result = new Function(data.script).apply(null, data.args);
+process.stdout.write(JSON.stringify(result === undefined ? null : result));
+"""
+
+
+def _props(el) -> Dict[str, Any]:
+    """与浏览器 DOM 属性（property）一致的字段，只设置该标签实际有的属性"""
+    tag = el.tag
+    if tag not in ('input', 'select', 'button', 'textarea', 'form'):
+        return {}
+    if tag == 'form':
+        return {'action': el.get('action') or '', 'method': (el.get('method') or 'get').lower()}
+    props = {'name': el.get('name') or '', 'type': _dom_type(el), 'value': _dom_value(el),
+             'disabled': el.get('disabled') is not None}
+    if tag in ('input', 'textarea'):
+        props['placeholder'] = el.get('placeholder') or ''
+    if tag in ('input', 'select', 'textarea'):
+        props['required'] = el.get('required') is not None
+    if tag == 'input':
+        props['checked'] = el.get('checked') is not None
+    if tag == 'select':
+        props['options'] = [{'value': _option_value(option), 'text': _text(option)}
+                            for option in el.iter('option')]
+    return props
+
+
+def serialize_dom(root) -> Dict[str, Any]:
+    """lxml 文档 → 节点列表（文档顺序）"""
+    elements = [el for el in root.iter(tag=etree.Element)]
+    index = {el: i for i, el in enumerate(elements)}
+    nodes = []
+    for i, el in enumerate(elements):
+        previous = el.getprevious()
+        while previous is not None and not isinstance(previous.tag, str):
+            previous = previous.getprevious()
+        nodes.append({
+            'index': i,
+            'tag': el.tag,
+            'attrs': dict(el.attrib),
+            'props': _props(el),
+            'text': _text(el),
+            'visible': _is_visible(el),
+            'parent': index.get(el.getparent()),
+            'previous': index.get(previous),
+        })
+    return {'nodes': nodes, 'index': index}
+
+
+def run_script(html: str, script: str, args: Sequence[Any] = (),
+               css_xpaths: Optional[Dict[str, str]] = None, xpaths: Iterable[str] = ()) -> Any:
+    """
+    用 node 执行页面内脚本并返回结果
+
+    Args:
+        css_xpaths: 脚本会查询的CSS选择器 → 等价XPath（不在其中的选择器按语法错误抛出）
+        xpaths: 脚本会执行的XPath
+    """
+    if not NODE:
+        raise RuntimeError("未安装 node")
+    root = parse_html(html)
+    dom = serialize_dom(root)
+    index = dom['index']
+
+    def query(xpath):
+        return [index[el] for el in root.xpath(xpath) if el in index]
+
+    payload = {
+        'nodes': dom['nodes'],
+        'css': {selector: query(xpath) for selector, xpath in (css_xpaths or {}).items()},
+        'xpath': {xpath: query(xpath) for xpath in xpaths},
+        'script': script,
+        'args': list(args),
+    }
+    completed = subprocess.run([NODE, '-e', DOM_SHIM], input=json.dumps(payload), capture_output=True,
+                               text=True, timeout=30)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'node 执行失败')
+    return json.loads(completed.stdout)
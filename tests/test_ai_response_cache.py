@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_ai_response_cache.py
+测试AI响应缓存 - 验证相同正文跳过AI调用、有效期、最久未使用淘汰和跨进程持久化
+"""
+
+import sys
+import os
+import time
+import tempfile
+from unittest import mock
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.ai import analyzer
+from src.weverse.ai.response_cache import AIResponseCache
+
+NOTICE = "[공지] 팬미팅 응모 안내\n응모 기간: 2025년 8월 20일 20:00 ~ 8월 22일 23:59 (KST)"
+
+
+def test_rerun_skips_ai():
+    """验证同一公告第二次运行不调用AI，正文空白变化不影响命中"""
+    print("🧪 测试重复运行跳过AI")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AIResponseCache(path=os.path.join(cache_dir, 'ai_cache.json'))
+        time_data = {'申请开始时间': '2025-08-20 20:00', '关键时间点': []}
+        calls = []
+
+        with mock.patch.object(analyzer, 'get_response_cache', return_value=cache), \
+             mock.patch.object(analyzer, '_extract_time_with_ai', side_effect=lambda c: calls.append('time') or time_data), \
+             mock.patch.object(analyzer, '_analyze_with_ai', side_effect=lambda c, t: calls.append('analysis') or '分析结果'):
+            for content in (NOTICE, NOTICE.replace('\n', '\n\n  ')):
+                assert analyzer.extract_time_with_ai(content) == time_data
+                assert analyzer.analyze_with_ai(content, None) == '分析结果'
+
+        print(f"   AI调用: {calls}, 统计: {cache.get_stats()}")
+        assert calls == ['time', 'analysis']
+        assert cache.stats['hits'] == 2
+
+        # 新进程读取同一缓存文件
+        reloaded = AIResponseCache(path=cache.path)
+        assert reloaded.get('time_extraction', NOTICE, analyzer.TIME_MODEL, analyzer.TIME_PROMPT_VERSION) == time_data
+        # 提示词版本变化后不命中
+        assert reloaded.get('time_extraction', NOTICE, analyzer.TIME_MODEL, 'time-v0') is None
+
+    print("✅ 重复运行跳过AI验证通过")
+
+
+def test_degraded_result_not_cached():
+    """验证JSON修复失败的默认空结构不写入缓存"""
+    print("\n🧪 测试降级结果不缓存")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AIResponseCache(path=os.path.join(cache_dir, 'ai_cache.json'))
+        with mock.patch.object(analyzer, 'get_response_cache', return_value=cache), \
+             mock.patch.object(analyzer, '_extract_time_with_ai', return_value=dict(analyzer.EMPTY_TIME_DATA)):
+            analyzer.extract_time_with_ai(NOTICE)
+        assert len(cache.entries) == 0
+
+    print("✅ 降级结果不缓存验证通过")
+
+
+def test_ttl_and_lru():
+    """验证过期失效和超出上限时淘汰最久未使用的条目"""
+    print("\n🧪 测试有效期和LRU淘汰")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AIResponseCache(path=os.path.join(cache_dir, 'ai_cache.json'),
+                                config={'ttl_seconds': 60, 'max_entries': 2})
+        for name in ('a', 'b'):
+            cache.put('time_extraction', name, 'm', 'v1', {'name': name})
+        cache.get('time_extraction', 'a', 'm', 'v1')  # a 最近使用
+        cache.put('time_extraction', 'c', 'm', 'v1', {'name': 'c'})
+
+        assert cache.get('time_extraction', 'b', 'm', 'v1') is None
+        assert cache.get('time_extraction', 'a', 'm', 'v1') == {'name': 'a'}
+        assert cache.stats['evicted'] == 1
+
+        with mock.patch('time.time', return_value=time.time() + 61):
+            assert cache.get('time_extraction', 'c', 'm', 'v1') is None
+        assert cache.stats['expired'] == 1
+        print(f"   统计: {cache.get_stats()}")
+
+    print("✅ 有效期和LRU淘汰验证通过")
+
+
+if __name__ == "__main__":
+    test_rerun_skips_ai()
+    test_degraded_result_not_cached()
+    test_ttl_and_lru()
+    print("\n✅ AI响应缓存测试完成")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_ai_streaming.py
+测试AI流式响应 - 验证增量JSON解析、JSON完整即返回、首个token超时快速失败
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ai_config
+from src.weverse.ai import analyzer
+from src.weverse.ai.hedging import LatencyHistory
+from src.weverse.ai.streaming import FirstTokenTimeout, IncrementalJSONExtractor, stream_chat_completion
+
+TIME_JSON = '{"申请开始时间": "2025-08-20 20:00", "描述": "括号 {不算} \\"引号\\"", "关键时间点": [{"时间": "2025-08-22 23:59"}]}'
+
+
+def _event(content=None, reasoning=None):
+    delta = {}
+    if content is not None:
+        delta['content'] = content
+    if reasoning is not None:
+        delta['reasoning_content'] = reasoning
+    return f"data: {json.dumps({'choices': [{'delta': delta}]}, ensure_ascii=False)}\n\n".encode('utf-8')
+
+
+class StreamHandler(BaseHTTPRequestHandler):
+    """按路径模拟不同的流式响应"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/silent'):
+            time.sleep(1.5)  # 响应头都不返回
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        try:
+            if self.path.startswith('/keepalive'):
+                # 只发 keep-alive，一直没有token
+                for _ in range(10):
+                    self.wfile.write(b': keep-alive\n\n')
+                    self.wfile.flush()
+                    time.sleep(0.2)
+                return
+            self.wfile.write(_event(reasoning='思考中'))
+            for index in range(0, len(TIME_JSON), 7):
+                self.wfile.write(_event(('```json\n' if index == 0 else '') + TIME_JSON[index:index + 7]))
+                self.wfile.flush()
+            # JSON之后还有很慢的收尾token
+            for _ in range(10):
+                time.sleep(0.3)
+                self.wfile.write(_event('\n```\n说明文字'))
+                self.wfile.flush()
+            self.wfile.write(b'data: [DONE]\n\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StreamHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_incremental_extractor():
+    """验证跨分段、字符串内括号和转义引号的增量解析"""
+    print("🧪 测试增量JSON解析")
+    print("=" * 50)
+
+    extractor = IncrementalJSONExtractor()
+    text = '```json\n' + TIME_JSON + '\n```'
+    results = [extractor.feed(text[index:index + 3]) for index in range(0, len(text), 3)]
+    complete_at = next(index for index, result in enumerate(results) if result is not None)
+    assert results[complete_at] == json.loads(TIME_JSON)
+    assert complete_at * 3 < len(text) - 3, "JSON完整后应立即返回"
+
+    # 括号配平但不合法时继续找下一个对象
+    extractor = IncrementalJSONExtractor()
+    assert extractor.feed("{foo: 1} 然后 ") is None
+    assert extractor.feed('{"a": 1}') == {'a': 1}
+    print("✅ 增量解析验证通过")
+
+
+def test_early_completion():
+    """验证JSON完整后不等剩余token"""
+    print("\n🧪 测试JSON完整即返回")
+    print("=" * 50)
+
+    server, base_url = _start_server()
+    try:
+        start_time = time.time()
+        result = stream_chat_completion(requests.Session(), f"{base_url}/chat/completions", {}, {'model': 'test'},
+                                        {'first_token_timeout_s': 2, 'total_timeout_s': 10})
+        elapsed = time.time() - start_time
+    finally:
+        server.shutdown()
+
+    print(f"   耗时 {elapsed:.2f}s, 首token {result['first_token_s']:.3f}s")
+    assert result['json'] == json.loads(TIME_JSON)
+    assert result['early']
+    assert elapsed < 1.0, "不应等待约3秒的收尾token"
+    print("✅ JSON完整后立即返回")
+
+
+def test_first_token_timeout():
+    """验证没有token时按首token超时快速失败"""
+    print("\n🧪 测试首token超时")
+    print("=" * 50)
+
+    server, base_url = _start_server()
+    try:
+        for path in ('/keepalive', '/silent'):
+            start_time = time.time()
+            try:
+                stream_chat_completion(requests.Session(), f"{base_url}{path}/chat/completions", {}, {'model': 'test'},
+                                       {'first_token_timeout_s': 0.5, 'total_timeout_s': 60})
+                assert False, "应抛出 FirstTokenTimeout"
+            except FirstTokenTimeout as e:
+                elapsed = time.time() - start_time
+                print(f"   {path}: {elapsed:.2f}s 后失败 ({e})")
+                assert elapsed < 1.2
+    finally:
+        server.shutdown()
+
+    assert issubclass(FirstTokenTimeout, requests.exceptions.Timeout)
+    print("✅ 首token超时快速失败")
+
+
+def test_time_extraction_streams():
+    """验证AI时间提取走流式接口并直接使用完整的JSON"""
+    print("\n🧪 测试时间提取流式调用")
+    print("=" * 50)
+
+    server, base_url = _start_server()
+    try:
+        with mock.patch.dict(ai_config.DEEPSEEK_CONFIG, {'base_url': base_url}), \
+             mock.patch.object(analyzer, 'get_latency_history', return_value=LatencyHistory(path='')), \
+             mock.patch.object(analyzer, 'get_streaming_config',
+                               return_value={'enabled': True, 'connect_timeout_s': 2,
+                                             'first_token_timeout_s': 2, 'total_timeout_s': 60}):
+            start_time = time.time()
+            time_data = analyzer._extract_time_with_ai("응모 기간: 8월 20일 20:00 ~ 8월 22일 23:59")
+            elapsed = time.time() - start_time
+    finally:
+        server.shutdown()
+
+    assert time_data == json.loads(TIME_JSON)
+    assert elapsed < 1.0
+    print(f"✅ 流式时间提取 {elapsed:.2f}s 完成")
+
+
+if __name__ == "__main__":
+    test_incremental_extractor()
+    test_early_completion()
+    test_first_token_timeout()
+    test_time_extraction_streams()
+    print("\n🎉 AI流式响应测试全部通过")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_async_monitor.py
+测试异步监控循环 - 验证事件到达立即处理、空闲时只有心跳、跟踪器缺失时不空转、回车结束监控
+"""
+
+import sys
+import os
+import time
+import queue
+import asyncio
+import threading
+from unittest import mock
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.core.mode_components.async_monitor import AsyncMonitorLoop
+from src.weverse.core.mode_components.monitoring_handler import MonitoringHandler
+
+
+class FakeWatcher:
+    last_count = 0
+
+
+class FakeDriver:
+    """execute_async_script 阻塞到有事件或心跳超时"""
+
+    def __init__(self, no_tracker=False):
+        self.events = queue.Queue()
+        self.no_tracker = no_tracker
+        self.calls = 0
+
+    def execute_async_script(self, script, cursor, dom_count, timeout_ms, coalesce_ms):
+        self.calls += 1
+        if self.no_tracker:
+            # 页面没有跟踪器时等待脚本立即返回
+            return {'reasons': ['no_tracker']}
+        try:
+            return {'reasons': [self.events.get(timeout=timeout_ms / 1000)]}
+        except queue.Empty:
+            return {'reasons': ['timeout']}
+
+
+class FakeHandler:
+    def __init__(self, no_tracker=False):
+        self.driver = FakeDriver(no_tracker)
+        self.action_cursor = 0
+        self.dom_watcher = FakeWatcher()
+        self.ticks = []
+
+    def _process_monitor_tick(self, reasons):
+        self.ticks.append((time.perf_counter(), reasons))
+
+    def _report_monitor_error(self, error):
+        raise AssertionError(error)
+
+
+def test_event_driven_loop():
+    """验证事件立即处理、空闲只有心跳、回车结束"""
+    print("🧪 测试异步监控循环")
+    print("=" * 50)
+
+    handler = FakeHandler()
+    read_fd, write_fd = os.pipe()
+    stdin = os.fdopen(read_fd, 'r')
+    loop = AsyncMonitorLoop(handler, {'max_wait_ms': 300}, stdin=stdin)
+
+    sent = {}
+
+    def user_session():
+        time.sleep(0.1)
+        sent['action'] = time.perf_counter()
+        handler.driver.events.put('action')
+        time.sleep(0.8)  # 空闲期间只有心跳
+        sent['enter'] = time.perf_counter()
+        os.write(write_fd, b'\n')
+
+    threading.Thread(target=user_session, daemon=True).start()
+    started = time.perf_counter()
+    stats = asyncio.run(loop.run())
+    elapsed = time.perf_counter() - started
+    stdin.close()
+    os.close(write_fd)
+
+    print(f"   统计: {stats}, 用时 {elapsed:.2f}s")
+    action_tick = next(t for t, reasons in handler.ticks if reasons == ['action'])
+    reaction_ms = (action_tick - sent['action']) * 1000
+    print(f"   操作处理延迟: {reaction_ms:.1f}ms")
+
+    assert reaction_ms < 50
+    assert stats['reasons'].get('action') == 1
+    assert 2 <= stats['reasons'].get('timeout', 0) <= 4  # 0.8秒空闲 / 0.3秒心跳
+    assert elapsed - (sent['enter'] - started) < 0.35  # 回车后最多一个心跳就结束
+
+    print("✅ 异步监控循环验证通过")
+
+
+def _run_for(loop, seconds):
+    """运行监控循环，seconds 秒后模拟回车"""
+    read_fd, write_fd = os.pipe()
+    loop.stdin = os.fdopen(read_fd, 'r')
+    timer = threading.Timer(seconds, lambda: os.write(write_fd, b'\n'))
+    timer.start()
+    try:
+        return asyncio.run(loop.run())
+    finally:
+        loop.stdin.close()
+        os.close(write_fd)
+
+
+def test_no_tracker_backoff():
+    """验证跟踪器缺失时等待脚本立即返回也不会空转"""
+    print("\n🧪 测试跟踪器缺失时退避")
+    print("=" * 50)
+
+    handler = FakeHandler(no_tracker=True)
+    loop = AsyncMonitorLoop(handler, {'max_wait_ms': 300, 'error_backoff_s': 0.2})
+    stats = _run_for(loop, 1.0)
+    print(f"   1秒内唤醒 {stats['wakes']} 次, 页面等待调用 {handler.driver.calls} 次")
+
+    assert stats['reasons'] == {'no_tracker': stats['wakes']}
+    assert stats['wakes'] <= 7, "每次唤醒后应退避 error_backoff_s"
+    print("✅ 跟踪器缺失时不空转")
+
+
+def test_same_url_tracker_reinjected():
+    """验证URL未变但跟踪器丢失（同URL刷新）时重新注入跟踪器和DOM观察器"""
+    print("\n🧪 测试同URL刷新后重新注入")
+    print("=" * 50)
+
+    url = 'https://weverse.io/apply'
+    handler = MonitoringHandler(mock.Mock(current_url=url))
+    trackers = [{'installed': False, 'href': url}, {'installed': True, 'href': url}]
+    with mock.patch.object(handler, '_poll_tracker', side_effect=trackers), \
+         mock.patch.object(handler, '_inject_user_action_tracker') as inject, \
+         mock.patch.object(handler.dom_watcher, 'install') as install, \
+         mock.patch.object(handler.dom_watcher, 'poll', return_value=None), \
+         mock.patch.object(handler, '_poll_dom_recorder') as poll_recorder, \
+         mock.patch.object(handler, '_get_user_actions', return_value=[]), \
+         mock.patch.object(handler, '_record_page_change') as page_change:
+        state = {'last_url': url, 'tracked_count': 0}
+        handler._process_page_events(state)
+
+    assert inject.call_count == 1 and install.call_count == 1 and poll_recorder.call_count == 1
+    assert page_change.call_count == 0, "同URL不记录页面跳转"
+    print("✅ 同URL刷新后已重新注入")
+
+
+class FakeNetworkMonitor:
+    """后台轮询已停止：只有 pump() 才读取性能日志"""
+
+    def __init__(self, logged):
+        self.logged = logged
+        self.captured = []
+
+    def pump(self):
+        self.captured.extend(self.logged)
+        self.logged = []
+        return len(self.captured)
+
+    def get_captured_requests(self):
+        return list(self.captured)
+
+
+def test_final_requests_pumped():
+    """验证结束监控后收集最终数据前再读一次日志，最后一次唤醒之后的请求不丢失"""
+    print("\n🧪 测试最终数据包含最后的请求")
+    print("=" * 50)
+
+    submit = {'method': 'POST', 'url': 'https://weverse.io/api/apply/submit', 'status': 200}
+    handler = MonitoringHandler(mock.Mock(current_url='https://weverse.io/apply'), FakeNetworkMonitor([submit]))
+    handler.monitoring_start_time = time.time()
+    with mock.patch.object(handler, '_get_user_actions', return_value=[]), \
+         mock.patch.object(handler, '_page_snapshot', return_value={}), \
+         mock.patch.object(handler, '_disable_user_action_tracker'):
+        handler._collect_final_data()
+
+    assert handler.collected_data['network_requests'] == [submit]
+    print("✅ 最后的表单提交请求已收集")
+
+
+if __name__ == "__main__":
+    test_event_driven_loop()
+    test_no_tracker_backoff()
+    test_same_url_tracker_reinjected()
+    test_final_requests_pumped()
+    print("\n✅ 异步监控循环测试完成")
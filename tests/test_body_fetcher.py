@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_body_fetcher.py
+测试选择性响应体抓取 - 验证按解码后长度占用字节预算、预算用完后跳过、单个响应体截断、请求体抓取受同一预算限制，以及关联记录清理
+"""
+
+import sys
+import os
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.network.body_fetcher import ResponseBodyFetcher
+
+
+class FakeClassifier:
+    """只有 /api/ 请求需要详细记录"""
+
+    def is_detailed(self, method, url):
+        return '/api/' in url
+
+
+class FakeCDPDriver:
+    """execute_cdp_cmd 按 requestId 返回预设的响应体/请求体"""
+
+    def __init__(self, bodies=None, post_data=None):
+        self.bodies = bodies or {}
+        self.post_data = post_data or {}
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params['requestId']))
+        if cmd == 'Network.getResponseBody':
+            return {'body': self.bodies[params['requestId']], 'base64Encoded': False}
+        if cmd == 'Network.getRequestPostData':
+            return {'postData': self.post_data[params['requestId']]}
+        raise ValueError(cmd)
+
+
+def _fetcher(driver, **config):
+    config = dict({'enabled': True, 'max_workers': 1, 'byte_budget': 1000,
+                   'max_body_bytes': 400, 'drain_timeout_s': 2}, **config)
+    return ResponseBodyFetcher(driver, classifier=FakeClassifier(), config=config)
+
+
+def _load(fetcher, request_id, url='https://weverse.io/api/apply', encoded_length=10, request_params=None):
+    """按 requestWillBeSent → responseReceived → loadingFinished 顺序喂事件，返回响应记录"""
+    request = dict({'method': 'POST', 'url': url}, **(request_params or {}))
+    request_record = {'method': 'POST', 'url': url}
+    fetcher.on_request(request_id, request_record, {'request': request})
+    response_record = {'method': 'GET', 'url': url}
+    fetcher.on_response(request_id, response_record, {'response': {'url': url}})
+    fetcher.on_loading_finished({'requestId': request_id, 'encodedDataLength': encoded_length})
+    return request_record, response_record
+
+
+def test_budget_uses_decoded_length():
+    """验证压缩响应按解码后的长度占用预算，预算用完后不再抓取"""
+    print("🧪 测试字节预算")
+    print("=" * 50)
+
+    # 压缩后只有10字节，解码后300字节
+    driver = FakeCDPDriver(bodies={f'r{i}': 'x' * 300 for i in range(6)})
+    fetcher = _fetcher(driver)
+    records = []
+    for i in range(6):
+        records.append(_load(fetcher, f'r{i}')[1])
+        fetcher.executor.submit(lambda: None).result()  # 等待单线程池处理完前面的抓取
+    fetcher.drain()
+    stats = fetcher.get_stats()
+    print(f"   统计: {stats}")
+
+    assert [len(record.get('response_body', '')) for record in records] == [300, 300, 300, 100, 0, 0]
+    assert records[3]['response_body_truncated'], "超出剩余预算的部分截断"
+    assert all(record['response_body_skipped'] == 'byte_budget' for record in records[4:])
+    assert stats['bytes_fetched'] == 1000 and stats['bytes_reserved'] == 1000
+    assert stats['skipped_budget'] == 2
+    # 预算用完后 loadingFinished 不再发出CDP命令
+    assert len(driver.commands) == 4
+    print("✅ 预算按解码后长度计算")
+
+
+def test_truncation_and_request_body_budget():
+    """验证单个响应体截断，请求体抓取计入同一预算"""
+    print("\n🧪 测试截断与请求体预算")
+    print("=" * 50)
+
+    driver = FakeCDPDriver(bodies={'big': 'y' * 1000, 'next': 'z' * 100},
+                           post_data={'big': 'p' * 500, 'next': 'q' * 500})
+    fetcher = _fetcher(driver)
+    request_record, response_record = _load(fetcher, 'big', request_params={'hasPostData': True})
+    fetcher.executor.submit(lambda: None).result()
+    assert response_record['response_body'] == 'y' * 400 and response_record['response_body_truncated']
+    assert request_record['request_body'] == 'p' * 400 and request_record['request_body_truncated']
+
+    # 已用 800 字节，下一个请求体只能挂上剩余的 200 字节，之后的响应体和请求体都不再抓取
+    request_record, response_record = _load(fetcher, 'next', request_params={'hasPostData': True})
+    fetcher.executor.submit(lambda: None).result()
+    last_request, _ = _load(fetcher, 'last', request_params={'hasPostData': True})
+    fetcher.drain()
+    stats = fetcher.get_stats()
+    print(f"   统计: {stats}")
+
+    assert request_record['request_body'] == 'q' * 200 and request_record['request_body_truncated']
+    assert response_record['response_body_skipped'] == 'byte_budget' and 'response_body' not in response_record
+    assert last_request['request_body_skipped'] == 'byte_budget'
+    assert ('Network.getRequestPostData', 'last') not in driver.commands
+    assert stats['truncated'] == 3 and stats['bytes_reserved'] == 1000
+    print("✅ 截断和请求体预算验证通过")
+
+
+def test_records_and_futures_pruned():
+    """验证请求结束后清理关联记录，已完成的抓取任务不再保留"""
+    print("\n🧪 测试记录清理")
+    print("=" * 50)
+
+    driver = FakeCDPDriver(bodies={f'r{i}': 'ok' for i in range(50)})
+    fetcher = _fetcher(driver, byte_budget=10 ** 6)
+    for i in range(50):
+        _load(fetcher, f'r{i}')
+        fetcher.executor.submit(lambda: None).result()
+    # 非关键请求和加载失败的请求
+    fetcher.on_request('static', {}, {'request': {'method': 'GET', 'url': 'https://weverse.io/app.js'}})
+    fetcher.on_request('failed', {}, {'request': {'method': 'POST', 'url': 'https://weverse.io/api/x'}})
+    fetcher.on_loading_failed({'requestId': 'failed'})
+
+    assert fetcher.records == {}
+    assert len(fetcher.futures) <= 1
+    fetcher.drain()
+    assert fetcher.get_stats()['fetched'] == 50
+    print("✅ 关联记录和已完成任务已清理")
+
+
+if __name__ == "__main__":
+    test_budget_uses_decoded_length()
+    test_truncation_and_request_body_budget()
+    test_records_and_futures_pruned()
+    print("\n🎉 响应体抓取测试全部通过")
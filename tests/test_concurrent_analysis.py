@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_concurrent_analysis.py
+测试并发AI分析 - 验证时间提取与完整分析同时发出，时间结果先返回，分析在后台完成并保存
+"""
+
+import sys
+import os
+import time
+import threading
+from unittest import mock
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.ai import analyzer
+from src.weverse.analysis import batch_analyzer
+from src.weverse.core.mode_components import content_analyzer
+from src.weverse.core.mode_components.content_analyzer import ContentAnalyzer
+from src.weverse.network.http_client import get_http_client
+
+NOTICE = "[공지] 팬미팅 응모 안내\n응모 기간: 2025년 8월 20일 20:00 ~ 8월 22일 23:59 (KST)"
+TIME_DATA = {'申请开始时间': '2025-08-20 20:00', '关键时间点': []}
+TIME_DELAY = 0.3
+ANALYSIS_DELAY = 0.6
+
+
+def _slow_time(content):
+    time.sleep(TIME_DELAY)
+    return TIME_DATA
+
+
+def _slow_analysis(content, time_info=None):
+    time.sleep(ANALYSIS_DELAY)
+    return '分析结果'
+
+
+def test_time_returned_before_analysis():
+    """验证时间信息先返回，后台分析结果在 wait_for_analysis 中打印并保存一次"""
+    print("🧪 测试时间结果先于完整分析返回")
+    print("=" * 50)
+
+    saved = []
+    with mock.patch.object(content_analyzer, 'extract_article_content', return_value=NOTICE), \
+         mock.patch.object(content_analyzer, 'extract_time', side_effect=_slow_time), \
+         mock.patch.object(analyzer, 'analyze_with_ai', side_effect=_slow_analysis), \
+         mock.patch.object(content_analyzer, 'save_analysis', side_effect=lambda *args: saved.append(args)):
+        component = ContentAnalyzer(driver=None, wait=None)
+        component.config['concurrent_analysis'] = True
+
+        start_time = time.time()
+        article_content, time_data, analysis_result = component.analyze_page_content()
+        time_elapsed = time.time() - start_time
+
+        assert article_content == NOTICE
+        assert time_data == TIME_DATA
+        assert analysis_result is None
+        assert time_elapsed < ANALYSIS_DELAY, f"时间结果应先返回: {time_elapsed:.2f}s"
+
+        # 后台线程完成后不输出也不保存（可能正处于倒计时或静默关键区），留给 wait_for_analysis
+        component.analysis_future.result(timeout=5)
+        assert saved == []
+
+        assert component.wait_for_analysis(timeout=5) == '分析结果'
+        total_elapsed = time.time() - start_time
+        assert component.wait_for_analysis(timeout=5) == '分析结果'
+
+    print(f"   时间结果: {time_elapsed:.2f}s, 分析完成: {total_elapsed:.2f}s")
+    # 两个调用并发：总耗时接近较慢的一个，而不是两者之和
+    assert total_elapsed < TIME_DELAY + ANALYSIS_DELAY
+    assert len(saved) == 1
+    assert saved[0][:3] == (NOTICE, '分析结果', TIME_DATA)
+    print("✅ 时间结果先返回，完整分析在后台完成并保存")
+
+
+def test_sequential_mode():
+    """验证关闭并发时保持原有顺序执行"""
+    print("🧪 测试顺序模式")
+    print("=" * 50)
+
+    calls = []
+    with mock.patch.object(content_analyzer, 'extract_article_content', return_value=NOTICE), \
+         mock.patch.object(content_analyzer, 'extract_time', side_effect=lambda c: calls.append('time') or None), \
+         mock.patch.object(content_analyzer, 'extract_time_info', return_value={'dates': ['8월 20일']}), \
+         mock.patch.object(content_analyzer, 'analyze_with_ai',
+                           side_effect=lambda c, t: calls.append(('analysis', t)) or '分析结果'), \
+         mock.patch.object(content_analyzer, 'save_analysis'):
+        component = ContentAnalyzer(driver=None, wait=None)
+        component.config['concurrent_analysis'] = False
+        _, time_data, analysis_result = component.analyze_page_content()
+
+    assert calls == ['time', ('analysis', {'dates': ['8월 20일']})]
+    assert time_data == {'dates': ['8월 20일']}
+    assert analysis_result == '分析结果'
+    assert component.wait_for_analysis() is None
+    print("✅ 顺序模式下正则时间信息仍传给AI分析")
+
+
+def test_batch_analysis_concurrent():
+    """验证批量分析中两个AI调用并发"""
+    print("🧪 测试批量分析并发调用")
+    print("=" * 50)
+
+    with mock.patch('src.weverse.ai.analyzer.extract_time', side_effect=_slow_time), \
+         mock.patch.object(analyzer, 'analyze_with_ai', side_effect=_slow_analysis):
+        start_time = time.time()
+        result = batch_analyzer.analyze_content(NOTICE)
+        elapsed = time.time() - start_time
+
+    print(f"   耗时: {elapsed:.2f}s")
+    assert result == {'time_info': TIME_DATA, 'analysis': '分析结果'}
+    assert elapsed < TIME_DELAY + ANALYSIS_DELAY
+    print("✅ 批量分析耗时接近较慢的调用")
+
+
+def test_batch_workers_do_not_queue():
+    """验证多个批量工作线程同时分析时不在共享的两线程分析池后排队"""
+    print("🧪 测试批量分析不排队")
+    print("=" * 50)
+
+    workers = 4
+    with mock.patch('src.weverse.ai.analyzer.extract_time', side_effect=_slow_time), \
+         mock.patch.object(analyzer, 'analyze_with_ai', side_effect=_slow_analysis):
+        start_time = time.time()
+        threads = [threading.Thread(target=batch_analyzer.analyze_content, args=(NOTICE,)) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start_time
+
+    print(f"   {workers} 篇同时分析耗时: {elapsed:.2f}s")
+    assert elapsed < ANALYSIS_DELAY * 2, "分析应并行进行，而不是每两篇排一轮"
+    print("✅ 批量分析随工作线程数并行")
+
+
+def test_shared_session():
+    """验证AI请求共用同一个带连接池的HTTP会话"""
+    print("🧪 测试共享HTTP会话")
+    print("=" * 50)
+
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(analyzer._get_session())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 1
+    adapter = sessions[0].get_adapter('https://api.deepseek.com')
+    assert adapter is get_http_client().adapter, "AI请求应使用共享HTTP客户端的连接池"
+    print("✅ 并发请求共用一个会话和连接池")
+
+
+if __name__ == "__main__":
+    test_time_returned_before_analysis()
+    test_sequential_mode()
+    test_batch_analysis_concurrent()
+    test_batch_workers_do_not_queue()
+    test_shared_session()
+    print("\n🎉 并发AI分析测试全部通过")
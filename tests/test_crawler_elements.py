@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_crawler_elements.py
+测试页面爬取单次调用 - 验证坐标取整与 WebElement 一致、页面内分类和去重与离线爬取一致、单次调用失败时回退到逐元素爬取
+"""
+
+import sys
+import os
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from node_dom import NODE, run_script
+from src.weverse.analysis.page_crawler import PageCrawler
+from src.weverse.analysis.form_inventory import CRAWLER_CSS_SELECTORS, CRAWLER_XPATHS, collect_crawler_elements
+from src.weverse.analysis.offline_analyzer import crawl_form_elements, css_to_xpath, parse_html
+
+CATEGORIES = ['input_fields', 'checkboxes', 'radio_buttons', 'select_dropdowns', 'textareas', 'buttons']
+FORM_HTML = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_weverse_form.html')
+
+# 三种查找方式交叉命中的元素：按钮类名、提交文字、name/placeholder 关键词、类名选择器命中的非表单元素、重复 name
+CROSS_MATCH_HTML = """<html><body><form>
+  <input type="text" name="birth" class="form-control">
+  <input type="tel" placeholder="전화번호" class="form-input">
+  <input name="mobile">
+  <input type="checkbox" name="agree" class="checkbox">
+  <input type="checkbox" name="agree" class="checkbox">
+  <div class="checkbox"><input type="radio" name="seat" value="a"></div>
+  <span class="radio">A</span>
+  <div class="form-control">readonly</div>
+  <select name="count"><option>1</option></select>
+  <textarea name="memo"></textarea>
+  <button type="button" class="btn-confirm">확인</button>
+  <button>신청하기</button>
+  <button type="submit" class="submit" disabled>제출</button>
+  <input type="button" value="취소" style="display: none">
+</form></body></html>"""
+
+
+class FakeDriver:
+    """execute_script 返回页面内脚本的原始结果"""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.scripts = 0
+        self.finds = []
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        if self.result is None:
+            raise RuntimeError("javascript error")
+        return self.result
+
+    def find_elements(self, by, value):
+        self.finds.append((by, value))
+        return []
+
+
+def _raw_result():
+    result = {category: [] for category in CATEGORIES}
+    result['input_fields'].append({
+        'tag_name': 'input', 'type': 'text', 'name': 'birth', 'id': '', 'class': 'form-control',
+        'placeholder': '생년월일', 'value': '', 'text': '', 'required': True, 'disabled': False,
+        'visible': True, 'enabled': True,
+        'location': {'x': 10.5, 'y': 220.49}, 'size': {'height': 31.8, 'width': 199.99},
+        'found_by': 'tag_name'
+    })
+    return result
+
+
+def test_single_call_schema():
+    """验证单次调用结果与逐元素实现的字段格式一致"""
+    print("🧪 测试单次调用结果格式")
+    print("=" * 50)
+
+    driver = FakeDriver(_raw_result())
+    form_elements = collect_crawler_elements(driver)
+    element = form_elements['input_fields'][0]
+    print(f"   位置: {element['location']}, 尺寸: {element['size']}")
+
+    assert driver.scripts == 1
+    assert element['location'] == {'x': 10, 'y': 220}
+    assert element['size'] == {'height': 31, 'width': 199}
+    assert sorted(form_elements) == sorted(CATEGORIES)
+
+    print("✅ 单次调用结果格式验证通过")
+
+
+class NodeDriver:
+    """execute_script 交给 node 在 lxml 构造的 DOM 上执行"""
+
+    def __init__(self, html):
+        self.html = html
+        self.scripts = 0
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        return run_script(self.html, script, args, xpaths=CRAWLER_XPATHS,
+                          css_xpaths={selector: css_to_xpath(selector) for selector in CRAWLER_CSS_SELECTORS})
+
+
+def test_in_page_matches_offline_crawler():
+    """验证页面内脚本的分类、去重、顺序和字段与离线爬取（PageCrawler 规则）一致"""
+    print("\n🧪 测试页面内分类与去重")
+    print("=" * 50)
+
+    if not NODE:
+        print("⚠️ 未安装 node，跳过页面内脚本执行")
+        return
+
+    with open(FORM_HTML, 'r', encoding='utf-8') as f:
+        pages = {'test_weverse_form.html': f.read(), 'cross_match': CROSS_MATCH_HTML}
+    for page, html in pages.items():
+        driver = NodeDriver(html)
+        form_elements = collect_crawler_elements(driver)
+        expected = crawl_form_elements(parse_html(html))
+        assert driver.scripts == 1
+        assert sorted(form_elements) == sorted(CATEGORIES)
+        for category in CATEGORIES:
+            actual = [dict(element, location=None, size=None) for element in form_elements[category]]
+            assert actual == expected[category], f"{page} {category} 不一致"
+            for element in form_elements[category]:
+                # 坐标按 WebElement 的方式取整（离线没有布局信息，只比较格式）
+                assert all(isinstance(v, int) for v in list(element['location'].values()) + list(element['size'].values()))
+        print(f"   {page}: {', '.join(f'{k}={len(v)}' for k, v in form_elements.items() if v)}")
+
+    found = {category: [(e['tag_name'], e['name'], e['found_by']) for e in elements]
+             for category, elements in collect_crawler_elements(NodeDriver(CROSS_MATCH_HTML)).items()}
+    # 同名复选框只保留一个；类名选择器命中的 div/span 按选择器归类
+    assert found['checkboxes'] == [('input', 'agree', 'tag_name'), ('div', '', 'css: .checkbox')]
+    assert found['radio_buttons'] == [('input', 'seat', 'tag_name'), ('span', '', 'css: .radio')]
+    assert ('div', '', 'css: .form-control') in found['input_fields']
+    # 按钮型输入框按标签名归入输入框，CSS选择器再归入按钮；无 name/id 的两个提交按钮去重键相同，只保留一个
+    assert ('input', '', 'tag_name') in found['input_fields']
+    assert found['buttons'] == [('button', '', 'tag_name'), ('button', '', 'tag_name'),
+                                ('input', '', 'css: input[type="button"]')]
+    print("✅ 页面内分类与去重和离线爬取一致")
+
+
+def test_fallback_to_webdriver():
+    """验证单次调用失败时回退到三种查找方式"""
+    print("\n🧪 测试回退到逐元素爬取")
+    print("=" * 50)
+
+    crawler = PageCrawler(FakeDriver())
+    crawler._crawl_form_elements()
+    methods = {by for by, _ in crawler.driver.finds}
+    print(f"   回退查找方式: {sorted(methods)}")
+
+    assert methods == {'tag name', 'css selector', 'xpath'}
+    assert all(crawler.page_data['form_elements'][category] == [] for category in CATEGORIES)
+
+    print("✅ 回退验证通过")
+
+
+if __name__ == "__main__":
+    test_single_call_schema()
+    test_in_page_matches_offline_crawler()
+    test_fallback_to_webdriver()
+    print("\n✅ 页面爬取单次调用测试完成")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_critical_path.py
+测试点击后关键路径分析 - 用构造的性能日志验证关键链和瀑布图
+"""
+
+import sys
+import os
+import json
+from collections import deque
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.network.critical_path import (
+    CriticalPathAnalyzer, compact_timeline_event, render_waterfall
+)
+from src.weverse.network.enhanced_monitor import EnhancedNetworkMonitor
+
+CLICK_MS = 1_700_000_000_000
+
+
+def _request(request_id, ts, url, resource_type, initiator_url='', method='GET'):
+    params = {
+        'requestId': request_id,
+        'type': resource_type,
+        'request': {'url': url, 'method': method},
+        'initiator': {'type': 'script', 'stack': {'callFrames': [{'url': initiator_url}]}}
+        if initiator_url else {'type': 'other'}
+    }
+    return compact_timeline_event('Network.requestWillBeSent', params, CLICK_MS + ts)
+
+
+def _response(request_id, ts, status=200):
+    return compact_timeline_event('Network.responseReceived',
+                                  {'requestId': request_id, 'response': {'status': status}}, CLICK_MS + ts)
+
+
+def _finished(request_id, ts, size=1000):
+    return compact_timeline_event('Network.loadingFinished',
+                                  {'requestId': request_id, 'encodedDataLength': size}, CLICK_MS + ts)
+
+
+def build_sample_events():
+    """文档 → 主脚本 → 表单配置API，字体和图片不阻塞"""
+    doc = 'https://weverse.io/event/apply'
+    bundle = 'https://static.weverse.io/app/main.js'
+    api = 'https://global.apis.naver.com/weverse/event/v1/form'
+    return [
+        _request('1', 10, doc, 'Document'), _response('1', 150), _finished('1', 180, 20000),
+        _request('2', 190, bundle, 'Script', initiator_url=doc), _response('2', 260), _finished('2', 320, 300000),
+        _request('3', 330, api, 'XHR', initiator_url=bundle), _response('3', 560), _finished('3', 570, 2000),
+        _request('4', 200, 'https://static.weverse.io/font.woff2', 'Font', initiator_url=doc), _finished('4', 700),
+        _request('5', 340, 'https://static.weverse.io/analytics.js', 'Script', initiator_url=doc), _finished('5', 450),
+        compact_timeline_event('Page.domContentEventFired', {'timestamp': 0}, CLICK_MS + 330),
+        compact_timeline_event('Page.requestWillBeSentExtraInfo', {}, CLICK_MS + 1),
+    ]
+
+
+def test_critical_chain():
+    """验证关键链回溯"""
+    print("🧪 测试关键路径回溯")
+    print("=" * 50)
+
+    events = [e for e in build_sample_events() if e]
+    report = CriticalPathAnalyzer(events, CLICK_MS, form_ready_ms=CLICK_MS + 620,
+                                  form_selector='#requiredProperties-birthDate').analyze()
+
+    chain_urls = [item['url'] for item in report['critical_path']]
+    print(f"   关键链: {chain_urls}")
+
+    assert chain_urls == [
+        'https://weverse.io/event/apply',
+        'https://static.weverse.io/app/main.js',
+        'https://global.apis.naver.com/weverse/event/v1/form',
+    ]
+    assert report['critical_path'][-1]['ttfb_ms'] == 230.0
+    assert report['critical_path_end_ms'] == 570.0
+    assert report['post_network_ms'] == 50.0
+    assert report['milestones_ms']['dom_content_loaded'] == 330.0
+
+    # 字体不算阻塞请求，分析脚本阻塞但不在关键链上
+    gating_urls = {item['url']: item for item in report['gating_requests']}
+    assert 'https://static.weverse.io/font.woff2' not in gating_urls
+    assert not gating_urls['https://static.weverse.io/analytics.js']['on_critical_path']
+
+    json.dumps(report, ensure_ascii=False)
+    print("✅ 关键链验证通过")
+
+
+def test_waterfall_rendering():
+    """验证文本瀑布图"""
+    print("\n🧪 测试文本瀑布图")
+    print("=" * 50)
+
+    events = [e for e in build_sample_events() if e]
+    report = CriticalPathAnalyzer(events, CLICK_MS, form_ready_ms=CLICK_MS + 620).analyze()
+    waterfall = render_waterfall(report, width=40)
+    print(waterfall)
+
+    assert '█' in waterfall
+    assert 'F=form_ready 620ms' in waterfall
+    assert '关键链 (3 个请求)' in waterfall
+    print("✅ 瀑布图验证通过")
+
+
+def test_pre_click_milestones_ignored():
+    """验证点击前页面的里程碑不计入，取点击后的第一次"""
+    print("\n🧪 测试点击前的里程碑")
+    print("=" * 50)
+
+    events = [e for e in build_sample_events() if e]
+    events += [
+        compact_timeline_event('Page.domContentEventFired', {}, CLICK_MS - 5000),
+        compact_timeline_event('Page.loadEventFired', {}, CLICK_MS - 4000),
+        compact_timeline_event('Page.loadEventFired', {}, CLICK_MS + 800),
+        compact_timeline_event('Page.loadEventFired', {}, CLICK_MS + 900),
+    ]
+    report = CriticalPathAnalyzer(events, CLICK_MS, form_ready_ms=CLICK_MS + 620).analyze()
+    print(f"   里程碑: {report['milestones_ms']}")
+    assert report['milestones_ms']['dom_content_loaded'] == 330.0
+    assert report['milestones_ms']['load_event'] == 800.0
+    print("✅ 里程碑只取点击之后")
+
+
+def test_timeline_events_capped():
+    """验证监控期间时间线事件只保留最近的条数"""
+    print("\n🧪 测试时间线事件上限")
+    print("=" * 50)
+
+    monitor = EnhancedNetworkMonitor(driver=None, capture_bodies=False)
+    monitor.timeline_events = deque(maxlen=50)
+    for index in range(200):
+        message = json.dumps({'message': {'method': 'Page.loadEventFired', 'params': {}}})
+        monitor._process_log_entry({'message': message, 'timestamp': index}, [])
+    events = monitor.get_timeline_events()
+    assert len(events) == 50 and events[0]['ts'] == 150
+    print("✅ 时间线事件不会无限增长")
+
+
+if __name__ == "__main__":
+    test_critical_chain()
+    test_waterfall_rendering()
+    test_pre_click_milestones_ignored()
+    test_timeline_events_capped()
+    print("\n✅ 关键路径分析测试完成")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_dom_change_watcher.py
+测试DOM变化监视器 - 验证无变化时不取页面源码、跳转后重新注入
+"""
+
+import sys
+import os
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.core.mode_components.dom_change_watcher import (
+    DomChangeWatcher, INSTALL_SCRIPT, POLL_SCRIPT
+)
+
+
+class FakePage:
+    """模拟页面内 window.__domWatch 状态的假驱动"""
+
+    def __init__(self):
+        self.watch = None
+        self.page_source_reads = 0
+        self.script_calls = 0
+
+    @property
+    def page_source(self):
+        self.page_source_reads += 1
+        return '<html><body>' + 'x' * 1000 + '</body></html>'
+
+    def mutate(self, target, count=1):
+        for _ in range(count):
+            self.watch['count'] += 1
+            self.watch['subtrees'].append({'seq': self.watch['count'], 'type': 'childList', 'target': target})
+
+    def navigate(self):
+        self.watch = None
+
+    def execute_script(self, script, *args):
+        self.script_calls += 1
+        if script == INSTALL_SCRIPT:
+            if self.watch is None:
+                self.watch = {'count': 0, 'digest': 2166136261, 'subtrees': []}
+            return self.watch['count']
+        if script == POLL_SCRIPT:
+            if self.watch is None:
+                return None
+            since = args[0]
+            if self.watch['count'] == since:
+                return self.watch['count']
+            return {
+                'count': self.watch['count'],
+                'digest': self.watch['digest'],
+                'subtrees': [s for s in self.watch['subtrees'] if s['seq'] > since]
+            }
+        raise AssertionError('unexpected script')
+
+
+def test_poll_reads_source_only_on_change():
+    """验证无变化的轮询不获取页面源码"""
+    print("🧪 测试DOM变化轮询")
+    print("=" * 50)
+
+    page = FakePage()
+    watcher = DomChangeWatcher(page, config={'enabled': True, 'capture_page_source': True})
+    assert watcher.install()
+
+    for _ in range(100):
+        assert watcher.poll() is None
+    assert page.page_source_reads == 0
+
+    page.mutate('div#form-page', 3)
+    change = watcher.poll()
+    print(f"   变化记录: {change['new_mutations']} 处, 子树: {[s['target'] for s in change['subtrees']]}")
+    assert change['new_mutations'] == 3
+    assert len(change['subtrees']) == 3
+    assert change['page_source_length'] > 1000
+    assert page.page_source_reads == 1
+
+    # 同一批变化不会重复上报
+    assert watcher.poll() is None
+    print("✅ DOM变化轮询验证通过")
+
+
+def test_reinstall_after_navigation():
+    """验证页面跳转后自动重新注入"""
+    print("\n🧪 测试跳转后重新注入")
+    print("=" * 50)
+
+    page = FakePage()
+    watcher = DomChangeWatcher(page, config={'enabled': True, 'capture_page_source': False})
+    watcher.install()
+    page.mutate('section', 5)
+    watcher.poll()
+
+    page.navigate()
+    assert watcher.poll() is None
+    assert watcher.installs == 2
+    assert watcher.last_count == 0
+
+    page.mutate('form#application-form')
+    change = watcher.poll()
+    assert change['new_mutations'] == 1
+    assert 'page_source_length' not in change
+    print("✅ 跳转后重新注入验证通过")
+
+
+if __name__ == "__main__":
+    test_poll_reads_source_only_on_change()
+    test_reinstall_after_navigation()
+    print("\n✅ DOM变化监视器测试完成")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_dom_diff_recorder.py
+测试DOM增量记录器 - 验证变化回放、检查点重建和页面跳转后重新取基线
+"""
+
+import sys
+import os
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.core.mode_components.dom_diff_recorder import (
+    DomDiffRecorder, DRAIN_SCRIPT, reconstruct_segment
+)
+
+BASELINE = {'i': 1, 't': 'html', 'a': {}, 'c': [
+    {'i': 2, 't': 'body', 'a': {}, 'c': [
+        {'i': 3, 't': 'div', 'a': {'id': 'app'}, 'c': [{'i': 4, 'x': 'loading'}]},
+        {'i': 5, 't': 'ul', 'a': {}, 'c': [{'i': 6, 't': 'li', 'a': {}, 'c': [{'i': 7, 'x': 'a & b'}]}]}
+    ]}
+]}
+
+BATCHES = [
+    # 文本和属性变化，新增表单
+    {'s': 1, 'ts': 0, 'ops': [
+        {'o': 'a', 'i': 3, 'n': 'class', 'v': 'ready'},
+        {'o': 't', 'i': 4, 'v': '신청'},
+        {'o': 'c', 'i': 3, 'c': [{'r': 4}, {'i': 8, 't': 'form', 'a': {}, 'c': [
+            {'i': 9, 't': 'input', 'a': {'name': 'birth'}, 'c': []}
+        ]}]}
+    ]},
+    # 已有节点移动到表单内，属性删除
+    {'s': 2, 'ts': 0, 'ops': [
+        {'o': 'a', 'i': 3, 'n': 'class', 'v': None},
+        {'o': 'a', 'i': 9, 'n': 'value', 'v': '19900101'},
+        {'o': 'c', 'i': 8, 'c': [{'r': 9}, {'r': 6}]},
+        {'o': 'c', 'i': 5, 'c': []}
+    ]}
+]
+
+
+class FakeDriver:
+    """按脚本返回基线或变化批次"""
+
+    def __init__(self):
+        self.pending = []
+        self.navigated = False
+
+    def execute_script(self, script, *args):
+        if script == DRAIN_SCRIPT:
+            if self.navigated:
+                self.navigated = False
+                return None
+            batches = [b for b in self.pending if b['s'] > args[0]]
+            return {'seq': batches[-1]['s'] if batches else args[0], 'batches': batches, 'lost': False}
+        return {'seq': 0, 'ts': 0, 'url': 'https://weverse.io/form', 'root': BASELINE}
+
+
+def test_replay_batches():
+    """验证按批次回放重建DOM"""
+    print("🧪 测试变化回放")
+    print("=" * 50)
+
+    segment = {'baseline': BASELINE, 'batches': BATCHES}
+    assert reconstruct_segment(segment, 0) == (
+        '<!DOCTYPE html><html><body><div id="app">loading</div><ul><li>a &amp; b</li></ul></body></html>')
+    assert reconstruct_segment(segment, 1) == (
+        '<!DOCTYPE html><html><body><div id="app" class="ready">신청<form><input name="birth"></form></div>'
+        '<ul><li>a &amp; b</li></ul></body></html>')
+    assert reconstruct_segment(segment) == (
+        '<!DOCTYPE html><html><body><div id="app">신청<form><input name="birth" value="19900101">'
+        '<li>a &amp; b</li></form></div><ul></ul></body></html>')
+
+    # 回放不修改记录本身
+    assert BASELINE['c'][0]['c'][0]['c'] == [{'i': 4, 'x': 'loading'}]
+
+    print("✅ 变化回放验证通过")
+
+
+def test_checkpoints_and_navigation():
+    """验证检查点重建和跳转后重新取基线"""
+    print("\n🧪 测试检查点和页面跳转")
+    print("=" * 50)
+
+    driver = FakeDriver()
+    recorder = DomDiffRecorder(driver, config={'enabled': True})
+    recorder.checkpoint('pre_click')
+
+    driver.pending = BATCHES[:1]
+    recorder.checkpoint('form_page')
+    driver.pending = BATCHES
+    recorder.poll()
+
+    driver.navigated = True
+    driver.pending = []
+    recorder.poll()
+    recorder.checkpoint('final')
+
+    stats = recorder.get_stats()
+    print(f"   统计: {stats}")
+    assert stats['segments'] == 2 and stats['batches'] == 2 and stats['checkpoints'] == 3
+    assert recorder.segments[1]['reason'] == 'navigation'
+    assert 'loading' in recorder.reconstruct_checkpoint('pre_click')
+    assert '<form><input name="birth"></form>' in recorder.reconstruct_checkpoint('form_page')
+    assert recorder.reconstruct_checkpoint('final') == reconstruct_segment({'baseline': BASELINE, 'batches': []})
+
+    print("✅ 检查点和页面跳转验证通过")
+
+
+if __name__ == "__main__":
+    test_replay_batches()
+    test_checkpoints_and_navigation()
+    print("\n✅ DOM增量记录器测试完成")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_form_inventory.py
+测试页面内表单清单 - 验证单次调用结果的结构与逐元素实现一致，以及 execute_script 失败时回退到逐元素分析
+"""
+
+import sys
+import os
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from node_dom import NODE, _props, run_script
+from src.weverse.analysis.form_inventory import FORM_INVENTORY_SCRIPT
+from src.weverse.analysis.offline_analyzer import _is_visible, _text, deep_form_analysis, parse_html, xpath_of
+from src.weverse.core.mode_components.monitoring_handler import MonitoringHandler
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FORM_HTML = os.path.join(TESTS_DIR, 'test_weverse_form.html')
+
+CATEGORIES = ['input_fields', 'select_fields', 'checkboxes', 'radio_buttons',
+              'buttons', 'form_containers', 'validation_messages', 'hidden_fields']
+
+# 页面内脚本的查询选择器及等价XPath
+INVENTORY_SELECTOR = 'input, select, button, form, [role="alert"], [aria-live="assertive"]'
+INVENTORY_XPATH = "//input | //select | //button | //form | //*[@role='alert'] | //*[@aria-live='assertive']"
+
+# 补充测试页面没有的元素：下拉框、单选、隐藏字段、按钮型输入框、禁用按钮、隐藏元素
+EXTRA_HTML = """<html><body>
+<form id="apply" action="/apply" method="POST">
+  <input type="hidden" name="token" value="abc">
+  <input name="phone" placeholder="전화번호" required maxlength="11">
+  <select name="seat"><option value="a">A석</option><option selected>B석</option></select>
+  <input type="radio" name="ticket" value="1" checked><input type="radio" name="ticket" value="2">
+  <input type="button" value="확인">
+  <button class="btn submit" disabled>신청</button>
+  <div style="display: none"><button type="button">숨김</button></div>
+  <div role="alert">전화번호를 입력하세요</div>
+</form>
+</body></html>"""
+
+
+def _read_form():
+    with open(FORM_HTML, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class FakeWebElement:
+    """按 lxml 元素模拟 WebElement（get_attribute 先取属性值再取HTML属性）"""
+
+    def __init__(self, el):
+        self.el = el
+        self.tag_name = el.tag
+
+    def get_attribute(self, name):
+        props = _props(self.el)
+        if name in props and name != 'options':
+            value = props[name]
+            return None if value is False else ('true' if value is True else value)
+        return self.el.get(name)
+
+    @property
+    def text(self):
+        return _text(self.el) if _is_visible(self.el) else ''
+
+    def is_displayed(self):
+        return _is_visible(self.el)
+
+    def is_enabled(self):
+        return self.el.get('disabled') is None
+
+    def find_elements(self, by, value):
+        return [FakeWebElement(el) for el in self.el.xpath(value)]
+
+
+class FakeDriver:
+    """页面内脚本交给 node 执行；fail_inventory 时单次调用抛出脚本错误"""
+
+    def __init__(self, html, fail_inventory=False):
+        self.html = html
+        self.root = parse_html(html)
+        self.fail_inventory = fail_inventory
+        self.scripts = 0
+        self.finds = []
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        if script == FORM_INVENTORY_SCRIPT:
+            if self.fail_inventory:
+                raise RuntimeError("javascript error: Cannot read properties of null")
+            return run_script(self.html, script, css_xpaths={INVENTORY_SELECTOR: INVENTORY_XPATH})
+        # 逐元素分析的XPath脚本
+        return xpath_of(args[0].el)
+
+    def find_elements(self, by, value):
+        self.finds.append(value)
+        return [FakeWebElement(el) for el in self.root.xpath(value) if isinstance(el.tag, str)]
+
+
+def test_single_call_schema():
+    """验证单次调用的结果结构与逐元素实现一致，内容与离线分析一致"""
+    print("🧪 测试单次调用结果结构")
+    print("=" * 50)
+
+    if not NODE:
+        print("⚠️ 未安装 node，跳过页面内脚本执行")
+        return
+    assert INVENTORY_SELECTOR in FORM_INVENTORY_SCRIPT
+
+    for html in (_read_form(), EXTRA_HTML):
+        driver = FakeDriver(html)
+        analysis = MonitoringHandler(driver)._deep_form_analysis()
+        assert driver.scripts == 1 and driver.finds == [], "单次调用不应逐元素查找"
+        assert sorted(analysis) == sorted(CATEGORIES)
+
+        legacy = MonitoringHandler(FakeDriver(html))._deep_form_analysis_webdriver()
+        for category in ('input_fields', 'select_fields', 'checkboxes', 'radio_buttons', 'buttons', 'form_containers'):
+            assert len(analysis[category]) == len(legacy[category]), category
+            for field, legacy_field in zip(analysis[category], legacy[category]):
+                assert set(field) - {'checked'} == set(legacy_field), f"{category} 字段不一致"
+                assert field['xpath'] == legacy_field['xpath']
+                assert field.get('css_selector') == legacy_field.get('css_selector')
+
+        assert analysis == deep_form_analysis(parse_html(html)), "页面内脚本与离线分析结果应一致"
+        print(f"   {', '.join(f'{k}={len(v)}' for k, v in analysis.items() if v)}")
+
+    extra = MonitoringHandler(FakeDriver(EXTRA_HTML))._deep_form_analysis()
+    assert [f['name'] for f in extra['hidden_fields']] == ['token']
+    assert extra['select_fields'][0]['options'] == [{'value': 'a', 'text': 'A석'}, {'value': 'B석', 'text': 'B석'}]
+    assert extra['select_fields'][0]['selected_value'] == 'B석'
+    assert [f['checked'] for f in extra['radio_buttons']] == [True, False]
+    # 按钮型输入框同时计入输入框和按钮；隐藏按钮不取文本
+    assert [b['tag'] for b in extra['buttons']] == ['input', 'button', 'button']
+    assert extra['buttons'][1]['is_enabled'] is False
+    assert extra['buttons'][2]['is_visible'] is False and extra['buttons'][2]['text'] == ''
+    assert extra['validation_messages'] == [{'text': '전화번호를 입력하세요', 'xpath': '/html[1]/body[1]/form[1]/div[2]'}]
+    print("✅ 单次调用结果结构验证通过")
+
+
+def test_fallback_to_webdriver():
+    """验证页面内脚本失败时回退到逐元素分析"""
+    print("\n🧪 测试回退到逐元素分析")
+    print("=" * 50)
+
+    driver = FakeDriver(EXTRA_HTML, fail_inventory=True)
+    analysis = MonitoringHandler(driver)._deep_form_analysis()
+    print(f"   回退查询: {driver.finds}")
+
+    assert driver.finds[0] == '//input' and '//form' in driver.finds
+    assert [f['name'] for f in analysis['input_fields']] == ['phone', '']
+    assert [f['name'] for f in analysis['hidden_fields']] == ['token']
+    assert len(analysis['radio_buttons']) == 2 and len(analysis['select_fields']) == 1
+    assert len(analysis['buttons']) == 3
+    assert analysis['form_containers'][0]['xpath'] == '//*[@id="apply"]'
+    print("✅ 回退验证通过")
+
+
+if __name__ == "__main__":
+    test_single_call_schema()
+    test_fallback_to_webdriver()
+    print("\n✅ 页面内表单清单测试完成")
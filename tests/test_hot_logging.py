@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_hot_logging.py
+测试热路径日志 - 验证分级过滤、队列输出和静默关键区
+"""
+
+import io
+import sys
+import os
+import queue
+import logging
+import contextlib
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.core.hot_logging import (
+    setup_logging, get_logger, flush_logging, silent_section, in_silent_section, DroppingQueueHandler
+)
+
+
+def _setup(**overrides):
+    stream = io.StringIO()
+    config = {'level': 'INFO', 'module_levels': {'noisy': 'WARNING'}}
+    config.update(overrides)
+    setup_logging(config, stream=stream)
+    return stream
+
+
+def test_module_level_gating():
+    """验证全局级别和模块级别过滤"""
+    print("🧪 测试分级过滤")
+    print("=" * 50)
+
+    stream = _setup()
+    get_logger('quiet').debug("调试信息")
+    get_logger('quiet').info("普通信息")
+    get_logger('noisy').info("被模块级别过滤")
+    get_logger('noisy').warning("模块警告")
+    flush_logging()
+
+    lines = stream.getvalue().splitlines()
+    print(f"   输出: {lines}")
+    assert lines == ["普通信息", "模块警告"]
+
+    print("✅ 分级过滤验证通过")
+
+
+def test_silent_section():
+    """验证静默关键区只放行错误并统计省略条数"""
+    print("\n🧪 测试静默关键区")
+    print("=" * 50)
+
+    stream = _setup()
+    logger = get_logger('countdown')
+    with silent_section():
+        assert in_silent_section()
+        for i in range(5):
+            logger.info(f"⏳ 倒计时 {i}")
+        logger.warning("⚠️ 被省略的警告")
+        logger.error("❌ 点击失败")
+    assert not in_silent_section()
+    flush_logging()
+
+    lines = stream.getvalue().splitlines()
+    print(f"   输出: {lines}")
+    assert lines == ["❌ 点击失败", "🔇 静默关键区结束，期间省略 6 条日志"]
+
+    print("✅ 静默关键区验证通过")
+
+
+def test_form_lookup_quiet_in_silent_section():
+    """验证表单处理中预期的“元素未找到”不在静默关键区输出"""
+    print("\n🧪 测试表单元素查找静默")
+    print("=" * 50)
+
+    from unittest import mock
+    from src.weverse.forms.lightning_form_processor import LightningFormProcessor
+
+    stream = _setup()
+    driver = mock.Mock()
+    driver.find_element.side_effect = Exception("no such element")
+    processor = LightningFormProcessor(driver)
+    with silent_section():
+        assert processor._find_element_by_selector('#birth', '生日输入框') is None
+    flush_logging()
+
+    lines = stream.getvalue().splitlines()
+    print(f"   输出: {lines}")
+    assert lines == []
+    print("✅ 元素查找未输出")
+
+
+def test_inline_status_line():
+    """验证状态行用回车覆盖，普通日志另起一行"""
+    print("\n🧪 测试状态行输出")
+    print("=" * 50)
+
+    stream = _setup()
+    logger = get_logger('countdown')
+    logger.info("⏳ 00:02.000", extra={'inline': True})
+    logger.info("⏳ 00:01.900", extra={'inline': True})
+    logger.info("🎉 目标时间已到！")
+    flush_logging()
+
+    assert stream.getvalue() == "\r⏳ 00:02.000\r⏳ 00:01.900\n🎉 目标时间已到！\n"
+
+    print("✅ 状态行输出验证通过")
+
+
+def test_full_queue_drops_silently():
+    """验证队列满时丢弃记录并计数，不向stderr输出traceback"""
+    print("\n🧪 测试队列已满")
+    print("=" * 50)
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=3))
+    logger = logging.getLogger('weverse_test.full_queue')
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        for i in range(10):
+            logger.info(f"⏳ 倒计时 {i}")
+
+    assert handler.queue.qsize() == 3
+    assert handler.dropped == 7
+    assert stderr.getvalue() == '', "丢弃记录时不应输出traceback"
+    print("✅ 队列满时丢弃并计数")
+
+
+if __name__ == "__main__":
+    test_module_level_gating()
+    test_silent_section()
+    test_form_lookup_quiet_in_silent_section()
+    test_inline_status_line()
+    test_full_queue_drops_silently()
+    print("\n✅ 热路径日志测试完成")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_http_client.py
+测试共享HTTP客户端 - 验证按主机复用长连接、复用统计、默认超时，以及延迟探测和AI请求共用连接池
+"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.ai import analyzer
+from src.weverse.analysis import time_processor
+from src.weverse.network import http_client
+from src.weverse.network.http_client import SharedHTTPClient, get_http_client
+from src.weverse.vpn.shanghai_korea_optimizer import ShanghaiKoreaOptimizer
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """支持长连接的本地服务，/slow 延迟返回"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body=b'ok'):
+        if self.path.startswith('/slow'):
+            time.sleep(1.0)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._reply()
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._reply(b'{"ok": true}')
+
+
+def _start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"127.0.0.1:{server.server_address[1]}"
+
+
+def test_connection_reuse():
+    """验证同一主机的顺序和并发请求复用长连接"""
+    print("🧪 测试长连接复用")
+    print("=" * 50)
+
+    server, host = _start_server()
+    client = SharedHTTPClient({'pool_maxsize': 4})
+    try:
+        for _ in range(10):
+            assert client.head(f"http://{host}/").status_code == 200
+        stats = client.get_stats()['hosts'][host]
+        assert stats['requests'] == 10 and stats['new_connections'] == 1
+        assert stats['reused'] == 9 and stats['http_versions'] == {'HTTP/1.1': 10}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: client.post(f"http://{host}/", json={}), range(40)))
+        stats = client.get_stats()['totals']
+        print(f"   {stats['requests']} 次请求, 新建 {stats['new_connections']} 个连接")
+        assert stats['requests'] == 50
+        assert stats['new_connections'] <= 4, "并发请求不应超过每主机连接池大小"
+        assert stats['reuse_rate'] > 0.9
+    finally:
+        client.close()
+        server.shutdown()
+    print("✅ 长连接复用验证通过")
+
+
+def test_default_timeout_and_errors():
+    """验证未指定超时时使用配置的读取超时，失败计入主机统计"""
+    print("\n🧪 测试默认超时与失败统计")
+    print("=" * 50)
+
+    server, host = _start_server()
+    client = SharedHTTPClient({'connect_timeout_s': 1, 'read_timeout_s': 0.3})
+    try:
+        start_time = time.time()
+        try:
+            client.get(f"http://{host}/slow")
+            assert False, "应抛出超时异常"
+        except requests.exceptions.Timeout:
+            pass
+        assert time.time() - start_time < 0.9
+        assert client.get(f"http://{host}/slow", timeout=3).status_code == 200
+        stats = client.get_stats()['hosts'][host]
+        assert stats['errors'] == 1 and stats['requests'] == 1
+    finally:
+        client.close()
+        server.shutdown()
+    print("✅ 默认超时和失败统计验证通过")
+
+
+def test_callers_share_client():
+    """验证AI请求、延迟探测和VPN优化器共用同一个连接池"""
+    print("\n🧪 测试各模块共用客户端")
+    print("=" * 50)
+
+    client = SharedHTTPClient()
+    server, host = _start_server()
+    try:
+        with mock.patch.object(http_client, '_http_client', client):
+            assert analyzer._get_session() is client.session
+            assert ShanghaiKoreaOptimizer().http_client is client
+            assert get_http_client() is client
+
+            result = time_processor.test_real_network_latency(duration=1, test_url=f"http://{host}/")
+            stats = client.get_stats()['hosts'][host]
+    finally:
+        server.shutdown()
+        client.close()
+
+    print(f"   延迟探测 {stats['requests']} 次, 新建 {stats['new_connections']} 个连接, 平均 {result['avg_ms']:.1f}ms")
+    assert stats['requests'] >= 5
+    assert stats['new_connections'] <= 3, "并行探测最多3个连接，其余复用"
+    print("✅ 各模块共用连接池")
+
+
+if __name__ == "__main__":
+    test_connection_reuse()
+    test_default_timeout_and_errors()
+    test_callers_share_client()
+    print("\n🎉 共享HTTP客户端测试全部通过")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_korean_time_parser.py
+测试规则时间解析器 - 验证常见公告格式、区间、时区换算、年份推断、关键词标注，以及置信度足够时跳过AI
+"""
+
+import sys
+import os
+from datetime import datetime
+from unittest import mock
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.ai import analyzer
+from src.weverse.analysis.korean_time_parser import parse_notice_times
+
+NOW = datetime(2025, 8, 1, 12, 0)
+
+NOTICE = """[공지] 팬미팅 응모 안내
+응모 기간: 2025년 8월 20일(수) 20:00 ~ 8월 22일(금) 23:59 (KST)
+당첨자 발표: 8월 25일(월) 18:00
+공연 일시: 2025.09.06 (토) 오후 6시
+■ 입장 시간
+9월 6일 17시 30분"""
+
+
+def test_full_notice():
+    """验证与AI输出相同的结构和各类时间"""
+    print("🧪 测试完整公告解析")
+    print("=" * 50)
+
+    result = parse_notice_times(NOTICE, now=NOW)
+    print(f"   结果: {result}")
+
+    assert result['申请开始时间'] == '2025-08-20 20:00'
+    assert result['申请结束时间'] == '2025-08-22 23:59'
+    assert result['活动时间'] == '2025-09-06 18:00'
+    assert result['集合时间'] == '2025-09-06 17:30'
+    assert result['时区'] == 'KST'
+    assert result['置信度'] >= 0.9
+    high = [point for point in result['关键时间点'] if point['重要性'] == '高']
+    assert [point['时间'] for point in high] == ['2025-08-20 20:00', '2025-08-22 23:59']
+
+    print("✅ 完整公告解析验证通过")
+
+
+def test_formats_and_inference():
+    """验证各种格式、时区换算、年份推断和置信度"""
+    print("\n🧪 测试格式与推断")
+    print("=" * 50)
+
+    cases = [
+        # 斜杠简写 + 只有时间的区间结束
+        ("■ 신청 기간\n8/20(수) 20:00 ~ 23:59 KST", '申请开始时间', '2025-08-20 20:00'),
+        # 北京时间换算为KST
+        ("申请时间：2025年8月20日 19:00（北京时间）开始", '申请开始时间', '2025-08-20 20:00'),
+        # 자정 = 次日0点
+        ("응모 마감: 8월 22일 자정까지", '申请结束时间', '2025-08-23 00:00'),
+        # 跨年区间：结束日期按星期推断为下一年
+        ("12월 30일(화) 20:00 ~ 1월 2일(금) 23:59 응모", '申请结束时间', '2026-01-02 23:59'),
+        # ISO格式
+        ("공연 일시: 2025-09-06T18:00", '活动时间', '2025-09-06 18:00'),
+    ]
+    for text, field, expected in cases:
+        result = parse_notice_times(text, now=NOW)
+        print(f"   {field}: {result[field]} (置信度 {result['置信度']})")
+        assert result[field] == expected, (text, result)
+
+    # 没有申请时间：置信度低，需要AI
+    assert parse_notice_times("공연 일시: 2025-09-06T18:00", now=NOW)['置信度'] < 0.75
+    # 电话号码、版本号不是日期
+    assert parse_notice_times("버전 1.5 업데이트, 전화 010-1234-5678", now=NOW)['关键时间点'] == []
+
+    print("✅ 格式与推断验证通过")
+
+
+def test_date_without_time_not_confident():
+    """验证申请时间只解析出日期（时间写法未识别）时置信度不足，交给AI"""
+    print("\n🧪 测试只有日期的申请时间")
+    print("=" * 50)
+
+    for text in ("응모: 2025.08.20 8PM", "신청: 8월 20일 (수) 8 PM KST", "응모: 2025.08.20 (수)"):
+        result = parse_notice_times(text, now=NOW)
+        print(f"   {text!r}: {result['申请开始时间']} (置信度 {result['置信度']})")
+        assert result['置信度'] < 0.75, (text, result)
+
+    with mock.patch.object(analyzer, 'extract_time_with_ai', return_value={'申请开始时间': '2025-08-20 20:00'}) as ai:
+        result = analyzer.extract_time("응모: 2025.08.20 8PM")
+        assert ai.call_count == 1 and result['申请开始时间'] == '2025-08-20 20:00'
+
+    print("✅ 只有日期时不使用规则结果")
+
+
+def test_llm_only_when_low_confidence():
+    """验证置信度足够时不调用AI，不足时调用AI"""
+    print("\n🧪 测试AI快速路径")
+    print("=" * 50)
+
+    with mock.patch.object(analyzer, 'extract_time_with_ai', return_value={'申请开始时间': '2025-08-20 20:00'}) as ai:
+        result = analyzer.extract_time(NOTICE)
+        assert result['来源'] == 'rule' and ai.call_count == 0
+
+        result = analyzer.extract_time("공연 일시: 9월 6일")
+        assert ai.call_count == 1 and result == {'申请开始时间': '2025-08-20 20:00'}
+
+    print("✅ AI快速路径验证通过")
+
+
+if __name__ == "__main__":
+    test_full_notice()
+    test_formats_and_inference()
+    test_date_without_time_not_confident()
+    test_llm_only_when_low_confidence()
+    print("\n✅ 规则时间解析器测试完成")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_mock_llm_server.py
+测试本地模拟LLM服务 - 验证OpenAI兼容响应、流式输出、故障注入可复现，以及AI流程在断连/卡住时的重试
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+from unittest import mock
+
+import requests
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ai_config
+from src.weverse.ai import analyzer
+from src.weverse.ai.hedging import LatencyHistory
+from src.weverse.ai.mock_server import MockLLMServer, classify_request
+from src.weverse.ai.response_cache import AIResponseCache
+from src.weverse.ai.streaming import stream_chat_completion
+
+NOTICE = """[공지] 팬미팅 응모 안내
+응모 기간: 2025년 8월 20일(수) 20:00 ~ 8월 22일(금) 23:59 (KST)
+공연 일시: 2025.09.06 (토) 오후 6시"""
+
+
+def _time_prompt(content):
+    return f"你是一个专业的时间信息提取助手。\n文章内容：\n{content}\n\n请按照以下JSON格式返回提取的时间信息："
+
+
+def test_completions():
+    """验证普通和流式响应，时间提取按公告内容生成答案"""
+    print("🧪 测试模拟服务响应")
+    print("=" * 50)
+
+    with MockLLMServer({'latency_s': 0}) as server:
+        url = f"{server.base_url}/chat/completions"
+        payload = {'model': 'deepseek-chat', 'messages': [{'role': 'user', 'content': _time_prompt(NOTICE)}]}
+
+        response = requests.post(url, json=payload, timeout=5)
+        assert response.status_code == 200
+        text = response.json()['choices'][0]['message']['content']
+        assert text.startswith('```json')
+
+        streamed = stream_chat_completion(requests.Session(), url, {}, payload, {'first_token_timeout_s': 2})
+        assert streamed['json']['申请开始时间'] == '2025-08-20 20:00'
+        assert streamed['json']['活动时间'] == '2025-09-06 18:00'
+
+        ping = requests.post(url, json={'messages': [{'role': 'user', 'content': '你好'}]}, timeout=5)
+        assert ping.json()['choices'][0]['message']['content'] == 'API连接成功'
+        stats = server.get_stats()
+
+    assert stats['requests'] == 3 and stats['streamed'] == 1
+    assert stats['by_kind'] == {'time_extraction': 2, 'other': 1}
+    assert classify_request('请提供抢票策略建议') == 'content_analysis'
+    print("✅ 普通/流式响应验证通过")
+
+
+def test_fault_injection_reproducible():
+    """验证相同种子下故障序列相同"""
+    print("\n🧪 测试故障注入可复现")
+    print("=" * 50)
+
+    profile = {'failure_rate': 0.3, 'disconnect_rate': 0.2, 'seed': 7}
+    sequences = []
+    for _ in range(2):
+        with MockLLMServer(profile) as server:
+            for _ in range(10):
+                try:
+                    requests.post(f"{server.base_url}/chat/completions", json={'messages': []}, timeout=5)
+                except requests.exceptions.ConnectionError:
+                    pass
+            sequences.append([entry['outcome'] for entry in server.get_stats()['log']])
+
+    print(f"   结果序列: {sequences[0]}")
+    assert sequences[0] == sequences[1]
+    assert {'ok', 'error', 'disconnect'} <= set(sequences[0])
+    print("✅ 故障注入可复现")
+
+
+def _run_time_extraction(profile, streaming_config):
+    with MockLLMServer(profile) as server, tempfile.TemporaryDirectory() as cache_dir:
+        cache = AIResponseCache(path=os.path.join(cache_dir, 'ai_cache.json'), config={'enabled': True})
+        with mock.patch.dict(ai_config.DEEPSEEK_CONFIG, {'base_url': server.base_url}), \
+             mock.patch.dict(ai_config.AI_STREAMING_CONFIG, streaming_config), \
+             mock.patch.object(analyzer, 'get_response_cache', return_value=cache), \
+             mock.patch.object(analyzer, 'get_latency_history', return_value=LatencyHistory(path='')):
+            start_time = time.time()
+            first = analyzer.extract_time_with_ai(NOTICE)
+            elapsed = time.time() - start_time
+            second = analyzer.extract_time_with_ai(NOTICE)
+        return first, second, elapsed, server.get_stats(), cache.get_stats()
+
+
+def test_pipeline_through_mock():
+    """验证AI时间提取经过模拟服务，第二次命中缓存"""
+    print("\n🧪 测试AI时间提取经过模拟服务")
+    print("=" * 50)
+
+    first, second, elapsed, stats, cache_stats = _run_time_extraction('fast', {'enabled': True})
+    assert first['申请结束时间'] == '2025-08-22 23:59'
+    assert second == first
+    assert stats['requests'] == 1 and cache_stats['hits'] == 1
+    print(f"✅ {elapsed:.2f}s 完成，第二次命中缓存")
+
+
+def test_retries_on_disconnect_and_stall():
+    """验证断连时重试，卡住时按首token超时快速失败后重试"""
+    print("\n🧪 测试断连与卡住时的重试")
+    print("=" * 50)
+
+    first, _, _, stats, _ = _run_time_extraction({'disconnect_rate': 1.0}, {'enabled': True})
+    assert first is None
+    # 每次调用2轮，每轮主模型失败后立即请求备用模型
+    assert stats['requests'] == 2 * 2 * 2
+
+    first, _, elapsed, stats, _ = _run_time_extraction(
+        {'stall_rate': 1.0, 'stall_s': 3}, {'enabled': True, 'first_token_timeout_s': 0.3})
+    print(f"   卡住: {stats['requests']} 次请求, {elapsed:.2f}s")
+    assert first is None
+    assert elapsed < 2.5, "每次尝试应在首token超时后放弃"
+    print("✅ 断连和卡住的重试验证通过")
+
+
+if __name__ == "__main__":
+    test_completions()
+    test_fault_injection_reproducible()
+    test_pipeline_through_mock()
+    test_retries_on_disconnect_and_stall()
+    print("\n🎉 模拟LLM服务测试全部通过")
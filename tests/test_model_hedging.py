@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_model_hedging.py
+测试模型竞速请求 - 验证主模型慢时按p90并行请求备用模型、先到先用并取消落后请求、延迟记录持久化
+"""
+
+import sys
+import os
+import time
+import tempfile
+from unittest import mock
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ai_config
+from src.weverse.ai import analyzer
+from src.weverse.ai.hedging import LatencyHistory, hedged_call
+from src.weverse.ai.mock_server import MockLLMServer
+from src.weverse.ai.response_cache import AIResponseCache
+
+NOTICE = """[공지] 팬미팅 응모 안내
+응모 기간: 2025년 8월 20일(수) 20:00 ~ 8월 22일(금) 23:59 (KST)"""
+
+
+def _fake_call(delays, failures=(), cancelled=None):
+    """按模型延迟返回结果；等待期间检查取消信号"""
+    def call(model, cancel_event):
+        if model in failures:
+            raise ConnectionError(f"{model} 断开")
+        if cancel_event.wait(delays[model]):
+            if cancelled is not None:
+                cancelled.append(model)
+            raise RuntimeError('已取消')
+        return {'model': model}
+    return call
+
+
+def test_primary_fast_no_hedge():
+    """验证主模型在等待时间内返回时不请求备用模型"""
+    print("🧪 测试主模型正常返回")
+    print("=" * 50)
+
+    history = LatencyHistory(path='')
+    outcome = hedged_call('chat', 'reasoner', _fake_call({'chat': 0.05, 'reasoner': 0.05}),
+                          lambda result: result is not None, 1.0, history)
+    assert outcome['winner'] == 'chat' and not outcome['hedged']
+    assert outcome['attempts'] == {'chat': 'won'}
+    assert history.get_stats()['models']['chat']['wins'] == 1
+    print(f"✅ {outcome['elapsed_s']:.2f}s 由主模型返回，未发出备用请求")
+
+
+def test_slow_primary_hedged_and_cancelled():
+    """验证主模型超过等待时间后并行请求备用模型，备用先到时取消主模型"""
+    print("\n🧪 测试主模型变慢时的竞速")
+    print("=" * 50)
+
+    cancelled = []
+    history = LatencyHistory(path='')
+    outcome = hedged_call('chat', 'reasoner', _fake_call({'chat': 5.0, 'reasoner': 0.1}, cancelled=cancelled),
+                          lambda result: result is not None, 0.2, history)
+    assert outcome['winner'] == 'reasoner' and outcome['hedged']
+    assert outcome['attempts'] == {'chat': 'cancelled', 'reasoner': 'won'}
+    assert outcome['elapsed_s'] < 1.0
+    time.sleep(0.1)
+    assert cancelled == ['chat'], "落后的主模型请求应被取消"
+    assert history.get_stats()['models']['reasoner']['hedged'] == 1
+    # 被取消的主模型按已等待时间记一个下限样本
+    chat_stats = history.get_stats()['models']['chat']
+    assert chat_stats['samples'] == 1 and chat_stats['p50_s'] >= 0.2
+
+    # 主模型直接失败时不等竞速时间
+    start_time = time.time()
+    outcome = hedged_call('chat', 'reasoner', _fake_call({'reasoner': 0.05}, failures=('chat',)),
+                          lambda result: result is not None, 5.0)
+    assert outcome['winner'] == 'reasoner' and not outcome['hedged']
+    assert time.time() - start_time < 1.0
+    print("✅ 备用模型先返回，主模型请求已取消")
+
+
+def test_slow_primary_raises_hedge_delay():
+    """验证主模型持续变慢时，取消样本使竞速等待时间跟着升高，而不是停在快速样本的p90"""
+    print("\n🧪 测试取消样本对竞速等待时间的影响")
+    print("=" * 50)
+
+    config = {'min_samples': 5, 'default_hedge_delay_s': 0.05, 'min_hedge_delay_s': 0.01,
+              'max_hedge_delay_s': 30.0, 'history_size': 10}
+    history = LatencyHistory(path='', config=config)
+    for _ in range(5):
+        history.record('chat', 0.05, won=True)
+    fast_delay = history.hedge_delay('chat')
+
+    for _ in range(5):
+        hedged_call('chat', 'reasoner', _fake_call({'chat': 5.0, 'reasoner': 0.2}),
+                    lambda result: result is not None, history.hedge_delay('chat'), history)
+    slow_delay = history.hedge_delay('chat')
+    print(f"   等待时间: {fast_delay:.2f}s → {slow_delay:.2f}s")
+    assert slow_delay > 0.2, "被取消的慢请求应抬高p90"
+    print("✅ 取消样本计入p90")
+
+
+def test_latency_history_persisted():
+    """验证延迟记录持久化，样本足够后竞速等待时间取p90并限制在范围内"""
+    print("\n🧪 测试延迟记录与竞速等待时间")
+    print("=" * 50)
+
+    config = {'min_samples': 5, 'default_hedge_delay_s': 8.0, 'min_hedge_delay_s': 1.0,
+              'max_hedge_delay_s': 30.0, 'history_size': 10}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'latency.json')
+        history = LatencyHistory(path=path, config=config)
+        for latency in (2.0, 2.5, 3.0, 3.5):
+            history.record('deepseek-chat', latency, won=True)
+        assert history.hedge_delay('deepseek-chat') == 8.0, "样本不足时使用默认值"
+        history.record('deepseek-chat', 10.0, won=True)
+
+        reloaded = LatencyHistory(path=path, config=config)
+        delay = reloaded.hedge_delay('deepseek-chat')
+        print(f"   重新加载后 p90 等待时间: {delay:.2f}s")
+        assert 3.5 < delay <= 10.0
+        assert reloaded.get_stats()['models']['deepseek-chat']['samples'] == 5
+
+        for _ in range(20):
+            reloaded.record('deepseek-chat', 0.1)
+        assert reloaded.get_stats()['models']['deepseek-chat']['samples'] == 10
+        assert reloaded.hedge_delay('deepseek-chat') == 1.0, "等待时间不低于下限"
+    print("✅ 延迟记录持久化和p90计算验证通过")
+
+
+def test_time_extraction_hedges_through_mock():
+    """验证AI时间提取在chat模型变慢时由推理模型返回结果"""
+    print("\n🧪 测试AI时间提取竞速（模拟服务）")
+    print("=" * 50)
+
+    profile = {'latency_s': 0.05, 'model_latency_s': {'deepseek-chat': 3.0}}
+    with MockLLMServer(profile) as server, tempfile.TemporaryDirectory() as temp_dir:
+        cache = AIResponseCache(path=os.path.join(temp_dir, 'ai_cache.json'), config={'enabled': False})
+        history = LatencyHistory(path='', config={'default_hedge_delay_s': 0.3})
+        with mock.patch.dict(ai_config.DEEPSEEK_CONFIG, {'base_url': server.base_url}), \
+             mock.patch.dict(ai_config.AI_STREAMING_CONFIG, {'enabled': True, 'first_token_timeout_s': 5}), \
+             mock.patch.object(analyzer, 'get_response_cache', return_value=cache), \
+             mock.patch.object(analyzer, 'get_latency_history', return_value=history):
+            start_time = time.time()
+            time_data = analyzer.extract_time_with_ai(NOTICE)
+            elapsed = time.time() - start_time
+        models = history.get_stats()['models']
+
+    print(f"   {elapsed:.2f}s 返回, 各模型: {models}")
+    assert time_data['申请开始时间'] == '2025-08-20 20:00'
+    assert elapsed < 2.0, "不应等待chat模型的3秒延迟"
+    assert models['deepseek-reasoner']['wins'] == 1 and models['deepseek-reasoner']['hedged'] == 1
+    assert 'deepseek-chat' not in models or models['deepseek-chat']['wins'] == 0
+    print("✅ 推理模型竞速返回结果")
+
+
+if __name__ == "__main__":
+    test_primary_fast_no_hedge()
+    test_slow_primary_hedged_and_cancelled()
+    test_slow_primary_raises_hedge_delay()
+    test_latency_history_persisted()
+    test_time_extraction_hedges_through_mock()
+    print("\n🎉 模型竞速请求测试全部通过")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_network_emulation.py
+测试网络条件模拟 - 验证CDP参数、夹具服务器和延迟汇总表
+"""
+
+import sys
+import os
+import json
+import random
+import urllib.request
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.network.emulation import (
+    LocalFixtureServer, apply_network_profile, get_network_profile,
+    default_form_fixture_path, summarize_runs, render_benchmark_table
+)
+
+
+class RecordingDriver:
+    """只记录CDP调用的假驱动"""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        return {}
+
+
+def test_apply_profile_with_jitter():
+    """验证CDP参数换算和抖动范围"""
+    print("🧪 测试网络配置下发")
+    print("=" * 50)
+
+    profile = get_network_profile('shanghai_korea')
+    driver = RecordingDriver()
+    rng = random.Random(7)
+
+    latencies = []
+    for _ in range(50):
+        conditions = apply_network_profile(driver, profile, rng)
+        latencies.append(conditions['latency'])
+
+    low = profile['latency_ms'] - profile['jitter_ms']
+    high = profile['latency_ms'] + profile['jitter_ms']
+    print(f"   采样延迟范围: {min(latencies)} ~ {max(latencies)}ms")
+    assert all(low <= value <= high for value in latencies)
+    assert len(set(latencies)) > 1
+
+    cmd, params = driver.commands[-1]
+    assert cmd == 'Network.emulateNetworkConditions'
+    assert params['downloadThroughput'] == profile['download_kbps'] * 1024 / 8
+
+    # 不限速配置下发 -1
+    conditions = apply_network_profile(driver, get_network_profile('lan'))
+    assert conditions['latency'] == 0
+    assert conditions['downloadThroughput'] == -1
+
+    print("✅ 网络配置下发验证通过")
+
+
+def test_fixture_server_flow():
+    """验证夹具服务器页面和提交接口"""
+    print("\n🧪 测试本地夹具服务器")
+    print("=" * 50)
+
+    with LocalFixtureServer(default_form_fixture_path(), bundle_kb=4) as server:
+        notice = urllib.request.urlopen(server.notice_url).read().decode('utf-8')
+        assert 'NoticeModalView_floating__Mx9Cs' in notice
+
+        form = urllib.request.urlopen(f"{server.base_url}/form?page=form").read().decode('utf-8')
+        assert 'requiredProperties-birthDate' in form
+        assert '/static/app.js' in form
+
+        bundle = urllib.request.urlopen(f"{server.base_url}/static/app.js").read()
+        assert len(bundle) >= 4 * 1024 - 64
+
+        request = urllib.request.Request(f"{server.base_url}/api/submit",
+                                         data=json.dumps({'birthDate': '19900101'}).encode('utf-8'),
+                                         method='POST')
+        assert json.loads(urllib.request.urlopen(request).read())['success']
+        assert len(server.get_submissions()) == 1
+        print(f"   服务器: {server.base_url}")
+
+    print("✅ 夹具服务器验证通过")
+
+
+def test_benchmark_summary():
+    """验证延迟汇总和对比表"""
+    print("\n🧪 测试延迟汇总表")
+    print("=" * 50)
+
+    runs = [
+        {'success': True, 'end_to_end_ms': value, 'click_to_form_ms': value - 100}
+        for value in (300.0, 400.0, 500.0, 600.0)
+    ] + [{'success': False, 'end_to_end_ms': None, 'click_to_form_ms': None}]
+
+    summary = summarize_runs('shanghai_korea', runs)
+    assert summary['runs'] == 5 and summary['success'] == 4
+    assert summary['mean_ms'] == 450.0
+    assert summary['p50_ms'] == 450.0
+    assert summary['p90_ms'] == 570.0
+
+    table = render_benchmark_table([summary])
+    print(table)
+    assert 'shanghai_korea' in table
+    assert '提前点击模型' in table
+
+    print("✅ 延迟汇总验证通过")
+
+
+if __name__ == "__main__":
+    test_apply_profile_with_jitter()
+    test_fixture_server_flow()
+    test_benchmark_summary()
+    print("\n✅ 网络条件模拟测试完成")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_offline_analyzer.py
+测试离线表单分析 - 验证从保存的HTML得到与在线分析相同结构的清单、候选选择器和并行目录分析
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.analysis.offline_analyzer import analyze_html, analyze_directory, summarize
+from src.weverse.analysis.snapshot_store import SnapshotStore
+from src.weverse.core.mode_components.dom_diff_recorder import DomDiffRecorder, DRAIN_SCRIPT
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FORM_HTML = os.path.join(TESTS_DIR, 'test_weverse_form.html')
+
+
+def _read_form():
+    with open(FORM_HTML, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_analyze_saved_html():
+    """验证表单清单结构和候选选择器"""
+    print("🧪 测试离线分析保存的HTML")
+    print("=" * 50)
+
+    result = analyze_html(_read_form())
+    form_analysis = result['form_analysis']
+    form_elements = result['form_elements']
+    candidates = result['candidate_selectors']
+    print(f"   输入框: {len(form_analysis['input_fields'])}, 复选框: {len(form_analysis['checkboxes'])}, "
+          f"按钮: {len(form_analysis['buttons'])}")
+
+    # 与 _deep_form_analysis / PageCrawler 相同的类别
+    assert set(form_analysis) == {'input_fields', 'select_fields', 'checkboxes', 'radio_buttons',
+                                  'buttons', 'form_containers', 'validation_messages', 'hidden_fields'}
+    assert set(form_elements) == {'input_fields', 'checkboxes', 'radio_buttons',
+                                  'select_dropdowns', 'textareas', 'buttons'}
+    birth = form_analysis['input_fields'][0]
+    assert birth['xpath'] == '//*[@id="requiredProperties-birthDate"]'
+    assert form_elements['checkboxes'][0]['found_by'] == 'tag_name'
+
+    assert candidates['birth_date'][0]['css_selector'] == '#requiredProperties-birthDate'
+    assert candidates['phone_number'][0]['css_selector'] == '#requiredProperties-phoneNumber'
+    assert len(candidates['checkboxes']) == 2
+    assert candidates['submit_button'][0]['fallback'] is False
+    assert result['configured_selectors']['birth_date']['#requiredProperties-birthDate'] == 1
+
+    print("✅ 离线分析验证通过")
+
+
+def test_parallel_directory():
+    """验证进程池分析目录中的会话JSON和HTML文件"""
+    print("\n🧪 测试并行分析快照目录")
+    print("=" * 50)
+
+    html = _read_form()
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = SnapshotStore(root=os.path.join(data_dir, 'snapshots'))
+        for index in range(3):
+            session = {'monitoring_data': {'form_page_data': {'page_content': {'html_content': html}}}}
+            store.dump_json(session, os.path.join(data_dir, f'monitoring_session_{index}.json'))
+        shutil.copy(FORM_HTML, os.path.join(data_dir, 'page.html'))
+
+        results = analyze_directory(data_dir, workers=2)
+        summary = summarize(results)
+        print(f"   汇总: 文件 {summary['files']}, 页面 {summary['pages']}, 候选 {summary['candidates_found']}")
+
+        assert summary['files'] == 4 and not summary['errors']
+        assert summary['pages'] == 4
+        assert summary['candidates_found']['birth_date'] == 4
+        session_page = next(r for r in results if r['file'].endswith('_0.json'))['pages'][0]
+        assert session_page['key'] == 'monitoring_data.form_page_data.page_content.html_content'
+
+    print("✅ 并行目录分析验证通过")
+
+
+class RecordingDriver:
+    """点击前只有加载提示，之后页面内渲染出表单"""
+
+    BASELINE = {'i': 1, 't': 'html', 'a': {}, 'c': [
+        {'i': 2, 't': 'body', 'a': {}, 'c': [{'i': 3, 't': 'div', 'a': {'id': 'app'}, 'c': [{'i': 4, 'x': 'loading'}]}]}
+    ]}
+    FORM_BATCH = {'s': 1, 'ts': 0, 'ops': [{'o': 'c', 'i': 3, 'c': [{'i': 5, 't': 'form', 'a': {}, 'c': [
+        {'i': 6, 't': 'input', 'a': {'type': 'text', 'id': 'requiredProperties-birthDate', 'placeholder': '생년월일'}, 'c': []},
+        {'i': 7, 't': 'input', 'a': {'type': 'checkbox', 'name': 'agree'}, 'c': []},
+        {'i': 8, 't': 'button', 'a': {'type': 'submit'}, 'c': [{'i': 9, 'x': '참여 신청'}]}
+    ]}]}]}
+
+    def __init__(self):
+        self.pending = []
+
+    def execute_script(self, script, *args):
+        if script == DRAIN_SCRIPT:
+            batches = [b for b in self.pending if b['s'] > args[0]]
+            return {'seq': batches[-1]['s'] if batches else args[0], 'batches': batches, 'lost': False}
+        return {'seq': 0, 'ts': 0, 'url': 'https://weverse.io/apply', 'root': self.BASELINE}
+
+
+def test_monitoring_session_checkpoints():
+    """验证只保存DOM增量记录的监控会话按检查点重建后分析"""
+    print("\n🧪 测试监控会话的DOM检查点")
+    print("=" * 50)
+
+    driver = RecordingDriver()
+    recorder = DomDiffRecorder(driver, config={'enabled': True})
+    pre_click = recorder.checkpoint('pre_click')
+    driver.pending.append(RecordingDriver.FORM_BATCH)
+    form_page = recorder.checkpoint('form_page')
+    session = {
+        'session_info': {'type': 'monitoring_session'},
+        'data_collection': {'pre_click_data': {'dom_checkpoint': pre_click},
+                            'form_page_data': {'dom_checkpoint': form_page}},
+        'dom_recording': recorder.export()
+    }
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        filename = os.path.join(data_dir, 'monitoring_session.json')
+        SnapshotStore(root=os.path.join(data_dir, 'snapshots')).dump_json(session, filename)
+        results = analyze_directory(data_dir, workers=1)
+
+    pages = {page['key']: page for page in results[0]['pages']}
+    print(f"   重建页面: {list(pages)}")
+    assert not results[0]['error']
+    assert list(pages) == ['dom_recording.checkpoints.pre_click', 'dom_recording.checkpoints.form_page']
+    assert pages['dom_recording.checkpoints.pre_click']['form_analysis']['input_fields'] == []
+    form = pages['dom_recording.checkpoints.form_page']
+    assert form['candidate_selectors']['birth_date'][0]['css_selector'] == '#requiredProperties-birthDate'
+    assert len(form['form_analysis']['checkboxes']) == 1
+    assert form['form_analysis']['buttons'][0]['text'] == '참여 신청'
+    print("✅ 监控会话检查点分析通过")
+
+
+if __name__ == "__main__":
+    test_analyze_saved_html()
+    test_parallel_directory()
+    test_monitoring_session_checkpoints()
+    print("\n✅ 离线表单分析测试完成")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_prompt_window.py
+测试提示词相关窗口 - 验证只保留时间相关句子、去掉其他语言的重复、长度上限，以及提取出的时间不变
+"""
+
+import sys
+import os
+from datetime import datetime
+from unittest import mock
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.ai import analyzer
+from src.weverse.ai.hedging import LatencyHistory
+from src.weverse.ai.prompt_window import build_prompt_window, verify_window
+
+NOW = datetime(2025, 8, 1, 12, 0)
+
+NOTICE = """[공지] 2025 FANMEETING 'HOME' 팬클럽 선예매 응모 안내
+안녕하세요. 위버스입니다. 2025 FANMEETING 'HOME' 팬클럽 선예매 응모에 대해 안내드립니다. 아래 내용을 반드시 확인해 주시기 바랍니다.
+■ 응모 기간
+2025년 8월 20일(수) 20:00 ~ 8월 22일(금) 23:59 (KST)
+■ 당첨자 발표
+8월 25일(월) 18:00
+■ 공연 일시
+2025.09.06 (토) 오후 6시
+■ 입장 시간
+9월 6일 17시 30분
+■ 유의사항
+- 본 응모는 팬클럽 멤버십 회원만 가능합니다. 멤버십 미가입 시 응모가 제한됩니다.
+- 1인 1회 응모 가능하며, 중복 응모 시 당첨이 취소될 수 있습니다.
+- 부정한 방법으로 응모한 경우 사전 안내 없이 당첨이 취소됩니다.
+- 티켓은 양도 및 재판매가 불가하며, 적발 시 입장이 제한됩니다.
+- 공연 당일 신분증을 반드시 지참해 주시기 바랍니다. 본인 확인이 되지 않을 경우 입장이 불가합니다.
+- 공연장 내 사진 및 영상 촬영은 금지되어 있습니다.
+- 기타 문의사항은 고객센터로 연락 주시기 바랍니다.
+[Notice] 2025 FANMEETING 'HOME' Fan Club Presale Application
+Hello, this is Weverse. Please read the information below carefully.
+■ Application Period
+2025년 8월 20일(수) 20:00 ~ 8월 22일(금) 23:59 (KST)
+■ Winner Announcement
+8월 25일(월) 18:00
+■ Notes
+- Only fan club members can apply. Duplicate applications may be cancelled.
+- Tickets cannot be transferred or resold. Please bring your ID on the day of the show.
+- Photography and video recording inside the venue are prohibited.
+[公告] 2025 FANMEETING 'HOME' 粉丝俱乐部优先购票申请说明
+申请时间：2025年8月20日 20:00 ~ 8月22日 23:59 (KST)
+中签公布：8月25日 18:00
+注意事项：仅限粉丝俱乐部会员申请。门票不可转让或转售。演出当天请携带身份证件。"""
+
+
+def test_window_keeps_times():
+    """验证窗口只保留时间相关句子，规则解析结果与全文一致"""
+    print("🧪 测试相关窗口")
+    print("=" * 50)
+
+    result = verify_window(NOTICE, now=NOW)
+    print(f"   {result['original_tokens']} → {result['window_tokens']} tokens ({result['kept']}/{result['sentences']} 句)")
+    print(result['text'])
+
+    assert result['applied']
+    assert result['match'], result['differences']
+    assert result['tokens_saved'] > result['original_tokens'] / 2
+    assert '■ 입장 시간' in result['text']
+    # 注意事项和其他语言重复的同一时间段被去掉
+    assert '신분증' not in result['text']
+    assert 'Application Period' not in result['text']
+    assert '中签公布' not in result['text']
+
+    print("✅ 窗口保留了全部时间信息")
+
+
+def test_new_dates_in_other_language_kept():
+    """验证其他语言段落里的新时间不会被当作重复去掉"""
+    print("\n🧪 测试其他语言中的新时间")
+    print("=" * 50)
+
+    notice = NOTICE + "\n[Notice] Global fan sign event\nGlobal application: 2025.09.01 (Mon) 10:00 ~ 2025.09.02 (Tue) 23:59"
+    result = build_prompt_window(notice)
+    assert '2025.09.01 (Mon) 10:00' in result['text']
+    assert 'Application Period' not in result['text']
+    print("✅ 新时间保留，重复时间去掉")
+
+
+def test_unparsed_application_time_kept():
+    """验证规则解析器不认识的申请时间写法不会被裁剪掉"""
+    print("\n🧪 测试规则不认识的时间写法")
+    print("=" * 50)
+
+    filler = "Please read the membership guide carefully before you continue. " * 8
+    notice = (f"[Notice] Fan Club Presale\n{filler}\n"
+              "Applications open on August 20 at 8 PM and close on August 22 at midnight.\n"
+              f"{filler}\n공연 일시: 2025.09.06 (토) 오후 6시")
+    result = build_prompt_window(notice)
+    assert not result['applied'], "规则没找到申请时间时应原样发送"
+    assert 'Applications open on August 20 at 8 PM' in result['text']
+
+    # 规则找到了申请时间：含数字或月份名的关键词句也作为锚点保留
+    extra = NOTICE + "\n- 추가 응모: September 3 from 9 PM."
+    result = verify_window(extra, now=NOW)
+    assert result['applied'] and result['match'], result['differences']
+    assert 'September 3 from 9 PM' in result['text']
+
+    # 关键词句中的数字被裁掉时验证失败
+    capped = verify_window(NOTICE, {'max_chars': 120}, now=NOW)
+    print(f"   截断后缺失的数字: {capped['missing_numbers']}")
+    assert not capped['match'] and capped['missing_numbers']
+    print("✅ 规则不认识的时间写法保留在窗口中")
+
+
+def test_short_and_capped():
+    """验证短正文原样返回，长正文不超过长度上限"""
+    print("\n🧪 测试短正文与长度上限")
+    print("=" * 50)
+
+    short = "응모 기간: 8월 20일 20:00 ~ 8월 22일 23:59"
+    result = build_prompt_window(short)
+    assert result['text'] == short and not result['applied'] and result['tokens_saved'] == 0
+
+    capped = build_prompt_window(NOTICE, {'max_chars': 120})
+    print(capped['text'])
+    assert capped['window_chars'] <= 120 + 10  # 省略标记
+    # 优先保留带日期和关键词的句子
+    assert '2025년 8월 20일(수) 20:00' in capped['text']
+    print("✅ 短正文不裁剪，长正文按优先级截断")
+
+
+def test_ai_prompt_uses_window():
+    """验证AI时间提取的提示词只包含窗口内容"""
+    print("\n🧪 测试AI提示词")
+    print("=" * 50)
+
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {'choices': [{'message': {'content': '{"申请开始时间": "2025-08-20 20:00"}'}}]}
+    session = mock.Mock()
+    session.post.return_value = response
+
+    with mock.patch.object(analyzer, '_get_session', return_value=session), \
+         mock.patch.object(analyzer, 'get_streaming_config', return_value={'enabled': False}), \
+         mock.patch.object(analyzer, 'get_latency_history', return_value=LatencyHistory(path='')):
+        assert analyzer._extract_time_with_ai(NOTICE) == {'申请开始时间': '2025-08-20 20:00'}
+        prompt = session.post.call_args.kwargs['json']['messages'][0]['content']
+        assert '신분증' not in prompt and '8월 22일(금) 23:59' in prompt
+
+        analyzer._extract_time_with_ai(NOTICE, use_window=False)
+        prompt = session.post.call_args.kwargs['json']['messages'][0]['content']
+        assert '신분증' in prompt
+
+    print("✅ AI提示词使用窗口内容")
+
+
+if __name__ == "__main__":
+    test_window_keeps_times()
+    test_new_dates_in_other_language_kept()
+    test_unparsed_application_time_kept()
+    test_short_and_capped()
+    test_ai_prompt_uses_window()
+    print("\n🎉 提示词窗口测试全部通过")
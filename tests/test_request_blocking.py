@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_request_blocking.py
+测试非必要资源拦截 - 验证类别匹配、拦截下发和测量报告
+"""
+
+import sys
+import os
+import json
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.network.request_blocking import (
+    RequestBlocker, measure_blocking_impact, render_blocking_report
+)
+
+PAGE_RESOURCES = [
+    ('https://weverse.io/event/apply', 'Document', 20000),
+    ('https://static.weverse.io/app/main.js', 'Script', 300000),
+    ('https://static.weverse.io/fonts/pretendard.woff2', 'Font', 80000),
+    ('https://www.googletagmanager.com/gtag/js?id=G-1', 'Script', 120000),
+    ('https://connect.facebook.net/en_US/fbevents.js', 'Script', 90000),
+    ('https://global.apis.naver.com/weverse/event/v1/form', 'XHR', 2000),
+]
+
+
+def _log(method, params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class FakeBrowser:
+    """按当前拦截列表生成性能日志的假浏览器"""
+
+    def __init__(self):
+        self.blocked = []
+        self.logs = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Network.setBlockedURLs':
+            self.blocked = params['urls']
+        return {}
+
+    def get(self, url):
+        matcher = RequestBlocker(self, config={'profiles': {'p': {'blocked': self.blocked}}}, profile='p')
+        self.logs = []
+        for i, (resource_url, resource_type, size) in enumerate(PAGE_RESOURCES):
+            request_id = str(i)
+            self.logs.append(_log('Network.requestWillBeSent', {
+                'requestId': request_id, 'type': resource_type, 'request': {'url': resource_url}
+            }))
+            if self.blocked and matcher.categorize(resource_url):
+                self.logs.append(_log('Network.loadingFailed', {
+                    'requestId': request_id, 'type': resource_type, 'blockedReason': 'inspector'
+                }))
+            else:
+                self.logs.append(_log('Network.loadingFinished', {
+                    'requestId': request_id, 'encodedDataLength': size
+                }))
+
+    def get_log(self, log_type):
+        logs, self.logs = self.logs, []
+        return logs
+
+    def find_elements(self, by, selector):
+        return [object()]
+
+
+def test_categorize_and_apply():
+    """验证类别匹配和拦截下发"""
+    print("🧪 测试拦截类别匹配")
+    print("=" * 50)
+
+    browser = FakeBrowser()
+    blocker = RequestBlocker(browser)
+
+    assert blocker.categorize('https://static.weverse.io/fonts/pretendard.woff2') == 'fonts'
+    assert blocker.categorize('https://www.googletagmanager.com/gtag/js?id=G-1') == 'analytics'
+    assert blocker.categorize('https://connect.facebook.net/en_US/fbevents.js') == 'tracking'
+    assert blocker.categorize('https://static.weverse.io/app/main.js') is None
+    assert blocker.categorize('https://global.apis.naver.com/weverse/event/v1/form') is None
+
+    # 字体在weverse域名下不算必要请求，接口算
+    assert not blocker.is_essential('https://static.weverse.io/fonts/a.woff2', 'Font')
+    assert blocker.is_essential('https://global.apis.naver.com/weverse/event/v1/form', 'XHR')
+
+    patterns = blocker.apply(['fonts', 'analytics'])
+    assert browser.blocked == patterns
+    assert '*.woff2' in patterns
+    blocker.clear()
+    assert browser.blocked == []
+
+    print("✅ 拦截类别匹配验证通过")
+
+
+def test_measurement_report():
+    """验证测量模式的字节统计和必要请求报警"""
+    print("\n🧪 测试拦截测量报告")
+    print("=" * 50)
+
+    browser = FakeBrowser()
+    report = measure_blocking_impact(browser, 'https://weverse.io/event/apply', '#requiredProperties-birthDate',
+                                     blocker=RequestBlocker(browser), runs=1, timeout_s=1)
+    print(render_blocking_report(report))
+
+    assert report['baseline']['total_bytes'] == sum(size for _, _, size in PAGE_RESOURCES)
+    assert report['categories']['fonts']['bytes_saved'] == 80000
+    assert report['categories']['analytics']['requests_blocked'] == 1
+    assert report['all']['bytes_saved'] == 80000 + 120000 + 90000
+    assert report['all']['form_ok']
+
+    # 误把接口域名加入拦截 → 报警
+    browser = FakeBrowser()
+    bad_blocker = RequestBlocker(browser, config={'profiles': {'bad': {'api': ['*apis.naver.com*']}}}, profile='bad')
+    report = measure_blocking_impact(browser, 'https://weverse.io/event/apply', '#requiredProperties-birthDate',
+                                     blocker=bad_blocker, runs=1, timeout_s=1)
+    assert not report['categories']['api']['form_ok']
+    assert report['categories']['api']['blocked_essential'] == ['https://global.apis.naver.com/weverse/event/v1/form']
+
+    print("✅ 拦截测量报告验证通过")
+
+
+if __name__ == "__main__":
+    test_categorize_and_apply()
+    test_measurement_report()
+    print("\n✅ 资源拦截测试完成")
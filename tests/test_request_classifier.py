@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_request_classifier.py
+测试预编译请求分类器 - 验证分类结果与缓存行为
+"""
+
+import sys
+import os
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.network.request_classifier import RequestClassifier
+
+
+SAMPLE_REQUESTS = [
+    {'method': 'GET', 'url': 'https://weverse.io/static/main.js'},
+    {'method': 'GET', 'url': 'https://weverse.io/static/app.css?v=3'},
+    {'method': 'GET', 'url': 'https://weverse.io/fonts/pretendard.woff2'},
+    {'method': 'GET', 'url': 'https://global.apis.naver.com/weverse/wevweb/notice/v1.0/notice-27925'},
+    {'method': 'GET', 'url': 'https://weverse.io/config/settings.json'},
+    {'method': 'POST', 'url': 'https://weverse.io/event/apply'},
+    {'method': 'PUT', 'url': 'https://weverse.io/profile'},
+    {'method': 'GET', 'url': 'https://weverse.io/신청/안내'},
+    {'method': 'GET', 'url': 'https://weverse.io/nct127/notice/27925'},
+]
+
+
+def test_classification_rules():
+    """验证分类规则"""
+    print("🧪 测试请求分类规则")
+    print("=" * 50)
+
+    classifier = RequestClassifier()
+    analysis = classifier.classify_batch(SAMPLE_REQUESTS)
+
+    static_urls = [req['url'] for req in analysis['static_requests']]
+    api_urls = [req['url'] for req in analysis['api_requests']]
+    important_urls = [req['url'] for req in analysis['important_requests']]
+
+    print(f"   静态资源: {len(static_urls)} 个")
+    print(f"   API请求: {len(api_urls)} 个")
+    print(f"   关键请求: {len(important_urls)} 个")
+
+    assert analysis['get_count'] == 7
+    assert analysis['post_count'] == 1
+    assert analysis['put_count'] == 1
+
+    # 后缀表匹配：.json 不再被 .js 误判为静态资源
+    assert 'https://weverse.io/static/main.js' in static_urls
+    assert 'https://weverse.io/static/app.css?v=3' in static_urls
+    assert 'https://weverse.io/fonts/pretendard.woff2' in static_urls
+    assert 'https://weverse.io/config/settings.json' not in static_urls
+
+    # 关键词不区分大小写，支持韩文
+    assert 'https://weverse.io/신청/안내' in important_urls
+    assert 'https://weverse.io/event/apply' in important_urls
+    assert 'https://weverse.io/profile' in important_urls
+    assert 'https://weverse.io/nct127/notice/27925' not in important_urls
+    assert classifier.classify('GET', 'https://weverse.io/API/v1')['important']
+
+    # 非GET或含api → API请求
+    assert 'https://global.apis.naver.com/weverse/wevweb/notice/v1.0/notice-27925' in api_urls
+    assert 'https://weverse.io/profile' in api_urls
+
+    print("✅ 分类规则验证通过")
+
+
+def test_detailed_logging_and_cache():
+    """验证详细记录规则和URL缓存"""
+    print("\n🧪 测试详细记录规则和缓存")
+    print("=" * 50)
+
+    classifier = RequestClassifier(
+        rules={'cache_size': 10000},
+        detailed_logging={'methods': ['POST', 'PUT'], 'keywords': ['api']}
+    )
+
+    assert classifier.is_detailed('POST', 'https://weverse.io/event/apply')
+    assert classifier.is_detailed('GET', 'https://weverse.io/api/notice')
+    assert not classifier.is_detailed('GET', 'https://weverse.io/static/main.js')
+
+    # 默认配置保持原有规则：POST/PUT 或 URL 含 api
+    default = RequestClassifier()
+    assert default.is_detailed('GET', 'https://weverse.io/API/notice')
+    assert not default.is_detailed('GET', 'https://weverse.io/form/submit')
+
+    # 同一URL重复分析只计算一次
+    requests = SAMPLE_REQUESTS * 500
+    start = time.perf_counter()
+    classifier.classify_batch(requests)
+    classifier.classify_batch(requests)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    stats = classifier.get_cache_stats()
+    print(f"   分析 {len(requests) * 2} 个请求耗时: {elapsed_ms:.1f}ms")
+    print(f"   缓存: {stats}")
+
+    assert stats['cached_urls'] <= len(SAMPLE_REQUESTS) + 2
+    assert stats['hits'] > stats['misses']
+
+    # 超出上限时只淘汰最久未用的URL，常用URL保持命中
+    small = RequestClassifier(rules={'cache_size': 100})
+    hot_url = 'https://weverse.io/api/apply'
+    for i in range(1000):
+        small.classify('GET', hot_url)
+        small.classify('GET', f'https://cdn.weverse.io/assets/{i}.png')
+    stats = small.get_cache_stats()
+    assert stats['cached_urls'] == 100
+    assert stats['misses'] == 1001, "热门URL不应因缓存满而被清空"
+
+    print("✅ 缓存验证通过")
+
+
+if __name__ == "__main__":
+    test_classification_rules()
+    test_detailed_logging_and_cache()
+    print("\n✅ 请求分类器测试完成")
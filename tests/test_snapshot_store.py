@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_snapshot_store.py
+测试快照存储 - 验证内容寻址去重、会话JSON只存引用和惰性解压
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.analysis.snapshot_store import SnapshotStore, LazySnapshot, load_session
+
+PAGE_HTML = '<html><body>' + '<div class="notice">위버스 공지</div>' * 200 + '</body></html>'
+
+
+def _session(title):
+    return {
+        'metadata': {'title': title},
+        'monitoring_data': {
+            'pre_click_data': {'page_content': {'html_content': PAGE_HTML, 'page_title': title}},
+            'final_data': {'final_page_content': {'html_content': '<html></html>'}},
+            'dom_recording': {'segments': [{'index': 0, 'baseline': {'i': 1, 't': 'html', 'a': {}, 'c': []}}]}
+        }
+    }
+
+
+def test_dedupe_across_sessions():
+    """验证两个会话的相同页面只存一份"""
+    print("🧪 测试跨会话去重")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        snapshot_dir = os.path.join(data_dir, 'snapshots')
+        first = SnapshotStore(root=snapshot_dir).dump_json(_session('a'), os.path.join(data_dir, 'a.json'))
+        second = SnapshotStore(root=snapshot_dir).dump_json(_session('b'), os.path.join(data_dir, 'b.json'))
+        print(f"   第一次: {first}")
+        print(f"   第二次: {second}")
+
+        # 页面HTML和DOM基线各一个blob，小字符串保持内联
+        assert first['written'] == 2 and first['deduplicated'] == 0
+        assert second['written'] == 0 and second['deduplicated'] == 2
+        blobs = [name for _, _, names in os.walk(snapshot_dir) for name in names]
+        assert len(blobs) == 2
+        assert first['stored_bytes'] < len(PAGE_HTML) / 10
+
+        with open(os.path.join(data_dir, 'b.json'), encoding='utf-8') as f:
+            raw = json.load(f)
+        pre_click = raw['monitoring_data']['pre_click_data']['page_content']
+        assert 'snapshot_ref' in pre_click['html_content']
+        assert raw['monitoring_data']['final_data']['final_page_content']['html_content'] == '<html></html>'
+
+    print("✅ 跨会话去重验证通过")
+
+
+def test_lazy_read():
+    """验证读取会话时按需解压"""
+    print("\n🧪 测试惰性读取")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        filename = os.path.join(data_dir, 'session.json')
+        SnapshotStore(root=os.path.join(data_dir, 'snapshots')).dump_json(_session('a'), filename)
+
+        session = load_session(filename)
+        html = session['monitoring_data']['pre_click_data']['page_content']['html_content']
+        assert isinstance(html, LazySnapshot) and not html.loaded
+        assert len(html) == len(PAGE_HTML.encode('utf-8'))
+        assert html.text == PAGE_HTML and html.loaded
+
+        eager = load_session(filename, lazy=False)
+        assert eager['monitoring_data']['dom_recording']['segments'][0]['baseline'] == {'i': 1, 't': 'html', 'a': {}, 'c': []}
+
+    print("✅ 惰性读取验证通过")
+
+
+if __name__ == "__main__":
+    test_dedupe_across_sessions()
+    test_lazy_read()
+    print("\n✅ 快照存储测试完成")
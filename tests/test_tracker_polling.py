@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_tracker_polling.py
+测试用户操作跟踪器轮询 - 验证每次一个往返、游标增量拉取、状态变化才打印诊断
+"""
+
+import sys
+import os
+import io
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weverse.core.mode_components.monitoring_handler import MonitoringHandler
+from src.weverse.core.hot_logging import setup_logging, flush_logging
+
+
+class FakeTracker:
+    """模拟页面内 window.pollTracker 的假驱动"""
+
+    def __init__(self):
+        self.actions = []
+        self.seq = 0
+        self.calls = 0
+        self.installed = True
+
+    def add(self, action_type, **fields):
+        self.seq += 1
+        self.actions.append(dict(fields, id=self.seq, type=action_type))
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        assert 'pollTracker' in script
+        if not self.installed:
+            return {'installed': False, 'readyState': 'loading', 'href': 'https://weverse.io/form'}
+        cursor = args[0]
+        return {
+            'installed': True, 'readyState': 'complete', 'href': 'https://weverse.io/form',
+            'active': True, 'hasClickHandler': True, 'ringLength': len(self.actions),
+            'injectionTime': '2026-01-01T00:00:00Z',
+            'drain': {
+                'seq': self.seq, 'missed': 0, 'reset': False,
+                'actions': [a for a in self.actions if a['id'] > cursor]
+            }
+        }
+
+
+def test_incremental_drain_single_round_trip():
+    """验证每次轮询一个往返且只返回新操作"""
+    print("🧪 测试跟踪器增量轮询")
+    print("=" * 50)
+
+    tracker = FakeTracker()
+    handler = MonitoringHandler(tracker)
+
+    tracker.add('click', element='BUTTON', elementText='참여 신청')
+    tracker.add('input', elementType='text', placeholder='생년월일')
+
+    actions = handler._get_user_actions()
+    assert [a['element_id'] for a in actions] == ['click_1', 'input_2']
+    assert tracker.calls == 1
+
+    # 无新操作时返回空，游标不回退
+    assert handler._get_user_actions() == []
+    assert handler.action_cursor == 2
+
+    tracker.add('click', element='INPUT', elementText='')
+    actions = handler._get_user_actions()
+    assert [a['element_id'] for a in actions] == ['click_3']
+    assert tracker.calls == 3
+    print("✅ 增量轮询验证通过")
+
+
+def test_diagnostics_only_on_state_change():
+    """验证诊断信息只在状态变化时打印"""
+    print("\n🧪 测试状态变化诊断")
+    print("=" * 50)
+
+    tracker = FakeTracker()
+    handler = MonitoringHandler(tracker)
+
+    output = io.StringIO()
+    setup_logging(stream=output)
+    for _ in range(50):
+        handler._get_user_actions()
+    tracker.installed = False
+    for _ in range(50):
+        handler._get_user_actions()
+    flush_logging()
+    setup_logging()
+    log = output.getvalue()
+
+    assert log.count('跟踪器状态变化') == 1
+    assert log.count('跟踪器不可用') == 1
+    assert tracker.calls == 100
+    print("✅ 状态变化诊断验证通过")
+
+
+if __name__ == "__main__":
+    test_incremental_drain_single_round_trip()
+    test_diagnostics_only_on_state_change()
+    print("\n✅ 跟踪器轮询测试完成")